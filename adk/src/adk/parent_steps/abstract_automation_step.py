@@ -1,12 +1,12 @@
 import abc
 from abc import ABC
-from typing import Dict
-import time
-import yaml
+from typing import Callable, Dict, Optional
 
 from adk.src.adk.domain.cancellation_exception import CancellationException
 from adk.src.adk.domain.non_retriable_exception import NonRetriableException
 from adk.src.adk.parent_steps.step import Step
+from adk.src.adk.parent_steps.step_executor import CompiledStep
+from adk.src.adk.util.clock import get_clock
 
 try:
     from typing import Protocol
@@ -16,31 +16,37 @@ except ImportError:
 
 class AbstractAutomationStep(Step, ABC):
 
-    def invoke(self, params: dict):
-        params.setdefault("python_simulation_steps", [])
+    def compile_step(self, compiled_step: CompiledStep, get_index: Callable[[Step], int]):
+        if self._next_step and not self._is_end:
+            compiled_step.next = get_index(self._next_step)
+        if self._on_failure:
+            compiled_step.on_failure = get_index(self._on_failure)
+        if self._on_cancel:
+            compiled_step.on_cancel = get_index(self._on_cancel)
+
+    def invoke_compiled(self, compiled_step: CompiledStep, params: dict) -> Optional[int]:
         params["python_simulation_steps"].append(self.name)
         print(f"Executing Step: ${self.name}")
-        self.validations()
-        self._invoke_with_fallback(params)
-
-    def _invoke_with_fallback(self, params):
+        clock = get_clock()
+        start = clock.time()
         try:
             response_dict = self._invoke_with_retries(params)
-            params.update(response_dict)
-            if self._next_step and not self._is_end:
-                self._next_step.invoke(params)
         except CancellationException as exc:
-            if self._on_cancel:
-                print('Step failed: ' + self.name + ". Executing onCancel step " + self._on_cancel.name)
-                return self._on_cancel.invoke(params)
-            else:
+            if compiled_step.on_cancel is None:
                 raise exc
+            print('Step failed: ' + self.name + ". Executing onCancel step "
+                  + compiled_step.get_step_name(compiled_step.on_cancel))
+            return compiled_step.on_cancel
         except Exception as exc:
-            if self._on_failure:
-                print('Step failed: ' + self.name + ". Executing onFailure step " + self._on_failure.name)
-                return self._on_failure.invoke(params)
-            else:
+            if compiled_step.on_failure is None:
                 raise exc
+            print('Step failed: ' + self.name + ". Executing onFailure step "
+                  + compiled_step.get_step_name(compiled_step.on_failure))
+            return compiled_step.on_failure
+        finally:
+            clock.record_step(self.name, clock.time() - start)
+        params.update(response_dict)
+        return compiled_step.next
 
     def _invoke_with_retries(self, params):
         exception = None
@@ -57,7 +63,7 @@ class AbstractAutomationStep(Step, ABC):
         raise exception
 
     def _try_invoke(self, params):
-        start = time.time()
+        start = get_clock().time()
         self._validate_input(params)
         response = self.execute_step(params)
         response_dict = self._get_selected_response(response)
@@ -65,7 +71,7 @@ class AbstractAutomationStep(Step, ABC):
         return response_dict
 
     def _check_execution_time(self, start):
-        execution_time = time.time() - start
+        execution_time = get_clock().time() - start
         if execution_time > self._timeout_seconds:
             raise Exception("Execution time exceeded timeout: timeout set to " + str(
                 self._timeout_seconds) + " but took " + str(execution_time))
@@ -97,7 +103,7 @@ class AbstractAutomationStep(Step, ABC):
         self._is_end = is_end
         return self
 
-    def to_yaml(self, inputs: Dict[str, any]) -> str:
+    def to_definition(self, inputs: Dict[str, any]) -> dict:
         formatted_outputs = [
             {'Name': out.name, 'Selector': out.selector, 'Type': out.output_type.name} for out in self.get_outputs()]
         ssm_def = {}
@@ -121,7 +127,7 @@ class AbstractAutomationStep(Step, ABC):
         if self._on_failure:
             ssm_def.update({'onFailure': 'step:' + self._on_failure.name})
 
-        return yaml.dump(ssm_def, sort_keys=False)
+        return ssm_def
 
     def resolve_step(self, _: 'AbstractAutomationStep'):
         return self
@@ -1,11 +1,10 @@
 import abc
-from typing import List, Dict
-
-import yaml
+from typing import Callable, List, Dict, Optional
 
 from adk.src.adk.domain.output import Output
 from adk.src.adk.domain.platform import Platform
 from adk.src.adk.parent_steps.step import Step
+from adk.src.adk.parent_steps.step_executor import CompiledStep
 
 
 class AbstractCommandStep(Step, abc.ABC):
@@ -35,39 +34,42 @@ class AbstractCommandStep(Step, abc.ABC):
     def get_outputs(self) -> List[Output]:
         return []
 
-    def invoke(self, params: dict):
+    def compile_step(self, compiled_step: CompiledStep, get_index: Callable[[Step], int]):
+        super().compile_step(compiled_step, get_index)
+        last_step = self._get_last_step()
+        if last_step != self and last_step._is_finally:
+            compiled_step.final = get_index(last_step)
+
+    def invoke_compiled(self, compiled_step: CompiledStep, params: dict) -> Optional[int]:
         print("Executing step " + self.name)
-        params.setdefault("python_simulation_steps", [])
         params["python_simulation_steps"].append(self.name)
-        self.validations()
         try:
             self.execute_step(params)
-            self.invoke_subsequent(params)
         except Exception as e:
             print("Execution failed for step " + self.name + ": " + str(e))
-            if self._mark_success_on_failure:
-                print("Step " + self.name + " marked to succeed on failure. Proceeding...")
-                self.invoke_subsequent(params)
-            else:
-                self.invoke_finally(params)
+            if not self._mark_success_on_failure:
+                self.invoke_finally(compiled_step, params)
                 raise Exception('Raising previously thrown exception (raised prior to finally step)') from e
+            print("Step " + self.name + " marked to succeed on failure. Proceeding...")
+        return self.get_subsequent(compiled_step)
 
-    def invoke_subsequent(self, params):
+    def get_subsequent(self, compiled_step: CompiledStep) -> Optional[int]:
         if self._exit_on_success:
             print("Exit on success enabled for current step: " + self.name)
-            self.invoke_finally(params)
-        elif self._next_step:
-            self._next_step.invoke(params)
-
-    def invoke_finally(self, params):
-        last_step = self._get_last_step()
-        if last_step != self and last_step._is_finally:
-            print("Invoking finally step: " + last_step.name)
-            last_step.invoke(params)
-            return True
-        return False
-
-    def to_yaml(self, inputs: Dict[str, any]) -> str:
+            if compiled_step.final is not None:
+                print("Invoking finally step: " + compiled_step.get_step_name(compiled_step.final))
+            return compiled_step.final
+        return compiled_step.next
+
+    def invoke_finally(self, compiled_step: CompiledStep, params: dict) -> bool:
+        if compiled_step.final is None:
+            return False
+        final_step = compiled_step.program[compiled_step.final]
+        print("Invoking finally step: " + final_step.step.name)
+        final_step.step.invoke_compiled(final_step, params)
+        return True
+
+    def to_definition(self, inputs: Dict[str, any]) -> dict:
         inputs_copy = dict(inputs)
         ssm_def = {}
         if self.get_description():
@@ -84,7 +86,7 @@ class AbstractCommandStep(Step, abc.ABC):
         if self._mark_success_on_failure:
             inputs_copy.update({'onSuccess': 'exit'})
 
-        return yaml.dump(ssm_def, sort_keys=False)
+        return ssm_def
 
     def _get_last_step(self):
         last = self
@@ -1,24 +1,52 @@
-import yaml
 import abc
+import json
 
 from adk.src.adk.parent_steps.step import Step
+from adk.src.adk.parent_steps.step_executor import StepExecutor
 
 
 class AbstractDocument(object):
 
     def __init__(self, first: Step):
         self._first = first
+        self._executor = None
+
+    def get_executor(self) -> StepExecutor:
+        """
+        Returns the executor of document steps. Steps are compiled on the first call only,
+        so the chain of steps may not be changed after the document is executed.
+        """
+        if self._executor is None:
+            self._executor = StepExecutor(self._first)
+        return self._executor
 
     def get_main_steps(self):
         current_step = self._first
-        ssm_steps = [yaml.safe_load(current_step.get_yaml())]
+        ssm_steps = [current_step.to_dict()]
         current_step.validations()
         while current_step.get_next_step():
             current_step = current_step.get_next_step()
             current_step.validations()
-            ssm_steps.append(yaml.safe_load(current_step.get_yaml()))
+            ssm_steps.append(current_step.to_dict())
         return ssm_steps
 
     @abc.abstractmethod
-    def get_document_yaml(self) -> str:
+    def get_document_dict(self) -> dict:
+        """
+        Generates the definition of the document including definitions of all of its steps.
+        """
         pass
+
+    @abc.abstractmethod
+    def get_document_yaml(self, use_c_dumper: bool = False) -> str:
+        """
+        Generates the yaml of the document. The document definition is built first and serialized once.
+        :param use_c_dumper: True to serialize with LibYAML emitter (if available) which is considerably faster
+        """
+        pass
+
+    def get_document_json(self) -> str:
+        """
+        Generates the document in JSON format (the header comments are not included).
+        """
+        return json.dumps(self.get_document_dict(), indent=2)
@@ -46,10 +46,10 @@ class AssertResourceStep(AwsApiStep):
             raise Exception('Did not find value from ' + str(self.get_desired_values()) + ' in selector '
                             + self.get_selector() + ' for response: ' + str(response))
 
-    def get_yaml(self):
+    def to_dict(self) -> dict:
         yaml_inputs = {**{'Service': self.get_service(),
                           'Api': self.get_camel_case_api(),
                           'PropertySelector': self.get_selector(),
                           'DesiredValues': self.get_desired_values()}
                        , **self.get_api_params()}
-        return self.to_yaml(inputs=yaml_inputs)
+        return self.to_definition(inputs=yaml_inputs)
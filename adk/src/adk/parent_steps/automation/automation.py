@@ -1,14 +1,13 @@
 import copy
 from typing import List
 
-import yaml
-
 from adk.src.adk.domain.data_type import DataType
 from adk.src.adk.domain.input import Input
 from adk.src.adk.domain.non_retriable_exception import NonRetriableException
 from adk.src.adk.domain.output import Output
 from adk.src.adk.parent_steps.abstract_automation_step import AbstractAutomationStep
 from adk.src.adk.parent_steps.abstract_document import AbstractDocument
+from adk.src.adk.parent_steps.step import dump_yaml
 
 
 class Automation(AbstractAutomationStep, AbstractDocument):
@@ -20,7 +19,7 @@ class Automation(AbstractAutomationStep, AbstractDocument):
     This class can also be used as a first class SSM Automation Document.
     When invoking this Automation as a first class SSM, you can both run the simulation and print as follows:
     The Automation can be simulated using the run_automation() function.
-    It can be printed using the get_automation_yaml() function.
+    It can be printed using the get_document_yaml() function.
     See example usages in test file (same package in test 'test_automation.py')
     """
     def __init__(self, step_name: str, steps: List[AbstractAutomationStep],
@@ -82,7 +81,7 @@ class Automation(AbstractAutomationStep, AbstractDocument):
         params_copy = copy.deepcopy(params)
         self.insert_default_inputs(params_copy)
         self.validate_inputs(params_copy)
-        self._first.invoke(params_copy)
+        self.get_executor().run(params_copy)
         return params_copy
 
     def validate_inputs(self, params):
@@ -108,16 +107,20 @@ class Automation(AbstractAutomationStep, AbstractDocument):
                     raise Exception("Value for input:" + param[0] + " was " + param[1] + "; Allowed: "
                                     + str(inp.allowed_values))
 
-    def get_yaml(self) -> str:
+    def to_dict(self) -> dict:
         input_payload = dict((inp, '{{ ' + inp + ' }}') for inp in self.get_subnames())
-        parent_yaml = yaml.safe_load(self.to_yaml(inputs={
+        parent_def = self.to_definition(inputs={
             'DocumentName': self.name,
-            'RuntimeParameters': input_payload}))
+            'RuntimeParameters': input_payload})
         # Outputs for automation steps are implicitly set as Output. They may not be declared in YAML.
-        parent_yaml.pop('outputs', None)
-        return yaml.dump(parent_yaml, sort_keys=False)
+        parent_def.pop('outputs', None)
+        return parent_def
+
+    def get_document_yaml(self, use_c_dumper: bool = False) -> str:
+        prefix = self.header_with_comments(self._header) + "\n---\n" if self._header else ''
+        return prefix + dump_yaml(self.get_document_dict(), use_c_dumper)
 
-    def get_document_yaml(self) -> str:
+    def get_document_dict(self) -> dict:
         ssm_steps = self.get_main_steps()
 
         root = {
@@ -128,8 +131,7 @@ class Automation(AbstractAutomationStep, AbstractDocument):
         if len(self._doc_outputs):
             root.update({'outputs': self._doc_outputs})
         root.update({'mainSteps': ssm_steps})
-        prefix = self.header_with_comments(self._header) + "\n---\n" if self._header else ''
-        return prefix + yaml.dump(root, sort_keys=False)
+        return root
 
     def _create_chain(self):
         first_step = self._steps[0]
@@ -72,6 +72,6 @@ class AwsApiStep(AbstractAutomationStep):
         api_params = self.replace_variables(api_params, params)
         return getattr(client, self.get_python_api())(**json.loads(api_params))
 
-    def get_yaml(self):
+    def to_dict(self) -> dict:
         yaml_inputs = {**{'Service': self.get_service(), 'Api': self.get_camel_case_api()}, **self.get_api_params()}
-        return self.to_yaml(inputs=yaml_inputs)
+        return self.to_definition(inputs=yaml_inputs)
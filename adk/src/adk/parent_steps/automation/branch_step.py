@@ -1,8 +1,10 @@
-from typing import List
+from typing import Callable, List, Optional
 
 from adk.src.adk.domain.choice import Choice
 from adk.src.adk.domain.output import Output
 from adk.src.adk.parent_steps.abstract_automation_step import AutomationStepReference, AbstractAutomationStep
+from adk.src.adk.parent_steps.step import Step
+from adk.src.adk.parent_steps.step_executor import CompiledStep
 
 
 class BranchStep(AbstractAutomationStep):
@@ -39,27 +41,27 @@ class BranchStep(AbstractAutomationStep):
     def execute_step(params):
         return {}
 
-    def invoke(self, params):
-        self.validations()
-        params.setdefault("python_simulation_steps", [])
+    def compile_step(self, compiled_step: CompiledStep, get_index: Callable[[Step], int]):
+        compiled_step.choices = [(choice, get_index(choice.skip_to.resolve_step(self))) for choice in self.choices]
+        compiled_step.next = get_index(
+            (self._default_step if self._default_step else self._next_step).resolve_step(self))
+
+    def invoke_compiled(self, compiled_step: CompiledStep, params: dict) -> Optional[int]:
         params["python_simulation_steps"].append(self.name)
         if not set(self.get_inputs()) <= params.keys():
             raise Exception("Inputs were not available " + str(self.get_inputs()))
-        for choice in self.choices:
+        for choice, index in compiled_step.choices:
             if choice.evaluate(params[choice.input_to_test]):
-                next_step = choice.skip_to.resolve_step(self)
-                print("Branch step forwarding to step " + next_step.name)
-                next_step.invoke(params)
-                return
-        fallback = (self._default_step if self._default_step else self._next_step).resolve_step(self)
-        print("Branch proceeding to step " + fallback.name)
-        fallback.invoke(params)
+                print("Branch step forwarding to step " + compiled_step.get_step_name(index))
+                return index
+        print("Branch proceeding to step " + compiled_step.get_step_name(compiled_step.next))
+        return compiled_step.next
 
-    def get_yaml(self) -> str:
+    def to_dict(self) -> dict:
         choices_inputs = {"Choices": [choice.get_as_dict(self) for choice in self.choices]}
         if self._default_step:
             choices_inputs['Default'] = self._default_step.resolve_step(self).name
-        return self.to_yaml(inputs=choices_inputs)
+        return self.to_definition(inputs=choices_inputs)
 
     def validations(self):
         super().validations()
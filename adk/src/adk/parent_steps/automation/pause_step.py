@@ -42,8 +42,8 @@ class PauseStep(AbstractAutomationStep):
     def get_input(text):
         return input(text)
 
-    def get_yaml(self) -> str:
-        return self.to_yaml(inputs={})
+    def to_dict(self) -> dict:
+        return self.to_definition(inputs={})
 
     def get_action(self) -> str:
         return 'aws:pause'
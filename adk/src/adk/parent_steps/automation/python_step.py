@@ -1,9 +1,10 @@
 import abc
+import ast
 import inspect
 import sys
 import json
 from inspect import getsource
-from typing import List, Callable
+from typing import Dict, FrozenSet, List, Callable, Set
 
 from adk.src.adk.domain.non_retriable_exception import NonRetriableException
 from adk.src.adk.parent_steps.abstract_automation_step import AbstractAutomationStep
@@ -21,13 +22,32 @@ class PythonStep(AbstractAutomationStep, metaclass=abc.ABCMeta):
     BAD => "import steps_util.shared"... "shared.amazing_function()" <= makes reference to file prefix
     GOOD => "from steps_util.shared import amazing_function"... "amazing_function"
     The entire execution of script_handler may not use any local variables available in "self".
+    The source of step classes does not change at runtime, so script and helper names are extracted once per class.
+    In fast simulation mode helper calls are validated once per class by static analysis of the script functions
+    instead of profiling every call during the execution.
     """
 
+    DEFAULT_FAST_SIMULATION = False
+    # Scripts (required imports and functions) by step class
+    _scripts: Dict[type, str] = {}
+    # Names of functions declared in get_helper_functions() by step class
+    _helper_function_names: Dict[type, FrozenSet[str]] = {}
+    # Step classes with helper function calls validated by static analysis
+    _statically_validated: Set[type] = set()
+
     def __init__(self, name=None):
         super().__init__(name if name else type(self).__name__)
         self._record = True
         self._record_stack_level = 0
         self._in_execute = False
+        self._fast_simulation = PythonStep.DEFAULT_FAST_SIMULATION
+
+    def fast_simulation(self, fast_simulation: bool):
+        """
+        :param fast_simulation: True to validate helper function calls by static analysis instead of profiler
+        """
+        self._fast_simulation = fast_simulation
+        return self
 
     @abc.abstractmethod
     def get_helper_functions(self) -> List[Callable]:
@@ -42,11 +62,16 @@ class PythonStep(AbstractAutomationStep, metaclass=abc.ABCMeta):
     def get_action(self) -> str:
         return 'aws:executeScript'
 
-    def invoke(self, params: dict):
+    def _invoke_with_retries(self, params):
+        if self._fast_simulation:
+            self.validate_function_calls_statically()
+            return super()._invoke_with_retries(params)
         prev = sys.getprofile()
         sys.setprofile(self.validate_function_calls)
-        super().invoke(params)
-        sys.setprofile(prev)
+        try:
+            return super()._invoke_with_retries(params)
+        finally:
+            sys.setprofile(prev)
 
     def execute_step(self, params: dict) -> dict:
         # Take the subnames of each of the inputs and send them into the script_handler()
@@ -83,30 +108,64 @@ class PythonStep(AbstractAutomationStep, metaclass=abc.ABCMeta):
             return
         if self._in_execute:
             if event == 'call' and self.is_local_module(inspect.getmodule(frame)):
-                code_name = frame.f_code.co_name
-                declared_qualnames = [func.__name__ for func in self.get_helper_functions()]
-                if code_name not in declared_qualnames:
+                if frame.f_code.co_name not in self.get_helper_function_names():
                     raise NonRetriableException(
                         "Function invoked but not declared in " + type(self).__name__ + ".get_helper_functions(): "
                         + frame.f_code.co_name + "; " + "line: file://" + frame.f_code.co_filename + ":"
                         + str(frame.f_lineno))
         return self.validate_function_calls
 
+    def validate_function_calls_statically(self):
+        """
+        Ensures that all local python calls made by script_handler() and helper functions are declared in
+        get_helper_functions(), without executing them. Only direct calls by name are checked,
+        which is enough with helper functions imported as recommended in class documentation.
+        """
+        step_class = type(self)
+        if step_class in PythonStep._statically_validated:
+            return
+        declared_names = self.get_helper_function_names()
+        for func in [self.script_handler] + list(self.get_helper_functions()):
+            for node in ast.walk(ast.parse(self.get_source(func))):
+                if not isinstance(node, ast.Call) or not isinstance(node.func, ast.Name):
+                    continue
+                called = func.__globals__.get(node.func.id)
+                if inspect.isfunction(called) and self.is_local_module(inspect.getmodule(called)) \
+                        and called.__name__ not in declared_names:
+                    raise NonRetriableException(
+                        "Function invoked but not declared in " + step_class.__name__ + ".get_helper_functions(): "
+                        + called.__name__ + "; " + "line: file://" + inspect.getsourcefile(func) + ":"
+                        + str(func.__code__.co_firstlineno + node.lineno - 1))
+        PythonStep._statically_validated.add(step_class)
+
+    def get_helper_function_names(self) -> FrozenSet[str]:
+        step_class = type(self)
+        names = PythonStep._helper_function_names.get(step_class)
+        if names is None:
+            names = frozenset(func.__name__ for func in self.get_helper_functions())
+            PythonStep._helper_function_names[step_class] = names
+        return names
+
     def is_local_module(self, module):
         return module is not None and self.__module__.split('.')[0] in module.__name__
 
-    def get_yaml(self) -> str:
+    def to_dict(self) -> dict:
         input_payload = dict((inp.split(".", 1)[-1], '{{ ' + inp + ' }}') for inp in self.get_inputs())
-        return self.to_yaml(inputs={
+        return self.to_definition(inputs={
             'Runtime': 'python3.6',
             'Handler': 'script_handler',
             'Script': self.get_script(),
             'InputPayload': input_payload})
 
     def get_script(self):
-        import_lines = self.get_required_file_imports()
-        functions = self.get_functions()
-        return '\n'.join(import_lines) + "\n\n" + '\n'.join(functions)
+        step_class = type(self)
+        script = PythonStep._scripts.get(step_class)
+        if script is None:
+            import_lines = self.get_required_file_imports()
+            functions = self.get_functions()
+            script = '\n'.join(import_lines) + "\n\n" + '\n'.join(functions)
+            PythonStep._scripts[step_class] = script
+        return script
 
     def get_functions(self):
         functions = [self.get_source(self.script_handler)]
@@ -125,8 +184,7 @@ class PythonStep(AbstractAutomationStep, metaclass=abc.ABCMeta):
 
     def validations(self):
         super().validations()
-        step_yaml = self.get_yaml()
-        if 'import unittest.mock' in step_yaml:
+        if 'import unittest.mock' in self.get_script():
             raise Exception('You are generating a module with an import "import unittest.mock". '
                             'Do not mock out modules when printing the yaml')
         non_payload_outputs = [out.name for out in self.get_outputs() if 'Payload' not in out.selector]
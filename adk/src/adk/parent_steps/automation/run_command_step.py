@@ -4,7 +4,6 @@ import re
 from typing import List, Dict
 
 import boto3
-import yaml
 
 from adk.src.adk.domain.data_type import DataType
 from adk.src.adk.domain.input import Input
@@ -14,6 +13,7 @@ from adk.src.adk.parent_steps.abstract_command_step import AbstractCommandStep
 from adk.src.adk.parent_steps.abstract_document import AbstractDocument
 from adk.src.adk.parent_steps.automation.aws_api_step import AwsApiStep
 from adk.src.adk.parent_steps.automation.wait_for_resource_step import WaitForResourceStep
+from adk.src.adk.parent_steps.step import dump_yaml
 
 
 class RunCommandStep(AbstractAutomationStep, AbstractDocument):
@@ -53,7 +53,11 @@ class RunCommandStep(AbstractAutomationStep, AbstractDocument):
             # Output(name='Output', output_type=DataType.String)
         ]
 
-    def get_document_yaml(self) -> str:
+    def get_document_yaml(self, use_c_dumper: bool = False) -> str:
+        prefix = self.header_with_comments(self._header) + "\n---\n" if self._header else ''
+        return prefix + dump_yaml(self.get_document_dict(), use_c_dumper)
+
+    def get_document_dict(self) -> dict:
         ssm_steps = self.get_main_steps()
 
         root = {
@@ -62,8 +66,7 @@ class RunCommandStep(AbstractAutomationStep, AbstractDocument):
             'parameters': self._get_ssm_inputs()}
 
         root.update({'mainSteps': ssm_steps})
-        prefix = self.header_with_comments(self._header) + "\n---\n" if self._header else ''
-        return prefix + yaml.dump(root, sort_keys=False)
+        return root
 
     def _get_ssm_inputs(self):
         ssm_inputs = {}
@@ -123,7 +126,7 @@ class RunCommandStep(AbstractAutomationStep, AbstractDocument):
 
     def run_document(self, params: {}) -> {}:
         params_copy = self.copy_and_replace_params(params)
-        self._first.invoke(params_copy)
+        self.get_executor().run(params_copy)
         return params_copy
 
     def copy_and_replace_params(self, params):
@@ -142,15 +145,15 @@ class RunCommandStep(AbstractAutomationStep, AbstractDocument):
             if name not in params_copy:
                 params_copy[name] = default
 
-    def get_yaml(self) -> str:
-        parent_yaml = yaml.safe_load(self.to_yaml(inputs={
+    def to_dict(self) -> dict:
+        parent_def = self.to_definition(inputs={
             'DocumentName': self._run_command_document_name,
             'InstanceIds': ['{{ ' + self._instance_ids_input + ' }}'],
             'Parameters': dict([(i[0].name, i[1]) for i in self._command_params.items() if i[1] is not None])
-        }))
+        })
         # Outputs for command steps are implicitly set as Output. They may not be declared in YAML.
-        parent_yaml.pop('outputs', None)
-        return yaml.dump(parent_yaml, sort_keys=False)
+        parent_def.pop('outputs', None)
+        return parent_def
 
     def get_default_populated_cmd_params(self):
         return dict([(i[0], i[0].default if i[1] is None else i[1]) for i in self._command_params.items()])
@@ -1,15 +1,16 @@
-import time
 from typing import List
 
 from adk.src.adk.domain.output import Output
 from adk.src.adk.parent_steps.abstract_automation_step import AbstractAutomationStep
+from adk.src.adk.util.clock import get_clock
 
 
 class SleepStep(AbstractAutomationStep):
     """
     aws:sleep implementation
     Used to sleep the execution for the specified amount of sleep_seconds.
-    The python code ALSO sleeps. Be sure to mock out the sleep code externally.
+    The python code ALSO sleeps. Be sure to mock out the sleep code externally
+    or simulate the execution with adk.src.adk.util.clock.simulated_clock() which only advances virtual time.
     """
 
     def __init__(self, sleep_seconds: int, name: str = None):
@@ -28,11 +29,12 @@ class SleepStep(AbstractAutomationStep):
         return ''
 
     def execute_step(self, params: dict) -> dict:
-        start = time.time()
-        time.sleep(self.sleep_seconds)
+        clock = get_clock()
+        start = clock.time()
+        clock.sleep(self.sleep_seconds)
         # Let's check if this actually went to sleep. We will use 0.8 seconds as a rule of thumb.
         # Anything greater than that means we actually went to sleep.
-        if time.time() - start > 0.8:
+        if not clock.simulated and clock.time() - start > 0.8:
             print('== WARNING! == The execution actually performed a sleep. '
                   'If you are committing this code ensure that you mock out the call to time.sleep using:\n'
                   '  @patch("time.sleep", return_value=None)\n'
@@ -42,5 +44,5 @@ class SleepStep(AbstractAutomationStep):
     def get_action(self) -> str:
         return 'aws:sleep'
 
-    def get_yaml(self) -> str:
-        return self.to_yaml(inputs={'Duration': "PT" + str(self.sleep_seconds) + "S"})
+    def to_dict(self) -> dict:
+        return self.to_definition(inputs={'Duration': "PT" + str(self.sleep_seconds) + "S"})
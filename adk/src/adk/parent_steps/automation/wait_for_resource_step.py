@@ -1,9 +1,9 @@
-import time
 from abc import ABC
 from typing import List, Dict
 
 from adk.src.adk.domain.non_retriable_exception import NonRetriableException
 from adk.src.adk.parent_steps.automation.assert_resource_step import AssertResourceStep
+from adk.src.adk.util.clock import get_clock
 
 
 class WaitForResourceStep(AssertResourceStep, ABC):
@@ -25,9 +25,10 @@ class WaitForResourceStep(AssertResourceStep, ABC):
         return 'aws:waitForAwsResourceProperty'
 
     def execute_step(self, params: dict) -> dict:
-        timeout = self._timeout_seconds + time.time()
+        clock = get_clock()
+        timeout = self._timeout_seconds + clock.time()
         last_exception = None
-        while time.time() < timeout:
+        while clock.time() < timeout:
             try:
                 return super().execute_step(params)
             except NonRetriableException as exc:
@@ -36,7 +37,7 @@ class WaitForResourceStep(AssertResourceStep, ABC):
                 print("Received exception when hitting AWS api " + self._service + "." + self.get_camel_case_api()
                       + ". Will try again in 3 seconds: " + str(exc))
                 last_exception = exc
-            time.sleep(3)
+            clock.sleep(3)
         error_msg = 'Response received for API ' + self.get_service() + ':' + self.get_python_api() +\
                     ' did not match selector values'
         if last_exception is not None:
@@ -66,7 +66,7 @@ class RunShellScript(AbstractCommandStep):
             return 'cd ' + params[self._working_dir_input] + '\n'
         return 'cd ' + self._working_dir + '\n' if self._working_dir else ''
 
-    def get_yaml(self) -> str:
+    def to_dict(self) -> dict:
         inputs = {'runCommand': self._run_commands}
         if self._working_dir:
             inputs.update({'workingDirectory': self._working_dir})
@@ -76,7 +76,7 @@ class RunShellScript(AbstractCommandStep):
             inputs.update({'timeoutSeconds': self._script_timeout_seconds})
         if self._timeout_input:
             inputs.update({'timeoutSeconds': '{{ ' + self._timeout_input + ' }}'})
-        return self.to_yaml(inputs=inputs)
+        return self.to_definition(inputs=inputs)
 
     def get_action(self) -> str:
         return 'aws:runShellScript'
@@ -2,12 +2,13 @@ import abc
 import inspect
 import json
 import re
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
 
 import yaml
-import jsonpath_ng
 
 from adk.src.adk.domain.output import Output
+from adk.src.adk.parent_steps.step_executor import CompiledStep, StepExecutor
+from adk.src.adk.util.json_path import find_json_path_values
 
 
 class Step(object):
@@ -86,13 +87,20 @@ class Step(object):
         return {}
 
     @abc.abstractmethod
+    def to_dict(self) -> dict:
+        """
+        Generates the definition of the given step.
+        The dict returned should have keys of "name", "action", "inputs", etc.
+        :return: the step definition to be used in the ssm.
+        """
+        return {}
+
     def get_yaml(self) -> str:
         """
         Generates the yaml for the given step.
-        The yaml returned should have keys of "name", "action", "inputs", etc.
         :return: the yaml to be used in the ssm.
         """
-        return ''
+        return dump_yaml(self.to_dict())
 
     @abc.abstractmethod
     def get_action(self) -> str:
@@ -103,9 +111,31 @@ class Step(object):
         """
         return ''
 
-    @abc.abstractmethod
     def invoke(self, params: dict):
-        pass
+        """
+        Simulates execution of this step and all of the subsequent steps.
+        :param params: the inputs of the execution, updated with the outputs of executed steps
+        """
+        StepExecutor(self).run(params)
+
+    def compile_step(self, compiled_step: CompiledStep, get_index: Callable[['Step'], int]):
+        """
+        Resolves the steps the execution may continue with to indexes of StepExecutor program.
+        :param compiled_step: the compiled step to set indexes to
+        :param get_index: the function returning program index of the given step
+        """
+        if self._next_step:
+            compiled_step.next = get_index(self._next_step)
+
+    @abc.abstractmethod
+    def invoke_compiled(self, compiled_step: CompiledStep, params: dict) -> Optional[int]:
+        """
+        Simulates execution of this step only.
+        :param compiled_step: this step compiled by StepExecutor
+        :param params: the inputs of the execution, updated with the outputs of this step
+        :return: the program index of the next step to execute or None to end the execution
+        """
+        return None
 
     def _validate_input(self, params):
         if not set(self.get_inputs()) <= params.keys():
@@ -120,15 +150,15 @@ class Step(object):
         return self._next_step
 
     @abc.abstractmethod
-    def to_yaml(self, inputs: Dict[str, any]) -> str:
-        return ''
+    def to_definition(self, inputs: Dict[str, any]) -> dict:
+        return {}
 
     def get_value_from_json(self, json_response, selector: str, identifier: str):
-        value = jsonpath_ng.parse(selector).find(json_response)
+        value = find_json_path_values(selector, json_response)
         if not value:
             raise Exception('Could not find value of ' + self.name + ':' + identifier + ' selector ' + selector
                             + ' in response: ' + str(json_response) + '\nfile://' + inspect.getfile(self.__class__))
-        return value[0].value
+        return value[0]
 
     def validations(self):
         pass
@@ -161,3 +191,38 @@ def str_presenter(dumper, data):
     if len(data.splitlines()) > 1:  # check for multiline string
         return dumper.represent_scalar('tag:yaml.org,2002:str', data, style='|')
     return dumper.represent_scalar('tag:yaml.org,2002:str', data)
+
+
+class SsmDumper(yaml.Dumper):
+    """
+    Dumper of SSM documents and steps. Objects shared by several steps are written in place instead of yaml aliases.
+    """
+
+    def ignore_aliases(self, data):
+        return True
+
+
+SsmDumper.add_representer(str, str_presenter)
+
+if yaml.__with_libyaml__:
+    class CSsmDumper(yaml.CDumper):
+        """
+        Same as SsmDumper, backed by LibYAML emitter
+        """
+
+        def ignore_aliases(self, data):
+            return True
+
+    CSsmDumper.add_representer(str, str_presenter)
+else:
+    CSsmDumper = SsmDumper
+
+
+def dump_yaml(definition: dict, use_c_dumper: bool = False) -> str:
+    """
+    Serializes the given definition of SSM document or step.
+    :param definition: the definition
+    :param use_c_dumper: True to use LibYAML emitter (if available) which is considerably faster
+    :return: the yaml
+    """
+    return yaml.dump(definition, Dumper=CSsmDumper if use_c_dumper else SsmDumper, sort_keys=False)
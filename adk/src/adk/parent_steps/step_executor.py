@@ -0,0 +1,74 @@
+from typing import Dict, List, Optional, Tuple
+
+
+class CompiledStep(object):
+    """
+    Step compiled into the program of StepExecutor.
+    All steps the execution may continue with are resolved once to their indexes in the program.
+    """
+
+    def __init__(self, index: int, step, program: List['CompiledStep']):
+        self.index = index
+        self.step = step
+        self.program = program
+        # Index of the step executed after this one, None to end the execution
+        self.next: Optional[int] = None
+        # Indexes of onFailure/onCancel steps
+        self.on_failure: Optional[int] = None
+        self.on_cancel: Optional[int] = None
+        # Choices of branch step with indexes of the steps to skip to
+        self.choices: List[Tuple[object, int]] = []
+        # Index of the finally step of command document
+        self.final: Optional[int] = None
+
+    def get_step_name(self, index: int) -> str:
+        return self.program[index].step.name
+
+
+class StepExecutor(object):
+    """
+    Simulates execution of the chain of steps starting from the given first step.
+    The chain is compiled once: every step which may be executed is validated and its transitions (next step,
+    branch choices, onFailure, onCancel and finally steps) are resolved to indexes of the program.
+    The program is driven by flat loop, so the stack depth does not grow with the number of executed steps.
+    """
+
+    def __init__(self, first):
+        self._program: List[CompiledStep] = []
+        self._indexes: Dict[object, int] = {}
+        # The program follows the chain of steps, steps out of the chain referenced by transitions
+        # (for example onFailure step declared in another document) are appended while it is compiled
+        step = first
+        while step is not None:
+            self._get_index(step)
+            step = step.get_next_step()
+        i = 0
+        while i < len(self._program):
+            compiled_step = self._program[i]
+            compiled_step.step.validations()
+            compiled_step.step.compile_step(compiled_step, self._get_index)
+            i += 1
+
+    def _get_index(self, step) -> int:
+        index = self._indexes.get(step)
+        if index is None:
+            index = len(self._program)
+            self._indexes[step] = index
+            self._program.append(CompiledStep(index, step, self._program))
+        return index
+
+    def get_program(self) -> List[CompiledStep]:
+        return self._program
+
+    def run(self, params: dict) -> dict:
+        """
+        Executes the compiled steps. Every step updates the given params and returns index of the next step.
+        :param params: the initial inputs, updated with outputs of the executed steps
+        :return: the given params
+        """
+        params.setdefault("python_simulation_steps", [])
+        index = 0
+        while index is not None:
+            compiled_step = self._program[index]
+            index = compiled_step.step.invoke_compiled(compiled_step, params)
+        return params
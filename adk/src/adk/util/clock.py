@@ -0,0 +1,92 @@
+import time
+from contextlib import contextmanager
+from typing import List, Tuple
+
+
+class Clock(object):
+    """
+    Clock used by steps in simulation for sleeps, waits and timeouts. The default clock uses the wall clock.
+    """
+
+    simulated = False
+
+    def time(self) -> float:
+        return time.time()
+
+    def sleep(self, seconds: float):
+        time.sleep(seconds)
+
+    def record_step(self, step_name: str, duration: float):
+        """
+        Records the duration of the executed step. Not recorded by the wall clock.
+        :param step_name: the name of the step
+        :param duration: the duration of the step in seconds
+        """
+        pass
+
+
+class SimulatedClock(Clock):
+    """
+    Virtual clock. Sleeps and waits advance virtual time instantly, so automations which take hours
+    are simulated in milliseconds while timeouts are still evaluated against virtual time.
+    The virtual durations of executed steps are recorded in step_durations in order of execution.
+    """
+
+    simulated = True
+
+    def __init__(self, start: float = 0):
+        self._now = start
+        self.step_durations: List[Tuple[str, float]] = []
+
+    def time(self) -> float:
+        return self._now
+
+    def sleep(self, seconds: float):
+        if seconds < 0:
+            raise ValueError("sleep length must be non-negative")
+        self._now += seconds
+
+    def advance(self, seconds: float):
+        """
+        Advances virtual time, for example to simulate duration of API call in a mocked client.
+        :param seconds: the number of seconds
+        """
+        self.sleep(seconds)
+
+    def record_step(self, step_name: str, duration: float):
+        self.step_durations.append((step_name, duration))
+
+
+_clock = Clock()
+
+
+def get_clock() -> Clock:
+    return _clock
+
+
+def set_clock(clock: Clock) -> Clock:
+    """
+    Sets the clock used by steps in simulation.
+    :param clock: the clock
+    :return: the previous clock
+    """
+    global _clock
+    previous = _clock
+    _clock = clock
+    return previous
+
+
+@contextmanager
+def simulated_clock(start: float = 0):
+    """
+    Simulates steps executed in the block with SimulatedClock, for example:
+    with simulated_clock() as clock:
+        automation.run_automation(params)
+    :param start: the initial virtual time
+    """
+    clock = SimulatedClock(start)
+    previous = set_clock(clock)
+    try:
+        yield clock
+    finally:
+        set_clock(previous)
@@ -0,0 +1,57 @@
+import re
+from functools import lru_cache
+from typing import Any, List, Optional, Tuple
+
+import jsonpath_ng
+
+JSON_PATH_CACHE_SIZE = 1024
+# Selectors of nested fields by plain names (such as $.Payload.Foo) are evaluated without jsonpath_ng
+SIMPLE_JSON_PATH_PATTERN = re.compile(r'^\$(\.[A-Za-z_][A-Za-z0-9_]*)+$')
+# Field names which are keywords of jsonpath_ng, selectors with them are left to jsonpath_ng
+JSON_PATH_RESERVED_WORDS = frozenset(['where', 'wherenot'])
+
+_NOT_SET = object()
+
+
+@lru_cache(maxsize=JSON_PATH_CACHE_SIZE)
+def parse_json_path(json_path: str):
+    """
+    Compiles the given JSONPath expression. The least recently used expressions are cached,
+    so the same selectors are not parsed again.
+    :param json_path: the JSONPath expression
+    :return: the compiled jsonpath_ng expression
+    """
+    return jsonpath_ng.parse(json_path)
+
+
+@lru_cache(maxsize=JSON_PATH_CACHE_SIZE)
+def _get_simple_json_path_fields(json_path: str) -> Optional[Tuple[str, ...]]:
+    if not SIMPLE_JSON_PATH_PATTERN.match(json_path):
+        return None
+    fields = tuple(json_path.split('.')[1:])
+    if JSON_PATH_RESERVED_WORDS.intersection(fields):
+        return None
+    return fields
+
+
+def find_json_path_values(json_path: str, data: Any) -> List[Any]:
+    """
+    Finds values of the given JSONPath expression in the given data.
+    Selectors of nested fields by plain names (such as $.Payload.Foo) are evaluated directly
+    with the same result as jsonpath_ng, other expressions are compiled once and cached.
+    :param json_path: the JSONPath expression
+    :param data: the data (for example response of API call)
+    :return: the values found, empty list if nothing is found
+    """
+    fields = _get_simple_json_path_fields(json_path)
+    if fields is None:
+        return [match.value for match in parse_json_path(json_path).find(data)]
+    value = data
+    for field in fields:
+        try:
+            value = value.get(field, _NOT_SET)
+        except (TypeError, AttributeError):
+            return []
+        if value is _NOT_SET:
+            return []
+    return [value]
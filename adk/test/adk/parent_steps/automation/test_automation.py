@@ -1,7 +1,9 @@
+import json
 import unittest
 from unittest.mock import patch, MagicMock
 
 import pytest
+import yaml
 
 from adk.src.adk.domain.branch_operation import Operation
 from adk.src.adk.domain.cancellation_exception import CancellationException
@@ -16,6 +18,7 @@ from adk.src.adk.domain.data_type import DataType
 from adk.src.adk.domain.input import Input
 from adk.src.adk.parent_steps.automation.automation import Automation
 from adk.src.adk.parent_steps.automation.pause_step import PauseStep
+from adk.src.adk.parent_steps.step import dump_yaml
 
 
 @pytest.mark.unit_test
@@ -244,6 +247,27 @@ class TestAutomation(unittest.TestCase):
             '  inputs:\n'
             '    Duration: PT1S\n', ssm_doc.get_document_yaml())
 
+    def test_print_multi_step_ssm_c_dumper(self):
+        self.assertEqual(sample_ssm().get_document_yaml(), sample_ssm().get_document_yaml(use_c_dumper=True))
+
+    def test_print_multi_step_ssm_json(self):
+        ssm_doc = sample_ssm()
+        self.assertEqual(yaml.safe_load(ssm_doc.get_document_yaml()), json.loads(ssm_doc.get_document_json()))
+
+    def test_automation_step_dict(self):
+        self.assertEqual({'description': 'Execute another SSM Doc: AssertEc2Running',
+                          'name': 'AssertEc2Running',
+                          'action': 'aws:executeAutomation',
+                          'inputs': {'DocumentName': 'AssertEc2Running',
+                                     'RuntimeParameters': {'AutoRole': '{{ AutoRole }}',
+                                                           'SampleInput': '{{ SampleInput }}'}}},
+                         self.automation_step.to_dict())
+
+    def test_dump_yaml_without_aliases(self):
+        values = ['running', 'going']
+        self.assertEqual('First:\n- running\n- going\nSecond:\n- running\n- going\n',
+                         dump_yaml({'First': values, 'Second': values}))
+
 
 def another_ssm() -> Automation:
     return Automation(inputs=[
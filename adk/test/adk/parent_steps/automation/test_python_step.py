@@ -1,10 +1,12 @@
 import unittest
 from typing import List, Callable
+from unittest.mock import patch
 
 import pytest
 
 from adk.src.adk.builtin_steps.sample_step import SampleStep
 from adk.src.adk.domain.data_type import DataType
+from adk.src.adk.domain.non_retriable_exception import NonRetriableException
 from adk.src.adk.domain.output import Output
 from adk.src.adk.parent_steps.automation.python_step import PythonStep
 
@@ -42,6 +44,31 @@ class TestPauseStep(unittest.TestCase):
     def test_validations(self):
         SampleStep().validations()
 
+    def test_should_fail_undeclared_helper(self):
+        with self.assertRaises(NonRetriableException):
+            MyUndeclaredPython().invoke({})
+
+    def test_should_execute_python_fast_simulation(self):
+        params = {}
+        with patch('sys.setprofile') as mocked_setprofile:
+            MyPython().fast_simulation(True).invoke(params)
+        self.assertEqual(4, params['MyPython.Foo'])
+        mocked_setprofile.assert_not_called()
+
+    def test_should_fail_undeclared_helper_fast_simulation(self):
+        with self.assertRaises(NonRetriableException) as e:
+            MyUndeclaredPython().fast_simulation(True).invoke({})
+        self.assertIn('MyUndeclaredPython.get_helper_functions(): my_undeclared_helper', str(e.exception))
+
+    def test_should_extract_script_once_per_class(self):
+        MyPython().get_yaml()
+        with patch('adk.src.adk.parent_steps.automation.python_step.getsource') as mocked_getsource:
+            python_yaml = MyPython(name='OtherPython').get_yaml()
+        mocked_getsource.assert_not_called()
+        self.assertIn('name: OtherPython', python_yaml)
+        self.assertIn('return {\'Foo\': my_helper()}', python_yaml)
+        self.assertEqual(frozenset(['my_helper']), MyPython().get_helper_function_names())
+
 
 class MyPython(PythonStep):
     def get_helper_functions(self) -> List[Callable]:
@@ -63,3 +90,16 @@ class MyPython(PythonStep):
 
 def my_helper():
     return 4
+
+
+class MyUndeclaredPython(MyPython):
+    def get_helper_functions(self) -> List[Callable]:
+        return []
+
+    @staticmethod
+    def script_handler(params: dict, context) -> dict:
+        return {'Foo': my_undeclared_helper()}
+
+
+def my_undeclared_helper():
+    return 5
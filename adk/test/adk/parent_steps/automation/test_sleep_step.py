@@ -4,6 +4,7 @@ from unittest.mock import patch
 import pytest
 
 from adk.src.adk.parent_steps.automation.sleep_step import SleepStep
+from adk.src.adk.util.clock import simulated_clock
 
 
 @pytest.mark.unit_test
@@ -14,6 +15,13 @@ class TestSleepStep(unittest.TestCase):
         SleepStep(4).execute_step({})
         mocked_sleep.assert_called_once()
 
+    @patch('time.sleep', return_value=None)
+    def test_should_advance_simulated_clock(self, mocked_sleep):
+        with simulated_clock() as clock:
+            SleepStep(4).execute_step({})
+        mocked_sleep.assert_not_called()
+        self.assertEqual(4, clock.time())
+
     def test_should_print_yaml(self):
         pause_yaml = SleepStep(4).get_yaml()
         self.assertEqual('name: SleepStep\n'
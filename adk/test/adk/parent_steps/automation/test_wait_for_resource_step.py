@@ -4,6 +4,7 @@ from unittest.mock import patch, MagicMock
 import pytest
 
 from adk.src.adk.parent_steps.automation.wait_for_resource_step import WaitForResourceStep
+from adk.src.adk.util.clock import simulated_clock
 
 
 @pytest.mark.unit_test
@@ -51,6 +52,18 @@ class TestRunner(unittest.TestCase):
         self.wait_for_resource_step.execute_step(step_input)
         self.assertEqual(mocked_sleep.call_count, 2)
 
+    @patch('time.sleep', return_value=None)
+    def test_desired_not_found_until_simulated_timeout(self, mocked_sleep):
+        self.mock_ec2.describe_instances.return_value = \
+            {'Reservations': [{'Instances': [{'InstanceType': 't1.nano', 'State': {'Name': 'FAIL'}}]}]}
+        step_input = {"InstanceId": 'i-0acf3aed3b36c6f51'}
+        with simulated_clock() as clock:
+            with self.assertRaises(Exception):
+                self.wait_for_resource_step.timeout_seconds(60).execute_step(step_input)
+        self.assertEqual(20, self.mock_ec2.describe_instances.call_count)
+        self.assertEqual(60, clock.time())
+        mocked_sleep.assert_not_called()
+
     def test_assert_resource_yaml(self):
         self.assertEqual('name: AssertEc2Running\n'
                          'action: aws:waitForAwsResourceProperty\n'
@@ -0,0 +1,82 @@
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from adk.src.adk.domain.branch_operation import Operation
+from adk.src.adk.domain.choice import Choice
+from adk.src.adk.domain.data_type import DataType
+from adk.src.adk.domain.input import Input
+from adk.src.adk.parent_steps.abstract_automation_step import ResolveByName
+from adk.src.adk.parent_steps.automation.automation import Automation
+from adk.src.adk.parent_steps.automation.branch_step import BranchStep
+from adk.src.adk.parent_steps.automation.pause_step import PauseStep
+from adk.src.adk.parent_steps.command.run_shell_script import RunShellScript
+from adk.src.adk.parent_steps.step_executor import StepExecutor
+
+
+@pytest.mark.unit_test
+class TestStepExecutor(unittest.TestCase):
+
+    def test_long_chain_without_recursion(self):
+        steps = [PauseStep(name=f"Pause{i}", pause_runtime=False) for i in range(sys.getrecursionlimit() * 2)]
+        for i in range(1, len(steps)):
+            steps[i - 1].then(steps[i])
+
+        params = StepExecutor(steps[0]).run({})
+
+        self.assertEqual([step.name for step in steps], params['python_simulation_steps'])
+
+    def test_compile_branch_targets(self):
+        pause_step1 = PauseStep(name="Pause1", pause_runtime=False).is_end(True)
+        pause_step2 = PauseStep(name="Pause2", pause_runtime=False)
+        branch_step = BranchStep(name="MyBranch", choices=[
+            Choice(operation=Operation.BooleanEquals, input_to_test="Input1", constant=True,
+                   skip_to=ResolveByName("Pause2"))])
+        branch_step.then(pause_step1).then(pause_step2)
+
+        program = StepExecutor(branch_step).get_program()
+
+        self.assertEqual(['MyBranch', 'Pause1', 'Pause2'], [compiled.step.name for compiled in program])
+        self.assertEqual([2], [index for _, index in program[0].choices])
+        self.assertEqual(1, program[0].next)
+        self.assertIsNone(program[1].next)
+
+    @patch('adk.src.adk.parent_steps.automation.pause_step.PauseStep.validations')
+    def test_validations_once_per_document(self, mocked_validations):
+        automation = Automation(step_name="TwoPauses",
+                                steps=[PauseStep(name="Pause1", pause_runtime=False),
+                                       PauseStep(name="Pause2", pause_runtime=False)],
+                                assume_role='AutoRole',
+                                inputs=[Input(name='AutoRole', input_type=DataType.String, description="role")])
+
+        automation.run_automation({'AutoRole': 'Role'})
+        automation.run_automation({'AutoRole': 'Role'})
+
+        self.assertEqual(2, mocked_validations.call_count)
+
+    @patch('adk.src.adk.parent_steps.automation.pause_step.PauseStep.get_input', side_effect=Exception('Failed'))
+    def test_on_failure_of_failed_step_only(self, mocked_pause):
+        final_step = PauseStep(name="Final", pause_runtime=False)
+        first_step = PauseStep(name="First", pause_runtime=False).on_failure(final_step)
+        first_step.then(PauseStep(name="Failing", pause_runtime=True)).then(final_step)
+        params = {}
+
+        with self.assertRaises(Exception):
+            first_step.invoke(params)
+        self.assertEqual(['First', 'Failing'], params['python_simulation_steps'])
+
+    @patch('subprocess.run')
+    def test_command_finally_step_on_failure(self, mocked_subprocess):
+        mocked_subprocess.side_effect = [MagicMock(), Exception('Failed'), MagicMock()]
+        first_step = RunShellScript(name="First", run_commands=["echo first"], inputs=[])
+        first_step \
+            .then(RunShellScript(name="Failing", run_commands=["exit 1"], inputs=[])) \
+            .then(RunShellScript(name="Skipped", run_commands=["echo skipped"], inputs=[])) \
+            .then(RunShellScript(name="Final", run_commands=["echo final"], inputs=[]).is_finally_step(True))
+        params = {}
+
+        with self.assertRaises(Exception):
+            first_step.invoke(params)
+        self.assertEqual(['First', 'Failing', 'Final'], params['python_simulation_steps'])
@@ -0,0 +1,47 @@
+import unittest
+from unittest.mock import patch
+
+import pytest
+
+from adk.src.adk.domain.data_type import DataType
+from adk.src.adk.domain.input import Input
+from adk.src.adk.parent_steps.automation.automation import Automation
+from adk.src.adk.parent_steps.automation.pause_step import PauseStep
+from adk.src.adk.parent_steps.automation.sleep_step import SleepStep
+from adk.src.adk.util.clock import Clock, SimulatedClock, get_clock, simulated_clock
+
+
+@pytest.mark.unit_test
+class TestClock(unittest.TestCase):
+
+    def test_simulated_clock_restored(self):
+        with simulated_clock(100) as clock:
+            self.assertIs(clock, get_clock())
+            clock.sleep(5)
+            clock.advance(10)
+            self.assertEqual(115, clock.time())
+        self.assertIs(type(get_clock()), Clock)
+
+    def test_simulated_clock_negative_sleep(self):
+        with self.assertRaises(ValueError):
+            SimulatedClock().sleep(-1)
+
+    @patch('time.sleep', return_value=None)
+    def test_simulate_multi_hour_automation(self, mocked_sleep):
+        final_step = PauseStep(name="Final", pause_runtime=False)
+        three_hours_step = SleepStep(sleep_seconds=3 * 3600, name="WaitThreeHours").timeout_seconds(4 * 3600)
+        two_hours_step = SleepStep(sleep_seconds=2 * 3600, name="WaitTwoHours").on_failure(final_step)
+        automation = Automation(step_name="MultiHourSop",
+                                steps=[three_hours_step, two_hours_step,
+                                       PauseStep(name="Skipped", pause_runtime=False), final_step],
+                                assume_role='AutoRole',
+                                inputs=[Input(name='AutoRole', input_type=DataType.String, description="role")])
+
+        with simulated_clock() as clock:
+            params = automation.run_automation({'AutoRole': 'Role'})
+
+        mocked_sleep.assert_not_called()
+        self.assertEqual(['WaitThreeHours', 'WaitTwoHours', 'Final'], params['python_simulation_steps'])
+        # WaitTwoHours exceeds default timeout of the step in virtual time and fails over to Final
+        self.assertEqual([('WaitThreeHours', 3 * 3600), ('WaitTwoHours', 2 * 3600), ('Final', 0)],
+                         clock.step_durations)
@@ -0,0 +1,38 @@
+import unittest
+from unittest.mock import patch
+
+import jsonpath_ng
+import pytest
+
+from adk.src.adk.util.json_path import find_json_path_values, parse_json_path
+
+RESPONSE = {'Payload': {'Foo': 4, 'Empty': None, 'List': [{'Bar': 'a'}, {'Bar': 'b'}], 'Text': 'text'},
+            'where': {'Foo': 5}}
+
+
+@pytest.mark.unit_test
+class TestJsonPath(unittest.TestCase):
+
+    def test_simple_selector_same_as_jsonpath_ng(self):
+        for json_path in ['$.Payload', '$.Payload.Foo', '$.Payload.Empty', '$.Payload.Missing', '$.Payload.List.Bar',
+                          '$.Payload.Text.Foo', '$.Payload.Foo.Bar']:
+            self.assertEqual([match.value for match in jsonpath_ng.parse(json_path).find(RESPONSE)],
+                             find_json_path_values(json_path, RESPONSE), json_path)
+
+    def test_simple_selector_without_parser(self):
+        with patch('jsonpath_ng.parse') as mocked_parse:
+            self.assertEqual([4], find_json_path_values('$.Payload.Foo', RESPONSE))
+        mocked_parse.assert_not_called()
+
+    def test_expression_parsed_once(self):
+        parse_json_path.cache_clear()
+        for _ in range(3):
+            self.assertEqual(['a', 'b'], find_json_path_values('$.Payload.List[*].Bar', RESPONSE))
+        self.assertEqual(1, parse_json_path.cache_info().misses)
+        self.assertEqual(2, parse_json_path.cache_info().hits)
+
+    def test_reserved_word_left_to_jsonpath_ng(self):
+        with self.assertRaises(Exception):
+            jsonpath_ng.parse('$.where.Foo')
+        with self.assertRaises(Exception):
+            find_json_path_values('$.where.Foo', RESPONSE)
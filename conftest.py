@@ -14,7 +14,6 @@ from datetime import datetime
 from typing import List
 
 import boto3
-import jsonpath_ng
 import pytest
 from botocore.exceptions import ClientError
 from pytest import ExitCode
@@ -26,6 +25,7 @@ from pytest_bdd import (
 from pytest_bdd.parsers import parse
 from sttable import parse_str_table
 
+from adk.src.adk.util.json_path import find_json_path_values
 from publisher.src.publish_documents import PublishDocuments
 from resource_manager.src.alarm_manager import AlarmManager
 from resource_manager.src.cloud_formation import CloudFormationTemplate
@@ -33,6 +33,7 @@ from resource_manager.src.constants import BgColors
 from resource_manager.src.resource_pool import ResourcePool
 from resource_manager.src.s3 import S3
 from resource_manager.src.ssm_document import SsmDocument
+from resource_manager.src.util import boto3_client_factory
 from resource_manager.src.util import common_test_utils
 from resource_manager.src.util.boto3_client_factory import client
 from resource_manager.src.util.common_test_utils import put_to_ssm_test_cache
@@ -80,6 +81,12 @@ def pytest_addoption(parser):
                      action="store",
                      help="Comma separated key=value pair of cloud formation file template names mapped to number of "
                           "pool size (Example: template_1=3, template_2=4).")
+    parser.addoption("--max_pool_connections",
+                     action="store",
+                     type=int,
+                     default=None,
+                     help="Maximum number of HTTP connections kept per boto3 client created by client factory "
+                          "(Default 50). Increase when running many tests per worker.")
     parser.addoption("--distributed_mode",
                      action="store_true",
                      default=False,
@@ -122,6 +129,8 @@ def pytest_sessionstart(session):
     """
     # Execute when running integration tests
     if session.config.option.run_integration_tests:
+        if session.config.option.max_pool_connections:
+            boto3_client_factory.configure(session.config.option.max_pool_connections)
         # Generating testing session id in order to tie test resources to specific session, so that when
         # running tests in parallel by multiple machines (sessions) tests will not try to change state of
         # resources which are still in use by other sessions.
@@ -182,6 +191,7 @@ def pytest_sessionfinish(session, exitstatus):
             # NOTE: We don't want to call this when running tests on multiple machines (sessions). Since resources
             # may still be in use by other machines (sessions).
             rm.destroy_all_resources()
+        logging.info(f'boto3 client pool statistics: {boto3_client_factory.get_stats()}')
 
 
 @pytest.fixture(scope='session')
@@ -261,6 +271,8 @@ def resource_pool(request, boto3_session, ssm_test_cache, function_logger):
     s3_helper = S3(boto3_session, aws_account_id, function_logger)
     custom_pool_size = parse_pool_size(request.session.config.option.pool_size)
     rp = ResourcePool(cfn_helper, s3_helper, custom_pool_size, test_session_id, ssm_test_cache, function_logger)
+    # Started once per worker process, wakes up tests waiting for resources released by other workers.
+    ResourcePool.start_lease_listener(boto3_session)
     yield rp
     # Release resources after test execution is completed if test was not manually
     # interrupted/cancelled. In case of interruption resources will be
@@ -980,7 +992,7 @@ def apply_json_path_and_cache_value(cfn_output_params, ssm_test_cache, cfn_insta
     params = common_test_utils.extract_all_from_input_parameters(cfn_output_params, ssm_test_cache, input_parameters,
                                                                  cfn_installed_alarms)
     input_value = params['Input']
-    result = jsonpath_ng.parse(json_path).find(input_value)[0].value
+    result = find_json_path_values(json_path, input_value)[0]
     put_to_ssm_test_cache(ssm_test_cache, cache_key, cache_property, result)
 
 
@@ -2,15 +2,12 @@ import json
 import logging
 from time import sleep
 
-import jsonpath_ng
 import pytest
-import requests
-from aws_requests_auth.aws_auth import AWSRequestsAuth
 from pytest_bdd import (
     given, parsers, when, then
 )
-from websocket import create_connection, WebSocketBadStatusException
 
+from adk.src.adk.util.json_path import find_json_path_values
 from resource_manager.src.util import apigw2_utils as apigw2_utils
 from resource_manager.src.util import apigw_utils as apigw_utils
 from resource_manager.src.util.boto3_client_factory import client
@@ -19,6 +16,7 @@ from resource_manager.src.util.common_test_utils import (
 )
 from resource_manager.src.util.enums.lambda_invocation_type import LambdaInvocationType
 from resource_manager.src.util.lambda_utils import trigger_lambda
+from resource_manager.src.util.traffic_generator import CachedSigningKeyAuth, run_http_load, run_ws_load
 
 cache_current_stage_deployment_id_expression = 'cache current deployment id as "{cache_property}" "{step_key}" SSM ' \
                                                'automation execution' \
@@ -92,6 +90,9 @@ cache_httpws_route_throttling_settings = 'cache route throttling rate limit as "
                                          'burst limit as "{burst_limit_key}" "{step_key}" SSM automation execution' \
                                          '\n{input_parameters}'
 
+get_api_key_and_perform_https_requests_at_rate_expression = 'get API key and perform https "{method}" requests ' \
+                                                            'at "{rps}" rps for "{duration}" seconds'
+
 call_api_gw_several_times_on_period = 'call test method "{api_method}" api-gw "{call_apigw_times:d}" times ' \
                                       'with "{call_apigw_delay:d}" seconds delay\n{input_parameters}'
 
@@ -108,7 +109,7 @@ def cache_apigw_property(resource_pool, ssm_test_cache, boto3_session, json_path
                                               ssm_test_cache)
     apigw_client = client('apigateway', boto3_session)
     response = apigw_client.get_usage_plan(usagePlanId=apigw_usage_plan_id)
-    target_value = jsonpath_ng.parse(json_path).find(response)[0].value
+    target_value = find_json_path_values(json_path, response)[0]
     put_to_ssm_test_cache(ssm_test_cache, step_key, cache_property, target_value)
 
 
@@ -499,30 +500,49 @@ def prepare_route_settings_teardown(
 def get_api_key_and_perform_https_requests(
         resource_pool, ssm_test_cache, boto3_session, count, method, interval
 ):
+    ssm_test_cache['traffic_result'] = _perform_https_requests(ssm_test_cache, boto3_session, method,
+                                                               total_requests=int(count),
+                                                               target_rps=_get_rate(interval), concurrency=1)
+    # Requests were followed by delay, the last one as well
+    sleep(int(interval))
+
+
+@given(parsers.parse(get_api_key_and_perform_https_requests_at_rate_expression))
+@when(parsers.parse(get_api_key_and_perform_https_requests_at_rate_expression))
+@then(parsers.parse(get_api_key_and_perform_https_requests_at_rate_expression))
+def get_api_key_and_perform_https_requests_at_rate(
+        resource_pool, ssm_test_cache, boto3_session, method, rps, duration
+):
+    ssm_test_cache['traffic_result'] = _perform_https_requests(
+        ssm_test_cache, boto3_session, method, duration_secs=float(duration), target_rps=float(rps))
+
+
+def _get_rate(interval) -> float:
+    """
+    Returns rate of requests sent with given interval in seconds, requests are not paced if interval is zero.
+    """
+    return 1 / int(interval) if int(interval) else None
+
+
+def _perform_https_requests(ssm_test_cache, boto3_session, method, **load_args):
     api_key_id = ssm_test_cache['before']['ApiKeyId']
     api_host = ssm_test_cache['before']['ApiHost']
     api_path = ssm_test_cache['before']['ApiPath']
     api_url = 'https://' + api_host + api_path
-    count = int(count)
-    interval = int(interval)
 
     aws_credentials = boto3_session.get_credentials()
     aws_region = boto3_session.region_name
     apigw_client = client('apigateway', boto3_session)
     api_key = apigw_client.get_api_key(apiKey=api_key_id, includeValue=True)['value']
-    api_auth = AWSRequestsAuth(aws_access_key=aws_credentials.access_key,
-                               aws_secret_access_key=aws_credentials.secret_key,
-                               aws_token=aws_credentials.token,
-                               aws_host=api_host,
-                               aws_region=aws_region,
-                               aws_service='execute-api')
-    while count > 0:
-        logging.info(f'Sending {method} request to: {api_url}')
-        response = requests.request(method, api_url, headers={'x-api-key': api_key}, auth=api_auth)
-        logging.info(f'Response status code: {response.status_code}')
-        logging.info(f'Response content: {json.loads(response.content.decode("utf-8"))}')
-        sleep(interval)
-        count -= 1
+    api_auth = CachedSigningKeyAuth(aws_access_key=aws_credentials.access_key,
+                                    aws_secret_access_key=aws_credentials.secret_key,
+                                    aws_token=aws_credentials.token,
+                                    aws_host=api_host,
+                                    aws_region=aws_region,
+                                    aws_service='execute-api')
+    result = run_http_load(method, api_url, headers={'x-api-key': api_key}, auth=api_auth, **load_args)
+    logging.info(f'Requests to {api_url} done: {result.to_dict()}')
+    return result
 
 
 @given(parsers.parse(get_api_key_and_invoke_lambda_to_perform_https_requests))
@@ -572,6 +592,10 @@ call_http_endpoint_expression = 'call endpoint "{url}" "{number}" times with del
                                 'using method "{method}"' \
                                 '\n{input_parameters}'
 
+call_http_endpoint_at_rate_expression = 'call endpoint "{url}" at "{rps}" rps for "{duration}" seconds ' \
+                                        'using method "{method}"' \
+                                        '\n{input_parameters}'
+
 
 @given(parsers.parse(call_http_endpoint_expression))
 @when(parsers.parse(call_http_endpoint_expression))
@@ -580,19 +604,31 @@ def call_http_endpoint(
         resource_pool, ssm_test_cache, url, number, delay, method, input_parameters
 ):
     request_url = extract_param_value(input_parameters, url, resource_pool, ssm_test_cache)
-    request_count = int(number)
-    request_delay = int(delay)
-    while request_count > 0:
-        response = requests.request(method, request_url)
-        logging.info(f'Send {method} request to {request_url}')
-        logging.debug(f'Response status code: {response.status_code}')
-        sleep(request_delay)
-        request_count -= 1
+    result = run_http_load(method, request_url, total_requests=int(number), target_rps=_get_rate(delay), concurrency=1)
+    logging.info(f'Requests to {request_url} done: {result.to_dict()}')
+    ssm_test_cache['traffic_result'] = result
+    # Requests were followed by delay, the last one as well
+    sleep(int(delay))
+
+
+@given(parsers.parse(call_http_endpoint_at_rate_expression))
+@when(parsers.parse(call_http_endpoint_at_rate_expression))
+@then(parsers.parse(call_http_endpoint_at_rate_expression))
+def call_http_endpoint_at_rate(
+        resource_pool, ssm_test_cache, url, rps, duration, method, input_parameters
+):
+    request_url = extract_param_value(input_parameters, url, resource_pool, ssm_test_cache)
+    result = run_http_load(method, request_url, duration_secs=float(duration), target_rps=float(rps))
+    logging.info(f'Requests to {request_url} done: {result.to_dict()}')
+    ssm_test_cache['traffic_result'] = result
 
 
 call_ws_endpoint_expression = 'call ws endpoint "{url}" "{number}" times with delay "{delay}" seconds' \
                               '\n{input_parameters}'
 
+call_ws_endpoint_at_rate_expression = 'call ws endpoint "{url}" at "{rps}" rps for "{duration}" seconds' \
+                                      '\n{input_parameters}'
+
 
 @given(parsers.parse(call_ws_endpoint_expression))
 @when(parsers.parse(call_ws_endpoint_expression))
@@ -601,18 +637,35 @@ def call_ws_endpoint(
         resource_pool, ssm_test_cache, url, number, delay, input_parameters
 ):
     ws_url = extract_param_value(input_parameters, url, resource_pool, ssm_test_cache)
-    request_count = int(number)
-    request_delay = int(delay)
-    while request_count > 0:
-        logging.info(f'Try ws handshake with {ws_url}')
-        try:
-            ws = create_connection(ws_url)
-            logging.info('Connected successfully')
-            ws.close()
-        except WebSocketBadStatusException as e:
-            logging.info(f'Handshake failed with {str(e.status_code)}')
-        sleep(request_delay)
-        request_count -= 1
+    result = run_ws_load(ws_url, total_requests=int(number), target_rps=_get_rate(delay), concurrency=1)
+    logging.info(f'Handshakes with {ws_url} done: {result.to_dict()}')
+    ssm_test_cache['traffic_result'] = result
+    # Handshakes were followed by delay, the last one as well
+    sleep(int(delay))
+
+
+@given(parsers.parse(call_ws_endpoint_at_rate_expression))
+@when(parsers.parse(call_ws_endpoint_at_rate_expression))
+@then(parsers.parse(call_ws_endpoint_at_rate_expression))
+def call_ws_endpoint_at_rate(
+        resource_pool, ssm_test_cache, url, rps, duration, input_parameters
+):
+    ws_url = extract_param_value(input_parameters, url, resource_pool, ssm_test_cache)
+    result = run_ws_load(ws_url, duration_secs=float(duration), target_rps=float(rps))
+    logging.info(f'Handshakes with {ws_url} done: {result.to_dict()}')
+    ssm_test_cache['traffic_result'] = result
+
+
+assert_traffic_status_code_received_expression = 'assert "{status_code:d}" responses were received by traffic generator'
+
+
+@given(parsers.parse(assert_traffic_status_code_received_expression))
+@when(parsers.parse(assert_traffic_status_code_received_expression))
+@then(parsers.parse(assert_traffic_status_code_received_expression))
+def assert_traffic_status_code_received(ssm_test_cache, status_code):
+    result = ssm_test_cache['traffic_result']
+    assert result.status_codes.get(status_code, 0) > 0, \
+        f'No [{status_code}] responses were received: {result.to_dict()}'
 
 
 @given(parsers.parse('register quota settings for teardown\n{input_parameters}'))
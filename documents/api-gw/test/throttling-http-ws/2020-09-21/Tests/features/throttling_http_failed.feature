@@ -17,7 +17,7 @@ Feature: SSM automation document Digito-TriggerHttpWsApiGwThrottlingTest_2020-09
     And Wait for the SSM automation document "Digito-TriggerHttpWsApiGwThrottlingTest_2020-09-21" execution is on step "RollbackCurrentExecution" in status "Success"
       | ExecutionId                |
       | {{cache:SsmExecutionId>1}} |
-    And call endpoint "HttpEndpoint" "12" times with delay "20" seconds using method "POST"
+    And call endpoint "HttpEndpoint" at "1" rps for "240" seconds using method "POST"
       | HttpEndpoint                                                |
       | {{cfn-output:HTTPWSApiGwTemplate>HttpApiThrottledEndpoint}} |
 
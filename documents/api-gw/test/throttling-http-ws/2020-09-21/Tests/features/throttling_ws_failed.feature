@@ -17,7 +17,7 @@ Feature: SSM automation document Digito-TriggerHttpWsApiGwThrottlingTest_2020-09
     And Wait for the SSM automation document "Digito-TriggerHttpWsApiGwThrottlingTest_2020-09-21" execution is on step "RollbackCurrentExecution" in status "Success"
       | ExecutionId                |
       | {{cache:SsmExecutionId>1}} |
-    And call ws endpoint "WsEndpoint" "12" times with delay "20" seconds
+    And call ws endpoint "WsEndpoint" at "1" rps for "240" seconds
       | WsEndpoint                                                |
       | {{cfn-output:HTTPWSApiGwTemplate>WsApiThrottledEndpoint}} |
 
@@ -12,15 +12,15 @@ Feature: Alarm Setup - Read Throttle Events Alarm
     And put random test item and cache it as "TestItem"
       | DynamoDBTableName                                                  |
       | {{cfn-output:DynamoDBTemplateWithLimitedThroughput>DynamoDBTable}} |
-    And get test item "TestItem" "500" times
+    And get test item "TestItem" at "50" rps for "10" seconds
       | DynamoDBTableName                                                  |
       | {{cfn-output:DynamoDBTemplateWithLimitedThroughput>DynamoDBTable}} |
     And sleep for "60" seconds
-    And get test item "TestItem" "500" times
+    And get test item "TestItem" at "50" rps for "10" seconds
       | DynamoDBTableName                                                  |
       | {{cfn-output:DynamoDBTemplateWithLimitedThroughput>DynamoDBTable}} |
     And sleep for "60" seconds
-    And get test item "TestItem" "500" times
+    And get test item "TestItem" at "50" rps for "10" seconds
       | DynamoDBTableName                                                  |
       | {{cfn-output:DynamoDBTemplateWithLimitedThroughput>DynamoDBTable}} |
     Then assert metrics for all alarms are populated
@@ -9,15 +9,15 @@ Feature: Alarm Setup - Write Throttle Events Alarm
     When alarm "dynamodb:alarm:health_write_throttle_events:2020-04-01" is installed
       | alarmId    | Threshold | DynamoDbTable                                                      | SNSTopicARN                       |
       | under_test | 1         | {{cfn-output:DynamoDBTemplateWithLimitedThroughput>DynamoDBTable}} | {{cfn-output:SnsForAlarms>Topic}} |
-    And put random test item "500" times
+    And put random test items at "50" rps for "10" seconds
       | DynamoDBTableName                                                  |
       | {{cfn-output:DynamoDBTemplateWithLimitedThroughput>DynamoDBTable}} |
     And sleep for "60" seconds
-    And put random test item "500" times
+    And put random test items at "50" rps for "10" seconds
       | DynamoDBTableName                                                  |
       | {{cfn-output:DynamoDBTemplateWithLimitedThroughput>DynamoDBTable}} |
     And sleep for "60" seconds
-    And put random test item "500" times
+    And put random test items at "50" rps for "10" seconds
       | DynamoDBTableName                                                  |
       | {{cfn-output:DynamoDBTemplateWithLimitedThroughput>DynamoDBTable}} |
     Then assert metrics for all alarms are populated
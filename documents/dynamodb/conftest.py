@@ -2,12 +2,12 @@ import json
 import logging
 import time
 
-import jsonpath_ng
 import pytest
 
 from botocore.exceptions import ClientError
 from pytest_bdd import given, parsers, when
 from pytest_bdd.steps import then
+from adk.src.adk.util.json_path import find_json_path_values
 from resource_manager.src.util import param_utils
 from resource_manager.src.util.auto_scaling_utils import (
     _describe_scalable_targets_for_dynamodb_table,
@@ -24,7 +24,8 @@ from resource_manager.src.util.dynamo_db_utils import (
     drop_and_wait_dynamo_db_table_if_exists, get_continuous_backups_status,
     get_contributor_insights_status_for_table_and_indexes,
     get_earliest_recovery_point_in_time, get_kinesis_destinations, get_stream_settings, get_time_to_live,
-    remove_global_table_and_wait_for_active, wait_table_to_be_active, put_item_async_stress_test)
+    remove_global_table_and_wait_for_active, wait_table_to_be_active, put_item_async_stress_test,
+    run_load_test, DynamoDbLoadMode)
 from resource_manager.src.util.enums.alarm_state import AlarmState
 from resource_manager.src.util.param_utils import parse_param_value
 
@@ -115,7 +116,7 @@ def cache_table_property(resource_pool, ssm_test_cache, boto3_session, json_path
     dynamodb_client = boto3_session.client('dynamodb')
     table_name_value = extract_param_value(input_parameters, 'TableName', resource_pool, ssm_test_cache)
     response = dynamodb_client.describe_table(TableName=table_name_value)
-    target_value = jsonpath_ng.parse(json_path).find(response)[0].value
+    target_value = find_json_path_values(json_path, response)[0]
     put_to_ssm_test_cache(ssm_test_cache, step_key, cache_property, target_value)
 
 
@@ -272,6 +273,24 @@ def get_items(boto3_session, resource_pool, ssm_test_cache, item_ref, number, in
     get_item_async_stress_test(boto3_session, table_name, int(number), item)
 
 
+@given(parsers.parse('get test item "{item_ref}" at "{rps}" rps for "{duration}" seconds\n{input_parameters}'))
+@when(parsers.parse('get test item "{item_ref}" at "{rps}" rps for "{duration}" seconds\n{input_parameters}'))
+def get_items_at_rate(boto3_session, resource_pool, ssm_test_cache, item_ref, rps, duration, input_parameters):
+    table_name: str = extract_param_value(input_parameters, "DynamoDBTableName", resource_pool, ssm_test_cache)
+    item: dict = ssm_test_cache[item_ref]
+    run_load_test(boto3_session, table_name, DynamoDbLoadMode.GET_ITEM, [item],
+                  duration_secs=float(duration), target_rps=float(rps))
+
+
+@given(parsers.parse('put random test items at "{rps}" rps for "{duration}" seconds\n{input_parameters}'))
+@when(parsers.parse('put random test items at "{rps}" rps for "{duration}" seconds\n{input_parameters}'))
+def put_items_at_rate(boto3_session, resource_pool, ssm_test_cache, rps, duration, input_parameters):
+    table_name: str = extract_param_value(input_parameters, "DynamoDBTableName", resource_pool, ssm_test_cache)
+    items = generate_random_item(boto3_session, table_name, 100)
+    run_load_test(boto3_session, table_name, DynamoDbLoadMode.PUT_ITEM, items,
+                  duration_secs=float(duration), target_rps=float(rps))
+
+
 @then(parsers.parse('assert scaling targets copied from {source_table_name_ref} to {target_table_name_ref}'))
 def assert_scaling_targets_copied(resource_pool, ssm_test_cache, boto3_session,
                                   target_table_name_ref,
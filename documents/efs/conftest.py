@@ -1,4 +1,3 @@
-import jsonpath_ng
 import logging
 import uuid
 from pytest_bdd import (
@@ -6,6 +5,7 @@ from pytest_bdd import (
 )
 from botocore.exceptions import ClientError
 
+from adk.src.adk.util.json_path import find_json_path_values
 from resource_manager.src.util import backup_utils, ec2_utils
 from resource_manager.src.util.param_utils import parse_param_values_from_table, parse_param_value
 from resource_manager.src.util.common_test_utils import extract_param_value, put_to_ssm_test_cache
@@ -24,7 +24,7 @@ def cache_filesystem_property(resource_pool, ssm_test_cache, boto3_session, json
                               input_parameters):
     filesystem_id = extract_param_value(input_parameters, 'FileSystemID', resource_pool, ssm_test_cache)
     response = describe_filesystem(boto3_session, filesystem_id)['FileSystems'][0]
-    target_value = jsonpath_ng.parse(json_path).find(response)[0].value
+    target_value = find_json_path_values(json_path, response)[0]
     put_to_ssm_test_cache(ssm_test_cache, step_key, cache_property, target_value)
 
 
@@ -46,7 +46,7 @@ def cache_backup_value(cfn_output_params, resource_pool, ssm_test_cache, boto3_s
         else:
             backup_client = boto3_session.client('backup')
         response = backup_client.describe_restore_job(RestoreJobId=restore_job_id)
-        target_value = jsonpath_ng.parse(json_path).find(response)[0].value
+        target_value = find_json_path_values(json_path, response)[0]
         put_to_ssm_test_cache(ssm_test_cache, step_key, cache_property, target_value)
     else:
         raise AssertionError('RestoreJobId was not provided for "cache restore property" step')
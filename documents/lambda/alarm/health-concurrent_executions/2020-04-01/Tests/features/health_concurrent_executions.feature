@@ -11,5 +11,6 @@ Feature: Alarm Setup - Lambda ConcurrentExecutions
     And test lambda function under stress "300" seconds overall with "50" invokes in each test and "20" seconds delay
       | LambdaARN                               |
       | {{cfn-output:LambdaTemplate>LambdaARN}} |
-    Then assert metrics for all alarms are populated
+    Then assert lambda function stress reached "10" concurrent executions without errors
+    And assert metrics for all alarms are populated
     And wait until alarm {{alarm:under_test>AlarmName}} becomes OK within 120 seconds, check every 15 seconds
@@ -1,8 +1,12 @@
 import time
+from datetime import datetime
+
 from pytest_bdd import given, parsers, when, then
 
 import resource_manager.src.constants as constants
 from resource_manager.src.util import lambda_utils
+from resource_manager.src.util.cw_util import wait_for_metric_data_point
+from resource_manager.src.util.enums.operator import Operator
 from resource_manager.src.util.common_test_utils import (extract_param_value,
                                                          put_to_ssm_test_cache)
 
@@ -213,8 +217,26 @@ def invoke_function_under_stress(
         number_in_each_chunk, delay_among_chunks
 ):
     lambda_arn = extract_param_value(input_parameters, "LambdaARN", resource_pool, ssm_test_cache)
-    lambda_utils.trigger_lambda_under_stress(lambda_arn, boto3_session, overall_stress_time,
-                                             number_in_each_chunk, delay_among_chunks)
+    ssm_test_cache['lambda_stress_function_name'] = lambda_arn.split(':')[6]
+    ssm_test_cache['lambda_stress_start_time'] = datetime.utcnow()
+    ssm_test_cache['lambda_stress_result'] = lambda_utils.trigger_lambda_under_stress(
+        lambda_arn, boto3_session, overall_stress_time, number_in_each_chunk, delay_among_chunks)
+
+
+@then(parsers.parse('assert lambda function stress reached "{expected_concurrency:d}" concurrent executions '
+                    'without errors'))
+def assert_lambda_stress_result(ssm_test_cache, boto3_session, expected_concurrency):
+    stress_result = ssm_test_cache['lambda_stress_result']
+    assert stress_result.errors == {}, f'Lambda stress invokes failed: {stress_result.to_dict()}'
+    # Event invokes return once queued, so concurrency is taken from executions reported by Lambda
+    wait_for_metric_data_point(session=boto3_session,
+                               name='ConcurrentExecutions',
+                               datapoint_threshold=float(expected_concurrency),
+                               operator=Operator.MORE_OR_EQUAL,
+                               namespace='AWS/Lambda',
+                               start_time_utc=ssm_test_cache['lambda_stress_start_time'],
+                               dimensions={'FunctionName': ssm_test_cache['lambda_stress_function_name']},
+                               unit='Count')
 
 
 @given(parsers.parse(cache_current_time_limit_expression))
@@ -1,12 +1,12 @@
 import logging
 
-import jsonpath_ng
 from boto3 import Session
 from pytest_bdd import (
     given,
     parsers, when
 )
 
+from adk.src.adk.util.json_path import find_json_path_values
 from resource_manager.src.util import s3_utils as s3_utils
 from resource_manager.src.util.boto3_client_factory import client
 from resource_manager.src.util.common_test_utils import extract_param_value, put_to_ssm_test_cache
@@ -107,7 +107,7 @@ def cache_bucket_replication_property(boto3_session, resource_pool, ssm_test_cac
                                       input_parameters):
     s3_bucket_name = extract_param_value(input_parameters, "BucketName", resource_pool, ssm_test_cache)
     response = s3_utils.get_bucket_replication(boto3_session, s3_bucket_name)
-    target_value = jsonpath_ng.parse(json_path).find(response)[0].value
+    target_value = find_json_path_values(json_path, response)[0]
     put_to_ssm_test_cache(ssm_test_cache, step_key, cache_property, target_value)
 
 
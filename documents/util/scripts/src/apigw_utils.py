@@ -1,12 +1,12 @@
 import json
 import logging
 import time
-from random import uniform
 from typing import Any, Callable
 
 import boto3
 from botocore.config import Config
-from botocore.exceptions import ClientError
+
+from documents.util.scripts.src.boto3_executor_util import execute_boto3
 
 log = logging.getLogger()
 log.setLevel(logging.INFO)
@@ -154,30 +154,8 @@ def execute_boto3_with_backoff(delegate: Callable[[Any], dict], **kwargs) -> dic
         base_time: Backoff base time
     :return: The output of the given function
     """
-    backoff_retries: int = kwargs.get('retries', 15)
-    backoff_max_interval: int = kwargs.get('max_interval', 64)
-    backoff_base_time: int = kwargs.get('base_time', 2)
-    apigw_client = boto3.client('apigateway')
-
-    count = 1
-    while count <= backoff_retries:
-        try:
-            log.debug(f'Making an API call, attempt: {count} ...')
-            response = delegate(apigw_client)
-            assert_https_status_code_200(response, 'Failed to perform API call')
-            log.debug('API call performed successfully.')
-            return response
-        except ClientError as error:
-            if error.response['Error']['Code'] == 'TooManyRequestsException':
-                interval: float = min(backoff_base_time * 2 ** count + round(uniform(-2, 2), 2), backoff_max_interval)
-                log.warning(f'TooManyRequestsException, slow it down with delay {interval} seconds ...')
-                time.sleep(interval)
-                count += 1
-            else:
-                log.error(error)
-                raise error
-
-    raise Exception(f'Failed to perform API call successfully for {count - 1} times.')
+    return execute_boto3('apigateway', delegate, max_attempts=kwargs.get('retries', 15),
+                         max_interval=kwargs.get('max_interval', 64), base_time=kwargs.get('base_time', 2))
 
 
 def get_service_quota(config: object, service_code: str, quota_code: str) -> dict:
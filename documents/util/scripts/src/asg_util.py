@@ -1,10 +1,11 @@
 import random
-import time
 from math import ceil
 
 import boto3
 from botocore.config import Config
 
+from documents.util.scripts.src.waiter_util import wait_until
+
 
 def get_instance_ids_in_asg(events, context):
     if 'AutoScalingGroupName' not in events:
@@ -217,13 +218,18 @@ def get_instance_ids_by_percentage(events, context):
 
 def wait_for_in_service(events, context):
     client = boto3.client('autoscaling')
-    while (True):
-        res = client.describe_auto_scaling_groups(AutoScalingGroupNames=[events['AutoScalingGroupName']])
+
+    def is_in_service(res):
         instances = res['AutoScalingGroups'][0]['Instances']
         num_in_service = sum(instance['LifecycleState'] == 'InService' for instance in instances)
-        if (num_in_service >= events['NewDesiredCapacity']):
-            return True
-        time.sleep(15)
+        return num_in_service >= events['NewDesiredCapacity']
+
+    timing = wait_until(
+        lambda: client.describe_auto_scaling_groups(AutoScalingGroupNames=[events['AutoScalingGroupName']]),
+        is_in_service, events.get('WaitTimeout', 1200),
+        f"{events['NewDesiredCapacity']} instances of {events['AutoScalingGroupName']} to be in service",
+        max_delay_secs=15, step_timeout_secs=events.get('StepTimeoutSeconds'))
+    return {'Polls': timing['Polls'], 'WaitedSeconds': timing['WaitedSeconds']}
 
 
 def get_instance_data(events, context):
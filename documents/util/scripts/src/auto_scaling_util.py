@@ -1,11 +1,7 @@
 
-import logging
 from typing import Any, Callable, Iterator
 
-import boto3
-from botocore.config import Config
-
-boto3_config = Config(retries={'max_attempts': 20, 'mode': 'standard'})
+from documents.util.scripts.src.boto3_executor_util import execute_boto3, paginate_boto3
 
 
 def _execute_boto3_auto_scaling(delegate: Callable[[Any], dict]) -> dict:
@@ -15,12 +11,7 @@ def _execute_boto3_auto_scaling(delegate: Callable[[Any], dict]) -> dict:
     :param delegate: The lambda function
     :return: The response of AWS API
     """
-    auto_scaling_client = boto3.client('application-autoscaling', config=boto3_config)
-    description = delegate(auto_scaling_client)
-    if not description['ResponseMetadata']['HTTPStatusCode'] == 200:
-        logging.error(description)
-        raise ValueError('Failed to execute request')
-    return description
+    return execute_boto3('application-autoscaling', delegate)
 
 
 def _execute_boto3_auto_scaling_paginator(func_name: str, search_exp: str = None, **kwargs) -> Iterator[Any]:
@@ -31,13 +22,7 @@ def _execute_boto3_auto_scaling_paginator(func_name: str, search_exp: str = None
     :param kwargs: The arguments of `func_name`
     :return: The iterator over elements on pages
     """
-    autoscaling_db_client = boto3.client('application-autoscaling', config=boto3_config)
-    paginator = autoscaling_db_client.get_paginator(func_name)
-    page_iterator = paginator.paginate(**kwargs)
-    if search_exp:
-        return page_iterator.search(search_exp)
-    else:
-        return page_iterator
+    return paginate_boto3('application-autoscaling', func_name, search_exp, **kwargs)
 
 
 def _describe_scalable_targets(table_name: str) -> Iterator[dict]:
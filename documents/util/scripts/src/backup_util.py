@@ -1,6 +1,7 @@
 import boto3
 import logging
-import time
+
+from documents.util.scripts.src.waiter_util import wait_until
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -81,7 +82,6 @@ def wait_restore_job_in_region(events, context):
         'Region',
     ]
     wait_timeout = 3600
-    result = {}
     for key in required_params:
         if key not in events:
             raise KeyError(f'Requires {key} in events')
@@ -91,20 +91,19 @@ def wait_restore_job_in_region(events, context):
     backup_client = boto3.client('backup', region_name=events['Region'])
     logger.info(f"Waiting for restore job id {events['RestoreJobId']} in region: {events['Region']}")
 
-    timeout_timestamp = time.time() + int(wait_timeout)
-    while time.time() < timeout_timestamp:
-        response = backup_client.describe_restore_job(
-            RestoreJobId=events['RestoreJobId']
-        )
-        if response.get('Status') == 'COMPLETED':
-            result = {
-                'RestoreJobId': response.get('RestoreJobId'),
-                'CreatedResourceArn': response.get('CreatedResourceArn')
-            }
-            break
-        elif response.get('Status') in ['ABORTED', 'FAILED']:
+    def is_completed(response):
+        if response.get('Status') in ['ABORTED', 'FAILED']:
             raise AssertionError(f"Restore job resulted with {response.get('Status')} status")
-        time.sleep(20)
-    if not result:
-        raise TimeoutError(f"Restore job couldn't be completed within {wait_timeout} seconds")
-    return result
+        return response.get('Status') == 'COMPLETED'
+
+    timing = wait_until(lambda: backup_client.describe_restore_job(RestoreJobId=events['RestoreJobId']),
+                        is_completed, int(wait_timeout), f"restore job {events['RestoreJobId']} to be completed",
+                        timeout_message=f"Restore job couldn't be completed within {wait_timeout} seconds",
+                        step_timeout_secs=events.get('StepTimeoutSeconds'))
+    response = timing['Result']
+    return {
+        'RestoreJobId': response.get('RestoreJobId'),
+        'CreatedResourceArn': response.get('CreatedResourceArn'),
+        'Polls': timing['Polls'],
+        'WaitedSeconds': timing['WaitedSeconds']
+    }
@@ -0,0 +1,177 @@
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, List
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+boto3_executor_logger = logging.getLogger()
+boto3_executor_logger.setLevel(logging.INFO)
+
+# Config of clients created by executor
+BOTO3_EXECUTOR_CONFIG = Config(retries={'max_attempts': 20, 'mode': 'standard'})
+# Config of clients used by execute_boto3. Throttled calls are retried by execute_boto3 with its own backoff,
+# so the client makes few attempts, otherwise attempts of client and execute_boto3 multiply
+BOTO3_EXECUTOR_BACKOFF_CONFIG = Config(retries={'max_attempts': 3, 'mode': 'standard'})
+# Error codes of requests rejected due to throttling, retried by executor with backoff
+BOTO3_THROTTLING_ERROR_CODES = ['Throttling', 'ThrottlingException', 'ThrottledException', 'RequestLimitExceeded',
+                                'TooManyRequestsException', 'ProvisionedThroughputExceededException',
+                                'RequestThrottled', 'RequestThrottledException', 'SlowDown']
+# Maximum number of API calls executed concurrently by executor
+BOTO3_EXECUTOR_MAX_WORKERS = 10
+
+# Clients cached by (service name, region name, config, credentials of script execution)
+boto3_executor_clients = {}
+# API call statistics by '<service>.<operation>'
+boto3_executor_stats = {}
+boto3_executor_lock = threading.Lock()
+boto3_executor_local = threading.local()
+
+
+def _record_boto3_call_start(model, **kwargs):
+    boto3_executor_local.call_start = time.time()
+
+
+def _record_boto3_call_end(http_response, parsed, model, **kwargs):
+    latency = time.time() - getattr(boto3_executor_local, 'call_start', time.time())
+    error_code = parsed.get('Error', {}).get('Code') if isinstance(parsed, dict) else None
+    key = f'{model.service_model.service_name}.{model.name}'
+    with boto3_executor_lock:
+        stats = boto3_executor_stats.setdefault(key, {'Calls': 0, 'Errors': 0, 'Throttles': 0,
+                                                      'TotalSeconds': 0.0, 'MaxSeconds': 0.0})
+        stats['Calls'] += 1
+        stats['TotalSeconds'] += latency
+        stats['MaxSeconds'] = max(stats['MaxSeconds'], latency)
+        if error_code in BOTO3_THROTTLING_ERROR_CODES:
+            stats['Throttles'] += 1
+        elif error_code:
+            stats['Errors'] += 1
+
+
+def get_boto3_client(service_name: str, region_name: str = None, config: Config = BOTO3_EXECUTOR_CONFIG):
+    """
+    Returns boto3 client cached for the lifetime of the script. Clients are cached per service,
+    region, config and credentials, so client is not reused with credentials of another execution.
+    Every API call of the client is recorded to statistics returned by get_boto3_call_stats.
+    :param service_name: The service name
+    :param region_name: The region name, region of the script execution if not given
+    :param config: The client config
+    :return: The client
+    """
+    key = (service_name, region_name, config,
+           os.environ.get('AWS_ACCESS_KEY_ID'), os.environ.get('AWS_SESSION_TOKEN'))
+    # Clients are created under lock, since default boto3 session is not thread safe
+    with boto3_executor_lock:
+        client = boto3_executor_clients.get(key)
+        if client is None:
+            if region_name:
+                client = boto3.client(service_name, region_name=region_name, config=config)
+            else:
+                client = boto3.client(service_name, config=config)
+            client.meta.events.register('before-call.*.*', _record_boto3_call_start)
+            client.meta.events.register('after-call.*.*', _record_boto3_call_end)
+            boto3_executor_clients[key] = client
+    return client
+
+
+def execute_boto3(service_name: str, delegate: Callable[[Any], dict], region_name: str = None,
+                  max_attempts: int = 15, base_time: float = 2, max_interval: float = 64,
+                  deadline: float = None) -> dict:
+    """
+    Executes the given delegate with cached client. Throttled calls (which failed after few retries of the client,
+    see BOTO3_EXECUTOR_BACKOFF_CONFIG) are retried with exponential backoff with random jitter, retries are stopped
+    before given deadline.
+    :param service_name: The service name
+    :param delegate: The delegate to execute (with boto3 function)
+    :param region_name: The region name, region of the script execution if not given
+    :param max_attempts: The maximum number of attempts of throttled call
+    :param base_time: The backoff base time in seconds
+    :param max_interval: The maximum backoff interval in seconds
+    :param deadline: The time (as time.time()) after which throttled call is not retried
+    :return: The output of the given function
+    """
+    client = get_boto3_client(service_name, region_name, BOTO3_EXECUTOR_BACKOFF_CONFIG)
+    attempt = 1
+    while True:
+        try:
+            response = delegate(client)
+        except ClientError as error:
+            error_code = error.response.get('Error', {}).get('Code')
+            if error_code not in BOTO3_THROTTLING_ERROR_CODES:
+                boto3_executor_logger.error(error)
+                raise
+            interval = min(base_time * 2 ** attempt + round(random.uniform(-2, 2), 2), max_interval)
+            if attempt >= max_attempts or (deadline is not None and time.time() + interval >= deadline):
+                break
+            boto3_executor_logger.warning(f'{error_code}, slow it down with delay {interval} seconds ...')
+            time.sleep(interval)
+            attempt += 1
+            continue
+        if not response['ResponseMetadata']['HTTPStatusCode'] == 200:
+            boto3_executor_logger.error(response)
+            raise ValueError(f'Failed to perform API call. Response is: {response}')
+        return response
+    raise Exception(f'Failed to perform API call successfully for {attempt} times.')
+
+
+def paginate_boto3(service_name: str, func_name: str, search_exp: str = None, region_name: str = None,
+                   **kwargs) -> Iterator[Any]:
+    """
+    Executes the given function with pagination with cached client
+    :param service_name: The service name
+    :param func_name: The function name of the client
+    :param search_exp: The search expression to return elements
+    :param region_name: The region name, region of the script execution if not given
+    :param kwargs: The arguments of `func_name`
+    :return: The iterator over elements on pages
+    """
+    paginator = get_boto3_client(service_name, region_name).get_paginator(func_name)
+    page_iterator = paginator.paginate(**kwargs)
+    if search_exp:
+        return page_iterator.search(search_exp)
+    else:
+        return page_iterator
+
+
+def execute_boto3_concurrently(function: Callable[[Any], Any], arguments: Iterable[Any],
+                               max_workers: int = BOTO3_EXECUTOR_MAX_WORKERS) -> List[Any]:
+    """
+    Executes the given function for every argument concurrently, for example API calls per region or index.
+    Clients are shared by threads, so every client is created once
+    :param function: The function of single argument
+    :param arguments: The arguments
+    :param max_workers: The maximum number of concurrent calls
+    :return: The list of function results in order of arguments, the first error is raised
+    """
+    arguments = list(arguments)
+    if len(arguments) <= 1:
+        return [function(argument) for argument in arguments]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(arguments))) as executor:
+        return list(executor.map(function, arguments))
+
+
+def get_boto3_call_stats() -> dict:
+    """
+    Returns statistics of API calls made by cached clients since the last reset
+    :return: The dict of 'Calls', 'Errors', 'Throttles', 'TotalSeconds', 'MaxSeconds' by '<service>.<operation>'
+    """
+    with boto3_executor_lock:
+        return {key: {'Calls': stats['Calls'], 'Errors': stats['Errors'], 'Throttles': stats['Throttles'],
+                      'TotalSeconds': round(stats['TotalSeconds'], 3), 'MaxSeconds': round(stats['MaxSeconds'], 3)}
+                for key, stats in sorted(boto3_executor_stats.items())}
+
+
+def reset_boto3_executor(clients: bool = False) -> None:
+    """
+    Resets API call statistics and optionally cached clients
+    :param clients: True to drop cached clients as well
+    """
+    with boto3_executor_lock:
+        boto3_executor_stats.clear()
+        if clients:
+            boto3_executor_clients.clear()
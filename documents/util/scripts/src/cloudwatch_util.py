@@ -5,6 +5,9 @@ from botocore.config import Config
 from datetime import datetime, timedelta
 from typing import Any, Callable, Iterator, List
 
+from documents.util.scripts.src.boto3_executor_util import execute_boto3, paginate_boto3, get_boto3_call_stats, \
+    reset_boto3_executor
+
 boto3_config = Config(retries={'max_attempts': 20, 'mode': 'standard'})
 
 PUT_METRIC_ALARM_PARAMS = ['AlarmName', 'AlarmDescription', 'ActionsEnabled', 'OKActions',
@@ -21,12 +24,7 @@ def _execute_boto3_cloudwatch(delegate: Callable[[Any], dict]) -> dict:
     :param delegate: The delegate to execute (with boto3 function)
     :return: The output of the given function
     """
-    cloudwatch_client = boto3.client('cloudwatch', config=boto3_config)
-    response = delegate(cloudwatch_client)
-    if not response['ResponseMetadata']['HTTPStatusCode'] == 200:
-        logging.error(response)
-        raise ValueError('Failed to execute request')
-    return response
+    return execute_boto3('cloudwatch', delegate)
 
 
 def _execute_boto3_cloudwatch_paginator(func_name: str, search_exp: str = None, **kwargs) -> Iterator[Any]:
@@ -37,13 +35,7 @@ def _execute_boto3_cloudwatch_paginator(func_name: str, search_exp: str = None,
     :param kwargs: The arguments of `func_name`
     :return: The iterator over elements on pages
     """
-    dynamo_db_client = boto3.client('cloudwatch')
-    paginator = dynamo_db_client.get_paginator(func_name)
-    page_iterator = paginator.paginate(**kwargs)
-    if search_exp:
-        return page_iterator.search(search_exp)
-    else:
-        return page_iterator
+    return paginate_boto3('cloudwatch', func_name, search_exp, **kwargs)
 
 
 def _describe_metric_alarms(alarm_names: List[str]) -> Iterator[dict]:
@@ -85,6 +77,7 @@ def copy_alarms_for_dynamo_db_table(events, context):
     if 'DynamoDBSourceTableAlarmNames' not in events:
         raise KeyError('Requires DynamoDBSourceTableAlarmNames')
 
+    reset_boto3_executor()
     source_table_name: str = events['SourceTableName']
     target_table_name: str = events['TargetTableName']
     alarms_names: str = events.get('DynamoDBSourceTableAlarmNames', [])
@@ -111,7 +104,8 @@ def copy_alarms_for_dynamo_db_table(events, context):
         alarms_copied_count += 1
 
     return {
-        "AlarmsChanged": alarms_copied_count
+        "AlarmsChanged": alarms_copied_count,
+        "ApiCallStats": get_boto3_call_stats()
     }
 
 
@@ -1,6 +1,5 @@
 import logging
 import random
-import time
 from datetime import datetime
 from operator import itemgetter
 from typing import List
@@ -8,6 +7,8 @@ from typing import List
 import boto3
 from botocore.config import Config
 
+from documents.util.scripts.src.waiter_util import wait_until_all
+
 if len(logging.getLogger().handlers) > 0:
     # The Lambda environment pre-configures a handler logging to stderr. If a handler is already configured,
     # `.basicConfig` does not execute. Thus we set the level directly.
@@ -389,32 +390,22 @@ def wait_for_available_instances(events, context):
         if not events.get(key):
             raise KeyError(f'Requires {key} in events')
 
-    initial_loop_timeout: int = events['WaitTimeout']
+    wait_timeout: int = events['WaitTimeout']
     db_instance_identifiers: List = events['DBInstanceIdentifiers']
 
     docdb = boto3.client('docdb')
 
-    loop_timeout = initial_loop_timeout
-    start_time = time.time()
-    timeout_between_calls = 20
-    response = None
-    while loop_timeout > 0 and len(db_instance_identifiers) != 0:
-        for identifier in db_instance_identifiers:
-            response = docdb.describe_db_instances(DBInstanceIdentifier=identifier)
-            status = response['DBInstances'][0]['DBInstanceStatus']
-            if status == 'available':
-                db_instance_identifiers.remove(identifier)
-
-        # Leave the loop if remained time less that timeout_between_calls
-        loop_timeout = loop_timeout - (time.time() - start_time)
-        if timeout_between_calls <= loop_timeout:
-            time.sleep(timeout_between_calls)
-        else:
-            break
-
-    if len(db_instance_identifiers) != 0:
-        message = f'DB Instances with identifier(-s) {db_instance_identifiers} ' \
-                  f'are not available after {initial_loop_timeout} second(-s).'
-        logger.debug(f'{message} describe_db_instances response: {response}, db_instance_identifiers:'
-                     f' {db_instance_identifiers}')
-        raise TimeoutError(message)
+    def describe_instance_statuses(identifiers):
+        # All pending instances are described by single call
+        response = docdb.describe_db_instances(Filters=[{'Name': 'db-instance-id', 'Values': identifiers}])
+        return {instance['DBInstanceIdentifier']: instance['DBInstanceStatus'] for instance in response['DBInstances']}
+
+    try:
+        timing = wait_until_all(describe_instance_statuses, db_instance_identifiers,
+                                lambda status: status == 'available', wait_timeout, 'DB instances to be available',
+                                step_timeout_secs=events.get('StepTimeoutSeconds'))
+    except TimeoutError as e:
+        logger.debug(f'{e} db_instance_identifiers: {db_instance_identifiers}')
+        raise TimeoutError(f'DB Instances with identifier(-s) {db_instance_identifiers} '
+                           f'are not available after {wait_timeout} second(-s).') from e
+    return {'Polls': timing['Polls'], 'WaitedSeconds': timing['WaitedSeconds']}
@@ -1,11 +1,10 @@
 import logging
-import time
 from typing import Any, Callable, Iterator, List
 
-import boto3
-from botocore.config import Config
+from documents.util.scripts.src.boto3_executor_util import execute_boto3, execute_boto3_concurrently, \
+    paginate_boto3, get_boto3_call_stats
+from documents.util.scripts.src.waiter_util import wait_until
 
-boto3_config = Config(retries={'max_attempts': 20, 'mode': 'standard'})
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
@@ -19,12 +18,7 @@ def _execute_boto3_dynamodb(delegate: Callable[[Any], dict]) -> dict:
     :param delegate: The delegate to execute (with boto3 function)
     :return: The output of the given function
     """
-    dynamo_db_client = boto3.client('dynamodb', config=boto3_config)
-    description = delegate(dynamo_db_client)
-    if not description['ResponseMetadata']['HTTPStatusCode'] == 200:
-        logging.error(description)
-        raise ValueError('Failed to execute request')
-    return description
+    return execute_boto3('dynamodb', delegate)
 
 
 def _execute_boto3_dynamodb_paginator(func_name: str, search_exp: str = None, **kwargs) -> Iterator[Any]:
@@ -35,13 +29,7 @@ def _execute_boto3_dynamodb_paginator(func_name: str, search_exp: str = None, **
     :param kwargs: The arguments of `func_name`
     :return: The iterator over elements on pages
     """
-    dynamo_db_client = boto3.client('dynamodb', config=boto3_config)
-    paginator = dynamo_db_client.get_paginator(func_name)
-    page_iterator = paginator.paginate(**kwargs)
-    if search_exp:
-        return page_iterator.search(search_exp)
-    else:
-        return page_iterator
+    return paginate_boto3('dynamodb', func_name, search_exp, **kwargs)
 
 
 def _describe_continuous_backups(table_name: str):
@@ -247,6 +235,7 @@ def copy_global_table_settings(events: dict, context: dict) -> dict:
         _update_table(table_name=target_table_name, ReplicaUpdates=[
             {'Create': {'RegionName': region}} for region in global_table_active_regions])
 
+    logger.info(f'API call statistics: {get_boto3_call_stats()}')
     return global_table_active_regions
 
 
@@ -257,6 +246,7 @@ def wait_replication_status_in_all_regions(events: dict, context: dict) -> dict:
     * `TableName` - The table name
     * `ReplicasRegionsToWait` - The list of regions where replicas should be active
     * `WaitTimeoutSeconds` - The number of seconds to wait Active status
+    * `StepTimeoutSeconds` - (Optional) The timeout of the step, the wait is stopped before it
     :return: The dictionary that contains list of regions where status is Active
     """
     if 'TableName' not in events:
@@ -270,31 +260,36 @@ def wait_replication_status_in_all_regions(events: dict, context: dict) -> dict:
     wait_timeout_seconds: int = int(events['WaitTimeoutSeconds'])
     replicas_regions_to_wait: str = events['ReplicasRegionsToWait']
     if not replicas_regions_to_wait:
-        return{
-            "GlobalTableRegionsActive": []
+        return {
+            "GlobalTableRegionsActive": [],
+            "Polls": 0,
+            "WaitedSeconds": 0
         }
 
-    start = time.time()
-    elapsed = 0
     replicas: List[dict] = []
-    while elapsed < wait_timeout_seconds:
-        replicas = _get_global_table_all_regions(table_name=table_name)
-        all_active = all([r['ReplicaStatus'] in GLOBAL_TABLE_ACTIVE_STATUSES
-                          for r in replicas
-                          if r['RegionName'] in replicas_regions_to_wait])
-        if all_active:
-            return{
-                'GlobalTableRegionsActive': replicas_regions_to_wait
-            }
 
-        end = time.time()
-        logging.debug(f'time elapsed {elapsed} seconds. The last result:{replicas}')
-        time.sleep(20)
-        elapsed = end - start
+    def describe_replicas() -> List[dict]:
+        replicas[:] = _get_global_table_all_regions(table_name=table_name)
+        return replicas
+
+    def is_replication_active(described_replicas: List[dict]) -> bool:
+        statuses = {r['RegionName']: r['ReplicaStatus'] for r in described_replicas}
+        return all(statuses.get(region) in GLOBAL_TABLE_ACTIVE_STATUSES for region in replicas_regions_to_wait)
+
+    try:
+        timing = wait_until(describe_replicas, is_replication_active, wait_timeout_seconds,
+                            f'replicas of table {table_name} to be Active in regions {replicas_regions_to_wait}',
+                            step_timeout_secs=events.get('StepTimeoutSeconds'))
+    except TimeoutError as e:
+        raise TimeoutError(f'After {wait_timeout_seconds} seconds not all replicas are Active. '
+                           f'Regions to waits: {replicas_regions_to_wait}. '
+                           f'The latest response: {replicas}') from e
 
-    raise TimeoutError(f'After {elapsed} not all replicas are Active. '
-                       f'Regions to waits: {replicas_regions_to_wait}. '
-                       f'The latest response: {replicas}')
+    return {
+        'GlobalTableRegionsActive': replicas_regions_to_wait,
+        'Polls': timing['Polls'],
+        'WaitedSeconds': timing['WaitedSeconds']
+    }
 
 
 def copy_contributor_insights_settings(events: dict, context: dict) -> dict:
@@ -314,26 +309,25 @@ def copy_contributor_insights_settings(events: dict, context: dict) -> dict:
     source_table_name: str = events['SourceTableName']
     target_table_name: str = events['TargetTableName']
 
-    # coping settings for table
-    table_result = _describe_contributor_insights(table_name=source_table_name)
-    table_status = table_result['ContributorInsightsStatus']
-    if table_status in ENABLED_INSIGHTS_STATUSES:
-        _update_contributor_insights(table_name=target_table_name,
-                                     status='ENABLE')
-    # coping settings for indexes
+    # describing settings for table (index name None) and indexes concurrently
     indexes = _get_global_secondary_indexes(table_name=source_table_name)
-    indexes_results = [_describe_contributor_insights(
-        table_name=source_table_name, index_name=index_name) for index_name in indexes]
+    table_result, *indexes_results = execute_boto3_concurrently(
+        lambda index_name: _describe_contributor_insights(table_name=source_table_name, index_name=index_name),
+        [None] + indexes)
 
     index_statuses = [{
         'IndexName': r['IndexName'],
         'ContributorInsightsStatus': r['ContributorInsightsStatus']
     } for r in indexes_results]
-    for index_status in index_statuses:
-        if index_status['ContributorInsightsStatus'] in ENABLED_INSIGHTS_STATUSES:
-            _update_contributor_insights(table_name=target_table_name,
-                                         status='ENABLE',
-                                         index_name=index_status['IndexName'])
+    # coping settings for table and indexes concurrently
+    enabled_index_names = [s['IndexName'] for s in index_statuses
+                           if s['ContributorInsightsStatus'] in ENABLED_INSIGHTS_STATUSES]
+    if table_result['ContributorInsightsStatus'] in ENABLED_INSIGHTS_STATUSES:
+        enabled_index_names.insert(0, None)
+    execute_boto3_concurrently(
+        lambda index_name: _update_contributor_insights(table_name=target_table_name, status='ENABLE',
+                                                        index_name=index_name),
+        enabled_index_names)
 
     return {
         "CopiedTableContributorInsightsStatus": table_result['ContributorInsightsStatus'],
@@ -1,11 +1,12 @@
 import json
 import logging
-import time
 from distutils.version import LooseVersion
 
 import boto3
 from botocore.exceptions import ClientError
 
+from documents.util.scripts.src.waiter_util import wait_until, wait_until_all
+
 log = logging.getLogger()
 
 
@@ -21,25 +22,29 @@ def verify_all_nodes_in_rg_available(events, context):
     :param events dict with the following keys
             * ReplicationGroupId (Required) - Id of replication group
             * Timeout (Optional) - time to wait for verifying
-            * Sleep (Optional) - time to sleep between verification attempts
+            * Sleep (Optional) - maximum time to sleep between verification attempts
+            * StepTimeoutSeconds (Optional) - timeoutSeconds of the step
     :param context context
     """
     check_required_params(['ReplicationGroupId'], events)
     elasticache_client = boto3.client('elasticache')
     time_to_wait = events.get('Timeout', 900)
     time_to_sleep = int(events.get('Sleep', 15))
-    timeout_timestamp = time.time() + int(time_to_wait)
-    while time.time() < timeout_timestamp:
-        rg = elasticache_client.describe_replication_groups(ReplicationGroupId=events['ReplicationGroupId'])
-        status = rg['ReplicationGroups'][0]['Status']
-        desired_members_count = len(rg['ReplicationGroups'][0]['MemberClusters'])
-        available_members_count = len([x for x in rg['ReplicationGroups'][0]['NodeGroups'][0]['NodeGroupMembers']])
+
+    def is_scaled(rg):
+        desired_members_count = len(rg['MemberClusters'])
+        available_members_count = len(rg['NodeGroups'][0]['NodeGroupMembers'])
         log.debug(f'Expected {desired_members_count} members, got {available_members_count}')
-        if status == 'available' and available_members_count == desired_members_count:
-            return True
-        time.sleep(time_to_sleep)
-    raise TimeoutError(f'Replication group {events["ReplicationGroupId"]} couldn\'t '
-                       f'be scaled in {time_to_wait} seconds')
+        return rg['Status'] == 'available' and available_members_count == desired_members_count
+
+    timing = wait_until(lambda: elasticache_client.describe_replication_groups(
+        ReplicationGroupId=events['ReplicationGroupId'])['ReplicationGroups'][0],
+        is_scaled, int(time_to_wait), f'replication group {events["ReplicationGroupId"]} nodes to be available',
+        timeout_message=f'Replication group {events["ReplicationGroupId"]} couldn\'t '
+                        f'be scaled in {time_to_wait} seconds',
+        initial_delay_secs=min(2, time_to_sleep), max_delay_secs=time_to_sleep,
+        step_timeout_secs=events.get('StepTimeoutSeconds'))
+    return {'Polls': timing['Polls'], 'WaitedSeconds': timing['WaitedSeconds']}
 
 
 def assert_cluster_mode_disabled(events, context):
@@ -150,23 +155,21 @@ def wait_for_parameters_in_sync(events, context, elasticache_client=None,
     cluster_members = elasticache_client.describe_replication_groups(
         ReplicationGroupId=events['ReplicationGroupId']
     )['ReplicationGroups'][0]['MemberClusters']
-    cluster_members_left_to_check = cluster_members.copy()
-    timeout_timestamp = time.time() + int(time_to_wait)
-    while time.time() < timeout_timestamp and cluster_members_left_to_check:
-        for cluster_member in cluster_members:
-            status = elasticache_client.describe_cache_clusters(
-                CacheClusterId=cluster_member
-            )['CacheClusters'][0]['CacheParameterGroup']['ParameterApplyStatus']
-            if status == 'in-sync':
-                cluster_members_left_to_check.remove(cluster_member)
-            else:
-                logging.debug(f'Cluster {cluster_member} cache parameter group is still in status {status}')
-        cluster_members = cluster_members_left_to_check
-        time.sleep(delay_sec)
-    if time.time() >= timeout_timestamp:
-        raise TimeoutError(f"All CacheParameterGroups for replicas "
-                           f"in rg {events['ReplicationGroupId']} didn't become available "
-                           f"in {time_to_wait} seconds")
+
+    def describe_parameter_apply_statuses(cluster_ids):
+        # DescribeCacheClusters accepts single cluster id, so every pending member is described on every poll
+        return {cluster_id: elasticache_client.describe_cache_clusters(
+            CacheClusterId=cluster_id
+        )['CacheClusters'][0]['CacheParameterGroup']['ParameterApplyStatus'] for cluster_id in cluster_ids}
+
+    timing = wait_until_all(describe_parameter_apply_statuses, cluster_members, lambda status: status == 'in-sync',
+                            int(time_to_wait),
+                            f'cache parameter groups of rg {events["ReplicationGroupId"]} to be in-sync',
+                            timeout_message=f"All CacheParameterGroups for replicas "
+                                            f"in rg {events['ReplicationGroupId']} didn't become available "
+                                            f"in {time_to_wait} seconds",
+                            max_delay_secs=delay_sec, step_timeout_secs=events.get('StepTimeoutSeconds'))
+    return {'Polls': timing['Polls'], 'WaitedSeconds': timing['WaitedSeconds']}
 
 
 def modify_cache_parameter_group(events, context):
@@ -1,8 +1,9 @@
 import boto3
 from datetime import datetime, timezone
-import time
 from botocore.config import Config
 
+from documents.util.scripts.src.waiter_util import wait_until
+
 
 def restore_to_pit(events, context):
     config = Config(retries={'max_attempts': 20, 'mode': 'standard'})
@@ -52,14 +53,12 @@ def wait_cluster_failover_completed(events, context):
         raise KeyError('Requires ClusterId, WriterId in events')
     config = Config(retries={'max_attempts': 20, 'mode': 'standard'})
     rds = boto3.client('rds', config=config)
-    clusters = rds.describe_db_clusters(DBClusterIdentifier=events['ClusterId'])
-    current_writer_id = _parse_writer_id(clusters)
-    status = clusters['DBClusters'][0]['Status']
-    while current_writer_id == events['WriterId'] or status != 'available':
-        time.sleep(5)
-        clusters = rds.describe_db_clusters(DBClusterIdentifier=events['ClusterId'])
-        current_writer_id = _parse_writer_id(clusters)
-        status = clusters['DBClusters'][0]['Status']
+    timing = wait_until(lambda: rds.describe_db_clusters(DBClusterIdentifier=events['ClusterId']),
+                        lambda clusters: _parse_writer_id(clusters) != events['WriterId']
+                        and clusters['DBClusters'][0]['Status'] == 'available',
+                        events.get('WaitTimeout', 600), f'failover of cluster {events["ClusterId"]} to be completed',
+                        max_delay_secs=5, step_timeout_secs=events.get('StepTimeoutSeconds'))
+    return {'Polls': timing['Polls'], 'WaitedSeconds': timing['WaitedSeconds']}
 
 
 def _parse_writer_id(clusters):
@@ -1,11 +1,11 @@
 import json
-import logging
-import time
 from typing import List
 
 import boto3
 from botocore.config import Config
 
+from documents.util.scripts.src.waiter_util import wait_until
+
 INTERNET_DESTINATION = '0.0.0.0/0'
 
 
@@ -130,22 +130,15 @@ def _create_route_and_wait(boto3_ec2_client, route_table_id: str,
                           destination_ipv4_cidr_block=destination_ipv4_cidr_block,
                           nat_gw_id=nat_gw_id)
 
-    start = time.time()
-    elapsed = 0
-    while elapsed <= wait_timeout_seconds:
-        ipv4_rt_nat = _get_ipv4_routes_to_nat(boto3_ec2_client=boto3_ec2_client,
-                                              nat_gw_id=nat_gw_id,
-                                              private_subnet_id=None,
-                                              destination_ipv4_cidr_block=destination_ipv4_cidr_block)
-        if ipv4_rt_nat:
-            return route
-
-        end = time.time()
-        logging.debug(f'time elapsed {elapsed} seconds. The last result:{ipv4_rt_nat}')
-        time.sleep(10)
-        elapsed = end - start
-
-    raise TimeoutError(f'After {elapsed} route [{route}] hasn\'t been found in route table [{route_table_id}].')
+    wait_until(lambda: _get_ipv4_routes_to_nat(boto3_ec2_client=boto3_ec2_client,
+                                               nat_gw_id=nat_gw_id,
+                                               private_subnet_id=None,
+                                               destination_ipv4_cidr_block=destination_ipv4_cidr_block),
+               bool, wait_timeout_seconds, f'route to {destination_ipv4_cidr_block} in route table {route_table_id}',
+               timeout_message=f'After {wait_timeout_seconds} seconds route [{route}] hasn\'t been found '
+                               f'in route table [{route_table_id}].',
+               max_delay_secs=10)
+    return route
 
 
 def _check_if_route_already_exists(route_table_id: str, cidr_ipv4: str, current_routes: dict) -> bool:
@@ -1,7 +1,19 @@
 import boto3
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from datetime import datetime
 from botocore.config import Config
 
+# Maximum number of keys in single delete_objects request
+DELETE_OBJECTS_MAX_KEYS = 1000
+# Objects larger than this size (in bytes) are copied by multipart upload_part_copy
+MULTIPART_COPY_THRESHOLD = 256 * 1024 * 1024
+# Size (in bytes) of single part copied by upload_part_copy
+MULTIPART_COPY_PART_SIZE = 128 * 1024 * 1024
+# Number of concurrent requests of S3 workers
+S3_MAX_WORKERS = 16
+# Number of processed objects after which progress is printed
+PROGRESS_PRINT_INTERVAL = 1000
+
 
 def check_existence_of_objects_in_bucket(events, context):
     """
@@ -44,39 +56,28 @@ def clean_bucket(events, context):
     s3_bucket_name_to_clean = events['S3BucketNameToClean']
 
     print(f'Sending the list_object_versions request fore the {s3_bucket_name_to_clean} bucket...')
-    config = Config(retries={'max_attempts': 20, 'mode': 'standard'})
+    config = Config(retries={'max_attempts': 20, 'mode': 'standard'}, max_pool_connections=S3_MAX_WORKERS)
     s3_client = boto3.client('s3', config=config)
     paginator = s3_client.get_paginator('list_object_versions')
     pages = paginator.paginate(Bucket=s3_bucket_name_to_clean)
 
-    number_of_deleted_objects = 0
-
-    for page in pages:
-        print(f'The response from the list_object_versions: {page}')
-
-        versions: list = page.get('Versions')
-        if versions is not None:
-            for version in versions:
-                key = version.get('Key')
-                version_id = version.get('VersionId')
-                s3_client.delete_object(Bucket=s3_bucket_name_to_clean, Key=key, VersionId=version_id)
-
-                print(f'The versioned object with Bucket={s3_bucket_name_to_clean}, '
-                      f'Key={key}, VersionId={version_id} was deleted')
-
-                number_of_deleted_objects += 1
-
-        delete_markers: list = page.get('DeleteMarkers')
-        if delete_markers is not None:
-            for delete_marker in delete_markers:
-                key = delete_marker.get('Key')
-                version_id = delete_marker.get('VersionId')
-                s3_client.delete_object(Bucket=s3_bucket_name_to_clean, Key=key, VersionId=version_id)
+    def get_batches():
+        batch = []
+        for page in pages:
+            for version in (page.get('Versions') or []) + (page.get('DeleteMarkers') or []):
+                batch.append({'Key': version.get('Key'), 'VersionId': version.get('VersionId')})
+                if len(batch) == DELETE_OBJECTS_MAX_KEYS:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
 
-                print(f'The delete marker with Bucket={s3_bucket_name_to_clean},'
-                      f' Key={key}, VersionId={version_id} was deleted')
-
-                number_of_deleted_objects += 1
+    number_of_deleted_objects = 0
+    for deleted_in_batch in execute_concurrently(
+            lambda batch: delete_objects_batch(s3_client, s3_bucket_name_to_clean, batch), get_batches()):
+        number_of_deleted_objects += deleted_in_batch
+        print(f'{number_of_deleted_objects} versioned objects and delete markers were deleted '
+              f'from the {s3_bucket_name_to_clean} bucket')
 
     print(f'The number of deleted versioned objects and delete markers '
           f'in restore bucket is {number_of_deleted_objects}')
@@ -96,7 +97,7 @@ def restore_from_backup(events, context):
 
     s3_backup_bucket_name = events['S3BackupBucketName']
     s3_bucket_to_restore_name = events['S3BucketToRestoreName']
-    config = Config(retries={'max_attempts': 20, 'mode': 'standard'})
+    config = Config(retries={'max_attempts': 20, 'mode': 'standard'}, max_pool_connections=S3_MAX_WORKERS)
     s3_client = boto3.client('s3', config=config)
     paginator = s3_client.get_paginator('list_objects_v2')
     pages = paginator.paginate(Bucket=s3_backup_bucket_name)
@@ -104,22 +105,20 @@ def restore_from_backup(events, context):
     print(f'Starting to copy files from the {s3_backup_bucket_name} bucket '
           f'to the {s3_bucket_to_restore_name} bucket...')
 
-    copied_count = 0
-    for page in pages:
-        print(f'The response from the list_objects_v2: {page}')
-        if 'Contents' in page:
-            for content in page["Contents"]:
-                print(f'Copying the file {content["Key"]}...')
+    def get_contents():
+        for page in pages:
+            for content in page.get('Contents') or []:
+                yield content
 
-                copy_source = {
-                    'Bucket': s3_backup_bucket_name,
-                    'Key': content["Key"]
-                }
-                s3_client.copy(copy_source, s3_bucket_to_restore_name, content["Key"])
+    def copy_content(content):
+        copy_object(s3_client, {'Bucket': s3_backup_bucket_name, 'Key': content['Key']}, content['Size'],
+                    s3_bucket_to_restore_name, content['Key'])
 
-                print(f'The file {content["Key"]} was successfully copied')
-
-                copied_count += 1
+    copied_count = 0
+    for _ in execute_concurrently(copy_content, get_contents()):
+        copied_count += 1
+        if copied_count % PROGRESS_PRINT_INTERVAL == 0:
+            print(f'{copied_count} files were copied')
 
     print(f'The file number of copied files is {copied_count}')
 
@@ -138,7 +137,7 @@ def restore_to_the_previous_version(events, context):
 
     s3_bucket_name = events['S3BucketName']
     s3_bucket_object_key = events['S3BucketObjectKey']
-    config = Config(retries={'max_attempts': 20, 'mode': 'standard'})
+    config = Config(retries={'max_attempts': 20, 'mode': 'standard'}, max_pool_connections=S3_MAX_WORKERS)
     s3_client = boto3.client('s3', config=config)
     list_object_versions_response = s3_client.list_object_versions(Bucket=s3_bucket_name,
                                                                    Prefix=s3_bucket_object_key,
@@ -159,7 +158,8 @@ def restore_to_the_previous_version(events, context):
             'Key': s3_bucket_object_key,
             'VersionId': previous_version,
         }
-        s3_client.copy(copy_source, s3_bucket_name, s3_bucket_object_key)
+        copy_object(s3_client, copy_source, list_object_versions_response["Versions"][1]['Size'],
+                    s3_bucket_name, s3_bucket_object_key)
         print(f'The file {s3_bucket_object_key} file was successfully restored from the latest'
               f' {latest_version} '
               f'version to the previous {previous_version} version')
@@ -169,3 +169,89 @@ def restore_to_the_previous_version(events, context):
                 'OldVersion': latest_version}
     else:
         raise AssertionError(f'The bucket {s3_bucket_name} is not versioning but it has to be')
+
+
+def execute_concurrently(function, arguments, max_workers: int = S3_MAX_WORKERS):
+    """
+    Applies function to every item of arguments iterable with thread pool. Arguments are consumed lazily and
+    at most twice as many items as workers are in flight, so memory usage does not depend on number of items.
+    :param function: The function of single argument
+    :param arguments: The iterable (for example generator over listed pages) of arguments
+    :param max_workers: The number of worker threads
+    :return: The generator of function results in completion order
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        in_flight = set()
+        for argument in arguments:
+            in_flight.add(executor.submit(function, argument))
+            if len(in_flight) >= 2 * max_workers:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        for future in in_flight:
+            yield future.result()
+
+
+def delete_objects_batch(s3_client, bucket_name: str, objects: list) -> int:
+    """
+    Deletes given object versions with single delete_objects request
+    :param s3_client: The S3 client
+    :param bucket_name: The bucket name
+    :param objects: The list of dicts with Key and VersionId (up to 1000 items)
+    :return: The number of deleted objects
+    """
+    response = s3_client.delete_objects(Bucket=bucket_name, Delete={'Objects': objects, 'Quiet': True})
+    errors = response.get('Errors')
+    if errors:
+        raise Exception(f'Failed to delete {len(errors)} of {len(objects)} objects from the {bucket_name} bucket: '
+                        f'{errors[:10]}')
+    return len(objects)
+
+
+def copy_object(s3_client, copy_source: dict, size: int, target_bucket_name: str, target_key: str) -> None:
+    """
+    Copies object server side: with single copy_object request if object is smaller than
+    MULTIPART_COPY_THRESHOLD, with multipart upload_part_copy requests otherwise
+    :param s3_client: The S3 client
+    :param copy_source: The dict with Bucket, Key and optionally VersionId of source object
+    :param size: The size of source object in bytes
+    :param target_bucket_name: The target bucket name
+    :param target_key: The target key
+    """
+    if size <= MULTIPART_COPY_THRESHOLD:
+        s3_client.copy_object(CopySource=copy_source, Bucket=target_bucket_name, Key=target_key)
+    else:
+        multipart_copy_object(s3_client, copy_source, size, target_bucket_name, target_key)
+
+
+def multipart_copy_object(s3_client, copy_source: dict, size: int, target_bucket_name: str, target_key: str) -> None:
+    """
+    Copies large object with parts copied concurrently by upload_part_copy requests. Content type
+    and metadata of source object are preserved, upload is aborted if any part failed
+    """
+    head_args = {'Bucket': copy_source['Bucket'], 'Key': copy_source['Key']}
+    if copy_source.get('VersionId'):
+        head_args['VersionId'] = copy_source['VersionId']
+    head = s3_client.head_object(**head_args)
+    upload_args = {'Bucket': target_bucket_name, 'Key': target_key, 'Metadata': head.get('Metadata', {})}
+    if head.get('ContentType'):
+        upload_args['ContentType'] = head['ContentType']
+    upload_id = s3_client.create_multipart_upload(**upload_args)['UploadId']
+
+    def copy_part(part_number):
+        start = (part_number - 1) * MULTIPART_COPY_PART_SIZE
+        end = min(start + MULTIPART_COPY_PART_SIZE, size) - 1
+        response = s3_client.upload_part_copy(Bucket=target_bucket_name, Key=target_key, UploadId=upload_id,
+                                              PartNumber=part_number, CopySource=copy_source,
+                                              CopySourceRange=f'bytes={start}-{end}')
+        return {'PartNumber': part_number, 'ETag': response['CopyPartResult']['ETag']}
+
+    number_of_parts = (size + MULTIPART_COPY_PART_SIZE - 1) // MULTIPART_COPY_PART_SIZE
+    try:
+        parts = sorted(execute_concurrently(copy_part, range(1, number_of_parts + 1)),
+                       key=lambda part: part['PartNumber'])
+        s3_client.complete_multipart_upload(Bucket=target_bucket_name, Key=target_key, UploadId=upload_id,
+                                            MultipartUpload={'Parts': parts})
+    except Exception:
+        s3_client.abort_multipart_upload(Bucket=target_bucket_name, Key=target_key, UploadId=upload_id)
+        raise
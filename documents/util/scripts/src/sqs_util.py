@@ -1,5 +1,7 @@
 import json
 import logging
+import queue
+import threading
 import time
 import uuid
 import boto3
@@ -202,31 +204,35 @@ def transform_messages(messages: List[dict], transform_message_function: Callabl
     return transformed_messages
 
 
-def send_messages(messages_to_send: List[dict], target_queue_url: str) -> dict:
+def send_messages(messages_to_send: List[dict], target_queue_url: str, sqs_client=None) -> dict:
     """
     Send messages by batch operation
     :param messages_to_send: messages to send
     :param target_queue_url: URL of the queue to send
+    :param sqs_client: SQS client to reuse, new one is created if not given
     :return: response of send_message_batch method
     """
-    config = Config(retries={'max_attempts': 20, 'mode': 'standard'})
-    sqs_client = boto3.client("sqs", config=config)
+    if sqs_client is None:
+        config = Config(retries={'max_attempts': 20, 'mode': 'standard'})
+        sqs_client = boto3.client("sqs", config=config)
     send_message_batch_response: dict = sqs_client.send_message_batch(QueueUrl=target_queue_url,
                                                                       Entries=messages_to_send)
     return send_message_batch_response
 
 
-def receive_messages(source_queue_url: str, messages_transfer_batch_size: int, wait_timeout: int = 0) -> \
-        Optional[List[dict]]:
+def receive_messages(source_queue_url: str, messages_transfer_batch_size: int, wait_timeout: int = 0,
+                     sqs_client=None) -> Optional[List[dict]]:
     """
     Receive messages
     :param wait_timeout: The duration i seconds for which the call waits for a message to arrive in the queue
     :param messages_transfer_batch_size: how many messages to receive
     :param source_queue_url:  URL of the queue where from messages are received
+    :param sqs_client: SQS client to reuse, new one is created if not given
     :return: response of receive_message method
     """
-    config = Config(retries={'max_attempts': 20, 'mode': 'standard'})
-    sqs_client = boto3.client("sqs", config=config)
+    if sqs_client is None:
+        config = Config(retries={'max_attempts': 20, 'mode': 'standard'})
+        sqs_client = boto3.client("sqs", config=config)
     receive_message_response: dict = \
         sqs_client.receive_message(QueueUrl=source_queue_url,
                                    MaxNumberOfMessages=messages_transfer_batch_size,
@@ -291,15 +297,16 @@ def receive_messages_by_events(events: dict, context: dict) -> dict:
 
 def transfer_messages(events: dict, context: dict) -> dict:
     """
-    Move received_messages from one queue to another.
+    Move received_messages from one queue to another. Messages are moved by pipeline: several receive workers
+    feed bounded queues of transfer workers, which send messages to target queue and delete sent messages
+    from source queue. If both queues are FIFO, messages of the same group are always transferred by the same
+    worker in the order they were received, so order of messages within group is preserved.
     """
     if "SourceQueueUrl" not in events or "TargetQueueUrl" not in events \
             or "NumberOfMessagesToTransfer" not in events or "ForceExecution" not in events \
             or "MessagesTransferBatchSize" not in events:
         raise KeyError("Requires SourceQueueUrl and TargetQueueUrl and NumberOfMessagesToTransfer and "
                        "MessagesTransferBatchSize and ForceExecution in events")
-    config = Config(retries={'max_attempts': 20, 'mode': 'standard'})
-    sqs_client = boto3.client("sqs", config=config)
     start_execution = datetime.utcnow()
 
     source_queue_url: str = events['SourceQueueUrl']
@@ -307,6 +314,12 @@ def transfer_messages(events: dict, context: dict) -> dict:
     force_execution: bool = bool(events['ForceExecution'])
     number_of_messages_to_transfer: int = int(events['NumberOfMessagesToTransfer'])
     messages_transfer_batch_size: int = int(events['MessagesTransferBatchSize'])
+    number_of_receive_workers: int = int(events.get('NumberOfReceiveWorkers', 4))
+    number_of_transfer_workers: int = int(events.get('NumberOfTransferWorkers', 8))
+
+    config = Config(retries={'max_attempts': 20, 'mode': 'standard'},
+                    max_pool_connections=number_of_receive_workers + number_of_transfer_workers)
+    sqs_client = boto3.client("sqs", config=config)
 
     is_source_queue_fifo: bool = is_queue_fifo(source_queue_url, sqs_client)
     is_target_queue_fifo: bool = is_queue_fifo(target_queue_url, sqs_client)
@@ -315,59 +328,89 @@ def transfer_messages(events: dict, context: dict) -> dict:
         raise ValueError(f'The source queue and target queue have different types when ForceExecution '
                          f'parameter is {force_execution}: ')
 
-    number_of_messages_transferred_to_target = 0
-    number_of_messages_failed_to_send_to_target = 0
-    number_of_messages_failed_to_delete_from_source = 0
-    start = now = int(time.time())
+    if is_source_queue_fifo and is_target_queue_fifo:  # If both queues are FIFO
+        transform_message_function = transform_message_from_fifo_to_fifo
+    elif not is_source_queue_fifo and is_target_queue_fifo:
+        transform_message_function = transform_message_from_standard_to_fifo
+    else:
+        transform_message_function = transform_message_and_attributes
+    preserve_group_order: bool = is_source_queue_fifo and is_target_queue_fifo
+
+    start = time.time()
     max_duration_seconds = 9 * 60
-    loop_count = 1
-    number_of_messages_received_from_source = 0
-
-    if number_of_messages_to_transfer == 0:
-        return get_statistics(loop_count, now, number_of_messages_failed_to_delete_from_source,
-                              number_of_messages_failed_to_send_to_target,
-                              number_of_messages_transferred_to_target, source_queue_url, start,
-                              start_execution, max_duration_seconds)
-
-    while number_of_messages_received_from_source < number_of_messages_to_transfer \
-            and (now - start) < max_duration_seconds:
-        logger.debug(f'Entered into loop #{loop_count} '
-                     f'with number_of_messages_transferred_to_target < number_of_messages_to_transfer = '
-                     f'{number_of_messages_transferred_to_target} < {number_of_messages_to_transfer}, '
-                     f'(now - start) < max_duration_seconds = {now - start} < {max_duration_seconds}')
-
-        messages_transfer_batch_size_for_each_call = \
-            min((number_of_messages_to_transfer - number_of_messages_received_from_source),
-                messages_transfer_batch_size)
-
-        received_messages: Optional[List[dict]] = receive_messages(
-            source_queue_url, messages_transfer_batch_size_for_each_call, 5
-        )
-        if not received_messages:
-            logger.debug('Received no messages from source, repeating')
-            now = int(time.time())
-            continue
-
-        number_of_messages_received_from_source += len(received_messages)
-
-        messages_to_send: List[dict] = []
-        if is_source_queue_fifo and is_target_queue_fifo:  # If both queues are FIFO
-            messages_to_send = transform_messages(received_messages, transform_message_from_fifo_to_fifo)
-        elif not is_source_queue_fifo and not is_target_queue_fifo:  # If both queues are standard
-            messages_to_send = transform_messages(received_messages, transform_message_and_attributes)
-        elif is_source_queue_fifo and not is_target_queue_fifo:
-            messages_to_send = transform_messages(received_messages, transform_message_and_attributes)
-        elif not is_source_queue_fifo and is_target_queue_fifo:
-            messages_to_send = transform_messages(received_messages, transform_message_from_standard_to_fifo)
-
-        send_message_batch_response: dict = send_messages(messages_to_send, target_queue_url)
+    counters = {'Received': 0, 'Reserved': 0, 'Transferred': 0, 'FailedToSend': 0, 'FailedToDelete': 0,
+                'ReceiveCalls': 0, 'Batches': 0}
+    counters_lock = threading.Lock()
+    stop_event = threading.Event()
+    errors: List[Exception] = []
+    transfer_queues = [queue.Queue(maxsize=2) for _ in range(number_of_transfer_workers)]
+
+    def put_to_transfer_queue(worker_index: int, batch) -> None:
+        while not stop_event.is_set():
+            try:
+                transfer_queues[worker_index].put(batch, timeout=1)
+                return
+            except queue.Full:
+                continue
+
+    def receive_worker() -> None:
+        try:
+            while not stop_event.is_set() and time.time() - start < max_duration_seconds:
+                with counters_lock:
+                    reserved = min(number_of_messages_to_transfer - counters['Received'] - counters['Reserved'],
+                                   messages_transfer_batch_size)
+                    if reserved <= 0:
+                        return
+                    counters['Reserved'] += reserved
+                received_messages: Optional[List[dict]] = receive_messages(source_queue_url, reserved, 5, sqs_client)
+                received_messages = received_messages or []
+                with counters_lock:
+                    counters['Reserved'] -= reserved
+                    counters['Received'] += len(received_messages)
+                    counters['ReceiveCalls'] += 1
+                    batch_number = counters['Batches']
+                    counters['Batches'] += 1
+                if not received_messages:
+                    logger.debug('Received no messages from source, repeating')
+                    continue
+                if preserve_group_order:
+                    messages_by_group = {}
+                    for message in received_messages:
+                        group_id = message.get('Attributes', {}).get('MessageGroupId')
+                        messages_by_group.setdefault(group_id, []).append(message)
+                    for group_id, group_messages in messages_by_group.items():
+                        worker_index = hash(group_id) % number_of_transfer_workers
+                        put_to_transfer_queue(worker_index, group_messages)
+                else:
+                    put_to_transfer_queue(batch_number % number_of_transfer_workers, received_messages)
+        except Exception as e:
+            logger.error(f'Failed to receive messages from {source_queue_url}: {e}')
+            errors.append(e)
+            stop_event.set()
+
+    def transfer_worker(worker_index: int) -> None:
+        try:
+            while True:
+                try:
+                    received_messages = transfer_queues[worker_index].get(timeout=1)
+                except queue.Empty:
+                    if stop_event.is_set():
+                        return
+                    continue
+                if received_messages is None:
+                    return
+                transfer_batch(received_messages)
+        except Exception as e:
+            logger.error(f'Failed to transfer messages to {target_queue_url}: {e}')
+            errors.append(e)
+            stop_event.set()
+
+    def transfer_batch(received_messages: List[dict]) -> None:
+        messages_to_send: List[dict] = transform_messages(received_messages, transform_message_function)
+        send_message_batch_response: dict = send_messages(messages_to_send, target_queue_url, sqs_client)
+        transferred, failed_to_delete, failed_to_send = 0, 0, 0
         successfully_sent_results = send_message_batch_response.get('Successful')
-        if successfully_sent_results is not None:
-            successfully_sent_results_number = len(successfully_sent_results)
-            logger.info(f'Succeed to send {successfully_sent_results_number} message(-s) '
-                        f'during the loop #{loop_count}: '
-                        f'{successfully_sent_results}')
-
+        if successfully_sent_results:
             message_id_to_receipt_handle = {message.get('MessageId'): message.get('ReceiptHandle')
                                             for message in received_messages}
             delete_message_entries: List = [{'Id': result.get('Id'),
@@ -377,48 +420,51 @@ def transfer_messages(events: dict, context: dict) -> dict:
                                                                                   Entries=delete_message_entries)
             failed_delete_messages: List[dict] = delete_message_batch_response.get('Failed')
             if failed_delete_messages is not None:
-                failed_delete_messages_number = len(failed_delete_messages)
-                logger.info(f'Failed to delete {failed_delete_messages_number} message(-s) '
-                            f'during the loop #{loop_count}: '
-                            f'{failed_delete_messages}')
-                number_of_messages_failed_to_delete_from_source += failed_delete_messages_number
-
+                logger.info(f'Failed to delete {len(failed_delete_messages)} message(-s): {failed_delete_messages}')
+                failed_to_delete = len(failed_delete_messages)
             succeed_delete_messages = delete_message_batch_response.get('Successful')
             if succeed_delete_messages is not None:
-                logger.info(f'Succeed to delete {len(succeed_delete_messages)} message(-s) '
-                            f'during the loop #{loop_count}: '
-                            f'{succeed_delete_messages}')
-                number_of_messages_transferred_to_target += len(succeed_delete_messages)
-
+                transferred = len(succeed_delete_messages)
         failed_send_results: dict = send_message_batch_response.get('Failed')
         if failed_send_results is not None:
-            failed_send_results_number = len(failed_send_results)
-            logger.info(f'Failed to send {failed_send_results_number} message(-s) '
-                        f'during the loop #{loop_count}: '
-                        f'{failed_send_results}')
-            number_of_messages_failed_to_send_to_target += failed_send_results_number
-
-        now = int(time.time())
-        loop_count += 1
-
-    return get_statistics(loop_count, now, number_of_messages_failed_to_delete_from_source,
-                          number_of_messages_failed_to_send_to_target,
-                          number_of_messages_transferred_to_target, source_queue_url, start,
-                          start_execution, max_duration_seconds)
-
-
-def get_statistics(loop_count: int, now, number_of_messages_failed_to_delete_from_source: int,
-                   number_of_messages_failed_to_send_to_target: int,
-                   number_of_messages_transferred_to_target: int,
-                   source_queue_url: str, start, start_execution, max_duration_seconds: int):
-    statistics = {'NumberOfMessagesTransferredToTarget': number_of_messages_transferred_to_target,
-                  'NumberOfMessagesFailedToDeleteFromSource':
-                      number_of_messages_failed_to_delete_from_source,
-                  'NumberOfMessagesFailedToSendToTarget': number_of_messages_failed_to_send_to_target,
-                  'TimeElapsed': str((datetime.utcnow() - start_execution).total_seconds())}
-    logger.info(f'Quiting the loop to receive the messages from source queue with URL = {source_queue_url} '
-                f'because there are no messages received during the loop #{loop_count} and {(now - start)} '
-                f'second(-s) of script\'s execution or the maximum time in {max_duration_seconds} was elapsed. '
+            logger.info(f'Failed to send {len(failed_send_results)} message(-s): {failed_send_results}')
+            failed_to_send = len(failed_send_results)
+        with counters_lock:
+            counters['Transferred'] += transferred
+            counters['FailedToDelete'] += failed_to_delete
+            counters['FailedToSend'] += failed_to_send
+
+    if number_of_messages_to_transfer > 0:
+        receive_threads = [threading.Thread(target=receive_worker) for _ in range(number_of_receive_workers)]
+        transfer_threads = [threading.Thread(target=transfer_worker, args=(i,))
+                            for i in range(number_of_transfer_workers)]
+        for thread in receive_threads + transfer_threads:
+            thread.start()
+        for thread in receive_threads:
+            thread.join()
+        for i in range(number_of_transfer_workers):
+            put_to_transfer_queue(i, None)
+        for thread in transfer_threads:
+            thread.join()
+        if errors:
+            raise errors[0]
+
+    return get_statistics(counters, source_queue_url, start, start_execution, max_duration_seconds)
+
+
+def get_statistics(counters: dict, source_queue_url: str, start, start_execution, max_duration_seconds: int):
+    time_elapsed = (datetime.utcnow() - start_execution).total_seconds()
+    statistics = {'NumberOfMessagesTransferredToTarget': counters['Transferred'],
+                  'NumberOfMessagesFailedToDeleteFromSource': counters['FailedToDelete'],
+                  'NumberOfMessagesFailedToSendToTarget': counters['FailedToSend'],
+                  'NumberOfMessagesReceivedFromSource': counters['Received'],
+                  'NumberOfReceiveCalls': counters['ReceiveCalls'],
+                  'MessagesTransferredPerSecond': round(counters['Transferred'] / time_elapsed, 2)
+                  if time_elapsed > 0 else 0.0,
+                  'TimeElapsed': str(time_elapsed)}
+    logger.info(f'Quiting the transfer of messages from source queue with URL = {source_queue_url} '
+                f'after {int(time.time() - start)} second(-s) of script\'s execution, because requested number of '
+                f'messages was received or the maximum time in {max_duration_seconds} was elapsed. '
                 f'Statistics: {statistics}')
     return statistics
 
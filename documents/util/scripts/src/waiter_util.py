@@ -0,0 +1,126 @@
+import logging
+import random
+import time
+from typing import Any, Callable, Dict, List
+
+waiter_logger = logging.getLogger()
+waiter_logger.setLevel(logging.INFO)
+
+# Delay (in seconds) after the first unsuccessful poll of waiter, doubled after every unsuccessful poll
+WAITER_INITIAL_DELAY_SECS = 2
+# Maximum delay (in seconds) between polls of waiter
+WAITER_MAX_DELAY_SECS = 20
+# Time (in seconds) reserved before SSM step timeout, so waiter raises descriptive error before step is killed
+WAITER_STEP_TIMEOUT_MARGIN_SECS = 10
+
+
+def get_wait_deadline(timeout_secs: float, step_timeout_secs: float = None, start: float = None) -> float:
+    """
+    Returns time (as time.time()) after which waiter stops polling: the earliest of wait timeout
+    and SSM step timeout reduced by safety margin
+    :param timeout_secs: The wait timeout in seconds
+    :param step_timeout_secs: The timeoutSeconds of SSM step the script is executed by
+    :param start: The time the wait was started, now if not given
+    :return: The deadline
+    """
+    start = time.time() if start is None else start
+    deadline = start + float(timeout_secs)
+    if step_timeout_secs:
+        deadline = min(deadline, start + float(step_timeout_secs) - WAITER_STEP_TIMEOUT_MARGIN_SECS)
+    return deadline
+
+
+def get_backoff_delay(attempt: int, initial_delay_secs: float, max_delay_secs: float) -> float:
+    """
+    Returns delay before the next poll: exponential backoff capped by maximum delay with 'equal jitter'
+    (from half to the full backoff), so waiters started together do not poll in lockstep
+    :param attempt: The zero based number of unsuccessful poll
+    :param initial_delay_secs: The delay after the first unsuccessful poll
+    :param max_delay_secs: The maximum delay
+    :return: The delay in seconds
+    """
+    delay = min(float(max_delay_secs), float(initial_delay_secs) * 2 ** min(attempt, 16))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def wait_until(poll: Callable[[], Any], is_done: Callable[[Any], bool], timeout_secs: float, description: str,
+               timeout_message: str = None, initial_delay_secs: float = WAITER_INITIAL_DELAY_SECS,
+               max_delay_secs: float = WAITER_MAX_DELAY_SECS, step_timeout_secs: float = None) -> dict:
+    """
+    Polls till poll result is done with adaptive backoff: the first polls are done soon after each other,
+    so short waits are not rounded up to coarse sleep period, long waits do not flood API with calls.
+    The last sleep is cut to the deadline, so timeout is detected as soon as possible.
+    :param poll: The function returning current state (for example describe call response)
+    :param is_done: The function checking state returned by poll, may raise to fail waiting
+    :param timeout_secs: The wait timeout in seconds
+    :param description: The description of awaited condition used in logs and timeout error
+    :param timeout_message: The message of TimeoutError, generated from description if not given
+    :param initial_delay_secs: The delay after the first unsuccessful poll
+    :param max_delay_secs: The maximum delay between polls
+    :param step_timeout_secs: The timeoutSeconds of SSM step the script is executed by
+    :return: The wait timing: {'Result': last poll result, 'Polls': number of polls,
+    'WaitedSeconds': wait time rounded to whole seconds (Integer output of SSM step)}
+    """
+    start = time.time()
+    deadline = get_wait_deadline(timeout_secs, step_timeout_secs, start)
+    polls = 0
+    while True:
+        result = poll()
+        polls += 1
+        if is_done(result):
+            waited_seconds = time.time() - start
+            waiter_logger.info(f'Waited for {description}: polls={polls}, waited_seconds={round(waited_seconds, 3)}')
+            return {'Result': result, 'Polls': polls, 'WaitedSeconds': round(waited_seconds)}
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            break
+        time.sleep(min(remaining, get_backoff_delay(polls - 1, initial_delay_secs, max_delay_secs)))
+    waiter_logger.info(f'Timed out waiting for {description}: polls={polls}, '
+                       f'waited_seconds={round(time.time() - start, 3)}')
+    raise TimeoutError(timeout_message or f'{description} is not completed within {timeout_secs} seconds')
+
+
+def wait_until_all(describe: Callable[[List[str]], Dict[str, Any]], resource_ids: List[str],
+                   is_done: Callable[[Any], bool], timeout_secs: float, description: str,
+                   timeout_message: str = None, batch_size: int = 100,
+                   initial_delay_secs: float = WAITER_INITIAL_DELAY_SECS, max_delay_secs: float = WAITER_MAX_DELAY_SECS,
+                   step_timeout_secs: float = None) -> dict:
+    """
+    Waits till all given resources are done. Every poll describes only resources which are not done yet
+    with as few describe calls as possible (up to batch_size resources per call).
+    :param describe: The function returning states of given resources mapped by resource id
+    :param resource_ids: The resource ids
+    :param is_done: The function checking state of single resource, may raise to fail waiting
+    :param timeout_secs: The wait timeout in seconds
+    :param description: The description of awaited condition used in logs and timeout error
+    :param timeout_message: The message of TimeoutError, generated from description and pending resources if not given
+    :param batch_size: The maximum number of resources described by single call
+    :param initial_delay_secs: The delay after the first unsuccessful poll
+    :param max_delay_secs: The maximum delay between polls
+    :param step_timeout_secs: The timeoutSeconds of SSM step the script is executed by
+    :return: The wait timing: {'States': last states by resource id, 'Polls': number of polls,
+    'WaitedSeconds': wait time, 'ReadySeconds': time every resource was done at by resource id}
+    """
+    start = time.time()
+    pending = list(dict.fromkeys(resource_ids))
+    states = {}
+    ready_seconds = {}
+
+    def poll():
+        for i in range(0, len(pending), batch_size):
+            states.update(describe(pending[i:i + batch_size]))
+        for resource_id in list(pending):
+            if resource_id in states and is_done(states[resource_id]):
+                pending.remove(resource_id)
+                ready_seconds[resource_id] = round(time.time() - start, 3)
+        return pending
+
+    try:
+        timing = wait_until(poll, lambda p: not p, timeout_secs, description, timeout_message,
+                            initial_delay_secs, max_delay_secs, step_timeout_secs)
+    except TimeoutError as e:
+        if timeout_message:
+            raise
+        raise TimeoutError(f'{e} Resources not done: {pending}') from e
+    return {'States': states, 'Polls': timing['Polls'], 'WaitedSeconds': timing['WaitedSeconds'],
+            'ReadySeconds': ready_seconds}
@@ -10,6 +10,7 @@ from botocore.exceptions import ClientError
 from dateutil.tz import tzlocal
 
 import documents.util.scripts.src.apigw_utils as apigw_utils
+from documents.util.scripts.src.boto3_executor_util import reset_boto3_executor
 from documents.util.scripts.test.mock_sleep import MockSleep
 
 BOTO3_CONFIG: object = Config(retries={'max_attempts': 20, 'mode': 'standard'})
@@ -327,6 +328,7 @@ def get_sample_modify_vpc_endpoint_response(return_value):
 @pytest.mark.unit_test
 class TestApigwUtil(unittest.TestCase):
     def setUp(self):
+        reset_boto3_executor(clients=True)
         self.patcher = patch('boto3.client')
         self.client = self.patcher.start()
         self.mock_apigw = MagicMock()
@@ -1016,6 +1018,7 @@ class TestApigwUtil(unittest.TestCase):
 @pytest.mark.unit_test
 class TestApigwUtilValueExceptions(unittest.TestCase):
     def setUp(self):
+        reset_boto3_executor(clients=True)
         self.patcher = patch('boto3.client')
         self.client = self.patcher.start()
         self.mock_apigw = MagicMock()
@@ -1121,6 +1124,7 @@ class TestApigwUtilValueExceptions(unittest.TestCase):
 @pytest.mark.unit_test
 class TestApigwUtilAssertionExceptions(unittest.TestCase):
     def setUp(self):
+        reset_boto3_executor(clients=True)
         self.patcher = patch('boto3.client')
         self.client = self.patcher.start()
         self.mock_apigw = MagicMock()
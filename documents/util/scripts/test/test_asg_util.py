@@ -165,8 +165,9 @@ class TestAsgUtil(unittest.TestCase):
         self.mock_autoscaling.describe_auto_scaling_groups.side_effect = \
             [test_data_provider.get_sample_describe_auto_scaling_groups_response(lifecycle_state='Pending'),
              test_data_provider.get_sample_describe_auto_scaling_groups_response(lifecycle_state='InService')]
-        wait_for_in_service(events, None)
+        timing = wait_for_in_service(events, None)
         self.assertEqual(self.mock_autoscaling.describe_auto_scaling_groups.call_count, 2)
+        self.assertEqual(timing['Polls'], 2)
         patched_time_sleep.assert_called_once()
 
     def test_get_instance_data_launch_config_success(self):
@@ -3,6 +3,7 @@ import unittest
 from unittest.mock import MagicMock, patch
 
 import pytest
+from documents.util.scripts.src.boto3_executor_util import reset_boto3_executor
 from documents.util.scripts.src.auto_scaling_util import (
     _describe_scalable_targets, _execute_boto3_auto_scaling,
     _register_scalable_target, copy_scaling_targets,
@@ -39,6 +40,7 @@ DESCRIBE_SCALABLE_TARGETS_RESPONSE = {
 @pytest.mark.unit_test
 class TestAutoScalingUtil(unittest.TestCase):
     def setUp(self):
+        reset_boto3_executor(clients=True)
         self.patcher = patch('boto3.client')
         self.client = self.patcher.start()
         self.application_autoscaling_client_mock = MagicMock()
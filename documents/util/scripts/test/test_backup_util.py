@@ -204,7 +204,9 @@ class TestBackupUtil(unittest.TestCase):
         )
         self.assertEqual(response, {
             'RestoreJobId': 'F45BBF9B-B18D-6831-62BA-59C12037613D',
-            'CreatedResourceArn': 'testResourceArn'
+            'CreatedResourceArn': 'testResourceArn',
+            'Polls': 1,
+            'WaitedSeconds': 0
         })
 
     def test_wait_restore_job_in_region_failed(self):
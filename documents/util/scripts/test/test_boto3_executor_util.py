@@ -0,0 +1,161 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+import boto3
+import pytest
+from botocore.exceptions import ClientError
+from botocore.stub import Stubber
+
+from documents.util.scripts.src.boto3_executor_util import BOTO3_EXECUTOR_BACKOFF_CONFIG, BOTO3_EXECUTOR_CONFIG, \
+    execute_boto3, execute_boto3_concurrently, get_boto3_call_stats, get_boto3_client, paginate_boto3, \
+    reset_boto3_executor
+from documents.util.scripts.test.mock_sleep import MockSleep
+
+SUCCESS_RESPONSE = {'ResponseMetadata': {'HTTPStatusCode': 200}}
+THROTTLING_ERROR = ClientError(error_response={'Error': {'Code': 'ThrottlingException'}},
+                               operation_name='DescribeTable')
+
+
+@pytest.mark.unit_test
+class TestBoto3ExecutorUtil(unittest.TestCase):
+
+    def setUp(self):
+        reset_boto3_executor(clients=True)
+        self.mock_sleep = MockSleep()
+        self.time_patcher = patch('time.time', side_effect=self.mock_sleep.time)
+        self.sleep_patcher = patch('time.sleep', side_effect=self.mock_sleep.sleep)
+        self.time_patcher.start()
+        self.patched_sleep = self.sleep_patcher.start()
+        self.patcher = patch('boto3.client')
+        self.client = self.patcher.start()
+        self.dynamodb_client_mock = MagicMock()
+        self.client.side_effect = lambda service_name, config: self.dynamodb_client_mock
+
+    def tearDown(self):
+        self.patcher.stop()
+        self.time_patcher.stop()
+        self.sleep_patcher.stop()
+        reset_boto3_executor(clients=True)
+
+    def test_get_boto3_client_cached(self):
+        self.assertEqual(get_boto3_client('dynamodb'), get_boto3_client('dynamodb'))
+        self.client.assert_called_once()
+
+    def test_get_boto3_client_credentials_changed(self):
+        with patch.dict('os.environ', {'AWS_ACCESS_KEY_ID': 'key-1'}):
+            get_boto3_client('dynamodb')
+        with patch.dict('os.environ', {'AWS_ACCESS_KEY_ID': 'key-2'}):
+            get_boto3_client('dynamodb')
+        self.assertEqual(2, self.client.call_count)
+
+    def test_execute_boto3_throttled_and_success(self):
+        delegate = MagicMock(side_effect=[THROTTLING_ERROR, THROTTLING_ERROR, SUCCESS_RESPONSE])
+
+        self.assertEqual(SUCCESS_RESPONSE, execute_boto3('dynamodb', delegate))
+        self.assertEqual(3, delegate.call_count)
+        self.assertEqual(2, self.patched_sleep.call_count)
+        self.client.assert_called_once()
+
+    def test_execute_boto3_client_with_few_retries(self):
+        execute_boto3('dynamodb', MagicMock(return_value=SUCCESS_RESPONSE))
+        get_boto3_client('dynamodb')
+
+        self.assertEqual(2, self.client.call_count)
+        self.client.assert_any_call('dynamodb', config=BOTO3_EXECUTOR_BACKOFF_CONFIG)
+        self.client.assert_any_call('dynamodb', config=BOTO3_EXECUTOR_CONFIG)
+
+    def test_execute_boto3_throttled_and_failed(self):
+        delegate = MagicMock(side_effect=THROTTLING_ERROR)
+
+        with pytest.raises(Exception) as exception_info:
+            execute_boto3('dynamodb', delegate, max_attempts=5)
+        self.assertTrue(exception_info.match('Failed to perform API call successfully for 5 times'))
+        self.assertEqual(5, delegate.call_count)
+
+    def test_execute_boto3_throttled_and_deadline_reached(self):
+        delegate = MagicMock(side_effect=THROTTLING_ERROR)
+
+        with pytest.raises(Exception) as exception_info:
+            execute_boto3('dynamodb', delegate, deadline=20)
+        self.assertTrue(exception_info.match('Failed to perform API call successfully for 3 times'))
+        self.assertLess(self.mock_sleep.time(), 20)
+
+    def test_execute_boto3_unknown_error(self):
+        delegate = MagicMock(side_effect=ClientError(error_response={'Error': {'Code': 'ValidationException'}},
+                                                     operation_name='DescribeTable'))
+
+        with self.assertRaises(ClientError) as e:
+            execute_boto3('dynamodb', delegate)
+        self.assertEqual('ValidationException', e.exception.response['Error']['Code'])
+        delegate.assert_called_once()
+        self.patched_sleep.assert_not_called()
+
+    def test_execute_boto3_status_code_not_200(self):
+        with self.assertRaises(ValueError):
+            execute_boto3('dynamodb', lambda client: {'ResponseMetadata': {'HTTPStatusCode': 500}})
+
+    def test_execute_boto3_concurrently(self):
+        self.dynamodb_client_mock.describe_table.side_effect = lambda TableName: {
+            'Table': {'TableName': TableName}, 'ResponseMetadata': {'HTTPStatusCode': 200}}
+
+        results = execute_boto3_concurrently(
+            lambda name: execute_boto3('dynamodb', lambda client: client.describe_table(TableName=name)),
+            [f'table-{i}' for i in range(20)], max_workers=4)
+
+        self.assertEqual([f'table-{i}' for i in range(20)], [r['Table']['TableName'] for r in results])
+        self.client.assert_called_once()
+
+    def test_execute_boto3_concurrently_raises_error(self):
+        def describe(name):
+            if name == 'missing':
+                raise KeyError(name)
+            return name
+
+        with self.assertRaises(KeyError):
+            execute_boto3_concurrently(describe, ['a', 'missing', 'b'])
+        self.assertEqual([], execute_boto3_concurrently(describe, []))
+
+    def test_paginate_boto3_search(self):
+        self.dynamodb_client_mock.get_paginator.return_value.paginate.return_value.search.return_value = iter(['a'])
+
+        self.assertEqual(['a'], list(paginate_boto3('dynamodb', 'list_tables', 'TableNames', Limit=10)))
+        self.dynamodb_client_mock.get_paginator.assert_called_once_with('list_tables')
+        self.dynamodb_client_mock.get_paginator.return_value.paginate.assert_called_once_with(Limit=10)
+
+
+@pytest.mark.unit_test
+class TestBoto3ExecutorUtilCallStats(unittest.TestCase):
+
+    def setUp(self):
+        reset_boto3_executor(clients=True)
+        client = boto3.client('dynamodb', region_name='us-east-1', aws_access_key_id='key',
+                              aws_secret_access_key='secret')
+        self.stubber = Stubber(client)
+        self.stubber.activate()
+        self.patcher = patch('boto3.client', return_value=client)
+        self.patcher.start()
+
+    def tearDown(self):
+        self.patcher.stop()
+        self.stubber.deactivate()
+        reset_boto3_executor(clients=True)
+
+    def test_get_boto3_call_stats(self):
+        self.stubber.add_response('list_tables', {'TableNames': [], 'ResponseMetadata': {'HTTPStatusCode': 200}})
+        self.stubber.add_client_error('describe_table', service_error_code='ResourceNotFoundException')
+        self.stubber.add_client_error('describe_table', service_error_code='ThrottlingException')
+
+        execute_boto3('dynamodb', lambda client: client.list_tables())
+        for _ in range(2):
+            with self.assertRaises(Exception):
+                execute_boto3('dynamodb', lambda client: client.describe_table(TableName='table'), max_attempts=1)
+
+        stats = get_boto3_call_stats()
+        self.assertEqual(['dynamodb.DescribeTable', 'dynamodb.ListTables'], list(stats))
+        self.assertEqual((2, 1, 1), tuple(stats['dynamodb.DescribeTable'][key]
+                                          for key in ['Calls', 'Errors', 'Throttles']))
+        self.assertEqual((1, 0, 0), tuple(stats['dynamodb.ListTables'][key]
+                                          for key in ['Calls', 'Errors', 'Throttles']))
+
+        reset_boto3_executor()
+        self.assertEqual({}, get_boto3_call_stats())
@@ -5,6 +5,7 @@ from unittest.mock import MagicMock, call, patch
 from parameterized import parameterized
 
 import pytest
+from documents.util.scripts.src.boto3_executor_util import reset_boto3_executor
 from documents.util.scripts.src.cloudwatch_util import (
     _describe_metric_alarms, _execute_boto3_cloudwatch, _execute_boto3_cloudwatch_paginator, _put_metric_alarm,
     copy_alarms_for_dynamo_db_table, describe_metric_alarm_state,
@@ -61,6 +62,7 @@ DESCRIBE_ALARMS_RESPONSE = {
 class TestCloudWatchUtil(unittest.TestCase):
 
     def setUp(self):
+        reset_boto3_executor(clients=True)
         self.patcher = patch('boto3.client')
         self.client = self.patcher.start()
         self.cw_mock = MagicMock()
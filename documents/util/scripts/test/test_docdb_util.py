@@ -321,7 +321,7 @@ DOCDB_INSTANCES = {
 }
 
 
-def get_unavailable_instance_side_effect(DBInstanceIdentifier):
+def get_unavailable_instance_side_effect(Filters):
     response = copy.deepcopy(DESCRIBE_DB_INSTANCES_RESPONSE)
     response['DBInstances'][0]['DBInstanceStatus'] = 'unavailable'
     return response
@@ -1067,13 +1067,15 @@ class TestDocDBUtil(unittest.TestCase):
             'WaitTimeout': 5
         }
         wait_for_available_instances(events, None)
-        self.mock_docdb.describe_db_instances.assert_called_with(
-            DBInstanceIdentifier=DOCDB_INSTANCE_ID
+        self.mock_docdb.describe_db_instances.assert_called_once_with(
+            Filters=[{'Name': 'db-instance-id', 'Values': [DOCDB_INSTANCE_ID]}]
         )
 
     @patch('time.sleep')
-    def test_wait_for_available_instances_timeout(self, patched_sleep):
+    @patch('time.time')
+    def test_wait_for_available_instances_timeout(self, patched_time, patched_sleep):
         mock_sleep = MockSleep()
+        patched_time.side_effect = mock_sleep.time
         patched_sleep.side_effect = mock_sleep.sleep
         self.mock_docdb.describe_db_instances.side_effect = get_unavailable_instance_side_effect
         self.assertRaises(TimeoutError, wait_for_available_instances,
@@ -1082,5 +1084,6 @@ class TestDocDBUtil(unittest.TestCase):
                               'WaitTimeout': 21
                           }, None)
         self.mock_docdb.describe_db_instances.assert_called_with(
-            DBInstanceIdentifier=DOCDB_INSTANCE_ID
+            Filters=[{'Name': 'db-instance-id', 'Values': [DOCDB_INSTANCE_ID]}]
         )
+        self.assertEqual(21, mock_sleep.time())
@@ -5,6 +5,8 @@ from parameterized import parameterized
 from datetime import datetime
 
 import pytest
+from documents.util.scripts.test.mock_sleep import MockSleep
+from documents.util.scripts.src.boto3_executor_util import reset_boto3_executor
 from documents.util.scripts.src.dynamo_db_util import (_describe_time_to_live, _execute_boto3_dynamodb,
                                                        _describe_contributor_insights,
                                                        _describe_kinesis_destinations,
@@ -251,6 +253,7 @@ class TestDynamoDbUtil(unittest.TestCase):
     CALLS_COUNTER = 0
 
     def setUp(self):
+        reset_boto3_executor(clients=True)
         self.patcher = patch('boto3.client')
         self.client = self.patcher.start()
         self.dynamodb_client_mock = MagicMock()
@@ -336,7 +339,7 @@ class TestDynamoDbUtil(unittest.TestCase):
 
     @staticmethod
     def describe_contributor_mock(**kwargs):
-        if "table_name" in kwargs and "index_name" in kwargs:
+        if "table_name" in kwargs and kwargs.get("index_name"):
             return DESCRIBE_CONTRIBUTOR_INSIGHTS_FOR_TABLE_AND_INDEX_RESPONCE
         else:
             return DESCRIBE_CONTRIBUTOR_INSIGHTS_FOR_TABLE_RESPONCE
@@ -365,12 +368,28 @@ class TestDynamoDbUtil(unittest.TestCase):
     def test_wait_replication_status_in_all_regions_raises_timeout(self):
         events = {
             "TableName": 'my_table',
-            "ReplicasRegionsToWait": ['ap-southeast-1'],
+            "ReplicasRegionsToWait": ['eu-west-1'],
             "WaitTimeoutSeconds": 0
         }
         with self.assertRaises(TimeoutError):
             wait_replication_status_in_all_regions(events=events, context={})
 
+    @patch('documents.util.scripts.src.dynamo_db_util._get_global_table_all_regions',
+           return_value=[{"RegionName": "ap-southeast-1", "ReplicaStatus": "ACTIVE"}])
+    def test_wait_replication_status_in_all_regions_missing_replica_timeout(self, get_mock):
+        mock_sleep = MockSleep()
+        events = {
+            "TableName": 'my_table',
+            "ReplicasRegionsToWait": ['ap-southeast-1', 'eu-west-1'],
+            "WaitTimeoutSeconds": 60
+        }
+        with patch('time.time', side_effect=mock_sleep.time), patch('time.sleep', side_effect=mock_sleep.sleep):
+            with self.assertRaises(TimeoutError) as e:
+                wait_replication_status_in_all_regions(events=events, context={})
+
+        self.assertIn("Regions to waits: ['ap-southeast-1', 'eu-west-1']", str(e.exception))
+        self.assertEqual(60, mock_sleep.time())
+
     @parameterized.expand([
         ({}, {}),
         ({'SourceTableName': 'my_table'}, {})
@@ -464,7 +483,7 @@ class TestDynamoDbUtil(unittest.TestCase):
 
     @patch('documents.util.scripts.src.dynamo_db_util._get_global_table_all_regions',
            new_callable=lambda: TestDynamoDbUtil.get_global_table_all_regions_mock)
-    @patch('documents.util.scripts.src.dynamo_db_util.time.sleep')
+    @patch('time.sleep')
     def test_wait_replication_status_in_all_regions(self, sleep_mock, get_mock):
         events = {
             "TableName": 'my_table',
@@ -474,8 +493,11 @@ class TestDynamoDbUtil(unittest.TestCase):
         result = wait_replication_status_in_all_regions(events=events, context={})
 
         self.assertEqual(result['GlobalTableRegionsActive'], ['ap-southeast-1'])
+        self.assertEqual(result['Polls'], 2)
         self.assertEqual(TestDynamoDbUtil.CALLS_COUNTER, 2)
-        sleep_mock.assert_has_calls([call(20)])
+        # The first poll is repeated after short delay
+        sleep_mock.assert_called_once()
+        self.assertLessEqual(sleep_mock.call_args[0][0], 2)
 
     def test_wait_replication_status_in_all_regions_no_regions(self):
         events = {
@@ -707,11 +729,12 @@ class TestDynamoDbUtil(unittest.TestCase):
         get_indexes_mock.assert_called_with(table_name='my_table')
         update_mock.assert_has_calls([
             call(table_name='my_table_target',
-                 status='ENABLE'),
+                 status='ENABLE',
+                 index_name=None),
             call(table_name='my_table_target',
                  status='ENABLE',
                  index_name="Partition_key-index")
-        ])
+        ], any_order=True)
 
         self.assertEqual(result['CopiedTableContributorInsightsStatus'], 'ENABLED')
         self.assertEqual(result['CopiedIndexesContributorInsightsStatus'],
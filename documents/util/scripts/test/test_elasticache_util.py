@@ -491,7 +491,7 @@ class TestElasticacheUtil(unittest.TestCase):
         ]
         calls = [
             call(CacheClusterId=REPLICATION_GROUP_ID + '-' + cluster_id)
-            for cluster_id in ['001', '002', '003', '004', '001', '002', '004', '001', '003']
+            for cluster_id in ['001', '002', '003', '004', '001', '002', '003', '004', '001']
         ]
         elasticache_util.wait_for_parameters_in_sync(
             events, {}
@@ -78,7 +78,9 @@ class TestRdsUtil(unittest.TestCase):
                        [{'IsClusterWriter': True, 'DBInstanceIdentifier': 'failed_over_id'}]}]}
 
         self.mock_rds.describe_db_clusters.side_effect = [execution_1, execution_2, execution_3]
-        wait_cluster_failover_completed(events, None)
+        timing = wait_cluster_failover_completed(events, None)
+        self.assertEqual(timing['Polls'], 3)
+        self.assertLessEqual(1, timing['WaitedSeconds'])
         self.mock_rds.describe_db_clusters.assert_has_calls([call(DBClusterIdentifier=test_cluster_id),
                                                              call(DBClusterIdentifier=test_cluster_id),
                                                              call(DBClusterIdentifier=test_cluster_id)])
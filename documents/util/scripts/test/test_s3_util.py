@@ -3,7 +3,8 @@ import pytest
 from datetime import datetime
 from unittest.mock import patch, MagicMock, call
 from documents.util.scripts.src.s3_util import check_existence_of_objects_in_bucket, clean_bucket,\
-    restore_from_backup, restore_to_the_previous_version
+    restore_from_backup, restore_to_the_previous_version, execute_concurrently, DELETE_OBJECTS_MAX_KEYS, \
+    MULTIPART_COPY_PART_SIZE, MULTIPART_COPY_THRESHOLD
 
 S3_BUCKET = 's3-bucket'
 S3_EMPTY_BUCKET = 's3-empty-bucket'
@@ -18,6 +19,7 @@ S3_OBJECT_WITH_VERSIONS = 's3-object-with-versions'
 
 def get_list_objects_v2_response(page=0):
     return {
+        'KeyCount': 2,
         'Contents': [
             {
                 'ETag': S3_ETAG,
@@ -141,6 +143,7 @@ def list_objects_v2_paginated_side_effect(Bucket):
     # time.sleep(1)
     if Bucket == S3_EMPTY_BUCKET:
         return [{
+            'KeyCount': 0,
             'Contents': []
         }]
     return [get_list_objects_v2_response(0), get_list_objects_v2_response(1)]
@@ -212,18 +215,43 @@ class TestS3Util(unittest.TestCase):
         events = {
             "S3BucketNameToClean": S3_BUCKET
         }
+        self.s3_service.delete_objects.return_value = {}
         response = clean_bucket(events, None)
         self.list_object_versions_mock.paginate.assert_called_once_with(Bucket=S3_BUCKET)
         self.assertEqual(6, response['NumberOfDeletedObjects'])
-        self.assertEqual(6, self.s3_service.delete_object.call_count)
-        self.s3_service.delete_object.assert_has_calls([
-            call(Bucket=S3_BUCKET, Key="test0.txt", VersionId="null"),
-            call(Bucket=S3_BUCKET, Key="test0.txt", VersionId=S3_FILE_VERSION_ID),
-            call(Bucket=S3_BUCKET, Key="test_deleted0.txt", VersionId=S3_FILE_VERSION_ID),
-            call(Bucket=S3_BUCKET, Key="test1.txt", VersionId="null"),
-            call(Bucket=S3_BUCKET, Key="test1.txt", VersionId=S3_FILE_VERSION_ID),
-            call(Bucket=S3_BUCKET, Key="test_deleted1.txt", VersionId=S3_FILE_VERSION_ID),
-        ])
+        self.s3_service.delete_object.assert_not_called()
+        self.s3_service.delete_objects.assert_called_once_with(Bucket=S3_BUCKET, Delete={
+            'Objects': [
+                {'Key': "test0.txt", 'VersionId': "null"},
+                {'Key': "test0.txt", 'VersionId': S3_FILE_VERSION_ID},
+                {'Key': "test_deleted0.txt", 'VersionId': S3_FILE_VERSION_ID},
+                {'Key': "test1.txt", 'VersionId': "null"},
+                {'Key': "test1.txt", 'VersionId': S3_FILE_VERSION_ID},
+                {'Key': "test_deleted1.txt", 'VersionId': S3_FILE_VERSION_ID},
+            ],
+            'Quiet': True
+        })
+
+    def test_clean_bucket_batches(self):
+        events = {
+            "S3BucketNameToClean": S3_BUCKET
+        }
+        self.s3_service.delete_objects.return_value = {}
+        self.list_object_versions_mock.paginate.side_effect = None
+        self.list_object_versions_mock.paginate.return_value = [get_list_versions_response(page) for page in range(700)]
+        response = clean_bucket(events, None)
+        self.assertEqual(2100, response['NumberOfDeletedObjects'])
+        batch_sizes = sorted(len(c[1]['Delete']['Objects']) for c in self.s3_service.delete_objects.call_args_list)
+        self.assertEqual([100, DELETE_OBJECTS_MAX_KEYS, DELETE_OBJECTS_MAX_KEYS], batch_sizes)
+
+    def test_clean_bucket_delete_errors(self):
+        events = {
+            "S3BucketNameToClean": S3_BUCKET
+        }
+        self.s3_service.delete_objects.return_value = {
+            'Errors': [{'Key': "test0.txt", 'VersionId': "null", 'Code': 'AccessDenied', 'Message': 'Access Denied'}]
+        }
+        self.assertRaises(Exception, clean_bucket, events, None)
 
     def test_clean_bucket_already_empty(self):
         events = {
@@ -233,13 +261,14 @@ class TestS3Util(unittest.TestCase):
         self.list_object_versions_mock.paginate.assert_called_once_with(Bucket=S3_EMPTY_BUCKET)
         self.assertEqual(0, response['NumberOfDeletedObjects'])
         self.s3_service.delete_object.assert_not_called()
+        self.s3_service.delete_objects.assert_not_called()
 
     # Test restore_from_backup
 
     def test_restore_from_backup_missing_buckets(self):
         events = {}
         self.assertRaises(KeyError, restore_from_backup, events, None)
-        self.s3_service.copy.assert_not_called()
+        self.s3_service.copy_object.assert_not_called()
         self.list_objects_v2_mock.paginate.assert_not_called()
 
     def test_restore_from_backup_missing_source_bucket(self):
@@ -247,7 +276,7 @@ class TestS3Util(unittest.TestCase):
             "S3BucketToRestoreName": S3_BUCKET
         }
         self.assertRaises(KeyError, restore_from_backup, events, None)
-        self.s3_service.copy.assert_not_called()
+        self.s3_service.copy_object.assert_not_called()
         self.list_objects_v2_mock.paginate.assert_not_called()
 
     def test_restore_from_backup_missing_target_bucket(self):
@@ -255,7 +284,7 @@ class TestS3Util(unittest.TestCase):
             "S3BackupBucketName": S3_BUCKET
         }
         self.assertRaises(KeyError, restore_from_backup, events, None)
-        self.s3_service.copy.assert_not_called()
+        self.s3_service.copy_object.assert_not_called()
         self.list_objects_v2_mock.paginate.assert_not_called()
 
     def test_restore_from_backup(self):
@@ -266,15 +295,76 @@ class TestS3Util(unittest.TestCase):
         response = restore_from_backup(events, None)
         self.list_objects_v2_mock.paginate.assert_called_once_with(Bucket=S3_BUCKET)
         self.assertEqual(4, response['CopiedFilesNumber'])
-        self.assertEqual(4, self.s3_service.copy.call_count)
-        self.s3_service.copy.assert_has_calls([
-            call({'Bucket': S3_BUCKET, 'Key': 'test0_0.txt'}, S3_EMPTY_BUCKET, 'test0_0.txt'),
-            call({'Bucket': S3_BUCKET, 'Key': 'test0_1.txt'}, S3_EMPTY_BUCKET, 'test0_1.txt'),
-            call({'Bucket': S3_BUCKET, 'Key': 'test1_0.txt'}, S3_EMPTY_BUCKET, 'test1_0.txt'),
-            call({'Bucket': S3_BUCKET, 'Key': 'test1_1.txt'}, S3_EMPTY_BUCKET, 'test1_1.txt')
-        ])
+        self.assertEqual(4, self.s3_service.copy_object.call_count)
+        self.s3_service.copy_object.assert_has_calls([
+            call(CopySource={'Bucket': S3_BUCKET, 'Key': 'test0_0.txt'}, Bucket=S3_EMPTY_BUCKET, Key='test0_0.txt'),
+            call(CopySource={'Bucket': S3_BUCKET, 'Key': 'test0_1.txt'}, Bucket=S3_EMPTY_BUCKET, Key='test0_1.txt'),
+            call(CopySource={'Bucket': S3_BUCKET, 'Key': 'test1_0.txt'}, Bucket=S3_EMPTY_BUCKET, Key='test1_0.txt'),
+            call(CopySource={'Bucket': S3_BUCKET, 'Key': 'test1_1.txt'}, Bucket=S3_EMPTY_BUCKET, Key='test1_1.txt')
+        ], any_order=True)
+        self.s3_service.create_multipart_upload.assert_not_called()
         self.assertLess(0, float(response['RecoveryTimeSeconds']))
 
+    def test_restore_from_backup_multipart(self):
+        events = {
+            "S3BucketToRestoreName": S3_EMPTY_BUCKET,
+            "S3BackupBucketName": S3_BUCKET
+        }
+        size = MULTIPART_COPY_THRESHOLD + MULTIPART_COPY_PART_SIZE // 2
+        self.list_objects_v2_mock.paginate.side_effect = None
+        self.list_objects_v2_mock.paginate.return_value = [{'Contents': [{'Key': 'big.bin', 'Size': size}]}]
+        self.s3_service.head_object.return_value = {'ContentType': 'application/octet-stream',
+                                                    'Metadata': {'owner': 'test'}}
+        self.s3_service.create_multipart_upload.return_value = {'UploadId': 'upload-id'}
+        self.s3_service.upload_part_copy.side_effect = \
+            lambda PartNumber, **kwargs: {'CopyPartResult': {'ETag': f'etag{PartNumber}'}}
+        response = restore_from_backup(events, None)
+
+        self.assertEqual(1, response['CopiedFilesNumber'])
+        self.s3_service.copy_object.assert_not_called()
+        self.s3_service.create_multipart_upload.assert_called_once_with(
+            Bucket=S3_EMPTY_BUCKET, Key='big.bin', Metadata={'owner': 'test'}, ContentType='application/octet-stream')
+        ranges = sorted((c[1]['PartNumber'], c[1]['CopySourceRange'])
+                        for c in self.s3_service.upload_part_copy.call_args_list)
+        self.assertEqual([(1, f'bytes=0-{MULTIPART_COPY_PART_SIZE - 1}'),
+                          (2, f'bytes={MULTIPART_COPY_PART_SIZE}-{2 * MULTIPART_COPY_PART_SIZE - 1}'),
+                          (3, f'bytes={2 * MULTIPART_COPY_PART_SIZE}-{size - 1}')], ranges)
+        self.s3_service.complete_multipart_upload.assert_called_once_with(
+            Bucket=S3_EMPTY_BUCKET, Key='big.bin', UploadId='upload-id',
+            MultipartUpload={'Parts': [{'PartNumber': 1, 'ETag': 'etag1'}, {'PartNumber': 2, 'ETag': 'etag2'},
+                                       {'PartNumber': 3, 'ETag': 'etag3'}]})
+        self.s3_service.abort_multipart_upload.assert_not_called()
+
+    def test_restore_from_backup_multipart_aborted(self):
+        events = {
+            "S3BucketToRestoreName": S3_EMPTY_BUCKET,
+            "S3BackupBucketName": S3_BUCKET
+        }
+        self.list_objects_v2_mock.paginate.side_effect = None
+        self.list_objects_v2_mock.paginate.return_value = [
+            {'Contents': [{'Key': 'big.bin', 'Size': MULTIPART_COPY_THRESHOLD + 1}]}]
+        self.s3_service.head_object.return_value = {}
+        self.s3_service.create_multipart_upload.return_value = {'UploadId': 'upload-id'}
+        self.s3_service.upload_part_copy.side_effect = Exception('Access Denied')
+        self.assertRaises(Exception, restore_from_backup, events, None)
+        self.s3_service.complete_multipart_upload.assert_not_called()
+        self.s3_service.abort_multipart_upload.assert_called_once_with(Bucket=S3_EMPTY_BUCKET, Key='big.bin',
+                                                                       UploadId='upload-id')
+
+    def test_execute_concurrently(self):
+        consumed = []
+
+        def arguments():
+            for i in range(100):
+                consumed.append(i)
+                yield i
+
+        results = execute_concurrently(lambda x: x * 2, arguments(), max_workers=2)
+        first = next(results)
+        # Arguments are consumed lazily
+        self.assertLessEqual(len(consumed), 5)
+        self.assertEqual(list(range(0, 200, 2)), sorted([first] + list(results)))
+
     def test_restore_from_backup_empty_source(self):
         events = {
             "S3BucketToRestoreName": S3_EMPTY_BUCKET,
@@ -283,7 +373,7 @@ class TestS3Util(unittest.TestCase):
         response = restore_from_backup(events, None)
         self.list_objects_v2_mock.paginate.assert_called_once_with(Bucket=S3_EMPTY_BUCKET)
         self.assertEqual(0, response['CopiedFilesNumber'])
-        self.s3_service.copy.assert_not_called()
+        self.s3_service.copy_object.assert_not_called()
 
     # Test restore_to_the_previous_version
 
@@ -291,7 +381,7 @@ class TestS3Util(unittest.TestCase):
         events = {}
         self.assertRaises(KeyError, restore_to_the_previous_version, events, None)
         self.s3_service.list_object_versions.assert_not_called()
-        self.s3_service.copy.assert_not_called()
+        self.s3_service.copy_object.assert_not_called()
 
     def test_restore_to_the_previous_version_missing_bucket(self):
         events = {
@@ -299,7 +389,7 @@ class TestS3Util(unittest.TestCase):
         }
         self.assertRaises(KeyError, restore_to_the_previous_version, events, None)
         self.s3_service.list_object_versions.assert_not_called()
-        self.s3_service.copy.assert_not_called()
+        self.s3_service.copy_object.assert_not_called()
 
     def test_restore_to_the_previous_version_missing_key(self):
         events = {
@@ -307,7 +397,7 @@ class TestS3Util(unittest.TestCase):
         }
         self.assertRaises(KeyError, restore_to_the_previous_version, events, None)
         self.s3_service.list_object_versions.assert_not_called()
-        self.s3_service.copy.assert_not_called()
+        self.s3_service.copy_object.assert_not_called()
 
     def test_restore_to_the_previous_version_empty_source(self):
         events = {
@@ -316,7 +406,7 @@ class TestS3Util(unittest.TestCase):
         }
         self.assertRaises(AssertionError, restore_to_the_previous_version, events, None)
         self.s3_service.list_object_versions.assert_called_once_with(Bucket=S3_EMPTY_BUCKET, Prefix="key", MaxKeys=2)
-        self.s3_service.copy.assert_not_called()
+        self.s3_service.copy_object.assert_not_called()
 
     def test_restore_to_the_previous_version_object_has_no_versions(self):
         events = {
@@ -326,7 +416,7 @@ class TestS3Util(unittest.TestCase):
         self.assertRaises(AssertionError, restore_to_the_previous_version, events, None)
         self.s3_service.list_object_versions.assert_called_once_with(Bucket=S3_BUCKET, Prefix=S3_OBJECT_KEY_NO_VERSIONS,
                                                                      MaxKeys=2)
-        self.s3_service.copy.assert_not_called()
+        self.s3_service.copy_object.assert_not_called()
 
     def test_restore_to_the_previous_version(self):
         events = {
@@ -336,10 +426,33 @@ class TestS3Util(unittest.TestCase):
         response = restore_to_the_previous_version(events, None)
         self.s3_service.list_object_versions.assert_called_once_with(Bucket=S3_BUCKET, Prefix=S3_OBJECT_WITH_VERSIONS,
                                                                      MaxKeys=2)
-        self.s3_service.copy.assert_called_once_with(
-            {'Bucket': S3_BUCKET, 'Key': S3_OBJECT_WITH_VERSIONS, 'VersionId': S3_FILE_VERSION_ID}, S3_BUCKET,
-            S3_OBJECT_WITH_VERSIONS
+        self.s3_service.copy_object.assert_called_once_with(
+            CopySource={'Bucket': S3_BUCKET, 'Key': S3_OBJECT_WITH_VERSIONS, 'VersionId': S3_FILE_VERSION_ID},
+            Bucket=S3_BUCKET, Key=S3_OBJECT_WITH_VERSIONS
         )
         self.assertLess(0, float(response['RestoreTimeSeconds']))
         self.assertEqual('null', response['OldVersion'])
         self.assertEqual(S3_FILE_VERSION_ID, response['ActualVersion'])
+
+    def test_restore_to_the_previous_version_multipart(self):
+        events = {
+            "S3BucketObjectKey": S3_OBJECT_WITH_VERSIONS,
+            "S3BucketName": S3_BUCKET
+        }
+        versions_response = get_list_versions_response()
+        versions_response['Versions'][1]['Size'] = MULTIPART_COPY_THRESHOLD + 1
+        self.s3_service.list_object_versions.side_effect = None
+        self.s3_service.list_object_versions.return_value = versions_response
+        self.s3_service.head_object.return_value = {}
+        self.s3_service.create_multipart_upload.return_value = {'UploadId': 'upload-id'}
+        self.s3_service.upload_part_copy.side_effect = \
+            lambda PartNumber, **kwargs: {'CopyPartResult': {'ETag': f'etag{PartNumber}'}}
+        restore_to_the_previous_version(events, None)
+
+        self.s3_service.copy_object.assert_not_called()
+        self.s3_service.head_object.assert_called_once_with(Bucket=S3_BUCKET, Key=S3_OBJECT_WITH_VERSIONS,
+                                                            VersionId=S3_FILE_VERSION_ID)
+        self.assertEqual(3, self.s3_service.upload_part_copy.call_count)
+        for c in self.s3_service.upload_part_copy.call_args_list:
+            self.assertEqual(S3_FILE_VERSION_ID, c[1]['CopySource']['VersionId'])
+        self.s3_service.complete_multipart_upload.assert_called_once()
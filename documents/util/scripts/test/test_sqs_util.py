@@ -1,4 +1,5 @@
 import json
+import threading
 import unittest
 import uuid
 from unittest.mock import patch, MagicMock, call
@@ -291,6 +292,41 @@ DELETE_MESSAGE_BATCH_RESPONSE = {"Successful": [{"Id": SUCCESSFUL_ID_1},
 INVALID_ATTRIBUTE_NAME_ERROR = ClientError({'Error': {'Code': 'InvalidAttributeName'}}, "")
 
 
+class FakeSourceQueue:
+    """
+    Thread safe source queue returning up to MaxNumberOfMessages messages per receive_message call
+    """
+
+    def __init__(self, messages):
+        self.messages = list(messages)
+        self.lock = threading.Lock()
+        self.sent_bodies = []
+
+    def receive_message(self, QueueUrl, MaxNumberOfMessages, WaitTimeSeconds, MessageAttributeNames, AttributeNames):
+        with self.lock:
+            received, self.messages = self.messages[:MaxNumberOfMessages], self.messages[MaxNumberOfMessages:]
+        return {'Messages': received}
+
+    def send_message_batch(self, QueueUrl, Entries):
+        with self.lock:
+            self.sent_bodies.extend(entry['MessageBody'] for entry in Entries)
+        return {'Successful': [{'Id': entry['Id']} for entry in Entries]}
+
+    def delete_message_batch(self, QueueUrl, Entries):
+        return {'Successful': [{'Id': entry['Id']} for entry in Entries]}
+
+
+def get_fake_messages(number, groups=None):
+    messages = []
+    for i in range(number):
+        attributes = {'MessageDeduplicationId': str(i)}
+        if groups:
+            attributes['MessageGroupId'] = groups[i % len(groups)]
+        messages.append({'MessageId': str(i), 'ReceiptHandle': f'handle-{i}', 'Body': f'body-{i}',
+                         'Attributes': attributes})
+    return messages
+
+
 @pytest.mark.unit_test
 class TestSqsUtil(unittest.TestCase):
     def setUp(self):
@@ -490,7 +526,8 @@ class TestSqsUtil(unittest.TestCase):
             "TargetQueueUrl": SQS_STANDARD_DEST_QUEUE_URL,
             "MessagesTransferBatchSize": self.messages_transfer_batch_size,
             "NumberOfMessagesToTransfer": self.number_of_messages_to_transfer,
-            "ForceExecution": True
+            "ForceExecution": True,
+            "NumberOfReceiveWorkers": 1
         }
         self.sqs_client_mock.receive_message.return_value = RECEIVE_MESSAGE_RESPONSE_FROM_STANDARD
         self.sqs_client_mock.get_queue_attributes.side_effect = INVALID_ATTRIBUTE_NAME_ERROR
@@ -526,7 +563,8 @@ class TestSqsUtil(unittest.TestCase):
             "TargetQueueUrl": SQS_STANDARD_DEST_QUEUE_URL,
             "MessagesTransferBatchSize": self.messages_transfer_batch_size,
             "NumberOfMessagesToTransfer": self.number_of_messages_to_transfer,
-            "ForceExecution": True
+            "ForceExecution": True,
+            "NumberOfReceiveWorkers": 1
         }
         self.sqs_client_mock.receive_message.return_value = RECEIVE_MESSAGE_RESPONSE_FROM_STANDARD
         self.sqs_client_mock.get_queue_attributes.side_effect = [INVALID_ATTRIBUTE_NAME_ERROR, {}]
@@ -568,7 +606,8 @@ class TestSqsUtil(unittest.TestCase):
             "TargetQueueUrl": SQS_STANDARD_DEST_QUEUE_URL,
             "MessagesTransferBatchSize": self.messages_transfer_batch_size,
             "NumberOfMessagesToTransfer": self.number_of_messages_to_transfer,
-            "ForceExecution": True
+            "ForceExecution": True,
+            "NumberOfReceiveWorkers": 1
         }
         self.sqs_client_mock.receive_message.return_value = RECEIVE_MESSAGE_RESPONSE_FROM_FIFO
         self.sqs_client_mock.get_queue_attributes.side_effect = [{}, INVALID_ATTRIBUTE_NAME_ERROR]
@@ -600,7 +639,8 @@ class TestSqsUtil(unittest.TestCase):
             "TargetQueueUrl": SQS_STANDARD_DEST_QUEUE_URL,
             "MessagesTransferBatchSize": self.messages_transfer_batch_size,
             "NumberOfMessagesToTransfer": self.number_of_messages_to_transfer,
-            "ForceExecution": True
+            "ForceExecution": True,
+            "NumberOfReceiveWorkers": 1
         }
         self.sqs_client_mock.receive_message.return_value = RECEIVE_MESSAGE_RESPONSE_FROM_FIFO
         self.sqs_client_mock.get_queue_attributes.side_effect = [{}, {}]
@@ -720,7 +760,9 @@ class TestSqsUtil(unittest.TestCase):
             "TargetQueueUrl": SQS_STANDARD_DEST_QUEUE_URL,
             "MessagesTransferBatchSize": messages_transfer_batch_size,
             "NumberOfMessagesToTransfer": 2,
-            "ForceExecution": True
+            "ForceExecution": True,
+            "NumberOfReceiveWorkers": 1,
+            "NumberOfTransferWorkers": 1
         }
         self.sqs_client_mock.receive_message.side_effect = \
             [{'Messages': [RECEIVE_MESSAGE_RESPONSE_FROM_STANDARD['Messages'][0]]},
@@ -759,6 +801,63 @@ class TestSqsUtil(unittest.TestCase):
             call(QueueUrl=SQS_STANDARD_QUEUE_URL, Entries=[DELETE_MESSAGE_ENTRIES[1]])
         ])
 
+    def test_transfer_messages_concurrently_from_standard_to_standard(self):
+        fake_queue = FakeSourceQueue(get_fake_messages(250))
+        self.sqs_client_mock.receive_message.side_effect = fake_queue.receive_message
+        self.sqs_client_mock.send_message_batch.side_effect = fake_queue.send_message_batch
+        self.sqs_client_mock.delete_message_batch.side_effect = fake_queue.delete_message_batch
+        self.sqs_client_mock.get_queue_attributes.side_effect = INVALID_ATTRIBUTE_NAME_ERROR
+        events = {
+            "SourceQueueUrl": SQS_STANDARD_QUEUE_URL,
+            "TargetQueueUrl": SQS_STANDARD_DEST_QUEUE_URL,
+            "MessagesTransferBatchSize": 10,
+            "NumberOfMessagesToTransfer": 200,
+            "ForceExecution": False
+        }
+        actual_response = transfer_messages(events, None)
+        self.assertEqual(200, actual_response['NumberOfMessagesTransferredToTarget'])
+        self.assertEqual(200, actual_response['NumberOfMessagesReceivedFromSource'])
+        self.assertEqual(0, actual_response['NumberOfMessagesFailedToSendToTarget'])
+        self.assertIsNotNone(actual_response['MessagesTransferredPerSecond'])
+        self.assertEqual(sorted(fake_queue.sent_bodies), sorted(f'body-{i}' for i in range(200)))
+        self.assertEqual(50, len(fake_queue.messages))
+
+    def test_transfer_messages_concurrently_from_fifo_to_fifo_preserves_group_order(self):
+        groups = ['group-1', 'group-2', 'group-3']
+        fake_queue = FakeSourceQueue(get_fake_messages(90, groups))
+        self.sqs_client_mock.receive_message.side_effect = fake_queue.receive_message
+        self.sqs_client_mock.send_message_batch.side_effect = fake_queue.send_message_batch
+        self.sqs_client_mock.delete_message_batch.side_effect = fake_queue.delete_message_batch
+        self.sqs_client_mock.get_queue_attributes.side_effect = [{}, {}]
+        events = {
+            "SourceQueueUrl": SQS_FIFO_QUEUE_URL,
+            "TargetQueueUrl": SQS_FIFO_QUEUE_URL,
+            "MessagesTransferBatchSize": 10,
+            "NumberOfMessagesToTransfer": 90,
+            "ForceExecution": False,
+            "NumberOfReceiveWorkers": 1
+        }
+        actual_response = transfer_messages(events, None)
+        self.assertEqual(90, actual_response['NumberOfMessagesTransferredToTarget'])
+        for group_index in range(len(groups)):
+            expected = [f'body-{i}' for i in range(group_index, 90, len(groups))]
+            self.assertEqual(expected, [body for body in fake_queue.sent_bodies if body in expected])
+
+    def test_transfer_messages_concurrently_send_error(self):
+        fake_queue = FakeSourceQueue(get_fake_messages(100))
+        self.sqs_client_mock.receive_message.side_effect = fake_queue.receive_message
+        self.sqs_client_mock.send_message_batch.side_effect = ClientError({'Error': {'Code': 'AccessDenied'}}, "")
+        self.sqs_client_mock.get_queue_attributes.side_effect = INVALID_ATTRIBUTE_NAME_ERROR
+        events = {
+            "SourceQueueUrl": SQS_STANDARD_QUEUE_URL,
+            "TargetQueueUrl": SQS_STANDARD_DEST_QUEUE_URL,
+            "MessagesTransferBatchSize": 10,
+            "NumberOfMessagesToTransfer": 100,
+            "ForceExecution": False
+        }
+        self.assertRaises(ClientError, transfer_messages, events, None)
+        self.sqs_client_mock.delete_message_batch.assert_not_called()
+
     def test_update_max_receive_count(self):
         events = {
             "MaxReceiveCount": 1,
@@ -0,0 +1,112 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from documents.util.scripts.src.waiter_util import get_backoff_delay, get_wait_deadline, wait_until, \
+    wait_until_all, WAITER_STEP_TIMEOUT_MARGIN_SECS
+from documents.util.scripts.test.mock_sleep import MockSleep
+
+
+@pytest.mark.unit_test
+class TestWaiterUtil(unittest.TestCase):
+
+    def setUp(self):
+        self.mock_sleep = MockSleep()
+        self.time_patcher = patch('time.time', side_effect=self.mock_sleep.time)
+        self.sleep_patcher = patch('time.sleep', side_effect=self.mock_sleep.sleep)
+        self.time_patcher.start()
+        self.patched_sleep = self.sleep_patcher.start()
+
+    def tearDown(self):
+        self.time_patcher.stop()
+        self.sleep_patcher.stop()
+
+    def test_get_wait_deadline_step_timeout(self):
+        self.assertEqual(100, get_wait_deadline(100, None, 0))
+        self.assertEqual(60 - WAITER_STEP_TIMEOUT_MARGIN_SECS, get_wait_deadline(100, 60, 0))
+        self.assertEqual(30, get_wait_deadline(30, 600, 0))
+
+    def test_get_backoff_delay(self):
+        for attempt, expected in [(0, 2), (1, 4), (2, 8), (3, 16), (4, 20), (50, 20)]:
+            delay = get_backoff_delay(attempt, 2, 20)
+            self.assertLessEqual(expected / 2, delay)
+            self.assertLessEqual(delay, expected)
+
+    def test_wait_until(self):
+        poll = MagicMock(side_effect=['CREATING', 'CREATING', 'CREATING', 'AVAILABLE'])
+        timing = wait_until(poll, lambda status: status == 'AVAILABLE', 600, 'resource to be available')
+
+        self.assertEqual('AVAILABLE', timing['Result'])
+        self.assertEqual(4, timing['Polls'])
+        # Delays grow from 1-2 to 4-8 seconds
+        self.assertLessEqual(timing['WaitedSeconds'], 14)
+        self.assertLessEqual(7, timing['WaitedSeconds'])
+
+    def test_wait_until_done_immediately(self):
+        timing = wait_until(lambda: True, bool, 600, 'done')
+        self.assertEqual(1, timing['Polls'])
+        self.patched_sleep.assert_not_called()
+
+    def test_wait_until_timeout(self):
+        poll = MagicMock(return_value='CREATING')
+        with self.assertRaises(TimeoutError) as context:
+            wait_until(poll, lambda status: status == 'AVAILABLE', 100, 'resource to be available')
+
+        self.assertEqual('resource to be available is not completed within 100 seconds', str(context.exception))
+        # The last sleep is cut to the deadline
+        self.assertEqual(100, self.mock_sleep.time())
+        for sleep_call in self.patched_sleep.call_args_list:
+            self.assertLessEqual(sleep_call[0][0], 20)
+
+    def test_wait_until_step_timeout(self):
+        with self.assertRaises(TimeoutError) as context:
+            wait_until(lambda: False, bool, 600, 'done', timeout_message='Custom message', step_timeout_secs=60)
+
+        self.assertEqual('Custom message', str(context.exception))
+        self.assertEqual(60 - WAITER_STEP_TIMEOUT_MARGIN_SECS, self.mock_sleep.time())
+
+    def test_wait_until_is_done_raises(self):
+        def is_done(status):
+            if status == 'FAILED':
+                raise AssertionError('Resource failed')
+            return False
+
+        self.assertRaises(AssertionError, wait_until, MagicMock(side_effect=['CREATING', 'FAILED']), is_done, 600,
+                          'resource to be available')
+
+    def test_wait_until_all(self):
+        statuses = [{'a': 'creating', 'b': 'available', 'c': 'creating'},
+                    {'a': 'available', 'c': 'creating'},
+                    {'c': 'available'}]
+        describe = MagicMock(side_effect=lambda ids: {i: statuses[0][i] for i in ids})
+
+        def describe_and_advance(ids):
+            states = describe(ids)
+            statuses.pop(0)
+            return states
+
+        timing = wait_until_all(describe_and_advance, ['a', 'b', 'c'], lambda status: status == 'available', 600,
+                                'resources to be available')
+
+        self.assertEqual(3, timing['Polls'])
+        self.assertEqual([['a', 'b', 'c'], ['a', 'c'], ['c']], [c[0][0] for c in describe.call_args_list])
+        self.assertEqual({'a': 'available', 'b': 'available', 'c': 'available'}, timing['States'])
+        self.assertEqual(['b', 'a', 'c'], list(timing['ReadySeconds']))
+        self.assertEqual(0, timing['ReadySeconds']['b'])
+
+    def test_wait_until_all_batches(self):
+        describe = MagicMock(side_effect=lambda ids: {i: 'available' for i in ids})
+        wait_until_all(describe, [str(i) for i in range(250)], lambda status: status == 'available', 600,
+                       'resources to be available', batch_size=100)
+
+        self.assertEqual([100, 100, 50], [len(c[0][0]) for c in describe.call_args_list])
+
+    def test_wait_until_all_timeout(self):
+        describe = MagicMock(side_effect=lambda ids: {i: 'available' if i == 'a' else 'creating' for i in ids})
+        with self.assertRaises(TimeoutError) as context:
+            wait_until_all(describe, ['a', 'b'], lambda status: status == 'available', 30,
+                           'resources to be available')
+
+        self.assertEqual("resources to be available is not completed within 30 seconds Resources not done: ['b']",
+                         str(context.exception))
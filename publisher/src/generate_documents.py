@@ -3,29 +3,73 @@ import getopt
 import json
 import logging
 import os
+import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 from publisher.src.publish_documents import PublishDocuments
 METADATA_FILE_NAME = "metadata.json"
 AUTOMATION_DOCUMENT_FINAL_NAME = 'AutomationDocumentFinal.yml'
+# Maximum number of documents generated concurrently
+GENERATE_MAX_WORKERS = 8
 
 default_logger = logging.getLogger('GenerateDocuments')
 
-USAGE = "usage: generate_document.py -l <log-level>  [--clean]"
+USAGE = "usage: generate_document.py -l <log-level>  [--clean] [--force]"
+
+_script_placeholder_pattern = re.compile(r'SCRIPT_PLACEHOLDER::(\w+)\.')
 
 
 class GenerateDocuments:
     @staticmethod
-    def generate():
-        for document_dir in GenerateDocuments.collect_files():
-            final_document_name = os.path.join(document_dir, AUTOMATION_DOCUMENT_FINAL_NAME)
-            with open(os.path.join(document_dir, METADATA_FILE_NAME)) as metadata_file:
-                document_metadata = json.load(metadata_file)
-                document_content = PublishDocuments.get_final_document_content(document_dir,
-                                                                               document_metadata)
-                with open(final_document_name, 'w') as automation_document_output:
-                    automation_document_output.write(document_content)
-                logging.info(f"Generated {final_document_name}")
+    def generate(force=False):
+        """
+        Generates final documents in parallel, document is generated only if its inputs
+        (metadata, document content and included scripts) were modified after it was generated last time.
+        :param force: True to generate all documents regardless of modification time of their inputs
+        """
+        with ThreadPoolExecutor(max_workers=GENERATE_MAX_WORKERS) as executor:
+            results = list(executor.map(lambda d: GenerateDocuments.generate_document(d, force),
+                                        GenerateDocuments.collect_files()))
+        logging.info(f"Generated [{results.count(True)}] documents, [{results.count(False)}] documents are up to date")
+
+    @staticmethod
+    def generate_document(document_dir, force=False):
+        """
+        Generates final document for given document directory.
+        :param document_dir: The document directory
+        :param force: True to generate document regardless of modification time of its inputs
+        :return: True if document was generated, False if it is up to date
+        """
+        final_document_name = os.path.join(document_dir, AUTOMATION_DOCUMENT_FINAL_NAME)
+        with open(os.path.join(document_dir, METADATA_FILE_NAME)) as metadata_file:
+            document_metadata = json.load(metadata_file)
+        if not force and GenerateDocuments.is_up_to_date(document_dir, document_metadata, final_document_name):
+            return False
+        document_content = PublishDocuments.get_final_document_content(document_dir, document_metadata)
+        with open(final_document_name, 'w') as automation_document_output:
+            automation_document_output.write(document_content)
+        logging.info(f"Generated {final_document_name}")
+        return True
+
+    @staticmethod
+    def is_up_to_date(document_dir, document_metadata, final_document_name):
+        """
+        Returns True if final document was generated after its inputs were modified last time. Documents
+        generated by ADK are never up to date, since their inputs are not tracked.
+        :param document_dir: The document directory
+        :param document_metadata: The document metadata
+        :param final_document_name: The final document path
+        """
+        if document_metadata.get('adkPath') or not os.path.exists(final_document_name):
+            return False
+        document_path = os.path.join(document_dir, document_metadata['documentContentPath'])
+        with open(document_path) as document_file:
+            script_names = set(_script_placeholder_pattern.findall(document_file.read()))
+        inputs = [os.path.join(document_dir, METADATA_FILE_NAME), document_path] + \
+            [PublishDocuments.get_script_file_path(script_name) for script_name in script_names]
+        generated_time = os.stat(final_document_name).st_mtime_ns
+        return all(os.stat(path).st_mtime_ns <= generated_time for path in inputs)
 
     @staticmethod
     def clean():
@@ -53,8 +97,9 @@ class GenerateDocuments:
 def main(argv):
     log_level = logging.INFO
     clean_only = False
+    force = False
     try:
-        opts, args = getopt.getopt(argv, "hcl:", ["log-level=", "clean"])
+        opts, args = getopt.getopt(argv, "hcl:", ["log-level=", "clean", "force"])
     except getopt.GetoptError:
         print(USAGE)
         sys.exit(2)
@@ -66,6 +111,8 @@ def main(argv):
             log_level = arg
         elif opt in ("-c", "--clean"):
             clean_only = True
+        elif opt == "--force":
+            force = True
 
     logging.basicConfig(
         format='%(asctime)s %(name)s %(levelname)s:%(message)s',
@@ -77,7 +124,7 @@ def main(argv):
     if clean_only:
         GenerateDocuments.clean()
     else:
-        GenerateDocuments.generate()
+        GenerateDocuments.generate(force)
 
 
 if __name__ == "__main__":
@@ -1,10 +1,14 @@
 import getopt
 import glob
+import hashlib
 import json
 import logging
 import os
 import sys
+import threading
+import weakref
 import importlib.util
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 import boto3
 from botocore.config import Config
@@ -12,42 +16,209 @@ from botocore.exceptions import ClientError
 
 import publisher.src.document_metadata_attrs as metadata_attrs
 from publisher.src.document_validator import DocumentValidator
+from publisher.src.script_index import ScriptIndex
 
 SCRIPT_DIR = '/documents/util/scripts/src'
+# Tag key referencing document metadata tag
+REFERENCE_ID_TAG = 'Digito-reference-id'
+# Tag key holding hash of published document content
+CONTENT_HASH_TAG = 'Digito-content-hash'
+# Local manifest of published document content hashes per account and region
+PUBLISHED_MANIFEST_FILE = '.published_documents.json'
+# Maximum number of documents published concurrently
+PUBLISH_MAX_WORKERS = 8
 default_logger = logging.getLogger('PublishDocuments')
+# Process wide index of helper scripts used to resolve script placeholders
+script_index = ScriptIndex()
+# Account ids of boto3 sessions, so caller identity is requested once per session
+account_ids = weakref.WeakKeyDictionary()
+account_ids_lock = threading.Lock()
 
 
 class PublishDocuments:
 
     def __init__(self, boto3_session, logger=None):
         self.root_dir = os.getcwd()
+        self.session = boto3_session
         config = Config(retries={'max_attempts': 20, 'mode': 'standard'})
         self.ssm = boto3_session.client('ssm', config=config)
+        self.sts = boto3_session.client('sts', config=config)
         self.document_validator = DocumentValidator()
         self.logger = logger if logger else default_logger
 
-    def publish_document(self, list_document_metadata):
-        for document_metadata in list_document_metadata:
-            doc_name = document_metadata['documentName']
-            doc_type = document_metadata['documentType']
-            doc_format = document_metadata['documentFormat']
-            tag_value = document_metadata['tag']
+    manifest_lock = threading.Lock()
 
+    def publish_document(self, list_document_metadata, force=False):
+        """
+        Publishes documents which content has changed since last publishing. Content hashes of published
+        documents are taken from document tags, local manifest is used as a hint only.
+        Documents are published concurrently, document is published after documents it depends on.
+        :param list_document_metadata: The list of documents metadata
+        :param force: True to publish all given documents regardless of their content hashes
+        """
+        documents = {}
+        for document_metadata in list_document_metadata:
             self.validate_metadata(document_metadata)
             document_content = self.get_document_content(document_metadata)
-            try:
-                if self.document_exists(doc_name):
-                    if self.has_document_content_changed(doc_name, doc_format, document_content):
-                        self.update_document(doc_name, document_content, doc_format, tag_value)
-                        self.logger.info('Updated document %s' % doc_name)
+            documents[document_metadata['documentName']] = (document_metadata, document_content,
+                                                            self.get_content_hash(document_content))
+
+        manifest_key = self.get_manifest_key()
+        published_hashes = self.get_published_document_hashes(manifest_key, list(documents.keys()))
+        changed_documents = {}
+        for doc_name, (document_metadata, document_content, content_hash) in documents.items():
+            if force or doc_name not in published_hashes or published_hashes[doc_name] != content_hash:
+                changed_documents[doc_name] = documents[doc_name]
+            else:
+                self.logger.info('Document content has not changed for document name, %s' % doc_name)
+
+        published = {}
+        try:
+            self.publish_in_parallel(changed_documents, published_hashes, published)
+        finally:
+            if published:
+                self.save_manifest(manifest_key, published)
+
+    def publish_in_parallel(self, documents, published_hashes, published):
+        """
+        Publishes given documents with bounded thread pool honoring 'dependsOn' ordering.
+        :param documents: The documents to publish mapped by name: (metadata, content, content hash)
+        :param published_hashes: The content hashes of already published documents mapped by name
+        :param published: The map to be filled with content hashes of successfully published documents
+        """
+        pending = dict(documents)
+        running = {}
+        errors = []
+        with ThreadPoolExecutor(max_workers=PUBLISH_MAX_WORKERS) as executor:
+            while pending or running:
+                if not errors:
+                    for doc_name in list(pending.keys()):
+                        depends_on = self.get_depends_on(pending[doc_name][0])
+                        if not any(d in pending or d in running.values() for d in depends_on):
+                            document_metadata, document_content, content_hash = pending.pop(doc_name)
+                            future = executor.submit(self.publish_single_document, document_metadata,
+                                                     document_content, content_hash, published_hashes)
+                            running[future] = doc_name
+                if not running:
+                    if errors:
+                        break
+                    raise Exception('Detected circular dependencies between documents {}.'
+                                    .format(list(pending.keys())))
+                done, _ = wait(running.keys(), return_when=FIRST_COMPLETED)
+                for future in done:
+                    doc_name = running.pop(future)
+                    if future.exception():
+                        errors.append(future.exception())
                     else:
-                        self.logger.info('Document content has not changed for document name, %s' % doc_name)
-                else:
-                    self.create_document(doc_name, document_content, doc_type, doc_format, tag_value)
+                        published[doc_name] = documents[doc_name][2]
+        if errors:
+            raise errors[0]
+
+    def publish_single_document(self, document_metadata, document_content, content_hash, published_hashes):
+        """
+        Creates or updates given document and tags it with given content hash.
+        :param document_metadata: The document metadata
+        :param document_content: The document content
+        :param content_hash: The document content hash
+        :param published_hashes: The content hashes of already published documents mapped by name
+        """
+        doc_name = document_metadata['documentName']
+        doc_format = document_metadata['documentFormat']
+        try:
+            if doc_name not in published_hashes:
+                if self.create_document(doc_name, document_content, document_metadata['documentType'],
+                                        doc_format, document_metadata['tag'], content_hash):
                     self.logger.info('Created document %s' % doc_name)
-            except ClientError as error:
-                self.logger.error('Failed to publish [{}] document.'.format(doc_name))
-                raise error
+                    return
+            elif published_hashes[doc_name] is None \
+                    and not self.has_document_content_changed(doc_name, doc_format, document_content):
+                self.logger.info('Document content has not changed for document name, %s' % doc_name)
+                self.tag_document_content_hash(doc_name, content_hash)
+                return
+            self.update_document(doc_name, document_content, doc_format, document_metadata['tag'])
+            self.tag_document_content_hash(doc_name, content_hash)
+            self.logger.info('Updated document %s' % doc_name)
+        except ClientError as error:
+            self.logger.error('Failed to publish [{}] document.'.format(doc_name))
+            raise error
+
+    @staticmethod
+    def get_depends_on(document_metadata):
+        depends_on = document_metadata.get('dependsOn')
+        return [d.strip() for d in depends_on.split(',')] if depends_on else []
+
+    @staticmethod
+    def get_content_hash(document_content):
+        return hashlib.sha256(document_content.encode('utf-8')).hexdigest()
+
+    def get_manifest_key(self):
+        """
+        Returns key of local manifest section for account and region documents are published to.
+        """
+        with account_ids_lock:
+            account_id = account_ids.get(self.session)
+            if account_id is None:
+                account_id = self.sts.get_caller_identity()['Account']
+                account_ids[self.session] = account_id
+        return '{}:{}'.format(account_id, self.ssm.meta.region_name)
+
+    def get_published_document_hashes(self, manifest_key, doc_names):
+        """
+        Returns content hashes of published documents. Hashes are confirmed with single paginated 'list_documents'
+        request by content hash tag, since local manifest may be outdated (e.g. documents were deleted in account),
+        documents missing in account are published again regardless of manifest.
+        :param manifest_key: The local manifest section key
+        :param doc_names: The document names
+        :return: The content hashes of existing documents mapped by name (None if document has no hash tag)
+        """
+        manifest = self.load_manifest().get(manifest_key, {})
+        published_hashes = {name: content_hash for name, content_hash in self.list_document_hashes().items()
+                            if name in doc_names}
+        for name in doc_names:
+            if name in manifest and published_hashes.get(name) != manifest[name]:
+                self.logger.info('Ignoring outdated published documents manifest record of document [{}].'
+                                 .format(name))
+        return published_hashes
+
+    def list_document_hashes(self):
+        """
+        Returns content hash tags of all documents owned by account.
+        :return: The content hashes mapped by document name (None if document has no hash tag)
+        """
+        document_hashes = {}
+        paginator = self.ssm.get_paginator('list_documents')
+        for page in paginator.paginate(Filters=[{'Key': 'Owner', 'Values': ['Self']},
+                                                {'Key': 'tag-key', 'Values': [REFERENCE_ID_TAG]}]):
+            for document in page['DocumentIdentifiers']:
+                tags = {t['Key']: t['Value'] for t in document.get('Tags', [])}
+                document_hashes[document['Name']] = tags.get(CONTENT_HASH_TAG)
+        return document_hashes
+
+    def load_manifest(self):
+        manifest_path = os.path.join(self.root_dir, PUBLISHED_MANIFEST_FILE)
+        if not os.path.exists(manifest_path):
+            return {}
+        try:
+            with open(manifest_path) as manifest_file:
+                return json.load(manifest_file)
+        except ValueError as e:
+            self.logger.warning('Ignoring corrupted published documents manifest [{}]: {}'.format(manifest_path, e))
+            return {}
+
+    def save_manifest(self, manifest_key, published):
+        """
+        Records content hashes of published documents in local manifest.
+        :param manifest_key: The local manifest section key
+        :param published: The content hashes of published documents mapped by name
+        """
+        manifest_path = os.path.join(self.root_dir, PUBLISHED_MANIFEST_FILE)
+        with PublishDocuments.manifest_lock:
+            manifest = self.load_manifest()
+            manifest.setdefault(manifest_key, {}).update(published)
+            tmp_path = '{}.{}.tmp'.format(manifest_path, os.getpid())
+            with open(tmp_path, 'w') as manifest_file:
+                json.dump(manifest, manifest_file, indent=2, sort_keys=True)
+            os.replace(tmp_path, manifest_path)
 
     def get_document_content(self, document_metadata):
         return self.get_final_document_content(document_metadata['location'], document_metadata)
@@ -57,15 +228,19 @@ class PublishDocuments:
         if 'adkPath' in document_metadata and document_metadata['adkPath']:
             adk_full_path = os.path.join(root, document_metadata['adkPath'])
             return PublishDocuments.get_adk_automation_yaml(adk_full_path)
-        updated_document_content = ""
-        with open(os.path.join(root, document_metadata['documentContentPath']), 'r') as f:
+        updated_document_content = []
+        script_placeholders = []
+        document_path = os.path.join(root, document_metadata['documentContentPath'])
+        with open(document_path, 'r') as f:
             document_content_lines = f.read().splitlines()
             for line in document_content_lines:
                 if ("SCRIPT_PLACEHOLDER" in line):
                     script_placeholder = line.strip()
+                    script_placeholders.append(script_placeholder)
                     line = PublishDocuments.replace_script_placeholder_in_document_content(line, script_placeholder)
-                updated_document_content += line + "\n"
-        return updated_document_content
+                updated_document_content.append(line + "\n")
+        PublishDocuments.check_script_dependencies(script_placeholders, document_path)
+        return ''.join(updated_document_content)
 
     @classmethod
     def get_adk_automation_yaml(cls, adk_full_path: str):
@@ -73,25 +248,30 @@ class PublishDocuments:
         spec = importlib.util.spec_from_file_location("digito.module.unused", adk_full_path)
         automation_module = importlib.util.module_from_spec(spec)
         spec.loader.exec_module(automation_module)
-        return automation_module.get_automation_doc().get_document_yaml()
-
-    def create_document(self, name, content, doc_type, doc_format, tag_value):
+        return automation_module.get_automation_doc().get_document_yaml(use_c_dumper=True)
+
+    def create_document(self, name, content, doc_type, doc_format, tag_value, content_hash=None):
+        tags = [
+            {
+                'Key': REFERENCE_ID_TAG,
+                'Value': tag_value
+            },
+        ]
+        if content_hash:
+            tags.append({'Key': CONTENT_HASH_TAG, 'Value': content_hash})
         try:
             self.ssm.create_document(
                 Content=content,
                 Name=name,
                 DocumentType=doc_type,
                 DocumentFormat=doc_format,
-                Tags=[
-                    {
-                        'Key': 'Digito-reference-id',
-                        'Value': tag_value
-                    },
-                ]
+                Tags=tags
             )
+            return True
         except ClientError as error:
             if error.response['Error']['Code'] == 'DocumentAlreadyExists':
                 self.logger.warning(error.response['Error']['Message'])
+                return False
             else:
                 self.logger.error('Failed to create [{}] document.'.format(name))
                 raise error
@@ -119,6 +299,13 @@ class PublishDocuments:
             DocumentVersion=version
         )
 
+    def tag_document_content_hash(self, name, content_hash):
+        self.ssm.add_tags_to_resource(
+            ResourceType='Document',
+            ResourceId=name,
+            Tags=[{'Key': CONTENT_HASH_TAG, 'Value': content_hash}]
+        )
+
     def document_exists(self, name):
         try:
             self.ssm.describe_document(
@@ -154,35 +341,30 @@ class PublishDocuments:
     def get_documents_list_by_names(self, desired_documents_list: []):
         list_document_metadata = []
         files = glob.glob(self.root_dir + '/documents/**/metadata.json', recursive=True)
-
-        self.logger.info('Desired documents list %s' % desired_documents_list)
-        # Find additional documents that are needed for desired documents
+        # Skipping alarms (alarms are not SSM automation documents):
+        # https://issues.amazon.com/issues/Digito-1743
+        metadata_by_name = {}
         for file in files:
-            document_metadata = self.read_metadata(file)
-            if 'dependsOn' in document_metadata and document_metadata['documentName'] in desired_documents_list:
-                dependent_documents = document_metadata['dependsOn'].split(',')
-                for dependent_document in dependent_documents:
-                    if dependent_document not in desired_documents_list:
-                        desired_documents_list.append(dependent_document)
-
-        self.logger.info('Desired documents list including required documents : %s' % desired_documents_list)
-        existing_document_names = []
-        for file in files:
-            # Skipping alarms (alarms are not SSM automation documents):
-            # https://issues.amazon.com/issues/Digito-1743
             if '/alarm/' not in str(file):
                 document_metadata = self.read_metadata(file)
-                existing_document_names.append(document_metadata['documentName'])
-                if document_metadata['documentName'] in desired_documents_list:
-                    document_metadata['location'] = os.path.dirname(file)
-                    list_document_metadata.append(document_metadata)
-                else:
-                    self.logger.debug('Not publishing %s' % document_metadata['documentName'])
+                document_metadata['location'] = os.path.dirname(file)
+                metadata_by_name[document_metadata['documentName']] = document_metadata
 
+        self.logger.info('Desired documents list %s' % desired_documents_list)
+        # Find additional documents that are needed for desired documents
         for desired_document_name in desired_documents_list:
-            if desired_document_name not in existing_document_names:
+            if desired_document_name not in metadata_by_name:
                 raise Exception("Document with name [{}] does not exist.".format(desired_document_name))
+            for dependent_document in self.get_depends_on(metadata_by_name[desired_document_name]):
+                if dependent_document not in desired_documents_list:
+                    desired_documents_list.append(dependent_document)
 
+        self.logger.info('Desired documents list including required documents : %s' % desired_documents_list)
+        for document_name, document_metadata in metadata_by_name.items():
+            if document_name in desired_documents_list:
+                list_document_metadata.append(document_metadata)
+            else:
+                self.logger.debug('Not publishing %s' % document_name)
         return list_document_metadata
 
     @classmethod
@@ -193,38 +375,44 @@ class PublishDocuments:
 
     @classmethod
     def get_script(cls, script_placeholder):
-        script_file_name = script_placeholder.split("::")[1].split(".")[0]
-        script_method_name = script_placeholder.split("::")[1].split(".")[1]
-
-        script_lines = []
-        script_lines_to_be_included = ""
-        with open(os.getcwd() + '/documents/util/scripts/src/' + script_file_name + '.py') as f:
-            script_lines = f.read().splitlines()
-
-        is_first = True
-        before_first_method = True
-        found_method = False
-
-        for line in script_lines:
-            if (before_first_method and "def " in line):
-                before_first_method = False
-
-            # method ended, found another method, return
-            if (found_method and ("def " in line)):
-                return script_lines_to_be_included
+        script_file_name, script_method_name = cls.parse_script_placeholder(script_placeholder)
+        script_file_path = cls.get_script_file_path(script_file_name)
+        if script_method_name != 'imports' \
+                and script_method_name not in script_index.get_module(script_file_path).functions:
+            default_logger.warning('Function [{}] does not exist in [{}] script.'
+                                   .format(script_method_name, script_file_path))
+            return ''
+        return script_index.get_snippet(script_file_path, script_method_name)
 
-            if ("def " + script_method_name + "(" in line):
-                found_method = True
+    @classmethod
+    def parse_script_placeholder(cls, script_placeholder):
+        script_file_name, script_method_name = script_placeholder.split("::")[1].split(".")[0:2]
+        return script_file_name, script_method_name
 
-            if ((before_first_method and script_method_name == "imports") or found_method):
-                # Add 8 spaces to all lines except first line so that it aligns with ssm document yaml format
-                if (is_first):
-                    is_first = False
-                else:
-                    line = "        " + line
-                script_lines_to_be_included += line + "\n"
+    @classmethod
+    def get_script_file_path(cls, script_file_name):
+        return os.getcwd() + SCRIPT_DIR + '/' + script_file_name + '.py'
 
-        return script_lines_to_be_included
+    @classmethod
+    def check_script_dependencies(cls, script_placeholders, document_path):
+        """
+        Logs warning for every module function called by scripts included in document which is not included itself.
+        :param script_placeholders: The script placeholders of document
+        :param document_path: The document path
+        """
+        included = {}
+        for script_placeholder in script_placeholders:
+            script_file_name, script_method_name = cls.parse_script_placeholder(script_placeholder)
+            included.setdefault(script_file_name, set()).add(script_method_name)
+        for script_file_name, method_names in included.items():
+            module = script_index.get_module(cls.get_script_file_path(script_file_name))
+            for method_name in method_names:
+                missing = module.get_dependencies(method_name) - method_names
+                missing.update('{}.{}'.format(m, f) for m, f in module.get_imported_dependencies(method_name)
+                               if f not in included.get(m, set()))
+                if missing:
+                    default_logger.warning('Script [{}.{}] in [{}] calls functions {} which are not included.'
+                                           .format(script_file_name, method_name, document_path, sorted(missing)))
 
     def validate_metadata(self, document_metadata):
         """
@@ -289,14 +477,15 @@ def main(argv):
     region = 'us-west-2'
     log_level = logging.INFO
     file_name = 'manifest'
+    force = False
     try:
-        opts, args = getopt.getopt(argv, "hr:l:f:", ["region=", "log-level=", "file-name="])
+        opts, args = getopt.getopt(argv, "hr:l:f:", ["region=", "log-level=", "file-name=", "force"])
     except getopt.GetoptError:
-        default_logger.info('usage: publish_document.py -r <region> -l <log-level> -f <file-name>')
+        default_logger.info('usage: publish_document.py -r <region> -l <log-level> -f <file-name> [--force]')
         sys.exit(2)
     for opt, arg in opts:
         if opt == '-h':
-            default_logger.info('usage: publish_document.py -r <region> -l <log-level> -f <file-name>')
+            default_logger.info('usage: publish_document.py -r <region> -l <log-level> -f <file-name> [--force]')
             sys.exit()
         elif opt in ("-r", "--region"):
             region = arg
@@ -304,6 +493,8 @@ def main(argv):
             log_level = arg
         elif opt in ("-f", "--file-name"):
             file_name = arg
+        elif opt == "--force":
+            force = True
 
     logging.basicConfig(
         format='%(asctime)s %(name)s %(levelname)s:%(message)s',
@@ -319,7 +510,7 @@ def main(argv):
     list_document_metadata = p.get_documents_list_by_manifest_file(file_name)
 
     # publish documents to account
-    p.publish_document(list_document_metadata)
+    p.publish_document(list_document_metadata, force)
 
 
 if __name__ == "__main__":
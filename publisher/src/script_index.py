@@ -0,0 +1,163 @@
+"""
+Index of helper script modules (documents/util/scripts/src) used to resolve SCRIPT_PLACEHOLDER lines
+in SSM documents. Every module is parsed once (and again only if it was modified), top level functions
+and import block are located by AST and rendered snippets are memoized. Helper modules may import functions
+of other helper modules (for example waiter_util), such imports are dropped from rendered import block
+since imported functions are inlined into document by their own placeholders.
+"""
+import ast
+import os
+import threading
+
+# Indentation of script lines (except first line) aligning them with SSM document yaml format
+SCRIPT_INDENT = '        '
+# Package of helper script modules
+SCRIPT_PACKAGE = 'documents.util.scripts.src'
+
+
+class ScriptModule:
+    """
+    Parsed helper script module: source lines, line ranges of import block and top level functions,
+    names of module functions called by every function and functions imported from other script modules.
+    """
+
+    def __init__(self, file_path: str, source: str):
+        self.file_path = file_path
+        self.lines = source.splitlines()
+        tree = ast.parse(source, file_path)
+        definitions = [node for node in tree.body if isinstance(node, (ast.FunctionDef, ast.ClassDef))]
+        starts = [self._get_start_line(node) for node in definitions]
+        # Import block is everything before first definition
+        self.imports = (0, starts[0] if starts else len(self.lines))
+        self.functions = {}
+        self.calls = {}
+        # Imported function name -> script module name
+        self.script_imports = {}
+        self._script_import_lines = set()
+        for node in tree.body:
+            if isinstance(node, ast.ImportFrom) and node.module and node.module.startswith(SCRIPT_PACKAGE + '.'):
+                for alias in node.names:
+                    self.script_imports[alias.asname or alias.name] = node.module[len(SCRIPT_PACKAGE) + 1:]
+                self._script_import_lines.update(range(node.lineno - 1, self._get_end_line(node)))
+        # Function snippet spans till next definition, so it includes trailing comments and blank lines
+        for i, node in enumerate(definitions):
+            if isinstance(node, ast.FunctionDef):
+                end = starts[i + 1] if i + 1 < len(definitions) else len(self.lines)
+                self.functions[node.name] = (node.lineno - 1, end)
+                self.calls[node.name] = {n.func.id for n in ast.walk(node)
+                                         if isinstance(n, ast.Call) and isinstance(n.func, ast.Name)}
+        self.imported_calls = {name: {c for c in calls if c in self.script_imports}
+                               for name, calls in self.calls.items()}
+        for name in self.calls:
+            self.calls[name] = {c for c in self.calls[name] if c in self.functions and c != name}
+
+    def _get_end_line(self, node) -> int:
+        """
+        Returns zero based index of the line following given top level statement. end_lineno is available
+        from python3.8 only, otherwise statement spans till closing parenthesis or last line continuation.
+        """
+        end_lineno = getattr(node, 'end_lineno', None)
+        if end_lineno:
+            return end_lineno
+        end = node.lineno - 1
+        if '(' in self.lines[end]:
+            while ')' not in self.lines[end]:
+                end += 1
+        else:
+            while self.lines[end].rstrip().endswith('\\'):
+                end += 1
+        return end + 1
+
+    @staticmethod
+    def _get_start_line(node) -> int:
+        """
+        Returns zero based index of the first line of given definition including its decorators.
+        """
+        return min([node.lineno] + [d.lineno for d in node.decorator_list]) - 1
+
+    def render(self, name: str) -> str:
+        """
+        Returns snippet of given function (or import block if name is 'imports') indented for SSM document.
+        :param name: The function name or 'imports'
+        :return: The snippet
+        """
+        if name == 'imports':
+            start, end = self.imports
+            snippet_lines = [line for i, line in enumerate(self.lines[start:end], start)
+                             if i not in self._script_import_lines]
+        elif name in self.functions:
+            start, end = self.functions[name]
+            snippet_lines = self.lines[start:end]
+        else:
+            raise Exception('Function [{}] does not exist in [{}] script.'.format(name, self.file_path))
+        return ''.join((line if i == 0 else SCRIPT_INDENT + line) + '\n' for i, line in enumerate(snippet_lines))
+
+    def get_dependencies(self, name: str) -> set:
+        """
+        Returns names of module functions called by given function directly or transitively.
+        :param name: The function name
+        :return: The set of function names
+        """
+        dependencies = set()
+        to_visit = list(self.calls.get(name, []))
+        while to_visit:
+            dependency = to_visit.pop()
+            if dependency not in dependencies and dependency != name:
+                dependencies.add(dependency)
+                to_visit.extend(self.calls[dependency])
+        return dependencies
+
+    def get_imported_dependencies(self, name: str) -> set:
+        """
+        Returns functions of other script modules called by given function or by its module dependencies.
+        :param name: The function name
+        :return: The set of (script module name, function name) tuples
+        """
+        return {(self.script_imports[c], c) for f in self.get_dependencies(name) | {name}
+                for c in self.imported_calls.get(f, [])}
+
+
+class ScriptIndex:
+    """
+    Thread safe cache of parsed script modules and rendered snippets. Module is validated by its
+    file stamp (modification time and size) on access, modified module is parsed again.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # file path -> (file stamp, script module, rendered snippets by name)
+        self._modules = {}
+
+    def get_module(self, file_path: str) -> ScriptModule:
+        return self._get_entry(file_path)[1]
+
+    def get_snippet(self, file_path: str, name: str) -> str:
+        """
+        Returns memoized snippet of given function or import block of given script module.
+        :param file_path: The script module file path
+        :param name: The function name or 'imports'
+        :return: The snippet
+        """
+        stamp, module, snippets = self._get_entry(file_path)
+        snippet = snippets.get(name)
+        if snippet is None:
+            snippet = module.render(name)
+            snippets[name] = snippet
+        return snippet
+
+    def _get_entry(self, file_path: str) -> ():
+        stat = os.stat(file_path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._modules.get(file_path)
+            if entry and entry[0] == stamp:
+                return entry
+        with open(file_path) as f:
+            entry = (stamp, ScriptModule(file_path, f.read()), {})
+        with self._lock:
+            self._modules[file_path] = entry
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._modules = {}
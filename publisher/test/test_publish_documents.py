@@ -0,0 +1,186 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+import pytest
+from botocore.exceptions import ClientError
+
+from publisher.src.publish_documents import PublishDocuments, PUBLISHED_MANIFEST_FILE, CONTENT_HASH_TAG
+
+MANIFEST_KEY = '123456789012:us-east-1'
+
+
+def get_metadata(name, depends_on=None):
+    metadata = {'documentName': name, 'documentType': 'Automation', 'documentFormat': 'YAML',
+                'tag': 'service:test:' + name, 'location': '/documents/service/test/' + name}
+    if depends_on:
+        metadata['dependsOn'] = depends_on
+    return metadata
+
+
+def get_client_error(code):
+    return ClientError({'Error': {'Code': code, 'Message': code}}, 'operation')
+
+
+@pytest.mark.unit_test
+class TestPublishDocuments(unittest.TestCase):
+
+    def setUp(self):
+        self.root_dir = tempfile.TemporaryDirectory()
+        self.ssm_mock = MagicMock()
+        self.ssm_mock.meta.region_name = 'us-east-1'
+        self.sts_mock = MagicMock()
+        self.sts_mock.get_caller_identity.return_value = {'Account': '123456789012'}
+        self.paginator_mock = MagicMock()
+        self.paginator_mock.paginate.return_value = [{'DocumentIdentifiers': []}]
+        self.ssm_mock.get_paginator.return_value = self.paginator_mock
+        self.ssm_mock.update_document.return_value = {'DocumentDescription': {'DocumentVersion': '2'}}
+        session_mock = MagicMock()
+        session_mock.client.side_effect = lambda service_name, config=None: \
+            {'ssm': self.ssm_mock, 'sts': self.sts_mock}[service_name]
+        self.publisher = PublishDocuments(session_mock)
+        self.publisher.root_dir = self.root_dir.name
+        self.publisher.validate_metadata = MagicMock()
+        self.publisher.get_document_content = lambda metadata: 'content of ' + metadata['documentName']
+
+    def tearDown(self):
+        self.root_dir.cleanup()
+
+    def write_manifest(self, published):
+        with open(os.path.join(self.root_dir.name, PUBLISHED_MANIFEST_FILE), 'w') as f:
+            json.dump({MANIFEST_KEY: published}, f)
+
+    def read_manifest(self):
+        with open(os.path.join(self.root_dir.name, PUBLISHED_MANIFEST_FILE)) as f:
+            return json.load(f)[MANIFEST_KEY]
+
+    def test_publish_document_new_documents_success(self):
+        self.publisher.publish_document([get_metadata('doc_a'), get_metadata('doc_b')])
+
+        self.assertEqual(self.ssm_mock.create_document.call_count, 2)
+        self.ssm_mock.update_document.assert_not_called()
+        self.assertEqual(self.read_manifest(),
+                         {'doc_a': PublishDocuments.get_content_hash('content of doc_a'),
+                          'doc_b': PublishDocuments.get_content_hash('content of doc_b')})
+        tags = self.ssm_mock.create_document.call_args[1]['Tags']
+        self.assertIn(CONTENT_HASH_TAG, [t['Key'] for t in tags])
+
+    def test_publish_document_skips_unchanged_success(self):
+        self.write_manifest({'doc_a': PublishDocuments.get_content_hash('content of doc_a'),
+                             'doc_b': 'outdated'})
+        self.paginator_mock.paginate.return_value = [
+            {'DocumentIdentifiers': [
+                {'Name': 'doc_a', 'Tags': [
+                    {'Key': CONTENT_HASH_TAG, 'Value': PublishDocuments.get_content_hash('content of doc_a')}]},
+                {'Name': 'doc_b', 'Tags': [{'Key': CONTENT_HASH_TAG, 'Value': 'outdated'}]}]}]
+
+        self.publisher.publish_document([get_metadata('doc_a'), get_metadata('doc_b')])
+
+        self.paginator_mock.paginate.assert_called_once()
+        self.ssm_mock.create_document.assert_not_called()
+        self.ssm_mock.update_document.assert_called_once()
+        self.assertEqual(self.ssm_mock.update_document.call_args[1]['Name'], 'doc_b')
+        self.ssm_mock.update_document_default_version.assert_called_once_with(Name='doc_b', DocumentVersion='2')
+        self.ssm_mock.add_tags_to_resource.assert_called_once_with(
+            ResourceType='Document', ResourceId='doc_b',
+            Tags=[{'Key': CONTENT_HASH_TAG, 'Value': PublishDocuments.get_content_hash('content of doc_b')}])
+
+    def test_publish_document_missing_in_account_recorded_in_manifest_success(self):
+        self.write_manifest({'doc_a': PublishDocuments.get_content_hash('content of doc_a')})
+
+        self.publisher.publish_document([get_metadata('doc_a')])
+
+        self.paginator_mock.paginate.assert_called_once()
+        self.ssm_mock.create_document.assert_called_once()
+        self.assertEqual(self.ssm_mock.create_document.call_args[1]['Name'], 'doc_a')
+
+    def test_publish_document_force_success(self):
+        self.paginator_mock.paginate.return_value = [
+            {'DocumentIdentifiers': [{'Name': 'doc_a', 'Tags': [
+                {'Key': CONTENT_HASH_TAG, 'Value': PublishDocuments.get_content_hash('content of doc_a')}]}]}]
+
+        self.publisher.publish_document([get_metadata('doc_a')], force=True)
+
+        self.ssm_mock.update_document.assert_called_once()
+
+    def test_get_manifest_key_caller_identity_cached_per_session_success(self):
+        self.assertEqual(self.publisher.get_manifest_key(), MANIFEST_KEY)
+        publisher = PublishDocuments(self.publisher.session)
+
+        self.assertEqual(publisher.get_manifest_key(), MANIFEST_KEY)
+        self.sts_mock.get_caller_identity.assert_called_once()
+
+    def test_publish_document_falls_back_to_list_documents_success(self):
+        self.paginator_mock.paginate.return_value = [
+            {'DocumentIdentifiers': [{'Name': 'doc_a', 'Tags': [
+                {'Key': CONTENT_HASH_TAG, 'Value': PublishDocuments.get_content_hash('content of doc_a')}]}]},
+            {'DocumentIdentifiers': [{'Name': 'doc_b', 'Tags': []}]}]
+        self.ssm_mock.get_document.return_value = {'Content': 'content of doc_b'}
+
+        self.publisher.publish_document([get_metadata('doc_a'), get_metadata('doc_b'), get_metadata('doc_c')])
+
+        self.paginator_mock.paginate.assert_called_once()
+        self.ssm_mock.get_document.assert_called_once_with(Name='doc_b', DocumentVersion='$LATEST',
+                                                           DocumentFormat='YAML')
+        self.ssm_mock.update_document.assert_not_called()
+        self.ssm_mock.add_tags_to_resource.assert_called_once()
+        self.assertEqual(self.ssm_mock.create_document.call_args[1]['Name'], 'doc_c')
+        self.assertEqual(set(self.read_manifest().keys()), {'doc_b', 'doc_c'})
+
+    def test_publish_document_already_exists_updates_success(self):
+        self.ssm_mock.create_document.side_effect = get_client_error('DocumentAlreadyExists')
+
+        self.publisher.publish_document([get_metadata('doc_a')])
+
+        self.ssm_mock.update_document.assert_called_once()
+        self.ssm_mock.add_tags_to_resource.assert_called_once()
+
+    def test_publish_document_depends_on_order_success(self):
+        order = []
+        lock = threading.Lock()
+
+        def create_document(**kwargs):
+            with lock:
+                order.append(kwargs['Name'])
+
+        self.ssm_mock.create_document.side_effect = create_document
+
+        self.publisher.publish_document([get_metadata('doc_a', 'doc_b,doc_c'), get_metadata('doc_b', 'doc_c'),
+                                         get_metadata('doc_c'), get_metadata('doc_d')])
+
+        self.assertEqual(len(order), 4)
+        self.assertLess(order.index('doc_c'), order.index('doc_b'))
+        self.assertLess(order.index('doc_b'), order.index('doc_a'))
+
+    def test_publish_document_fail(self):
+        def create_document(**kwargs):
+            if kwargs['Name'] == 'doc_b':
+                raise get_client_error('InvalidDocumentContent')
+
+        self.ssm_mock.create_document.side_effect = create_document
+
+        self.assertRaises(ClientError, self.publisher.publish_document,
+                          [get_metadata('doc_a', 'doc_b'), get_metadata('doc_b'), get_metadata('doc_c')])
+        self.assertNotIn('doc_a', [c[1]['Name'] for c in self.ssm_mock.create_document.call_args_list])
+        self.assertEqual(list(self.read_manifest().keys()), ['doc_c'])
+
+    def test_publish_document_circular_dependencies_fail(self):
+        self.assertRaises(Exception, self.publisher.publish_document,
+                          [get_metadata('doc_a', 'doc_b'), get_metadata('doc_b', 'doc_a')])
+        self.ssm_mock.create_document.assert_not_called()
+
+    def test_get_documents_list_by_names_success(self):
+        documents = {'a': get_metadata('doc_a', 'doc_b'), 'b': get_metadata('doc_b', 'doc_c'),
+                     'c': get_metadata('doc_c'), 'd': get_metadata('doc_d')}
+        for directory, metadata in documents.items():
+            os.makedirs(os.path.join(self.root_dir.name, 'documents', directory))
+            with open(os.path.join(self.root_dir.name, 'documents', directory, 'metadata.json'), 'w') as f:
+                json.dump(metadata, f)
+
+        result = self.publisher.get_documents_list_by_names(['doc_a'])
+
+        self.assertCountEqual([m['documentName'] for m in result], ['doc_a', 'doc_b', 'doc_c'])
+        self.assertRaises(Exception, self.publisher.get_documents_list_by_names, ['doc_x'])
@@ -0,0 +1,140 @@
+import ast
+import json
+import os
+import tempfile
+import time
+import unittest
+
+import pytest
+
+from publisher.src.generate_documents import GenerateDocuments, AUTOMATION_DOCUMENT_FINAL_NAME
+from publisher.src.script_index import ScriptIndex, ScriptModule
+
+SCRIPT = '''import boto3
+# comment before first function
+
+
+def helper(x):
+    return x + 1
+
+
+def nested_helper():
+    return helper(1)
+
+
+@decorator
+def decorated():
+    def inner():
+        return nested_helper()
+    return inner()
+
+
+class Holder:
+    pass
+
+
+def last():
+    return decorated()
+'''
+
+
+@pytest.mark.unit_test
+class TestScriptIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.module = ScriptModule('script.py', SCRIPT)
+
+    def test_render_imports_success(self):
+        self.assertEqual(self.module.render('imports'),
+                         'import boto3\n        # comment before first function\n        \n        \n')
+
+    def test_render_function_success(self):
+        self.assertEqual(self.module.render('helper'),
+                         'def helper(x):\n            return x + 1\n        \n        \n')
+
+    def test_render_function_with_nested_definition_success(self):
+        self.assertEqual(self.module.render('decorated'),
+                         'def decorated():\n'
+                         '            def inner():\n'
+                         '                return nested_helper()\n'
+                         '            return inner()\n        \n        \n')
+        self.assertEqual(self.module.render('last'), 'def last():\n            return decorated()\n')
+
+    def test_render_not_existing_function_fail(self):
+        self.assertRaises(Exception, self.module.render, 'not_existing')
+
+    def test_get_dependencies_success(self):
+        self.assertEqual(self.module.get_dependencies('last'), {'decorated', 'nested_helper', 'helper'})
+        self.assertEqual(self.module.get_dependencies('helper'), set())
+
+    def test_script_imports_success(self):
+        module = ScriptModule('script.py', 'import time\n'
+                                           'from documents.util.scripts.src.waiter_util import (wait_until,\n'
+                                           '                                                    wait_until_all)\n'
+                                           '\n\n'
+                                           'def helper():\n'
+                                           '    return wait_until_all()\n'
+                                           '\n\n'
+                                           'def wait():\n'
+                                           '    return helper() or wait_until()\n')
+        self.assertEqual(module.script_imports, {'wait_until': 'waiter_util', 'wait_until_all': 'waiter_util'})
+        self.assertEqual(module.render('imports'), 'import time\n        \n        \n')
+        self.assertEqual(module.get_imported_dependencies('wait'),
+                         {('waiter_util', 'wait_until'), ('waiter_util', 'wait_until_all')})
+        self.assertEqual(module.get_imported_dependencies('helper'), {('waiter_util', 'wait_until_all')})
+
+    def test_get_end_line_without_end_lineno_success(self):
+        source = ('from documents.util.scripts.src.waiter_util import (wait_until,\n'
+                  '                                                    wait_until_all)\n'
+                  'from documents.util.scripts.src.boto3_executor_util import execute_boto3, \\\n'
+                  '    paginate_boto3\n'
+                  'import time\n')
+        module = ScriptModule('script.py', source)
+        nodes = ast.parse(source).body
+        for node in nodes:
+            if hasattr(node, 'end_lineno'):
+                del node.end_lineno
+        self.assertEqual([module._get_end_line(node) for node in nodes], [2, 4, 5])
+
+    def test_get_snippet_cached_and_reloaded_success(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, 'script.py')
+            with open(file_path, 'w') as f:
+                f.write(SCRIPT)
+            index = ScriptIndex()
+            module = index.get_module(file_path)
+            self.assertIs(index.get_snippet(file_path, 'helper'), index.get_snippet(file_path, 'helper'))
+            self.assertIs(index.get_module(file_path), module)
+
+            with open(file_path, 'w') as f:
+                f.write('def helper():\n    pass\n')
+            os.utime(file_path, (time.time() + 1, time.time() + 1))
+
+            self.assertIsNot(index.get_module(file_path), module)
+            self.assertEqual(index.get_snippet(file_path, 'helper'), 'def helper():\n            pass\n')
+
+
+@pytest.mark.unit_test
+class TestGenerateDocuments(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.document_dir = self.tmp_dir.name
+        with open(os.path.join(self.document_dir, 'metadata.json'), 'w') as f:
+            json.dump({'documentContentPath': 'AutomationDocument.yml'}, f)
+        with open(os.path.join(self.document_dir, 'AutomationDocument.yml'), 'w') as f:
+            f.write('description: test\n')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_generate_document_incremental_success(self):
+        self.assertTrue(GenerateDocuments.generate_document(self.document_dir))
+        with open(os.path.join(self.document_dir, AUTOMATION_DOCUMENT_FINAL_NAME)) as f:
+            self.assertEqual(f.read(), 'description: test\n')
+        self.assertFalse(GenerateDocuments.generate_document(self.document_dir))
+        self.assertTrue(GenerateDocuments.generate_document(self.document_dir, force=True))
+
+        later = time.time() + 1
+        os.utime(os.path.join(self.document_dir, 'AutomationDocument.yml'), (later, later))
+        self.assertTrue(GenerateDocuments.generate_document(self.document_dir))
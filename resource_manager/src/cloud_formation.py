@@ -1,7 +1,6 @@
 import logging
-import time
-import resource_manager.src.constants as constants
 from botocore.exceptions import ClientError
+from .cloud_formation_waiter import get_stack_waiter
 from .util.boto3_client_factory import client, resource
 
 
@@ -14,6 +13,7 @@ class CloudFormationTemplate:
         self.client = client('cloudformation', boto3_session)
         self.resource = resource('cloudformation', boto3_session)
         self.logger = logger
+        self.stack_waiter = get_stack_waiter(self.client, logger)
 
     def deploy_cf_stack(self, cfn_template_s3_url: str, stack_name: str, **kwargs) -> []:
         """
@@ -134,16 +134,14 @@ class CloudFormationTemplate:
     def _wait_stack_operation_completion(self, stack_name: str):
         """
         Waits for stack operation to be completed. It could be CREATE/UPDATE/DELETE and other possible operations.
+        Waiting is done by stack waiter shared by all threads, which polls stack statuses and events.
         :param stack_name The cloud formation stack name
         """
         try:
             stack_status = self._get_stack_status(stack_name)
-            while 'IN_PROGRESS' in stack_status:
-                self.logger.info("Waiting for stack [%s] event [%s] to be completed, sleeping [%d] seconds.",
-                                 stack_name, stack_status, constants.cf_operation_sleep_time_secs)
-                time.sleep(constants.cf_operation_sleep_time_secs)
-                stack_status = self._get_stack_status(stack_name)
-                if 'FAILED' in stack_status or 'ROLLBACK_COMPLETE' in stack_status:
+            if 'IN_PROGRESS' in stack_status:
+                stack_status = self.stack_waiter.wait(stack_name, stack_status)
+                if stack_status and ('FAILED' in stack_status or 'ROLLBACK_COMPLETE' in stack_status):
                     raise Exception(f'Stack for name [{stack_name}] failed with status [{stack_status}].')
         except ClientError as e:
             err_message = e.response['Error']['Message']
@@ -0,0 +1,292 @@
+import logging
+import threading
+import time
+import resource_manager.src.constants as constants
+from botocore.exceptions import ClientError, BotoCoreError
+
+# Stack statuses of not yet completed stack operations
+IN_PROGRESS_STATUSES = ['CREATE_IN_PROGRESS', 'ROLLBACK_IN_PROGRESS', 'DELETE_IN_PROGRESS', 'UPDATE_IN_PROGRESS',
+                        'UPDATE_COMPLETE_CLEANUP_IN_PROGRESS', 'UPDATE_ROLLBACK_IN_PROGRESS',
+                        'UPDATE_ROLLBACK_COMPLETE_CLEANUP_IN_PROGRESS', 'REVIEW_IN_PROGRESS',
+                        'IMPORT_IN_PROGRESS', 'IMPORT_ROLLBACK_IN_PROGRESS']
+# Error codes of requests which may succeed once retried
+TRANSIENT_ERROR_CODES = ['Throttling', 'ThrottlingException', 'RequestLimitExceeded', 'ServiceUnavailable',
+                         'InternalFailure', 'InternalError']
+
+
+class StackWait:
+    """
+    State of single stack operation waited by StackWaiter: latest stack status,
+    stack events cursor and latest status of every stack resource.
+    """
+
+    def __init__(self, stack_name: str, stack_status: str):
+        self.stack_name = stack_name
+        self.stack_status = stack_status
+        self.last_event_id = None
+        self.resource_statuses = {}
+        self.error = None
+        self.failed_polls = 0
+        self.done = threading.Event()
+
+    def get_progress(self) -> (int, int):
+        """
+        Returns number of stack resources which reached final status and number of all known stack resources.
+        """
+        completed = [s for s in self.resource_statuses.values() if not s.endswith('IN_PROGRESS')]
+        return len(completed), len(self.resource_statuses)
+
+
+class StackWaiter:
+    """
+    Waits for cloud formation stack operations to be completed. All stacks waited by threads sharing
+    cloud formation client are polled by single poller thread: one ListStacks request per tick
+    returns statuses of all in progress stacks (DescribeStacks accepts single stack name only),
+    stack events are tailed incrementally using last seen event id as cursor. Poll interval starts
+    from constants.cf_waiter_initial_secs and grows up to constants.cf_operation_sleep_time_secs
+    while there is no progress, it is reset once new stack events are received. Transient errors are
+    retried for up to constants.cf_waiter_max_failed_polls consecutive polls, error of single stack
+    fails wait of this stack only.
+    """
+
+    def __init__(self, cfn_client, logger=logging.getLogger()):
+        self.client = cfn_client
+        self.logger = logger
+        self._condition = threading.Condition()
+        self._stacks = {}
+        self._poller = None
+        self._interval_secs = constants.cf_waiter_initial_secs
+        self._next_poll_time = 0
+        self._failed_polls = 0
+        self.stats = {'describe_stacks': 0, 'list_stacks': 0, 'describe_stack_events': 0}
+
+    def wait(self, stack_name: str, stack_status: str) -> str:
+        """
+        Waits till operation of given stack is completed.
+        :param stack_name: The cloud formation stack name
+        :param stack_status: The current (in progress) stack status
+        :return: The final stack status or None if stack does not exist anymore
+        """
+        with self._condition:
+            stack_wait = self._stacks.get(stack_name)
+            if not stack_wait or stack_wait.done.is_set():
+                stack_wait = StackWait(stack_name, stack_status)
+                self._stacks[stack_name] = stack_wait
+            # New stack operation is checked soon, since most of operations start with quick resource changes
+            self._interval_secs = constants.cf_waiter_initial_secs
+            poller_alive = self._poller is not None and self._poller.is_alive()
+            self._next_poll_time = min(self._next_poll_time, time.monotonic() + self._interval_secs) \
+                if poller_alive else time.monotonic() + self._interval_secs
+            if not poller_alive:
+                self._poller = threading.Thread(target=self._run, name='StackWaiter', daemon=True)
+                self._poller.start()
+            self._condition.notify_all()
+        stack_wait.done.wait()
+        if stack_wait.error:
+            raise stack_wait.error
+        return stack_wait.stack_status
+
+    def _run(self):
+        """
+        Poller thread, unexpected errors are passed to all pending waits, so waiting threads do not hang.
+        """
+        try:
+            self._poll_loop()
+        except Exception as e:
+            self.logger.error(f'Stack waiter failed: {e}')
+            with self._condition:
+                # Poller is released together with completion of waits, so next wait starts new poller
+                if self._poller is threading.current_thread():
+                    self._poller = None
+                for stack_wait in self._stacks.values():
+                    stack_wait.error = e
+                    stack_wait.done.set()
+                self._stacks.clear()
+        finally:
+            with self._condition:
+                if self._poller is threading.current_thread():
+                    self._poller = None
+
+    def _poll_loop(self):
+        """
+        Poller thread loop, thread exits once there are no stacks to wait for.
+        """
+        while True:
+            with self._condition:
+                while self._stacks and time.monotonic() < self._next_poll_time:
+                    self._condition.wait(self._next_poll_time - time.monotonic())
+                if not self._stacks:
+                    self._poller = None
+                    return
+                stack_waits = list(self._stacks.values())
+            progressed = self._poll(stack_waits)
+            with self._condition:
+                for stack_wait in stack_waits:
+                    if stack_wait.done.is_set() and self._stacks.get(stack_wait.stack_name) is stack_wait:
+                        self._stacks.pop(stack_wait.stack_name)
+                self._interval_secs = constants.cf_waiter_initial_secs if progressed \
+                    else min(constants.cf_operation_sleep_time_secs,
+                             self._interval_secs * constants.cf_waiter_backoff_factor)
+                self._next_poll_time = time.monotonic() + self._interval_secs
+
+    def _poll(self, stack_waits: []) -> bool:
+        """
+        Refreshes statuses and events of given stacks, completes waits of stacks which are not in progress.
+        :param stack_waits: The list of stack waits
+        :return: True if any of stacks made progress (new events or completion), False otherwise
+        """
+        progressed = False
+        try:
+            statuses, errors = self._get_stack_statuses([s.stack_name for s in stack_waits])
+            self._failed_polls = 0
+        except Exception as e:
+            # ListStacks failure leaves all stacks without status
+            self._failed_polls += 1
+            if self._is_transient(e) and self._failed_polls < constants.cf_waiter_max_failed_polls:
+                self.logger.warning(f'Failed to get stack statuses, poll [{self._failed_polls}] will be retried: {e}')
+                return False
+            self.logger.error(f'Failed to get stack statuses: {e}')
+            for stack_wait in stack_waits:
+                stack_wait.error = e
+                stack_wait.done.set()
+            return True
+        for stack_wait in stack_waits:
+            try:
+                progressed = self._tail_events(stack_wait) or progressed
+            except Exception as e:
+                self.logger.warning(f'Failed to get [{stack_wait.stack_name}] stack events: {e}')
+            error = errors.get(stack_wait.stack_name)
+            if error:
+                stack_wait.failed_polls += 1
+                if self._is_transient(error) and stack_wait.failed_polls < constants.cf_waiter_max_failed_polls:
+                    self.logger.warning(f'Failed to get [{stack_wait.stack_name}] stack status, '
+                                        f'poll [{stack_wait.failed_polls}] will be retried: {error}')
+                    continue
+                self.logger.error(f'Failed to get [{stack_wait.stack_name}] stack status: {error}')
+                progressed = True
+                stack_wait.error = error
+                stack_wait.done.set()
+                continue
+            stack_wait.failed_polls = 0
+            stack_wait.stack_status = statuses.get(stack_wait.stack_name)
+            if stack_wait.stack_status is None or stack_wait.stack_status not in IN_PROGRESS_STATUSES:
+                progressed = True
+                stack_wait.done.set()
+            else:
+                completed, total = stack_wait.get_progress()
+                self.logger.info("Waiting for stack [%s] event [%s] to be completed, [%d/%d] resources completed.",
+                                 stack_wait.stack_name, stack_wait.stack_status, completed, total)
+        return progressed
+
+    def _get_stack_statuses(self, stack_names: []) -> ({}, {}):
+        """
+        Returns statuses of given stacks. Single stack is described directly, for multiple stacks all in progress
+        stacks are listed with single (paginated) request and only stacks missing in the list are described.
+        :param stack_names: The cloud formation stack names
+        :return: The map of stack name and status (None if stack does not exist) and the map of stack name and
+        error of stacks which failed to be described
+        """
+        statuses = {}
+        errors = {}
+        if len(stack_names) > 1:
+            kwargs = {'StackStatusFilter': IN_PROGRESS_STATUSES}
+            while True:
+                self.stats['list_stacks'] += 1
+                response = self.client.list_stacks(**kwargs)
+                for summary in response['StackSummaries']:
+                    if summary['StackName'] in stack_names:
+                        statuses[summary['StackName']] = summary['StackStatus']
+                if not response.get('NextToken'):
+                    break
+                kwargs['NextToken'] = response['NextToken']
+        for stack_name in stack_names:
+            if stack_name not in statuses:
+                try:
+                    statuses[stack_name] = self._describe_stack_status(stack_name)
+                except Exception as e:
+                    errors[stack_name] = e
+        return statuses, errors
+
+    @staticmethod
+    def _is_transient(error: Exception) -> bool:
+        """
+        Checks if request failed with error which may disappear once request is retried.
+        :param error: The request error
+        :return: True for connection errors and throttling/service errors, False otherwise
+        """
+        if isinstance(error, ClientError):
+            return error.response['Error']['Code'] in TRANSIENT_ERROR_CODES
+        return isinstance(error, BotoCoreError)
+
+    def _describe_stack_status(self, stack_name: str) -> str:
+        """
+        Returns status of given stack.
+        :param stack_name: The cloud formation stack name
+        :return: The stack status or None if stack does not exist
+        """
+        try:
+            self.stats['describe_stacks'] += 1
+            return self.client.describe_stacks(StackName=stack_name)['Stacks'][0]['StackStatus']
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ValidationError' \
+                    and f'Stack with id {stack_name} does not exist' in e.response['Error']['Message']:
+                return None
+            raise e
+
+    def _tail_events(self, stack_wait: StackWait) -> bool:
+        """
+        Reads stack events which are newer than last seen event (or events of current operation
+        on first call) and logs per resource progress.
+        :param stack_wait: The stack wait
+        :return: True if new events were received, False otherwise
+        """
+        new_events = []
+        kwargs = {'StackName': stack_wait.stack_name}
+        for page in range(constants.cf_waiter_max_event_pages):
+            self.stats['describe_stack_events'] += 1
+            response = self.client.describe_stack_events(**kwargs)
+            cursor_reached = False
+            for event in response['StackEvents']:
+                if event['EventId'] == stack_wait.last_event_id:
+                    cursor_reached = True
+                    break
+                new_events.append(event)
+                # Without cursor only events of current operation are of interest
+                if stack_wait.last_event_id is None and event['LogicalResourceId'] == stack_wait.stack_name \
+                        and event.get('ResourceStatusReason') == 'User Initiated':
+                    cursor_reached = True
+                    break
+            if cursor_reached or not response.get('NextToken') or stack_wait.last_event_id is None:
+                break
+            kwargs['NextToken'] = response['NextToken']
+        if not new_events:
+            return False
+        stack_wait.last_event_id = new_events[0]['EventId']
+        # Events are returned in reverse chronological order
+        for event in reversed(new_events):
+            if event['LogicalResourceId'] == stack_wait.stack_name:
+                continue
+            stack_wait.resource_statuses[event['LogicalResourceId']] = event['ResourceStatus']
+            reason = f': {event["ResourceStatusReason"]}' if event.get('ResourceStatusReason') else ''
+            self.logger.info(f'Stack [{stack_wait.stack_name}] resource [{event["LogicalResourceId"]}] '
+                             f'({event.get("ResourceType")}) is in [{event["ResourceStatus"]}] status{reason}.')
+        return True
+
+
+_waiters = {}
+_lock = threading.Lock()
+
+
+def get_stack_waiter(cfn_client, logger=logging.getLogger()) -> StackWaiter:
+    """
+    Returns stack waiter shared by all threads using given cloud formation client.
+    :param cfn_client: The cloud formation client
+    :param logger: The logger
+    :return: The stack waiter
+    """
+    with _lock:
+        entry = _waiters.get(id(cfn_client))
+        if not entry or entry[0] is not cfn_client:
+            entry = (cfn_client, StackWaiter(cfn_client, logger))
+            _waiters[id(cfn_client)] = entry
+        return entry[1]
@@ -1,11 +1,39 @@
 # Number of seconds to wait for resources per waiting iteration
 sleep_time_secs = 5
+# Number of seconds between SSM execution monitor polls
+ssm_monitor_poll_time_secs = sleep_time_secs
 # Number of seconds to wait for resources before time out
 wait_time_out_secs = 7200
+# Initial and maximum number of seconds to wait for resource release notification per waiting iteration
+lease_wait_initial_secs = 0.5
+lease_wait_max_secs = sleep_time_secs
+# Number of seconds to wait between resource table stream polls
+lease_stream_poll_time_secs = 0.5
+# Maximum number of cloud formation templates pulled in parallel by resource pool
+resource_pull_max_workers = 5
+# Maximum number of items in single DynamoDB TransactWriteItems request
+ddb_transaction_max_items = 25
+# Number of segments (threads) used for parallel scan of resources DDB table
+ddb_scan_total_segments = 8
+# Number of seconds to wait for new global secondary index of resources DDB table to be backfilled
+ddb_index_wait_time_out_secs = 1800
+# Maximum number of concurrent requests executed by load generator
+load_generator_max_concurrency = 32
+# Timeout of single HTTP request or web socket handshake sent by traffic generator
+traffic_generator_request_timeout_secs = 30
 # Cloud formation step completion wait time per iteration
 cf_operation_sleep_time_secs = 20
+# Cloud formation stack waiter initial poll interval (grows up to cf_operation_sleep_time_secs while no progress)
+cf_waiter_initial_secs = 2
+cf_waiter_backoff_factor = 1.5
+# Maximum number of stack events pages read by stack waiter per poll
+cf_waiter_max_event_pages = 5
+# Number of consecutive failed stack status polls (transient errors) after which stack waiter gives up
+cf_waiter_max_failed_polls = 5
 # S3 bucket name patter for integration test cfn templates
 s3_bucket_name_pattern = 'ssm-test-resources-<account_id>-<region_name>'
+# Number of concurrent delete_objects requests used to clean S3 bucket
+s3_clean_bucket_max_workers = 10
 # TriggerRollback step constants
 rollback_step_name = 'TriggerRollback'
 rollback_execution_id_output_name = 'RollbackExecutionId'
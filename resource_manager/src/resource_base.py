@@ -19,7 +19,8 @@ class ResourceBase:
         """
         Deletes resource stack and record DynamoDB.
         :param resource_to_delete: Resource to be deleted.
-        :param all_resources: All existing resources to check dependencies.
+        :param all_resources: All existing resources to check dependencies, statuses of dependents
+        are updated in place by threads deleting them.
         :param cfn_helper: The cloud formation helper.
         """
         cfn_stack_name = resource_to_delete.cf_stack_name
@@ -31,7 +32,7 @@ class ResourceBase:
                 logger.info(f'Waiting for stack(s) [{",".join(dependent_stack_name)}] to be deleted before '
                             f'deleting [{cfn_stack_name}], sleeping [{sleep_time_secs}] seconds.')
                 time.sleep(sleep_time_secs)
-                dependent_stack_name = ResourceBase._get_dependents(cfn_stack_name, ResourceModel.scan(), logger)
+                dependent_stack_name = ResourceBase._get_dependents(cfn_stack_name, all_resources, logger)
 
             # Delete stack.
             cfn_helper.delete_cf_stack(cfn_stack_name)
@@ -0,0 +1,176 @@
+import logging
+import random
+import threading
+import resource_manager.src.constants as constants
+from .util.boto3_client_factory import client
+
+
+class ResourceLeaseNotifier:
+    """
+    In-process notification bus which wakes up threads waiting for resources of given cloud formation template.
+    Every resource status change for template increments template version, waiters remember version before
+    querying DDB table and are woken up as soon as version changes (no notifications are lost in between).
+    Notifications are published by ResourceModel.update_status (same process) and by
+    ResourceStreamListener (DynamoDB Streams, other processes/machines sharing same table).
+    """
+
+    def __init__(self, logger=logging.getLogger()):
+        self.logger = logger
+        self._condition = threading.Condition()
+        self._versions = {}
+        self._listener = None
+
+    def get_version(self, cfn_template_name: str) -> int:
+        """
+        Returns current notification version for given cloud formation template.
+        :param cfn_template_name: The cloud formation template name (DDB table hash key)
+        :return: The notification version
+        """
+        with self._condition:
+            return self._versions.get(cfn_template_name, 0)
+
+    def notify(self, cfn_template_name: str):
+        """
+        Notifies all waiters that resource status for given cloud formation template was changed.
+        :param cfn_template_name: The cloud formation template name (DDB table hash key)
+        """
+        with self._condition:
+            self._versions[cfn_template_name] = self._versions.get(cfn_template_name, 0) + 1
+            self._condition.notify_all()
+
+    def wait(self, cfn_template_name: str, version: int, timeout_secs: float) -> bool:
+        """
+        Waits till notification version for given cloud formation template is changed or timeout is reached.
+        :param cfn_template_name: The cloud formation template name (DDB table hash key)
+        :param version: The version received by get_version before resources were queried
+        :param timeout_secs: The maximum number of seconds to wait
+        :return: True if notification was received, False if timed out
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: self._versions.get(cfn_template_name, 0) != version,
+                                            timeout_secs)
+
+    @staticmethod
+    def get_backoff_secs(attempt: int) -> float:
+        """
+        Returns number of seconds to wait for given attempt using exponential backoff with jitter,
+        result is between half and full capped exponential delay.
+        :param attempt: The number of attempt (starting from 0)
+        :return: The number of seconds to wait
+        """
+        delay = min(constants.lease_wait_max_secs, constants.lease_wait_initial_secs * 2 ** attempt)
+        return random.uniform(delay / 2, delay)
+
+    def start_stream_listener(self, boto3_session, table_name: str):
+        """
+        Starts DynamoDB Streams listener for given table if it is not started yet in current process.
+        If table has no stream enabled waiters fall back to exponential backoff polling.
+        :param boto3_session: The boto3 session
+        :param table_name: The DDB table name
+        """
+        with self._condition:
+            if self._listener and self._listener.is_alive():
+                return
+            try:
+                stream_arn = client('dynamodb', boto3_session).describe_table(TableName=table_name)['Table']\
+                    .get('LatestStreamArn')
+            except Exception as e:
+                self.logger.warning(f'Failed to describe [{table_name}] table, resource lease waiting falls '
+                                    f'back to backoff polling: {e}')
+                return
+            if not stream_arn:
+                self.logger.warning(f'Stream for [{table_name}] table is not enabled, resource lease waiting falls '
+                                    f'back to backoff polling.')
+                return
+            self._listener = ResourceStreamListener(client('dynamodbstreams', boto3_session), stream_arn, self,
+                                                    self.logger)
+            self._listener.start()
+
+    def stop_stream_listener(self):
+        """
+        Stops DynamoDB Streams listener if it is running.
+        """
+        with self._condition:
+            listener = self._listener
+            self._listener = None
+        if listener:
+            listener.stop()
+
+
+class ResourceStreamListener(threading.Thread):
+    """
+    Background thread which tails DynamoDB stream of resources table and publishes
+    resource status changes into ResourceLeaseNotifier.
+    """
+
+    def __init__(self, streams_client, stream_arn: str, notifier: ResourceLeaseNotifier,
+                 logger=logging.getLogger()):
+        super().__init__(name='ResourceStreamListener', daemon=True)
+        self.streams_client = streams_client
+        self.stream_arn = stream_arn
+        self.notifier = notifier
+        self.logger = logger
+        self._stopped = threading.Event()
+
+    def stop(self):
+        """
+        Stops listener, returns once current polling iteration is completed.
+        """
+        self._stopped.set()
+        if self.is_alive() and threading.current_thread() != self:
+            self.join()
+
+    def run(self):
+        shard_iterators = {}
+        failures = 0
+        while not self._stopped.is_set():
+            try:
+                if not shard_iterators:
+                    shard_iterators = self._get_shard_iterators()
+                for shard_id, shard_iterator in list(shard_iterators.items()):
+                    response = self.streams_client.get_records(ShardIterator=shard_iterator)
+                    self._notify(response['Records'])
+                    next_shard_iterator = response.get('NextShardIterator')
+                    if next_shard_iterator:
+                        shard_iterators[shard_id] = next_shard_iterator
+                    else:
+                        # Shard is closed, new shards are picked up on next iteration.
+                        shard_iterators.pop(shard_id)
+                failures = 0
+            except Exception as e:
+                # Iterators may be expired or trimmed, shards are discovered again on next iteration.
+                # Resource lease waiting falls back to backoff polling till stream is read again.
+                shard_iterators = {}
+                failures += 1
+                self.logger.warning(f'Failed to read resource stream [{self.stream_arn}], shards will be '
+                                    f'discovered again: {e}')
+            # Polling is slowed down while stream can not be read
+            self._stopped.wait(min(constants.lease_wait_max_secs,
+                                   constants.lease_stream_poll_time_secs * 2 ** min(failures, 10)))
+
+    def _get_shard_iterators(self) -> {}:
+        """
+        Returns iterators for all open shards of the stream starting from latest record.
+        :return: The map of shard id and shard iterator
+        """
+        shard_iterators = {}
+        shards = self.streams_client.describe_stream(StreamArn=self.stream_arn)['StreamDescription']['Shards']
+        for shard in shards:
+            if 'EndingSequenceNumber' not in shard['SequenceNumberRange']:
+                shard_iterators[shard['ShardId']] = self.streams_client.get_shard_iterator(
+                    StreamArn=self.stream_arn,
+                    ShardId=shard['ShardId'],
+                    ShardIteratorType='LATEST')['ShardIterator']
+        return shard_iterators
+
+    def _notify(self, records: []):
+        """
+        Publishes changed cloud formation template names from given stream records.
+        :param records: The DynamoDB stream records
+        """
+        for cfn_template_name in {r['dynamodb']['Keys']['cf_template_name']['S'] for r in records}:
+            self.notifier.notify(cfn_template_name)
+
+
+# Shared per process notifier, all resource pools in process are using it.
+lease_notifier = ResourceLeaseNotifier()
@@ -1,6 +1,14 @@
 import logging
-from pynamodb.indexes import AllProjection
+import threading
+import time
+import resource_manager.src.constants as constants
+from concurrent.futures import ThreadPoolExecutor
+from pynamodb.connection import Connection
+from pynamodb.constants import STREAM_NEW_IMAGE, PAY_PER_REQUEST_BILLING_MODE, ALL_NEW
+from pynamodb.exceptions import QueryError, UpdateError, TransactWriteError
+from pynamodb.indexes import AllProjection, GlobalSecondaryIndex
 from pynamodb.models import Model
+from pynamodb.transactions import TransactWrite
 from pynamodb.attributes import (
     UnicodeAttribute,
     JSONAttribute,
@@ -9,6 +17,47 @@ from pynamodb.attributes import (
     VersionAttribute)
 from datetime import datetime
 from enum import Enum
+from .resource_lease_notifier import lease_notifier
+
+
+class AvailableIndex(GlobalSecondaryIndex):
+    """
+    Sparse index which contains only AVAILABLE resources ('available_template_name' attribute is
+    set only for AVAILABLE resources), used to find resource to lease without reading whole template partition.
+    """
+
+    class Meta:
+        index_name = 'available-index'
+        projection = AllProjection()
+
+    available_template_name = UnicodeAttribute(hash_key=True)
+    cf_stack_name = UnicodeAttribute(range_key=True)
+
+
+class StatusIndex(GlobalSecondaryIndex):
+    """
+    Index to query resources by status across all templates without full table scan.
+    """
+
+    class Meta:
+        index_name = 'status-index'
+        projection = AllProjection()
+
+    status = UnicodeAttribute(hash_key=True)
+    cf_stack_name = UnicodeAttribute(range_key=True)
+
+
+class SessionIndex(GlobalSecondaryIndex):
+    """
+    Index to query resources by test session id (and status) without full table scan.
+    """
+
+    class Meta:
+        index_name = 'test-session-index'
+        projection = AllProjection()
+
+    test_session_id = UnicodeAttribute(hash_key=True)
+    status = UnicodeAttribute(range_key=True)
 
 
 class ResourceModel(Model):
@@ -24,6 +73,9 @@ class ResourceModel(Model):
         table_name = 'ssm-test-resources'
         # All attributes are projected
         projection = AllProjection()
+        # Stream is used to notify resource pools waiting for resources about status changes
+        stream_view_type = STREAM_NEW_IMAGE
+        billing_mode = PAY_PER_REQUEST_BILLING_MODE
 
     class Status(Enum):
         """
@@ -79,6 +131,23 @@ class ResourceModel(Model):
     leased_times = NumberAttribute(default=0)
     cf_stack_index = NumberAttribute()
     version = VersionAttribute()
+    available_template_name = UnicodeAttribute(null=True)
+    available_index = AvailableIndex()
+    status_index = StatusIndex()
+    session_index = SessionIndex()
+    # Lease attempts statistics for current process, conflicts are attempts lost to other sessions
+    lease_stats = {'attempts': 0, 'leased': 0, 'conflicts': 0}
+    # Resources are leased from parallel threads of resource pool
+    _lease_stats_lock = threading.Lock()
+
+    def save(self, condition=None, **kwargs):
+        """
+        Saves resource record, 'available_template_name' is kept in sync with
+        resource status, so that only AVAILABLE resources are in 'available_index'.
+        """
+        self.available_template_name = self.cf_template_name \
+            if self.status == ResourceModel.Status.AVAILABLE.name else None
+        return super().save(condition=condition, **kwargs)
 
     @staticmethod
     def create_ddb_table():
@@ -87,10 +156,77 @@ class ResourceModel(Model):
         """
         if ResourceModel().exists():
             logging.info("Table for name [%s] already exist.", ResourceModel.Meta.table_name)
+            ResourceModel.create_missing_indexes()
+            ResourceModel.enable_stream()
         else:
             ResourceModel().create_table(billing_mode="PAY_PER_REQUEST", wait=True)
             logging.info("Table for name [%s] created.", ResourceModel.Meta.table_name)
 
+    @staticmethod
+    def create_missing_indexes():
+        """
+        Creates global secondary indexes which were added to model after table was created. DynamoDB allows
+        to create only one index per table update, so we create indexes one by one and wait for each to be ACTIVE.
+        """
+        client = ResourceModel._get_connection().connection.client
+        table_name = ResourceModel.Meta.table_name
+        existing_indexes = [index['IndexName'] for index in client.describe_table(TableName=table_name)['Table']
+                            .get('GlobalSecondaryIndexes', [])]
+        indexes = ResourceModel._get_indexes()
+        for index in indexes['global_secondary_indexes']:
+            if index['index_name'] in existing_indexes:
+                continue
+            logging.info("Creating index [%s] for table [%s].", index['index_name'], table_name)
+            index_attributes = [key['AttributeName'] for key in index['key_schema']]
+            attribute_types = {a['attribute_name']: a['attribute_type'] for a in indexes['attribute_definitions']}
+            client.update_table(
+                TableName=table_name,
+                AttributeDefinitions=[{'AttributeName': name, 'AttributeType': attribute_types[name]}
+                                      for name in index_attributes],
+                GlobalSecondaryIndexUpdates=[{'Create': {'IndexName': index['index_name'],
+                                                         'KeySchema': index['key_schema'],
+                                                         'Projection': index['projection']}}])
+            ResourceModel._wait_index_active(client, index['index_name'])
+
+    @staticmethod
+    def enable_stream():
+        """
+        Enables stream for table which was created before stream was added to model, stream is used to notify
+        resource pools of other processes waiting for resources (see ResourceStreamListener).
+        """
+        client = ResourceModel._get_connection().connection.client
+        table_name = ResourceModel.Meta.table_name
+        table = client.describe_table(TableName=table_name)['Table']
+        if table.get('StreamSpecification', {}).get('StreamEnabled'):
+            return
+        logging.info("Enabling stream for table [%s].", table_name)
+        client.update_table(TableName=table_name,
+                            StreamSpecification={'StreamEnabled': True,
+                                                 'StreamViewType': ResourceModel.Meta.stream_view_type})
+        client.get_waiter('table_exists').wait(TableName=table_name)
+
+    @staticmethod
+    def _wait_index_active(client, index_name: str):
+        """
+        Waits for given global secondary index to be ACTIVE (created and backfilled).
+        :param client: The DynamoDB client
+        :param index_name: The index name
+        """
+        start_time = time.monotonic()
+        while time.monotonic() - start_time < constants.ddb_index_wait_time_out_secs:
+            table = client.describe_table(TableName=ResourceModel.Meta.table_name)['Table']
+            statuses = [i['IndexStatus'] for i in table.get('GlobalSecondaryIndexes', [])
+                        if i['IndexName'] == index_name]
+            if statuses and statuses[0] == 'ACTIVE':
+                return
+            logging.info("Waiting for index [%s] to be ACTIVE, sleeping [%d] seconds.",
+                         index_name, constants.sleep_time_secs)
+            time.sleep(constants.sleep_time_secs)
+        err_message = f'Waiting for index [{index_name}] to be ACTIVE timed out ' \
+                      f'after [{constants.ddb_index_wait_time_out_secs}] seconds.'
+        logging.error(err_message)
+        raise Exception(err_message)
+
     @staticmethod
     def get_resources_by_status(status) -> []:
         """
@@ -98,22 +234,161 @@ class ResourceModel(Model):
         :param status: The status of resource record
         :return: List of resource records
         """
+        return list(ResourceModel.status_index.query(status.name))
+
+    @staticmethod
+    def get_resources_by_statuses(statuses: []) -> []:
+        """
+        Returns resource records in any of given statuses, one 'status_index' query per status.
+        :param statuses: The list of resource statuses
+        :return: List of resource records
+        """
         resources = []
-        for resource in ResourceModel.scan():
-            if resource.status == status.name:
-                resources.append(resource)
+        for status in statuses:
+            resources.extend(ResourceModel.get_resources_by_status(status))
         return resources
 
+    @staticmethod
+    def get_resources_by_session(test_session_id: str, statuses: [] = None) -> []:
+        """
+        Returns resource records leased/created by given test session.
+        :param test_session_id: The test session id
+        :param statuses: The list of resource statuses to filter by, all statuses if not given
+        :return: List of resource records
+        """
+        filter_condition = ResourceModel.status.is_in(*[status.name for status in statuses]) if statuses else None
+        return list(ResourceModel.session_index.query(test_session_id, filter_condition=filter_condition))
+
+    @staticmethod
+    def scan_parallel(filter_condition=None, total_segments: int = constants.ddb_scan_total_segments) -> []:
+        """
+        Returns all resource records with parallel scan, every segment of table is scanned in separate thread.
+        Should be used only when all resources are needed, otherwise query indexes.
+        :param filter_condition: The scan filter condition
+        :param total_segments: The number of segments table is divided into
+        :return: List of resource records
+        """
+        def scan_segment(segment: int) -> []:
+            return list(ResourceModel.scan(filter_condition, segment=segment, total_segments=total_segments))
+
+        with ThreadPoolExecutor(max_workers=total_segments) as executor:
+            segments = list(executor.map(scan_segment, range(total_segments)))
+        return [resource for segment in segments for resource in segment]
+
     @staticmethod
     def update_status(resource, status: Status):
         """
-        Updates resource record to given status.
+        Updates resource record to given status and notifies
+        resource pools waiting for resources of the same template.
         :param resource: The resource record to be updated
         :param status: The resource status
         """
         resource.updated_on = datetime.utcnow()
         resource.status = status.name
         resource.save()
+        lease_notifier.notify(resource.cf_template_name)
+
+    @staticmethod
+    def try_lease(cfn_template_path: str, resource_type: Type, test_session_id: str, cf_template_sha1: str,
+                  cf_input_parameters_sha1: str, cfn_dependency_stacks: [] = None):
+        """
+        Leases AVAILABLE resource for given template and type with single conditional UpdateItem
+        (status AVAILABLE -> LEASED). Candidates are taken from sparse 'available_index', resources
+        deployed with different template or input parameters are skipped, since they need to be updated.
+        :param cfn_template_path: The cloud formation template path (DDB table hash key)
+        :param resource_type: The resource type
+        :param test_session_id: The test session id which leases resource
+        :param cf_template_sha1: The cloud formation template content SHA1
+        :param cf_input_parameters_sha1: The cloud formation input parameters SHA1
+        :param cfn_dependency_stacks: The cloud formation stacks leased resource depends on
+        :return: The leased resource or None if there is no AVAILABLE resource to lease
+        """
+        try:
+            candidates = list(ResourceModel.available_index.query(
+                cfn_template_path, filter_condition=ResourceModel.type == resource_type.name))
+        except QueryError as e:
+            logging.warning("Failed to query [%s] index, falling back to template query: %s",
+                            AvailableIndex.Meta.index_name, e)
+            return None
+        for candidate in candidates:
+            if candidate.cf_template_sha1 != cf_template_sha1 \
+                    or candidate.cf_input_parameters_sha1 != cf_input_parameters_sha1:
+                continue
+            now = datetime.utcnow()
+            actions = [ResourceModel.status.set(ResourceModel.Status.LEASED.name),
+                       ResourceModel.available_template_name.remove(),
+                       ResourceModel.test_session_id.set(test_session_id),
+                       ResourceModel.leased_on.set(now),
+                       ResourceModel.updated_on.set(now),
+                       ResourceModel.leased_times.add(1),
+                       ResourceModel.version.add(1)]
+            if cfn_dependency_stacks is not None:
+                actions.append(ResourceModel.cfn_dependency_stacks.set(cfn_dependency_stacks))
+            ResourceModel._count_lease('attempts')
+            try:
+                data = ResourceModel._get_connection().update_item(
+                    candidate.cf_template_name,
+                    range_key=candidate.cf_stack_name,
+                    actions=actions,
+                    condition=ResourceModel.status == ResourceModel.Status.AVAILABLE.name,
+                    return_values=ALL_NEW)
+            except UpdateError as e:
+                if e.cause_response_code == 'ConditionalCheckFailedException':
+                    # Resource was leased by other session in between
+                    ResourceModel._count_lease('conflicts')
+                    continue
+                raise e
+            ResourceModel._count_lease('leased')
+            return ResourceModel.from_raw_data(data['Attributes'])
+        return None
+
+    @staticmethod
+    def _count_lease(name: str):
+        with ResourceModel._lease_stats_lock:
+            ResourceModel.lease_stats[name] += 1
+
+    @staticmethod
+    def get_lease_stats() -> dict:
+        """
+        Returns copy of lease attempts statistics for current process.
+        """
+        with ResourceModel._lease_stats_lock:
+            return dict(ResourceModel.lease_stats)
+
+    @staticmethod
+    def release_many(resources: [], status: Status = Status.AVAILABLE):
+        """
+        Updates given resource records to given status with TransactWriteItems (up to 25 records per request)
+        and notifies resource pools waiting for resources of the same templates.
+        :param resources: The resource records to be updated
+        :param status: The resource status
+        """
+        for i in range(0, len(resources), constants.ddb_transaction_max_items):
+            chunk = resources[i:i + constants.ddb_transaction_max_items]
+            now = datetime.utcnow()
+            try:
+                with TransactWrite(connection=Connection(region=ResourceModel.Meta.region)) as transaction:
+                    for resource in chunk:
+                        actions = [ResourceModel.status.set(status.name), ResourceModel.updated_on.set(now)]
+                        if status == ResourceModel.Status.AVAILABLE:
+                            actions.append(ResourceModel.available_template_name.set(resource.cf_template_name))
+                        else:
+                            actions.append(ResourceModel.available_template_name.remove())
+                        if resource.last_execution:
+                            actions.append(ResourceModel.last_execution.set(resource.last_execution))
+                        transaction.update(resource, actions=actions)
+            except TransactWriteError as e:
+                logging.warning("Failed to update [%d] resources in single transaction, updating one by one: %s",
+                                len(chunk), e)
+                for resource in chunk:
+                    ResourceModel.update_status(resource, status)
+                continue
+            for resource in chunk:
+                resource.status = status.name
+                resource.updated_on = now
+                resource.available_template_name = resource.cf_template_name \
+                    if status == ResourceModel.Status.AVAILABLE else None
+                lease_notifier.notify(resource.cf_template_name)
 
     @staticmethod
     def query_by_template(cfn_template_path: str) -> []:
@@ -1,8 +1,9 @@
 import os
 import logging
-import time
 import copy
 import re
+import threading
+import time
 import resource_manager.src.config as config
 import resource_manager.src.constants as constants
 import resource_manager.src.util.yaml_util as yaml_util
@@ -10,9 +11,10 @@ import resource_manager.src.util.param_utils as param_utils
 from .cloud_formation import CloudFormationTemplate
 from .s3 import S3
 from .resource_model import ResourceModel
+from .resource_lease_notifier import lease_notifier
 from .resource_base import ResourceBase
 from pynamodb.exceptions import PutError
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime
 from sttable import parse_str_table
 from _pytest.reports import TestReport
@@ -30,6 +32,12 @@ class ResourcePool(ResourceBase):
     CFN_RESOURCE_TYPE_PARAM = 'ResourceType'
     CFN_RESOURCE_PARAM = 'CfnResource'
     CFN_DEPENDENCY_STACKS_PARAM = 'CfnDependencyStackNames'
+    CFN_DEPENDENCY_TEMPLATES_PARAM = 'CfnDependencyTemplatePaths'
+    # Process wide cache of S3 cfn templates: (bucket name, key) -> (ETag, parsed content)
+    s3_cfn_cache = {}
+    # Process wide cache of assume role merge checks: (S3 template ETag, role template SHA1) -> is merged
+    assume_role_merged_cache = {}
+    cache_lock = threading.Lock()
 
     def __init__(self, cfn_helper: CloudFormationTemplate, s3_helper: S3, custom_pool_size: dict, test_session_id: str,
                  ssm_test_cache: {}, logger=logging.getLogger()):
@@ -50,6 +58,15 @@ class ResourcePool(ResourceBase):
         ResourceModel.configure(boto3_session)
         ResourceModel.create_ddb_table()
 
+    @staticmethod
+    def start_lease_listener(boto3_session):
+        """
+        Starts listening resource table changes, so that resources released by other
+        processes/machines are handed to waiting tests without polling delay.
+        :param boto3_session The AWS boto3 session
+        """
+        lease_notifier.start_stream_listener(boto3_session, ResourceModel.Meta.table_name)
+
     def add_cfn_templates(self, cfn_templates: str):
         """
         Adds cloud formation templates into dict into resource manager instance with input parameters.
@@ -84,6 +101,7 @@ class ResourcePool(ResourceBase):
 
             # Validate parameters
             cfn_in_params = self._parse_cfn_inputs(cfn_template)
+            cfn_dep_temp_paths = []
             for param, value in cfn_in_params.items():
                 if re.compile(r'{{2}(cfn-output:).+}{2}').match(value):
                     dep_cfn_template_name, dep_cfn_output_param = param_utils.parse_cfn_output_val_ref(value)
@@ -93,6 +111,8 @@ class ResourcePool(ResourceBase):
                                       f'was not configured in test.'
                         self.logger.error(err_message)
                         raise Exception(err_message)
+                    if dep_cfn_temp_path not in cfn_dep_temp_paths:
+                        cfn_dep_temp_paths.append(dep_cfn_temp_path)
                     dep_cfn_template = self.cfn_templates[dep_cfn_temp_path]
                     dep_res_type = dep_cfn_template[ResourcePool.CFN_RESOURCE_TYPE_PARAM]
                     if res_type != ResourceModel.Type.DEDICATED and dep_res_type == ResourceModel.Type.DEDICATED:
@@ -108,12 +128,19 @@ class ResourcePool(ResourceBase):
                                       f'ASSUME_ROLE should be used only for SSM document execution.'
                         raise Exception(err_message)
 
+            # All assume roles are merged into single cfn stack, so we pull them one by one.
+            if res_type == ResourceModel.Type.ASSUME_ROLE:
+                prev_assume_role_temp_path = self._get_last_cfn_temp_path_by_type(ResourceModel.Type.ASSUME_ROLE)
+                if prev_assume_role_temp_path:
+                    cfn_dep_temp_paths.append(prev_assume_role_temp_path)
+
             self.cfn_templates[cfn_temp_path] = {ResourcePool.CFN_TEMPLATE_NAME_PARAM: cfn_temp_name,
                                                  ResourcePool.CFN_INPUT_PARAMS_PARAM: cfn_in_params,
                                                  ResourcePool.CFN_RESOURCE_TYPE_PARAM: res_type,
                                                  ResourcePool.CFN_RESOURCE_PARAM: None,
                                                  ResourcePool.CFN_OUTPUT_PARAMS_PARAM: {},
-                                                 ResourcePool.CFN_DEPENDENCY_STACKS_PARAM: []}
+                                                 ResourcePool.CFN_DEPENDENCY_STACKS_PARAM: [],
+                                                 ResourcePool.CFN_DEPENDENCY_TEMPLATES_PARAM: cfn_dep_temp_paths}
 
     def get_cfn_output_params(self):
         """
@@ -138,18 +165,48 @@ class ResourcePool(ResourceBase):
     def pull_resources(self) -> []:
         """
         Pulls available resources for all cloud formation templates used by test.
+        Templates are pulled in parallel using ThreadPoolExecutor, template is pulled as soon as all templates
+        it depends on (see 'CfnDependencyTemplatePaths') are pulled, so that pulling time is equal to the longest
+        dependency chain rather than to the sum of all stack operations.
         :return: The available resources.
         """
-        for cfn_template in self.cfn_templates.items():
-            cfn_config = cfn_template[1]
+        pending_templates = {}
+        for cfn_template_path, cfn_config in self.cfn_templates.items():
             if not cfn_config.get(ResourcePool.CFN_RESOURCE_PARAM):
-                cfn_config[ResourcePool.CFN_RESOURCE_PARAM] = self.pull_resource_by_template(cfn_template)
+                pending_templates[cfn_template_path] = set(cfn_config[ResourcePool.CFN_DEPENDENCY_TEMPLATES_PARAM])
+        for dependencies in pending_templates.values():
+            dependencies.intersection_update(pending_templates.keys())
+
+        errors = []
+        with ThreadPoolExecutor(max_workers=constants.resource_pull_max_workers) as t_executor:
+            running_templates = {}
+            while running_templates or (pending_templates and not errors):
+                # In case of failure we don't start new templates, but wait for running ones,
+                # so that pulled resources are tracked and released after test.
+                if not errors:
+                    for cfn_template_path in [p for p, deps in pending_templates.items() if not deps]:
+                        pending_templates.pop(cfn_template_path)
+                        cfn_template = (cfn_template_path, self.cfn_templates[cfn_template_path])
+                        future = t_executor.submit(self.pull_resource_by_template, cfn_template)
+                        running_templates[future] = cfn_template_path
+                done, _ = wait(running_templates, return_when=FIRST_COMPLETED)
+                for future in done:
+                    cfn_template_path = running_templates.pop(future)
+                    try:
+                        self.cfn_templates[cfn_template_path][ResourcePool.CFN_RESOURCE_PARAM] = future.result()
+                    except Exception as e:
+                        errors.append(e)
+                    for dependencies in pending_templates.values():
+                        dependencies.discard(cfn_template_path)
+        if errors:
+            raise errors[0]
         return self.cfn_templates
 
     def pull_resource_by_template(self, cfn_template: ()):
         """
         Pulls 'AVAILABLE' resources from Dynamo DB table by cloud formation template name,
-        if resource is not available it waits.
+        if resource is not available it waits for resource status change notification
+        (see ResourceLeaseNotifier) or exponential backoff with jitter, whichever comes first.
         :param cfn_template: The cloud formation template object containing cloud formation configuration.
         :return: The available resources
         """
@@ -162,9 +219,26 @@ class ResourcePool(ResourceBase):
         time_out_sec = constants.wait_time_out_secs
         self.logger.info('Pulling resources for [{}] template'.format(cfn_template_path))
 
-        waited_time_sec = 0
-        while waited_time_sec < time_out_sec:
-            cfn_template_path_by_type = self._get_cfn_template_path_by_type(cfn_template_path, resource_type)
+        start_time = time.monotonic()
+        wait_attempt = 0
+        cfn_template_path_by_type = self._get_cfn_template_path_by_type(cfn_template_path, resource_type)
+        is_leasable = resource_type == ResourceModel.Type.ON_DEMAND or resource_type == ResourceModel.Type.DEDICATED
+        if is_leasable:
+            cfn_template_sha1 = yaml_util.get_yaml_file_sha1_hash(cfn_template_path)
+            cfn_params_sha1 = yaml_util.get_yaml_content_sha1_hash(cfn_in_params)
+        while time.monotonic() - start_time < time_out_sec:
+            # Version is taken before query, so that status change happened after query wakes us up.
+            notification_version = lease_notifier.get_version(cfn_template_path_by_type)
+            # Up to date AVAILABLE resource is leased with single conditional update, otherwise
+            # we go through all template resources to create/update/wait for them.
+            if is_leasable:
+                resource = ResourceModel.try_lease(cfn_template_path_by_type, resource_type, self.test_session_id,
+                                                   cfn_template_sha1, cfn_params_sha1,
+                                                   self._get_cfn_dependency_stacks(cfn_template_path, resource_type))
+                if resource is not None:
+                    self.logger.info(f'Leased [{resource.cf_stack_name}] resource, lease statistics: '
+                                     f'{ResourceModel.get_lease_stats()}')
+                    return resource
             resources = ResourceModel.query_by_template(cfn_template_path_by_type)
 
             if len(resources) >= pool_size and not self._has_executable_resources(resources):
@@ -199,11 +273,12 @@ class ResourcePool(ResourceBase):
                         # In case if resource type is ASSUME_ROLE
                         if resource.type == ResourceModel.Type.ASSUME_ROLE.name:
                             existing_assume_roles = self._get_s3_cfn_content(config.ssm_assume_role_cfn_s3_path)
-                            merged_roles = self._merge_assume_roles(existing_assume_roles, cfn_content)
-                            if not yaml_util.is_equal(merged_roles, existing_assume_roles) or \
-                                    resource.status == ResourceModel.Status.UPDATE_FAILED.name or \
+                            if resource.status == ResourceModel.Status.UPDATE_FAILED.name or \
                                     resource.status == ResourceModel.Status.CREATE_FAILED.name or \
-                                    resource.status == ResourceModel.Status.DELETED.name:
+                                    resource.status == ResourceModel.Status.DELETED.name or \
+                                    not self._is_assume_role_merged(existing_assume_roles, cfn_template_path,
+                                                                    cfn_content):
+                                merged_roles = self._merge_assume_roles(existing_assume_roles, cfn_content)
                                 resource = self._update_resource(i, cfn_template_path, cfn_in_params,
                                                                  merged_roles, resource)
                                 if resource is not None:
@@ -245,10 +320,13 @@ class ResourcePool(ResourceBase):
                     self.logger.error(e)
                     raise e
 
+            wait_time_sec = lease_notifier.get_backoff_secs(wait_attempt)
             self.logger.info(f'Resources for template [{cfn_template_name}:{resource_type.name}] and pool size '
-                             f'[{pool_size}] not available, waiting for [{constants.sleep_time_secs}] seconds.')
-            time.sleep(constants.sleep_time_secs)
-            waited_time_sec = waited_time_sec + constants.sleep_time_secs
+                             f'[{pool_size}] not available, waiting for release up to [{wait_time_sec:.2f}] seconds.')
+            if lease_notifier.wait(cfn_template_path_by_type, notification_version, wait_time_sec):
+                wait_attempt = 0
+            else:
+                wait_attempt = wait_attempt + 1
 
         err_message = f'Resource retrieving operation timed out in [{time_out_sec}] ' \
                       f'seconds for [{cfn_template_path}] template.'
@@ -275,6 +353,8 @@ class ResourcePool(ResourceBase):
         :param release_failed_resources: The flag to release resources for failed tests if True, otherwise false.
         """
         self.logger.info("Releasing test resources.")
+        # Status updates which don't require stack operations are written in single transaction per status.
+        resources_by_status = {ResourceModel.Status.EXECUTE_FAILED: [], ResourceModel.Status.AVAILABLE: []}
         # We do release/delete resources in reverse order, from bottom to top
         # due to possible relations between resources.
         for cfn_config in reversed(list(self.cfn_templates.values())):
@@ -285,7 +365,7 @@ class ResourcePool(ResourceBase):
                     # Sets last test executed using this resource
                     resource.last_execution = test_report.nodeid
                     if test_report.outcome == 'failed' and not release_failed_resources:
-                        ResourceModel.update_status(resource, ResourceModel.Status.EXECUTE_FAILED)
+                        resources_by_status[ResourceModel.Status.EXECUTE_FAILED].append(resource)
                     elif resource.type == ResourceModel.Type.DEDICATED.name:
                         # Deleting resource/stack for DEDICATED type.
                         cfn_stack_name = resource.cf_stack_name
@@ -298,7 +378,10 @@ class ResourcePool(ResourceBase):
                             self.logger.error(f'Failed to delete [{cfn_stack_name}] stack due to: {e}')
                             ResourceModel.update_status(resource, ResourceModel.Status.DELETE_FAILED)
                     elif resource.status == ResourceModel.Status.LEASED.name:
-                        ResourceModel.update_status(resource, ResourceModel.Status.AVAILABLE)
+                        resources_by_status[ResourceModel.Status.AVAILABLE].append(resource)
+        for status, resources in resources_by_status.items():
+            if resources:
+                ResourceModel.release_many(resources, status)
 
     def fix_stalled_resources(self):
         """
@@ -306,18 +389,21 @@ class ResourcePool(ResourceBase):
         failed we want to release resources for next test iteration.
         """
         self.logger.info("Releasing all stalled resources.")
-        for resource in ResourceModel().scan():
-            if not self.test_session_id or resource.test_session_id == self.test_session_id:
-                # If resource was not released because of failure or cancellation
-                if resource.status == ResourceModel.Status.LEASED.name:
-                    ResourceModel.update_status(resource, ResourceModel.Status.AVAILABLE)
-                # If resource was not fully created/updated because of failure or cancellation
-                elif resource.status == ResourceModel.Status.CREATING.name or \
-                        resource.status == ResourceModel.Status.DELETING.name or \
-                        resource.status == ResourceModel.Status.UPDATING.name:
-                    self.logger.info(f'Deleting resource for stack name [{resource.cf_stack_name}] '
-                                     f'in status [{resource.status}].')
-                    resource.delete()
+        stalled_statuses = [ResourceModel.Status.LEASED, ResourceModel.Status.CREATING,
+                            ResourceModel.Status.DELETING, ResourceModel.Status.UPDATING]
+        if self.test_session_id:
+            resources = ResourceModel.get_resources_by_session(self.test_session_id, stalled_statuses)
+        else:
+            resources = ResourceModel.get_resources_by_statuses(stalled_statuses)
+        for resource in resources:
+            # If resource was not released because of failure or cancellation
+            if resource.status == ResourceModel.Status.LEASED.name:
+                ResourceModel.update_status(resource, ResourceModel.Status.AVAILABLE)
+            # If resource was not fully created/updated because of failure or cancellation
+            else:
+                self.logger.info(f'Deleting resource for stack name [{resource.cf_stack_name}] '
+                                 f'in status [{resource.status}].')
+                resource.delete()
 
     def destroy_all_resources(self):
         """
@@ -327,9 +413,7 @@ class ResourcePool(ResourceBase):
         parallel using ThreadPoolExecutor.
         """
         # Deleting stacks
-        resources = []
-        for resource in ResourceModel.scan():
-            resources.append(resource)
+        resources = ResourceModel.scan_parallel()
         resource_count = len(resources)
         self.logger.info("Deleting [%d] cloud formation stacks.", resource_count)
         with ThreadPoolExecutor(max_workers=10) as t_executor:
@@ -338,9 +422,9 @@ class ResourcePool(ResourceBase):
                 t_executor.submit(ResourcePool._delete_resource, resource_to_delete,
                                   self.cfn_helper, self.logger, resources)
 
-        # Deleting DDB table
+        # Deleting DDB table, resource statuses are updated in place by deletion threads
         failed_resources = []
-        for resource in ResourceModel.scan():
+        for resource in resources:
             if resource.status == ResourceModel.Status.DELETE_FAILED.name:
                 self.logger.error(f'Deleting [{resource.cf_stack_name}] stack failed.')
                 failed_resources.append(resource)
@@ -553,18 +637,55 @@ class ResourcePool(ResourceBase):
 
     def _get_s3_cfn_content(self, cfn_template_path: str):
         """
-        Returns file content from S3.
+        Returns file content from S3. Parsed content is cached per process and validated
+        by S3 object ETag, so it is downloaded and parsed again only when changed.
         :param cfn_template_path The cloud formation template file path in S3
         :return The cloud formation file content from S3
         """
         bucket_name = self.s3_helper.get_bucket_name()
-        existing_assume_roles_content = self.s3_helper.get_file_content(bucket_name, cfn_template_path)
-        if existing_assume_roles_content is None:
-            return yaml_util.loads_yaml('{"AWSTemplateFormatVersion": "2010-09-09",'
-                                        '"Description": "Assume Roles for SSM automation execution.",'
-                                        '"Outputs": {},'
-                                        '"Resources": {}}')
-        return yaml_util.loads_yaml(existing_assume_roles_content)
+        etag = self.s3_helper.get_file_etag(bucket_name, cfn_template_path)
+        if etag is not None:
+            with ResourcePool.cache_lock:
+                cached = ResourcePool.s3_cfn_cache.get((bucket_name, cfn_template_path))
+            if cached and cached[0] == etag:
+                return cached[1]
+            existing_assume_roles_content = self.s3_helper.get_file_content(bucket_name, cfn_template_path)
+            if existing_assume_roles_content is not None:
+                content = yaml_util.loads_yaml(existing_assume_roles_content)
+                with ResourcePool.cache_lock:
+                    ResourcePool.s3_cfn_cache[(bucket_name, cfn_template_path)] = (etag, content)
+                return content
+        return yaml_util.loads_yaml('{"AWSTemplateFormatVersion": "2010-09-09",'
+                                    '"Description": "Assume Roles for SSM automation execution.",'
+                                    '"Outputs": {},'
+                                    '"Resources": {}}')
+
+    def _is_assume_role_merged(self, existing_assume_roles, cfn_template_path: str, cfn_content) -> bool:
+        """
+        Returns True if given assume role template content is already merged into existing
+        assume roles content. Result is cached per process by S3 template ETag and role template SHA1.
+        :param existing_assume_roles The existing assume roles content from S3
+        :param cfn_template_path The assume role cloud formation template path
+        :param cfn_content The assume role cloud formation template content
+        :return True if merged, False otherwise
+        """
+        bucket_name = self.s3_helper.get_bucket_name()
+        with ResourcePool.cache_lock:
+            cached = ResourcePool.s3_cfn_cache.get((bucket_name, config.ssm_assume_role_cfn_s3_path))
+        # Result is cached only for content which is cached itself (identified by ETag)
+        key = (cached[0], yaml_util.get_yaml_file_sha1_hash(cfn_template_path)) \
+            if cached and cached[1] is existing_assume_roles else None
+        if key:
+            with ResourcePool.cache_lock:
+                is_merged = ResourcePool.assume_role_merged_cache.get(key)
+            if is_merged is not None:
+                return is_merged
+        merged_roles = self._merge_assume_roles(existing_assume_roles, cfn_content)
+        is_merged = yaml_util.is_equal(merged_roles, existing_assume_roles)
+        if key:
+            with ResourcePool.cache_lock:
+                ResourcePool.assume_role_merged_cache[key] = is_merged
+        return is_merged
 
     def _merge_assume_roles(self, base_assume_role_cfn_json, add_assume_role_cfn_json):
         """
@@ -642,6 +763,18 @@ class ResourcePool(ResourceBase):
                 return cfn_path
         return None
 
+    def _get_last_cfn_temp_path_by_type(self, resource_type: ResourceModel.Type) -> str:
+        """
+        Returns path of the last added cfn template with given resource type.
+        :param resource_type: The cfn resource type (ON_DEMAND | DEDICATED | ASSUME_ROLE | SHARED )
+        :return: The cfn template path or None if template with given type was not added.
+        """
+        cfn_temp_path = None
+        for cfn_path, cfn_config in self.cfn_templates.items():
+            if cfn_config.get(ResourcePool.CFN_RESOURCE_TYPE_PARAM) == resource_type:
+                cfn_temp_path = cfn_path
+        return cfn_temp_path
+
     def _get_cfn_dependency_stacks(self, cfn_template_path: str, resource_type: ResourceModel.Type) -> []:
         """
         Returns list of cfn dependent stacks.
@@ -185,6 +185,22 @@ class S3:
                 return True
         return False
 
+    def get_file_etag(self, bucket_name, file_name):
+        """
+        Returns S3 file ETag by given bucket and file name, used to validate cached file content.
+        :param bucket_name The S3 bucket name
+        :param file_name The S3 file name
+        :return: The ETag or None if file does not exist
+        """
+        try:
+            return self.client.head_object(Bucket=bucket_name, Key=file_name,
+                                           ExpectedBucketOwner=self.aws_account_id)['ETag']
+        except ClientError as e:
+            if e.response['Error']['Code'] == "404" or e.response['Error']['Code'] == 'NoSuchKey':
+                return None
+            else:
+                raise e
+
     def get_file_content(self, bucket_name, file_name):
         """
         Returns S3 file content by given bucket and file name.
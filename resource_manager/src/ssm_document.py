@@ -1,5 +1,4 @@
 import logging
-import time
 from typing import List
 
 from botocore.exceptions import ClientError
@@ -7,8 +6,14 @@ from sttable import parse_str_table
 
 import resource_manager.src.constants as constants
 import resource_manager.src.util.param_utils as param_utils
+from .ssm_execution_monitor import get_execution_monitor
 from .util.boto3_client_factory import client
 
+# SSM execution statuses of not yet completed execution
+EXECUTION_WAIT_STATUSES = ['InProgress', 'Pending', 'Cancelling', 'Waiting']
+# SSM execution step statuses of not yet resolved step
+STEP_WAIT_STATUSES = ['InProgress', 'Pending', 'Cancelling']
+
 
 class SsmDocument:
     """
@@ -19,6 +24,7 @@ class SsmDocument:
         self.ssm_client = client('ssm', boto3_session)
         self.region = boto3_session.region_name
         self.logger = logger
+        self.execution_monitor = get_execution_monitor(self.ssm_client, logger)
 
     def execute(self, document_name, input_params):
         """
@@ -50,14 +56,11 @@ class SsmDocument:
         :param document_name: The SSM document name
         :return: The SSM document execution status.
         """
-        # Fetch ssm execution status
-        status = self._get_execution_status(execution_id, document_name)
-
-        # Wait for execution to be completed
-        while status == 'InProgress' or status == 'Pending' or status == 'Cancelling' or status == 'Waiting':
-            time.sleep(constants.sleep_time_secs)
-            status = self._get_execution_status(execution_id, document_name)
-        return status
+        self.logger.info(f'Waiting SSM document [{document_name or ""}] execution to be completed: '
+                         f'{self.get_execution_url(execution_id)}')
+        execution = self.execution_monitor.wait_for(
+            execution_id, lambda e: e['AutomationExecutionStatus'] not in EXECUTION_WAIT_STATUSES)
+        return execution['AutomationExecutionStatus']
 
     def wait_for_execution_step_status_is_terminal_or_waiting(self, execution_id, document_name,
                                                               step_name, time_to_wait):
@@ -70,19 +73,9 @@ class SsmDocument:
         :param time_to_wait: Time in seconds to wait until step status is resolved
         :return: The SSM document execution status.
         """
-        start_time = time.time()
-        step_status = self._get_execution_step_status(execution_id, step_name)
-        elapsed_time = time.time() - start_time
-
-        # Wait for execution step to resolve in waiting or one of terminating statuses
-        while step_status == 'InProgress' or step_status == 'Pending' or step_status == 'Cancelling':
-            if elapsed_time > time_to_wait:
-                self.logger.exception(f'Execution step {step_name} for document {document_name} timed out')
-                return 'WaitTimedOut'
-            time.sleep(constants.sleep_time_secs)
-            step_status = self._get_execution_step_status(execution_id, step_name)
-            elapsed_time = time.time() - start_time
-        return step_status
+        return self._wait_for_execution_step_status(
+            execution_id, document_name, step_name, time_to_wait,
+            lambda step_status: step_status not in STEP_WAIT_STATUSES)
 
     def wait_for_execution_step_status_is_in_progress(self, execution_id, document_name, step_name, time_to_wait):
         """
@@ -93,19 +86,28 @@ class SsmDocument:
         :param time_to_wait: Time in seconds to wait until step status is resolved
         :return: The SSM document execution status.
         """
-        start_time = time.time()
-        step_status = self._get_execution_step_status(execution_id, step_name)
-        elapsed_time = time.time() - start_time
+        return self._wait_for_execution_step_status(execution_id, document_name, step_name, time_to_wait,
+                                                    lambda step_status: step_status != 'Pending')
 
-        # Wait for execution step to resolve in waiting or one of terminating statuses
-        while step_status == 'Pending':
-            if elapsed_time > time_to_wait:
-                self.logger.exception(f'Execution step {step_name} for document {document_name} timed out')
-                return 'WaitTimedOut'
-            time.sleep(constants.sleep_time_secs)
-            step_status = self._get_execution_step_status(execution_id, step_name)
-            elapsed_time = time.time() - start_time
-        return step_status
+    def _wait_for_execution_step_status(self, execution_id, document_name, step_name, time_to_wait,
+                                        is_step_status_resolved):
+        """
+        Waits till execution step status is resolved by given predicate or timeout is reached.
+        :param execution_id: The SSM document execution id
+        :param document_name: The SSM document name
+        :param step_name: The SSM document execution step name
+        :param time_to_wait: Time in seconds to wait until step status is resolved
+        :param is_step_status_resolved: The predicate accepting step status
+        :return: The SSM document execution step status or 'WaitTimedOut'
+        """
+        execution = self.execution_monitor.wait_for(
+            execution_id,
+            lambda e: is_step_status_resolved(self._get_step_status(e['StepExecutions'], step_name)),
+            time_to_wait, with_steps=True)
+        if execution is None:
+            self.logger.error(f'Execution step {step_name} for document {document_name} timed out')
+            return 'WaitTimedOut'
+        return self._get_step_status(execution['StepExecutions'], step_name)
 
     def parse_input_parameters(self, cf_output, cfn_installed_alarms, cache, input_parameters):
         """
@@ -167,38 +169,14 @@ class SsmDocument:
             self.logger.error("Failed to cancel SSM execution [%s] due to: %s", execution_url, e.response)
             raise e
 
-    def _get_execution_status(self, execution_id, document_name=None):
+    def _get_step_status(self, steps, step_name):
         """
-        Returns SSM document execution status for given execution id.
-        :param execution_id: The SSM document execution id
-        :param document_name: The SSM document name
-        :return: The SSM document execution status
-        """
-        execution = self.ssm_client.get_automation_execution(
-            AutomationExecutionId=execution_id
-        )
-        # TODO(semiond): we can remove document name as parameter, can take it by execution id.
-        document_name = document_name if document_name else execution['AutomationExecution']['DocumentName']
-        step_executions = execution['AutomationExecution']['StepExecutions']
-        step = self._get_step_by_status(step_executions, 'InProgress')
-        if step:
-            step_name = step['StepName']
-            self.logger.info(f'Waiting SSM document step [{document_name}>{step_name}] to be completed: '
-                             f'{self.get_execution_step_url(execution_id, step_name, step_executions)}')
-        return execution['AutomationExecution']['AutomationExecutionStatus']
-
-    def _get_execution_step_status(self, execution_id, step_name):
-        """
-        Returns execution step status for given execution id and step name.
-        :param execution_id: The SSM document execution id
+        Returns execution step status for given step name, 'Pending' if step is not started yet.
+        :param steps: The SSM document execution steps
         :param step_name: The SSM document step name
         :return: The execution step status
         """
-        execution = self.ssm_client.get_automation_execution(
-            AutomationExecutionId=execution_id
-        )
-        step_executions = execution['AutomationExecution']['StepExecutions']
-        step = self._get_step_by_name(step_executions, step_name)
+        step = self._get_step_by_name(steps, step_name)
         if step:
             return step['StepStatus']
         return 'Pending'
@@ -0,0 +1,220 @@
+import logging
+import threading
+import time
+import resource_manager.src.constants as constants
+
+# Maximum number of execution ids in single DescribeAutomationExecutions filter
+DESCRIBE_EXECUTIONS_MAX_IDS = 10
+
+
+class ExecutionMonitor:
+    """
+    Tracks SSM automation executions waited by all threads sharing SSM client with single poller thread.
+    Statuses of tracked executions are polled in batches with DescribeAutomationExecutions, step executions
+    are fetched (GetAutomationExecution) only for executions which have step waiters. Waiters block on
+    condition till their predicate is satisfied by latest execution state, so number of API calls depends
+    on number of poll ticks and tracked executions instead of number of waiters.
+    """
+
+    def __init__(self, ssm_client, logger=logging.getLogger()):
+        self.ssm_client = ssm_client
+        self.logger = logger
+        self._condition = threading.Condition()
+        # execution id -> (poll number, latest execution state (AutomationExecution or AutomationExecutionMetadata))
+        self._executions = {}
+        self._poll_number = 0
+        # execution id -> [number of waiters, number of waiters requiring step executions]
+        self._waiters = {}
+        self._errors = {}
+        self._poller = None
+        self._next_poll_time = 0
+        self.stats = {'describe_automation_executions': 0, 'get_automation_execution': 0}
+
+    def wait_for(self, execution_id: str, predicate, timeout_secs: float = None, with_steps: bool = False):
+        """
+        Waits till given predicate is satisfied by execution state or timeout is reached.
+        :param execution_id: The SSM automation execution id
+        :param predicate: The function accepting execution state (dict in format of GetAutomationExecution
+        'AutomationExecution', 'StepExecutions' are present only if with_steps is True)
+        :param timeout_secs: The maximum number of seconds to wait, waits with no limit if not given
+        :param with_steps: True if predicate requires step executions
+        :return: The execution state satisfying predicate or None if timed out
+        """
+        with self._condition:
+            counts = self._waiters.setdefault(execution_id, [0, 0])
+            counts[0] += 1
+            counts[1] += 1 if with_steps else 0
+            # Only state fetched by poll started after registration is used, so that stale state
+            # (for example step status before resume signal) does not satisfy predicate.
+            registered_poll = self._poll_number
+            self._next_poll_time = time.monotonic()
+            if self._poller is None or not self._poller.is_alive():
+                self._poller = threading.Thread(target=self._run, name='ExecutionMonitor', daemon=True)
+                self._poller.start()
+            self._condition.notify_all()
+            try:
+                satisfied = self._condition.wait_for(
+                    lambda: execution_id in self._errors
+                    or self._is_satisfied(execution_id, predicate, with_steps, registered_poll),
+                    timeout_secs)
+                if execution_id in self._errors:
+                    raise self._errors[execution_id]
+                return self._executions[execution_id][1] if satisfied else None
+            finally:
+                counts[0] -= 1
+                counts[1] -= 1 if with_steps else 0
+                if counts[0] == 0:
+                    self._waiters.pop(execution_id)
+                    self._executions.pop(execution_id, None)
+                    self._errors.pop(execution_id, None)
+
+    def _is_satisfied(self, execution_id: str, predicate, with_steps: bool, registered_poll: int) -> bool:
+        """
+        Returns True if execution state fetched after given poll number satisfies given predicate.
+        """
+        poll_number, execution = self._executions.get(execution_id, (0, None))
+        if poll_number <= registered_poll or (with_steps and 'StepExecutions' not in execution):
+            return False
+        return predicate(execution)
+
+    def _run(self):
+        """
+        Poller thread, unexpected errors are passed to all waiters, so waiting threads do not hang.
+        """
+        try:
+            self._poll_loop()
+        except Exception as e:
+            self.logger.error(f'SSM execution monitor failed: {e}')
+            with self._condition:
+                # Poller is released together with notification of waiters, so next waiter starts new poller
+                if self._poller is threading.current_thread():
+                    self._poller = None
+                for execution_id in self._waiters:
+                    self._errors[execution_id] = e
+                self._condition.notify_all()
+        finally:
+            with self._condition:
+                if self._poller is threading.current_thread():
+                    self._poller = None
+
+    def _poll_loop(self):
+        """
+        Poller thread loop, thread exits once there are no executions to track.
+        """
+        while True:
+            with self._condition:
+                while self._waiters and time.monotonic() < self._next_poll_time:
+                    self._condition.wait(self._next_poll_time - time.monotonic())
+                if not self._waiters:
+                    self._poller = None
+                    return
+                step_execution_ids = [e for e, counts in self._waiters.items() if counts[1] > 0]
+                status_execution_ids = [e for e, counts in self._waiters.items() if counts[1] == 0]
+                self._next_poll_time = time.monotonic() + constants.ssm_monitor_poll_time_secs
+                self._poll_number += 1
+                poll_number = self._poll_number
+            executions, errors = self._poll(status_execution_ids, step_execution_ids)
+            with self._condition:
+                for execution_id, execution in executions.items():
+                    if execution_id in self._waiters:
+                        self._log_progress(self._executions.get(execution_id, (0, None))[1], execution)
+                        self._executions[execution_id] = (poll_number, execution)
+                for execution_id, error in errors.items():
+                    if execution_id in self._waiters:
+                        self._errors[execution_id] = error
+                self._condition.notify_all()
+
+    def _poll(self, status_execution_ids: [], step_execution_ids: []) -> ({}, {}):
+        """
+        Fetches latest state of given executions.
+        :param status_execution_ids: The execution ids which require status only
+        :param step_execution_ids: The execution ids which require step executions
+        :return: The tuple of execution states and errors mapped by execution id
+        """
+        executions = {}
+        errors = {}
+        for i in range(0, len(status_execution_ids), DESCRIBE_EXECUTIONS_MAX_IDS):
+            chunk = status_execution_ids[i:i + DESCRIBE_EXECUTIONS_MAX_IDS]
+            try:
+                executions.update(self._describe_executions(chunk))
+            except Exception as e:
+                self.logger.error(f'Failed to describe SSM executions {chunk}: {e}')
+                errors.update({execution_id: e for execution_id in chunk})
+        for execution_id in step_execution_ids:
+            try:
+                self.stats['get_automation_execution'] += 1
+                executions[execution_id] = self.ssm_client.get_automation_execution(
+                    AutomationExecutionId=execution_id)['AutomationExecution']
+            except Exception as e:
+                self.logger.error(f'Failed to get SSM execution [{execution_id}]: {e}')
+                errors[execution_id] = e
+        return executions, errors
+
+    def _describe_executions(self, execution_ids: []) -> {}:
+        """
+        Returns execution metadata for given execution ids (up to DESCRIBE_EXECUTIONS_MAX_IDS).
+        :param execution_ids: The execution ids
+        :return: The execution metadata mapped by execution id
+        """
+        executions = {}
+        kwargs = {'Filters': [{'Key': 'ExecutionId', 'Values': execution_ids}]}
+        while True:
+            self.stats['describe_automation_executions'] += 1
+            response = self.ssm_client.describe_automation_executions(**kwargs)
+            for execution in response['AutomationExecutionMetadataList']:
+                executions[execution['AutomationExecutionId']] = execution
+            if not response.get('NextToken'):
+                return executions
+            kwargs['NextToken'] = response['NextToken']
+
+    def _log_progress(self, previous: dict, current: dict):
+        """
+        Logs status transitions of execution steps if step executions were fetched, otherwise logs
+        execution step which is in progress once it changes.
+        :param previous: The previous execution state
+        :param current: The current execution state
+        """
+        execution_id = current.get('AutomationExecutionId')
+        document_name = current.get('DocumentName')
+        if 'StepExecutions' in current:
+            previous_statuses = {self._get_step_key(s): s.get('StepStatus')
+                                 for s in (previous or {}).get('StepExecutions', [])}
+            for index, step in enumerate(current['StepExecutions'], start=1):
+                if previous_statuses.get(self._get_step_key(step)) != step.get('StepStatus'):
+                    self.logger.info(f'SSM document step [{document_name}>{step["StepName"]}] is in '
+                                     f'[{step.get("StepStatus")}] status: '
+                                     f'{self._get_execution_url(execution_id)}/step/{index}/'
+                                     f'{step.get("StepExecutionId", "")}')
+            return
+        step_name = current.get('CurrentStepName')
+        if step_name and (previous is None or previous.get('CurrentStepName') != step_name) \
+                and current.get('AutomationExecutionStatus') in ['InProgress', 'Waiting']:
+            self.logger.info(f'Waiting SSM document step [{document_name}>{step_name}] to be completed: '
+                             f'{self._get_execution_url(execution_id)}')
+
+    @staticmethod
+    def _get_step_key(step: dict) -> str:
+        return step.get('StepExecutionId') or step['StepName']
+
+    def _get_execution_url(self, execution_id: str) -> str:
+        return f'https://{self.ssm_client.meta.region_name}.console.aws.amazon.com/systems-manager/automation/' \
+               f'execution/{execution_id}'
+
+
+_monitors = {}
+_lock = threading.Lock()
+
+
+def get_execution_monitor(ssm_client, logger=logging.getLogger()) -> ExecutionMonitor:
+    """
+    Returns execution monitor shared by all threads using given SSM client.
+    :param ssm_client: The SSM client
+    :param logger: The logger
+    :return: The execution monitor
+    """
+    with _lock:
+        entry = _monitors.get(id(ssm_client))
+        if not entry or entry[0] is not ssm_client:
+            entry = (ssm_client, ExecutionMonitor(ssm_client, logger))
+            _monitors[id(ssm_client)] = entry
+        return entry[1]
@@ -0,0 +1,196 @@
+import getopt
+import logging
+import sys
+import threading
+import time
+from datetime import datetime
+from resource_manager.src.resource_model import ResourceModel
+from resource_manager.src.constants import BgColors
+
+logger = logging.getLogger('resource_table_benchmark')
+logging.basicConfig(format='%(asctime)s %(name)s %(levelname)s:%(message)s', level=logging.INFO,
+                    handlers=[logging.StreamHandler(sys.stdout)])
+
+BENCHMARK_TABLE_NAME = 'ssm-test-resources-benchmark'
+STATUSES = [s for s in ResourceModel.Status]
+
+
+def configure_local_table(host: str, region: str):
+    """
+    Points resource model to benchmark table on given DynamoDB endpoint (for example DynamoDB Local).
+    :param host: The DynamoDB endpoint URL
+    :param region: The region name
+    """
+    ResourceModel.Meta.host = host
+    ResourceModel.Meta.region = region
+    ResourceModel.Meta.table_name = BENCHMARK_TABLE_NAME
+    # Drop cached connection, so that new endpoint and table name are used
+    ResourceModel._connection = None
+
+
+class ConsumedCapacityCounter:
+    """
+    Sums capacity units consumed by DynamoDB requests of resource model. PynamoDB requests TOTAL
+    consumed capacity (ReturnConsumedCapacity) for data operations, but does not return it to caller.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._capacity_units = 0.0
+
+    def install(self):
+        """
+        Wraps requests dispatched by resource model connection (shared by parallel scan threads).
+        """
+        connection = ResourceModel._get_connection().connection
+        dispatch = connection.dispatch
+
+        def dispatch_counted(operation_name, operation_kwargs, *args, **kwargs):
+            data = dispatch(operation_name, operation_kwargs, *args, **kwargs)
+            capacity = data.get('ConsumedCapacity') if data else None
+            if capacity:
+                # Batch operations return consumed capacity per table
+                capacities = capacity if isinstance(capacity, list) else [capacity]
+                with self._lock:
+                    self._capacity_units += sum(c.get('CapacityUnits', 0) for c in capacities)
+            return data
+
+        connection.dispatch = dispatch_counted
+
+    def reset(self) -> float:
+        """
+        Returns capacity units consumed since previous reset.
+        """
+        with self._lock:
+            capacity_units = self._capacity_units
+            self._capacity_units = 0.0
+        return capacity_units
+
+
+capacity_counter = ConsumedCapacityCounter()
+
+
+def generate_resources(item_count: int, template_count: int, session_count: int):
+    """
+    Generates synthetic resource records evenly distributed across templates, statuses and test sessions.
+    :param item_count: The number of resource records
+    :param template_count: The number of cloud formation templates
+    :param session_count: The number of test sessions
+    :return: The generator of resource records
+    """
+    now = datetime.utcnow()
+    for i in range(item_count):
+        template_name = f'path/to/BenchmarkTemplate{i % template_count}.yml'
+        yield ResourceModel(cf_template_name=template_name,
+                            cf_stack_name=f'BenchmarkTemplate{i % template_count}-ON-DEMAND-{i}',
+                            type=ResourceModel.Type.ON_DEMAND.name,
+                            status=STATUSES[i % len(STATUSES)].name,
+                            test_session_id=f'session-{i % session_count}',
+                            pool_size=1,
+                            cf_stack_index=i,
+                            leased_on=now,
+                            created_on=now,
+                            updated_on=now,
+                            available_template_name=template_name
+                            if STATUSES[i % len(STATUSES)] == ResourceModel.Status.AVAILABLE else None)
+
+
+def seed_table(item_count: int, template_count: int, session_count: int):
+    """
+    Recreates benchmark table and fills it with synthetic resource records using batch writes.
+    :param item_count: The number of resource records
+    :param template_count: The number of cloud formation templates
+    :param session_count: The number of test sessions
+    """
+    if ResourceModel.exists():
+        ResourceModel.delete_table()
+    ResourceModel.create_table(billing_mode="PAY_PER_REQUEST", wait=True)
+    logger.info(f' Seeding [{item_count}] items into [{BENCHMARK_TABLE_NAME}] table.')
+    with ResourceModel.batch_write() as batch:
+        for resource in generate_resources(item_count, template_count, session_count):
+            batch.save(resource)
+
+
+def measure(name: str, operation) -> dict:
+    """
+    Executes given operation and measures its duration and consumed read capacity.
+    :param name: The operation name
+    :param operation: The operation returning list of resource records
+    :return: The measurement with operation name, number of returned items, duration in seconds
+    and total consumed capacity units
+    """
+    capacity_counter.reset()
+    start = time.time()
+    items = len(operation())
+    return {'name': name, 'items': items, 'duration_secs': time.time() - start,
+            'capacity_units': capacity_counter.reset()}
+
+
+def run_benchmark(total_segments: int) -> []:
+    """
+    Compares full table scans replaced by indexed queries and parallel scan.
+    :param total_segments: The number of parallel scan segments
+    :return: The list of measurements
+    """
+    session_id = 'session-0'
+    stalled_statuses = [ResourceModel.Status.LEASED, ResourceModel.Status.CREATING,
+                        ResourceModel.Status.DELETING, ResourceModel.Status.UPDATING]
+    stalled_names = [s.name for s in stalled_statuses]
+    return [
+        measure('scan (sequential)', lambda: list(ResourceModel.scan())),
+        measure(f'scan_parallel ({total_segments} segments)',
+                lambda: ResourceModel.scan_parallel(total_segments=total_segments)),
+        measure('stalled resources: scan + filter',
+                lambda: [r for r in ResourceModel.scan() if r.status in stalled_names]),
+        measure('stalled resources: status-index query',
+                lambda: ResourceModel.get_resources_by_statuses(stalled_statuses)),
+        measure('session stalled resources: scan + filter',
+                lambda: [r for r in ResourceModel.scan()
+                         if r.test_session_id == session_id and r.status in stalled_names]),
+        measure('session stalled resources: test-session-index query',
+                lambda: ResourceModel.get_resources_by_session(session_id, stalled_statuses))]
+
+
+def main(argv):
+    host = 'http://localhost:8000'
+    region = 'us-east-1'
+    item_count = 100000
+    total_segments = 8
+    seed = True
+    try:
+        opts, args = getopt.getopt(argv, "he:r:n:s:k",
+                                   ["help", "endpoint=", "region=", "items=", "segments=", "skip_seed"])
+    except getopt.GetoptError as err:
+        logger.error(err)
+        sys.exit(2)
+    for o, a in opts:
+        if o in ["-h", "--help"]:
+            print('Example: resource_manager/src/tools/resource_table_benchmark.py -e <endpoint> -n <items>\n'
+                  '-e, --endpoint (optional): DynamoDB endpoint, default is DynamoDB Local (http://localhost:8000).\n'
+                  '-r, --region (optional): Region name, default is us-east-1.\n'
+                  '-n, --items (optional): Number of synthetic resource records, default is 100000.\n'
+                  '-s, --segments (optional): Number of parallel scan segments, default is 8.\n'
+                  '-k, --skip_seed (optional): Reuse already seeded benchmark table.')
+            sys.exit(0)
+        elif o in ["-e", "--endpoint"]:
+            host = a
+        elif o in ["-r", "--region"]:
+            region = a
+        elif o in ["-n", "--items"]:
+            item_count = int(a)
+        elif o in ["-s", "--segments"]:
+            total_segments = int(a)
+        elif o in ["-k", "--skip_seed"]:
+            seed = False
+
+    configure_local_table(host, region)
+    capacity_counter.install()
+    if seed:
+        seed_table(item_count, template_count=50, session_count=20)
+    for result in run_benchmark(total_segments):
+        print(BgColors.OKBLUE + f'* {result["name"]}: {result["items"]} items in {result["duration_secs"]:.3f}s, '
+                                f'{result["capacity_units"]:.1f} capacity units' + BgColors.ENDC)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
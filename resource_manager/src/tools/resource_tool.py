@@ -121,7 +121,8 @@ class ResourceTool(ResourceBase):
 
             s3_bucket_name = self.get_s3_bucket_name(self.account_id, self.region)
             failed_resources = []
-            for resource in ResourceModel.scan():
+            # Resource statuses are updated in place by deletion threads
+            for resource in all_resources:
                 if resource.status == ResourceModel.Status.DELETE_FAILED.name:
                     logger.error(f'Deleting [{resource.cf_stack_name}] stack failed.')
                     failed_resources.append(resource)
@@ -142,10 +143,7 @@ class ResourceTool(ResourceBase):
         Lists all existing resources and created list as an output so that we can iterate it over.
         :return: The list of resources.
         """
-        all_resources = []
-        for resource in ResourceModel.scan():
-            all_resources.append(resource)
-        return all_resources
+        return ResourceModel.scan_parallel()
 
     def _filter_resources_by_status(self, resources: [], statuses: []):
         """
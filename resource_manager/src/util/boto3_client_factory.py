@@ -1,32 +1,113 @@
+import json
+import threading
+import time
+import weakref
 from boto3 import Session
 from botocore.config import Config
 
-config = Config(retries={'max_attempts': 20, 'mode': 'standard'})
-clients = {}
-resources = {}
+# Maximum number of HTTP connections kept in the pool of every client
+max_pool_connections = 50
 
 
-def client(service_name: str, session: Session):
+def _build_config(pool_connections: int) -> Config:
+    """
+    Builds boto3 client config with retries, connection pool size and TCP keep-alive (if supported by botocore).
+    :param pool_connections The maximum number of connections kept in client connection pool
+    """
+    config_params = {'retries': {'max_attempts': 20, 'mode': 'standard'},
+                     'max_pool_connections': pool_connections}
+    if 'tcp_keepalive' in Config.OPTION_DEFAULTS:
+        config_params['tcp_keepalive'] = True
+    return Config(**config_params)
+
+
+config = _build_config(max_pool_connections)
+# Clients and resources are pooled per session, then by (region, service name, config), so that sessions with
+# different credentials never share clients and HTTP connection pools. Sessions are weakly referenced, pooled objects
+# of garbage collected session are evicted with it. Config is keyed by its option values, so equal configs
+# built per call share pooled clients.
+clients = weakref.WeakKeyDictionary()
+resources = weakref.WeakKeyDictionary()
+stats = {'hits': 0, 'misses': 0, 'creation_time_secs': 0.0}
+lock = threading.RLock()
+
+
+def configure(pool_connections: int):
+    """
+    Changes connection pool size of clients and resources created afterwards, already pooled ones are dropped.
+    :param pool_connections The maximum number of connections kept in client connection pool
+    """
+    global config, max_pool_connections, clients, resources
+    with lock:
+        max_pool_connections = pool_connections
+        config = _build_config(pool_connections)
+        clients = weakref.WeakKeyDictionary()
+        resources = weakref.WeakKeyDictionary()
+
+
+def get_stats() -> dict:
+    """
+    Returns client pool statistics: number of pool hits and misses, total and average creation time.
+    """
+    with lock:
+        result = dict(stats)
+    result['average_creation_time_secs'] = result['creation_time_secs'] / result['misses'] \
+        if result['misses'] > 0 else 0.0
+    return result
+
+
+def _get_config_key(client_config: Config) -> str:
+    """
+    Returns pool key of given config built from all its option values (retries, pool size, timeouts, etc.).
+    :param client_config The boto3 client config
+    """
+    return json.dumps({name: getattr(client_config, name, None) for name in Config.OPTION_DEFAULTS},
+                      sort_keys=True, default=repr)
+
+
+def _get_or_create(pool: dict, service_name: str, session: Session, factory_method_name: str,
+                   client_config: Config):
+    """
+    Returns pooled client/resource for given session, region, service name and config or creates new one.
+    Creation is done under lock, since boto3 session is not thread safe.
+    :param pool The pool to look up (clients or resources)
+    :param service_name The service name
+    :param session The boto3 session
+    :param factory_method_name The session method name used to create object ('client' or 'resource')
+    :param client_config The boto3 client config
+    """
+    key = (session.region_name, service_name, _get_config_key(client_config))
+    with lock:
+        session_pool = pool.get(session)
+        if session_pool is None:
+            session_pool = pool[session] = {}
+        created = session_pool.get(key)
+        if created is not None:
+            stats['hits'] += 1
+            return created
+        start = time.time()
+        created = getattr(session, factory_method_name)(service_name, config=client_config)
+        stats['misses'] += 1
+        stats['creation_time_secs'] += time.time() - start
+        session_pool[key] = created
+        return created
+
+
+def client(service_name: str, session: Session, client_config: Config = None):
     """
     Creates boto3 client for given service name and boto3 session.
     :param service_name The service name to create client
     :param session The boto3 session
+    :param client_config The boto3 client config, default config is used if not given
     """
-    client = clients.get(service_name)
-    if not client:
-        client = session.client(service_name, config=config)
-        clients[service_name] = client
-    return client
+    return _get_or_create(clients, service_name, session, 'client', client_config or config)
 
 
-def resource(service_name: str, session: Session):
+def resource(service_name: str, session: Session, client_config: Config = None):
     """
     Creates boto3 resource for given service name and boto3 session.
     :param service_name The service name to create resource
     :param session The boto3 session
+    :param client_config The boto3 client config, default config is used if not given
     """
-    resource = resources.get(service_name)
-    if not resource:
-        resource = session.resource(service_name, config=config)
-        resources[service_name] = resource
-    return resource
+    return _get_or_create(resources, service_name, session, 'resource', client_config or config)
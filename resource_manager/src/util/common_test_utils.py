@@ -1,10 +1,10 @@
 import random
 import uuid
 
-import jsonpath_ng
 from boto3 import Session
 from sttable import parse_str_table
 
+from adk.src.adk.util.json_path import find_json_path_values
 from resource_manager.src.util import param_utils as param_utils
 from .boto3_client_factory import client
 
@@ -212,8 +212,8 @@ def do_cache_by_method_of_service(cache_key, method_name, parameters, service_cl
                 arguments[parameter.replace(input_prefix, "")] = value
     response = getattr(service_client, method_name)(**arguments)
     for cache_property, json_path in json_paths.items():
-        found = jsonpath_ng.parse(json_path).find(response)
+        found = find_json_path_values(json_path, response)
         if found:
             # Always output as an array even len(found)==1 for the easiest processing
-            target_value = [f.value for f in found]
+            target_value = found
             put_to_ssm_test_cache(ssm_test_cache, cache_key, cache_property, target_value)
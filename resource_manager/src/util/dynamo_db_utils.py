@@ -3,15 +3,22 @@ import logging
 import random
 import string
 import time
-from concurrent.futures.thread import ThreadPoolExecutor
 from enum import Enum, unique
 from typing import Any, Callable, List, Tuple
 
 from boto3 import Session
 from boto3.dynamodb.types import BINARY, NUMBER, STRING, Binary
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
+import resource_manager.src.constants as constants
+from .boto3_client_factory import client
+from .load_generator import LoadResult, run_load
+
 log = logging.getLogger()
+# Config of DynamoDB clients used for load generation: no retries, connection per concurrent request
+LOAD_CLIENT_CONFIG = Config(retries={'max_attempts': 1, 'mode': 'standard'},
+                            max_pool_connections=constants.load_generator_max_concurrency)
 
 
 @unique
@@ -20,6 +27,19 @@ class DynamoDbIndexType(Enum):
     LocalSecondaryIndexes = 2
 
 
+@unique
+class DynamoDbLoadMode(Enum):
+    GET_ITEM = 1
+    PUT_ITEM = 2
+    BATCH_GET_ITEM = 3
+    BATCH_WRITE_ITEM = 4
+
+
+# Maximum number of items per request for every load mode
+LOAD_MODE_MAX_BATCH_SIZE = {DynamoDbLoadMode.GET_ITEM: 1, DynamoDbLoadMode.PUT_ITEM: 1,
+                            DynamoDbLoadMode.BATCH_GET_ITEM: 100, DynamoDbLoadMode.BATCH_WRITE_ITEM: 25}
+
+
 def _execute_boto3_dynamodb(boto3_session: Session, delegate: Callable[[Any], dict]) -> dict:
     """
     Executes the given delegate against `dynamodb` client.
@@ -515,6 +535,15 @@ def drop_and_wait_dynamo_db_table_if_exists(table_name: str,
     raise TimeoutError(f'Timeout of waiting `{table_name}` deletion')
 
 
+def _load_client(boto3_session: Session):
+    """
+    Returns pooled DynamoDB client used for load generation. Requests are not retried by client,
+    so that throttled requests are accounted by load generator.
+    :param boto3_session The boto3 session
+    """
+    return client('dynamodb', boto3_session, LOAD_CLIENT_CONFIG)
+
+
 def get_item_single(boto3_session, table_name: str, key: dict):
     """
     Single worker for get_item stress test
@@ -522,8 +551,7 @@ def get_item_single(boto3_session, table_name: str, key: dict):
     :param table_name The table name
     :param key The item key
     """
-    dynamo_db_client = boto3_session.client('dynamodb')
-    dynamo_db_client.get_item(TableName=table_name, Key=key, ConsistentRead=True)
+    _load_client(boto3_session).get_item(TableName=table_name, Key=key, ConsistentRead=True)
 
 
 def put_item_single(boto3_session, table_name: str, item: dict):
@@ -533,11 +561,78 @@ def put_item_single(boto3_session, table_name: str, item: dict):
     :param table_name The table name
     :param item The item key
     """
-    dynamo_db_client = boto3_session.client('dynamodb')
-    dynamo_db_client.put_item(TableName=table_name, Item=item)
+    _load_client(boto3_session).put_item(TableName=table_name, Item=item)
+
+
+def batch_get_item_single(boto3_session, table_name: str, keys: list) -> int:
+    """
+    Single worker for batch_get_item stress test
+    :param boto3_session The boto3 session
+    :param table_name The table name
+    :param keys The distinct item keys (up to 100)
+    :return Number of unprocessed keys
+    """
+    response = _load_client(boto3_session).batch_get_item(
+        RequestItems={table_name: {'Keys': keys, 'ConsistentRead': True}})
+    return len(response.get('UnprocessedKeys', {}).get(table_name, {}).get('Keys', []))
+
+
+def batch_write_item_single(boto3_session, table_name: str, items: list) -> int:
+    """
+    Single worker for batch_write_item stress test
+    :param boto3_session The boto3 session
+    :param table_name The table name
+    :param items The items with distinct keys (up to 25)
+    :return Number of unprocessed items
+    """
+    response = _load_client(boto3_session).batch_write_item(
+        RequestItems={table_name: [{'PutRequest': {'Item': item}} for item in items]})
+    return len(response.get('UnprocessedItems', {}).get(table_name, []))
 
 
-def get_item_async_stress_test(boto3_session: Session, table_name: str, number: int, item: dict):
+def run_load_test(boto3_session: Session, table_name: str, mode: DynamoDbLoadMode, items: list,
+                  total_items: int = None, duration_secs: float = None, target_rps: float = None,
+                  concurrency: int = constants.load_generator_max_concurrency, batch_size: int = None) -> LoadResult:
+    """
+    Generates read or write load on dynamo db table with given rate. Given items (or keys) are used round robin,
+    batch requests use distinct items, so batch size is limited by number of items.
+    :param boto3_session The boto3 session
+    :param table_name The table name
+    :param mode The load mode
+    :param items The items (keys for read modes)
+    :param total_items The number of items to read or write, no limit if not given
+    :param duration_secs The maximum duration of load in seconds, no limit if not given
+    :param target_rps The target number of read or written items per second, not paced if not given
+    :param concurrency The maximum number of concurrent requests
+    :param batch_size The number of items per batch request, maximum allowed by API if not given
+    :return The load result with latency histogram and throttle counts
+    """
+    max_batch_size = LOAD_MODE_MAX_BATCH_SIZE[mode]
+    batch_size = min(batch_size or max_batch_size, max_batch_size, len(items))
+    total_requests = -(-total_items // batch_size) if total_items is not None else None
+
+    def request(sequence_number: int):
+        if batch_size == 1:
+            item = items[sequence_number % len(items)]
+            if mode == DynamoDbLoadMode.GET_ITEM:
+                return get_item_single(boto3_session, table_name, item)
+            return put_item_single(boto3_session, table_name, item)
+        start = sequence_number * batch_size
+        batch = [items[(start + i) % len(items)] for i in range(batch_size)]
+        if mode == DynamoDbLoadMode.BATCH_GET_ITEM:
+            return batch_get_item_single(boto3_session, table_name, batch)
+        return batch_write_item_single(boto3_session, table_name, batch)
+
+    log.info(f'Start DynamoDB {mode.name} load on [{table_name}] table: total items [{total_items}], '
+             f'duration [{duration_secs}] seconds, target [{target_rps}] items per second')
+    result = run_load(request, total_requests=total_requests, duration_secs=duration_secs,
+                      target_rps=target_rps, concurrency=concurrency, tokens_per_request=batch_size)
+    log.info(f'DynamoDB {mode.name} load done: {result.to_dict()}')
+    return result
+
+
+def get_item_async_stress_test(boto3_session: Session, table_name: str, number: int, item: dict,
+                               target_rps: float = None, concurrency: int = constants.load_generator_max_concurrency):
     """
     Stress test for dynamo db reading item that has a schema of { attribute: value }
     Use multiple threads to make lots of simultaneous read requests
@@ -545,18 +640,16 @@ def get_item_async_stress_test(boto3_session: Session, table_name: str, number:
     :param table_name The table name
     :param number Number of times to read item
     :param item The item attribute
+    :param target_rps The target number of requests per second, not paced if not given
+    :param concurrency The maximum number of concurrent requests
+    :return The load result
     """
-    futures = []
-    logging.info(f'Start DynamoDB read items stress test, read {str(number)} times')
-    with ThreadPoolExecutor() as executor:
-        for i in range(number):
-            futures.append(
-                executor.submit(get_item_single, boto3_session, table_name, item)
-            )
-    logging.info('DynamoDB read items stress test done')
+    return run_load_test(boto3_session, table_name, DynamoDbLoadMode.GET_ITEM, [item], total_items=number,
+                         target_rps=target_rps, concurrency=concurrency)
 
 
-def put_item_async_stress_test(boto3_session: Session, table_name: str, items: list):
+def put_item_async_stress_test(boto3_session: Session, table_name: str, items: list,
+                               target_rps: float = None, concurrency: int = constants.load_generator_max_concurrency):
     """
     Stress test for dynamo db reading item that has a schema of { attribute: value }
     Use multiple threads to make lots of simultaneous read requests
@@ -564,16 +657,12 @@ def put_item_async_stress_test(boto3_session: Session, table_name: str, items: l
     :param boto3_session The boto3 session
     :param table_name The table name
     :param items The items
+    :param target_rps The target number of requests per second, not paced if not given
+    :param concurrency The maximum number of concurrent requests
+    :return The load result
     """
-    futures = []
-    items_size = len(items)
-    logging.info(f'Start DynamoDB put items stress test, write {items_size} times')
-    with ThreadPoolExecutor() as executor:
-        for item in items:
-            futures.append(
-                executor.submit(put_item_single, boto3_session, table_name, item)
-            )
-    logging.info('DynamoDB put items stress test done')
+    return run_load_test(boto3_session, table_name, DynamoDbLoadMode.PUT_ITEM, items, total_items=len(items),
+                         target_rps=target_rps, concurrency=concurrency)
 
 
 def _get_random_value(value_type: str, length: int = 5):
@@ -3,7 +3,6 @@ import time
 import random
 from random import choices
 import string
-import json
 
 from datetime import datetime, timedelta
 
@@ -12,6 +11,7 @@ from documents.util.scripts.src.kinesis_analytics_util import (
 
 from boto3 import Session
 from resource_manager.src.util.boto3_client_factory import client
+from resource_manager.src.util.kinesis_producer import KinesisProducer
 from botocore.exceptions import ClientError
 
 log = logging.getLogger()
@@ -31,6 +31,13 @@ STANDARD_SNAPSHOT_NAME_MARK = 'construct_test_snapshot_name'
 # number of records on trial for the input stream to Kinesis Data Analytics Flink application:
 RECORDS_NUMBER_ON_TRIAL = 4
 
+# default number of records per second put to input stream of SQL and Flink applications:
+ML_STREAM_RECORDS_PER_SECOND = 500
+TICKER_STREAM_RECORDS_PER_SECOND = 100
+
+# number of generated 2D points after which hotspot is moved:
+HOTSPOT_POINTS_NUMBER = 1000
+
 
 def _wait_for_status(kinesis_analytics_client, app_name, status,
                      wait_period=RETRY_START_APP_PARAMETER,
@@ -67,17 +74,31 @@ def _get_hotspot(field, spot_size):
     return hotspot
 
 
-def _get_record(field, hotspot, hotspot_weight):
+def _get_point(field, hotspot, hotspot_weight):
     """
     source: https://docs.aws.amazon.com/kinesisanalytics/latest/dev/app-hotspots-prepare.html
     """
     rectangle = hotspot if random.random() < hotspot_weight else field
-    point = {
+    return {
         'x': rectangle['left'] + random.random() * rectangle['width'],
         'y': rectangle['top'] + random.random() * rectangle['height'],
         'is_hot': 'Y' if rectangle == hotspot else 'N'
     }
-    return {'Data': json.dumps(point), 'PartitionKey': 'partition_key'}
+
+
+def _get_ml_point_factory(field=None, hotspot_size=1, hotspot_weight=0.2):
+    """
+    Returns function generating random 2D points, every HOTSPOT_POINTS_NUMBER points hotspot is moved.
+    """
+    field = field or {'left': 0, 'width': 10, 'top': 0, 'height': 10}
+    state = {'points_generated': 0, 'hotspot': None}
+
+    def next_point():
+        if state['points_generated'] % HOTSPOT_POINTS_NUMBER == 0:
+            state['hotspot'] = _get_hotspot(field, hotspot_size)
+        state['points_generated'] += 1
+        return _get_point(field, state['hotspot'], hotspot_weight)
+    return next_point
 
 
 def _get_ticker_data():
@@ -91,54 +112,34 @@ def _get_ticker_data():
 
 
 def generate_ml_stream(input_stream: str, sec_interval: str, session: Session,
-                       interval_among_stream_records=0.1):
+                       records_per_second: float = ML_STREAM_RECORDS_PER_SECOND):
     """
-    Calls AWS API to get function execution time limit
+    Puts random 2D points with hotspots to input stream for given period
     :param input_stream: Input Stream name
     :param sec_interval: period of data generation (seconds)
     :param session The boto3 session
-    :return: None
+    :param records_per_second: target number of records put per second
+    :return: The producer statistics
     this function is for SQL application testing
     """
-    kinesis_client = client('kinesis', session)
-    field = {'left': 0, 'width': 10, 'top': 0, 'height': 10}
-    hotspot_size = 1
-    hotspot_weight = 0.2
-    batch_size = 10
-    points_generated = 0
-    hotspot = None
-    start_stress = datetime.utcnow()
-    end_stress = start_stress + timedelta(seconds=float(sec_interval))
-    while datetime.utcnow() < end_stress:
-        if points_generated % 1000 == 0:
-            hotspot = _get_hotspot(field, hotspot_size)
-        records = [
-            _get_record(field, hotspot, hotspot_weight) for _ in range(batch_size)]
-        points_generated += len(records)
-        kinesis_client.put_records(StreamName=input_stream, Records=records)
-        time.sleep(interval_among_stream_records)
+    producer = KinesisProducer(session, input_stream, _get_ml_point_factory(),
+                               records_per_second=records_per_second)
+    return producer.produce(duration_secs=float(sec_interval))
 
 
 def generate_dummy_ticker_stream(input_stream: str, sec_interval: str, session: Session,
-                                 interval_among_stream_records=1):
+                                 records_per_second: float = TICKER_STREAM_RECORDS_PER_SECOND):
     """
     starts dummy ticket generartion, based on random data
     this function is for Apache Flink application testing
     :param input_stream: Input Stream name
     :param sec_interval: period of data generation (seconds)
     :param session The boto3 session
-    :return: None
+    :param records_per_second: target number of records put per second
+    :return: The producer statistics
     """
-    kinesis_client = client('kinesis', session)
-    start_stress = datetime.utcnow()
-    end_stress = start_stress + timedelta(seconds=float(sec_interval))
-    while datetime.utcnow() < end_stress:
-        data = _get_ticker_data()
-        kinesis_client.put_record(
-            StreamName=input_stream,
-            Data=json.dumps(data),
-            PartitionKey="partitionkey")
-        time.sleep(interval_among_stream_records)
+    producer = KinesisProducer(session, input_stream, _get_ticker_data, records_per_second=records_per_second)
+    return producer.produce(duration_secs=float(sec_interval))
 
 
 def produce_dummy_ticker_stream_records(input_stream: str,
@@ -151,19 +152,19 @@ def produce_dummy_ticker_stream_records(input_stream: str,
     this function is for Apache Flink break VPC test testing
     :param input_stream: Input Stream name
     :param number_records: number of records to generate and put to stream
-    :param interval_among_stream_records - interval among records put to the stream
+    :param interval_among_stream_records - interval among records put to the stream, records are put
+    with single request if not given
     :param session The boto3 session
-    :return: None
-    """
-    kinesis_client = client('kinesis', session)
-    for _ in range(number_records):
-        data = _get_ticker_data()
-        kinesis_client.put_record(
-            StreamName=input_stream,
-            Data=json.dumps(data),
-            PartitionKey="partitionkey")
-        time.sleep(interval_among_stream_records)
-    return
+    :return: The producer statistics
+    """
+    if not interval_among_stream_records:
+        producer = KinesisProducer(session, input_stream, _get_ticker_data)
+    else:
+        # Records are spread over time, one record per request
+        producer = KinesisProducer(session, input_stream, _get_ticker_data,
+                                   records_per_second=1 / interval_among_stream_records,
+                                   linger_secs=interval_among_stream_records)
+    return producer.produce(total_records=number_records)
 
 
 def cache_kinan_app_seperate_flink_sql(application_name: str, app_type: str, session: Session):
@@ -0,0 +1,188 @@
+import json
+import logging
+import random
+import threading
+import time
+import uuid
+from typing import Callable
+
+from boto3 import Session
+from botocore.config import Config
+
+import resource_manager.src.constants as constants
+from .boto3_client_factory import client
+from .load_generator import TokenBucket
+
+# Maximum number of records in single PutRecords request
+PUT_RECORDS_MAX_RECORDS = 500
+# Maximum payload size of single PutRecords request
+PUT_RECORDS_MAX_BYTES = 5 * 1024 * 1024
+# Error code of records rejected due to exceeded shard throughput
+THROUGHPUT_EXCEEDED_ERROR_CODE = 'ProvisionedThroughputExceededException'
+# Config of Kinesis producer clients: throttled requests are retried by producer with backoff
+PRODUCER_CLIENT_CONFIG = Config(retries={'max_attempts': 3, 'mode': 'standard'},
+                                max_pool_connections=constants.load_generator_max_concurrency)
+
+log = logging.getLogger()
+
+
+def random_partition_key(data) -> str:
+    """
+    Returns random partition key, so that records are spread evenly across all stream shards.
+    """
+    return uuid.uuid4().hex
+
+
+class KinesisProducer:
+    """
+    Puts records to Kinesis data stream with PutRecords requests aggregating up to 500 records (and 5 MiB).
+    Records failed in PutRecords response (for example throttled by shard) are retried with exponential
+    backoff, successfully put records are not sent again. Records are produced either synchronously
+    (produce) or by background thread (start/stop) with rate paced by token bucket.
+    """
+
+    def __init__(self, session: Session, stream_name: str, record_factory: Callable[[], dict] = None,
+                 partition_key: Callable[[object], str] = random_partition_key,
+                 records_per_second: float = None, linger_secs: float = 0.2, max_attempts: int = 5):
+        """
+        :param session: The boto3 session
+        :param stream_name: The stream name
+        :param record_factory: The function returning data of the next record to produce (serialized to JSON)
+        :param partition_key: The function returning partition key for record data
+        :param records_per_second: The target number of records per second, not paced if not given
+        :param linger_secs: The time records are aggregated for single request when rate is paced
+        :param max_attempts: The maximum number of attempts to put failed records
+        """
+        self.kinesis_client = client('kinesis', session, PRODUCER_CLIENT_CONFIG)
+        self.stream_name = stream_name
+        self.record_factory = record_factory
+        self.partition_key = partition_key
+        self.records_per_second = records_per_second
+        self.max_attempts = max_attempts
+        self.batch_size = PUT_RECORDS_MAX_RECORDS if not records_per_second \
+            else max(1, min(PUT_RECORDS_MAX_RECORDS, int(records_per_second * linger_secs)))
+        self.stats = {'requests': 0, 'records': 0, 'failed_records': 0, 'retried_records': 0, 'throttled_records': 0}
+        self._stats_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._error = None
+
+    def put_records(self, records: list) -> list:
+        """
+        Puts given records (dicts with 'Data' and 'PartitionKey') with as few PutRecords requests as possible.
+        :param records: The records
+        :return: The records which failed after all attempts
+        """
+        failed = []
+        batch = []
+        batch_bytes = 0
+        for record in records:
+            record_bytes = len(record['Data']) + len(record['PartitionKey'])
+            if len(batch) == PUT_RECORDS_MAX_RECORDS or batch_bytes + record_bytes > PUT_RECORDS_MAX_BYTES:
+                failed.extend(self._put_batch(batch))
+                batch, batch_bytes = [], 0
+            batch.append(record)
+            batch_bytes += record_bytes
+        if batch:
+            failed.extend(self._put_batch(batch))
+        return failed
+
+    def _put_batch(self, batch: list) -> list:
+        """
+        Puts single batch of records, retries only records failed in response.
+        :param batch: The records (up to PUT_RECORDS_MAX_RECORDS)
+        :return: The records which failed after all attempts
+        """
+        pending = batch
+        for attempt in range(self.max_attempts):
+            if attempt > 0:
+                # Full jitter backoff
+                time.sleep(random.uniform(0, min(2.0, 0.1 * 2 ** attempt)))
+            response = self.kinesis_client.put_records(StreamName=self.stream_name, Records=pending)
+            failed = [record for record, result in zip(pending, response['Records']) if result.get('ErrorCode')] \
+                if response.get('FailedRecordCount') else []
+            throttled = [r for r in response['Records'] if r.get('ErrorCode') == THROUGHPUT_EXCEEDED_ERROR_CODE]
+            with self._stats_lock:
+                self.stats['requests'] += 1
+                self.stats['records'] += len(pending) - len(failed)
+                self.stats['throttled_records'] += len(throttled)
+                self.stats['retried_records'] += len(failed) if attempt + 1 < self.max_attempts else 0
+            if not failed:
+                return []
+            pending = failed
+        with self._stats_lock:
+            self.stats['failed_records'] += len(pending)
+        log.warning(f'Failed to put [{len(pending)}] records to [{self.stream_name}] stream '
+                    f'after [{self.max_attempts}] attempts.')
+        return pending
+
+    def _next_batch(self, size: int) -> list:
+        records = []
+        for _ in range(size):
+            data = json.dumps(self.record_factory())
+            records.append({'Data': data, 'PartitionKey': self.partition_key(data)})
+        return records
+
+    def produce(self, duration_secs: float = None, total_records: int = None) -> dict:
+        """
+        Produces records from record factory till duration elapsed, total number of records produced
+        or producer is stopped.
+        :param duration_secs: The maximum duration in seconds, no limit if not given
+        :param total_records: The number of records to produce, no limit if not given
+        :return: The producer statistics
+        """
+        deadline = time.monotonic() + duration_secs if duration_secs is not None else None
+        bucket = TokenBucket(self.records_per_second, burst=self.batch_size) if self.records_per_second else None
+        produced = 0
+        while not self._stop_event.is_set() and (total_records is None or produced < total_records):
+            size = self.batch_size if total_records is None else min(self.batch_size, total_records - produced)
+            if bucket:
+                if bucket.acquire(size, deadline) is None:
+                    break
+            elif deadline is not None and time.monotonic() >= deadline:
+                break
+            self.put_records(self._next_batch(size))
+            produced += size
+        return dict(self.stats)
+
+    def start(self, duration_secs: float = None, total_records: int = None):
+        """
+        Starts producing records in background thread.
+        :param duration_secs: The maximum duration in seconds, no limit if not given
+        :param total_records: The number of records to produce, no limit if not given
+        """
+        if self._thread:
+            raise Exception(f'Producer for [{self.stream_name}] stream is already started.')
+        self._stop_event.clear()
+        self._error = None
+
+        def run():
+            try:
+                self.produce(duration_secs, total_records)
+            except Exception as e:
+                log.error(f'Producer for [{self.stream_name}] stream failed: {e}')
+                self._error = e
+
+        self._thread = threading.Thread(target=run, name=f'KinesisProducer-{self.stream_name}', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> dict:
+        """
+        Stops background producer and waits till in flight requests are completed.
+        :return: The producer statistics
+        """
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        self._stop_event.clear()
+        if self._error:
+            raise self._error
+        log.info(f'Producer for [{self.stream_name}] stream stopped: {self.stats}')
+        return dict(self.stats)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
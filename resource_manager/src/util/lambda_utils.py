@@ -1,15 +1,41 @@
 import logging
-from concurrent.futures.thread import ThreadPoolExecutor
 
 import time
 from boto3 import Session
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
 from resource_manager.src.util.enums.lambda_invocation_type import LambdaInvocationType
 from .boto3_client_factory import client
+from .load_generator import LoadResult, run_load
 from .. import constants
 
 log = logging.getLogger()
+# Config of Lambda clients used for load generation: no retries, so throttled invocations are accounted
+LOAD_CLIENT_CONFIG = Config(retries={'max_attempts': 1, 'mode': 'standard'},
+                            max_pool_connections=constants.load_generator_max_concurrency)
+
+
+class LambdaLoadResult(LoadResult):
+    """
+    Outcome of Lambda load generation: load result extended with number of invocations
+    failed with function error.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.function_errors = 0
+
+    def record_status(self, status_code: int, function_error: str = None):
+        super().record_status(status_code)
+        if function_error:
+            with self._lock:
+                self.function_errors += 1
+
+    def to_dict(self) -> dict:
+        result = super().to_dict()
+        result['function_errors'] = self.function_errors
+        return result
 
 
 def get_lambda_state(lambda_arn, session):
@@ -139,54 +165,79 @@ def trigger_ordinary_lambda(lambda_arn: str, session: Session, invocation_time='
             InvocationType=invocation_time
         )
     except ClientError as ee:
-        raise ee(f"Lambda Function not invoked, StatusCode: {ee.response['ResponseMetadata']['HTTPStatusCode']}")
+        raise Exception(f"Lambda Function not invoked, "
+                        f"StatusCode: {ee.response['ResponseMetadata']['HTTPStatusCode']}") from ee
     return True
 
 
-def trigger_ordinary_lambda_several_times(lambda_arn: str, session: Session, trigger_attempts: int):
-    """
-    invokes lambda for alarm fata population several times:
-    param:trigger_attempts - attempts to trigger lambda, default = 3
+def invoke_lambda_under_load(lambda_arn: str, session: Session, invocation_type: str = 'RequestResponse',
+                             total_invocations: int = None, duration_secs: float = None, target_rps: float = None,
+                             schedule=None, concurrency: int = constants.load_generator_max_concurrency,
+                             client_config: Config = LOAD_CLIENT_CONFIG) -> LambdaLoadResult:
     """
-    lambda_client = client('lambda', session)
-    i = 0
-    while i < trigger_attempts:
+    Invokes lambda with bounded number of concurrent invocations, paced to target rate or started
+    at times given by schedule, and accounts status code, latency and throttling of every invocation.
+    :param lambda_arn: The ARN of Lambda Function
+    :param session: The boto3 session
+    :param invocation_type: The invocation type ('RequestResponse' or 'Event')
+    :param total_invocations: The number of invocations, no limit if not given
+    :param duration_secs: The maximum duration of load in seconds, no limit if not given
+    :param target_rps: The target number of invocations per second, not paced if not given
+    :param schedule: The function returning offset (in seconds from load start) of invocation with given number
+    :param concurrency: The maximum number of concurrent invocations
+    :param client_config: The Lambda client config, client does not retry by default, so throttling is accounted
+    :return: The load result
+    """
+    lambda_client = client('lambda', session, client_config)
+    result = LambdaLoadResult()
+
+    def invoke(sequence_number):
         try:
-            lambda_client.invoke(
-                FunctionName=lambda_arn
-            )
-            i += 1
-        except ClientError as ee:
-            raise ee(f"Lambda Function not invoked, StatusCode:\
-                            {ee.response['ResponseMetadata']['HTTPStatusCode']}")
-    return True
+            response = lambda_client.invoke(FunctionName=lambda_arn, InvocationType=invocation_type)
+        except ClientError as e:
+            result.record_status(e.response['ResponseMetadata']['HTTPStatusCode'])
+            raise
+        result.record_status(response['StatusCode'], response.get('FunctionError'))
+
+    log.info(f'Start invoking [{lambda_arn}] lambda under load')
+    return run_load(invoke, total_requests=total_invocations, duration_secs=duration_secs, target_rps=target_rps,
+                    concurrency=concurrency, schedule=schedule, result=result)
+
+
+def trigger_ordinary_lambda_several_times(lambda_arn: str, session: Session, trigger_attempts: int,
+                                          concurrency: int = 1) -> LambdaLoadResult:
+    """
+    invokes lambda for alarm fata population several times, throttled invokes are retried by client
+    (default retries), so concurrency should not exceed reserved concurrency of the function:
+    param:trigger_attempts - number of lambda invokes
+    param:concurrency - maximum number of concurrent invokes, sequential by default
+    """
+    result = invoke_lambda_under_load(lambda_arn, session, total_invocations=trigger_attempts,
+                                      concurrency=concurrency, client_config=None)
+    if result.successes < trigger_attempts:
+        raise Exception(f'Lambda Function not invoked [{trigger_attempts - result.successes}] times out of '
+                        f'[{trigger_attempts}], status codes: {result.status_codes}, errors: {result.errors}')
+    return result
 
 
-def trigger_lambda_under_stress(lambda_arn: str, boto3_session: Session, overall_stress_time: int,
-                                number_in_each_chunk: int, delay_among_chunks: int):
+def trigger_lambda_under_stress(lambda_arn: str, boto3_session: Session, overall_stress_time: float,
+                                number_in_each_chunk: int, delay_among_chunks: float,
+                                concurrency: int = None) -> LambdaLoadResult:
     """
-    stress lambda - invokes lambda many times, chunk by chunk, waits among chunks
-    and invokes again, till stress time pass:
+    stress lambda - invokes lambda many times, chunk by chunk, chunks are started every
+    delay_among_chunks seconds (against monotonic clock) till stress time pass:
     param:overall_stress_time - overall time (seconds) from stress initiate still completion
     param:number_in_each_chunk - number of lambda invokes in each stress chunk
-    param:delay_among_chunks - delay seconds among chunks
+    param:delay_among_chunks - delay seconds among chunk starts
+    param:concurrency - maximum number of concurrent invokes, number in each chunk if not given
     """
-    futures = []
     logging.info(f'Start Lambda stress invokes, stress time {str(overall_stress_time)} seconds')
-    start_stress = time.time()
-    end_stress = start_stress + overall_stress_time
-    overall_exec = 0
-    with ThreadPoolExecutor() as executor:
-        while time.time() < end_stress:
-            for i in range(number_in_each_chunk):
-                futures.append(
-                    executor.submit(trigger_ordinary_lambda, lambda_arn, boto3_session,
-                                    invocation_time='Event')
-                )
-                overall_exec += 1
-            time.sleep(delay_among_chunks)
-    logging.info('Lambda invoke stress test done')
-    return overall_exec
+    result = invoke_lambda_under_load(lambda_arn, boto3_session, invocation_type='Event',
+                                      duration_secs=overall_stress_time,
+                                      schedule=lambda i: (i // number_in_each_chunk) * delay_among_chunks,
+                                      concurrency=concurrency or number_in_each_chunk)
+    logging.info(f'Lambda invoke stress test done: {result.to_dict()}')
+    return result
 
 
 def get_function_concurrency(lambda_arn: str, session: Session):
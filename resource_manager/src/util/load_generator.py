@@ -0,0 +1,245 @@
+import logging
+import threading
+import time
+from typing import Any, Callable
+
+from botocore.exceptions import ClientError
+
+import resource_manager.src.constants as constants
+
+# Error codes of requests rejected due to throttling
+THROTTLING_ERROR_CODES = ['ProvisionedThroughputExceededException', 'ThrottlingException', 'RequestLimitExceeded',
+                          'TooManyRequestsException', 'Throttling', 'SlowDown']
+
+log = logging.getLogger()
+
+
+class RequestError(Exception):
+    """
+    Raised by request executed by load generator to account it as failed with given error code.
+    """
+
+    def __init__(self, error_code: str, message: str = None):
+        super().__init__(message or error_code)
+        self.error_code = error_code
+
+
+class TokenBucket:
+    """
+    Thread safe token bucket pacing requests to given rate (implemented as generic cell rate algorithm:
+    every acquired token moves theoretical arrival time forward by 1/rate seconds). Up to 'burst' tokens
+    can be acquired immediately after idle period.
+    """
+
+    def __init__(self, rate: float, burst: float = 1):
+        self.rate = rate
+        self._burst_secs = burst / rate
+        self._next_time = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1, deadline: float = None) -> float:
+        """
+        Blocks till given number of tokens is available.
+        :param tokens: The number of tokens
+        :param deadline: The monotonic time after which tokens are not acquired
+        :return: The monotonic time request was scheduled to, None if it is scheduled after deadline
+        """
+        with self._lock:
+            scheduled = max(self._next_time, time.monotonic() - self._burst_secs)
+            if deadline is not None and scheduled >= deadline:
+                return None
+            self._next_time = scheduled + tokens / self.rate
+        delay = scheduled - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        return scheduled
+
+
+class LatencyHistogram:
+    """
+    Thread safe HDR style histogram of latencies: values (in microseconds) are recorded into log-linear
+    buckets keeping given number of significant bits, so relative error of percentiles is below 2^-bits.
+    """
+
+    def __init__(self, significant_bits: int = 7):
+        self._significant_bits = significant_bits
+        self._counts = {}
+        self._lock = threading.Lock()
+        self.count = 0
+        self.min_secs = None
+        self.max_secs = None
+        self.total_secs = 0.0
+
+    def record(self, latency_secs: float):
+        value = max(0, int(latency_secs * 1000000))
+        shift = max(0, value.bit_length() - self._significant_bits)
+        bucket = (value >> shift) << shift
+        with self._lock:
+            self._counts[bucket] = self._counts.get(bucket, 0) + 1
+            self.count += 1
+            self.total_secs += latency_secs
+            self.min_secs = latency_secs if self.min_secs is None else min(self.min_secs, latency_secs)
+            self.max_secs = latency_secs if self.max_secs is None else max(self.max_secs, latency_secs)
+
+    def percentile(self, percentile: float) -> float:
+        """
+        Returns latency (in seconds) below which given percentage of recorded latencies falls.
+        :param percentile: The percentile from 0 to 100
+        """
+        with self._lock:
+            if self.count == 0:
+                return None
+            rank = max(1, percentile / 100.0 * self.count)
+            cumulative = 0
+            for bucket in sorted(self._counts):
+                cumulative += self._counts[bucket]
+                if cumulative >= rank:
+                    return bucket / 1000000.0
+            return self.max_secs
+
+    def to_dict(self) -> dict:
+        return {'count': self.count,
+                'min_secs': self.min_secs,
+                'mean_secs': self.total_secs / self.count if self.count else None,
+                'p50_secs': self.percentile(50),
+                'p90_secs': self.percentile(90),
+                'p99_secs': self.percentile(99),
+                'max_secs': self.max_secs}
+
+
+class LoadResult:
+    """
+    Outcome of load generation: number of requests, successful requests, throttled requests and items,
+    other errors by error code, responses by status code, achieved rate, maximum number of requests
+    in flight and latency histogram. Latency is measured from time request was scheduled to, so queueing
+    caused by saturated workers is accounted as well.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.successes = 0
+        self.throttles = 0
+        self.unprocessed_items = 0
+        self.errors = {}
+        self.status_codes = {}
+        self.duration_secs = 0.0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.histogram = LatencyHistogram()
+        self._lock = threading.Lock()
+
+    def add_in_flight(self, delta: int):
+        with self._lock:
+            self.in_flight += delta
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def record_status(self, status_code: int):
+        with self._lock:
+            self.status_codes[status_code] = self.status_codes.get(status_code, 0) + 1
+
+    def record(self, latency_secs: float, error_code: str = None, unprocessed_items: int = 0):
+        self.histogram.record(latency_secs)
+        with self._lock:
+            self.requests += 1
+            self.unprocessed_items += unprocessed_items
+            if error_code is None:
+                self.successes += 1
+            elif error_code in THROTTLING_ERROR_CODES:
+                self.throttles += 1
+            else:
+                self.errors[error_code] = self.errors.get(error_code, 0) + 1
+
+    @property
+    def achieved_rps(self) -> float:
+        return self.requests / self.duration_secs if self.duration_secs > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        return {'requests': self.requests,
+                'successes': self.successes,
+                'throttles': self.throttles,
+                'unprocessed_items': self.unprocessed_items,
+                'errors': dict(self.errors),
+                'status_codes': dict(self.status_codes),
+                'duration_secs': self.duration_secs,
+                'achieved_rps': self.achieved_rps,
+                'max_in_flight': self.max_in_flight,
+                'latency': self.histogram.to_dict()}
+
+
+def run_load(request: Callable[[int], Any], total_requests: int = None, duration_secs: float = None,
+             target_rps: float = None, concurrency: int = constants.load_generator_max_concurrency,
+             tokens_per_request: float = 1, schedule: Callable[[int], float] = None,
+             result: LoadResult = None) -> LoadResult:
+    """
+    Executes requests with bounded number of worker threads, paced to target rate by token bucket
+    or started at times given by schedule. Request is given its sequence number and returns number
+    of unprocessed items (for batch requests) or None, raised ClientError or RequestError is accounted
+    by its error code.
+    :param request: The function executing single request
+    :param total_requests: The number of requests to execute, no limit if not given
+    :param duration_secs: The maximum duration of load in seconds, no limit if not given
+    :param target_rps: The target rate (tokens per second), requests are not paced if not given
+    :param concurrency: The maximum number of requests executed concurrently
+    :param tokens_per_request: The number of tokens acquired per request (for example items in batch request)
+    :param schedule: The function returning offset (in seconds from load start) of request with given sequence
+    number, used instead of target rate
+    :param result: The load result to record requests to, new one is created if not given
+    :return: The load result
+    """
+    if total_requests is None and duration_secs is None:
+        raise Exception('Either total number of requests or duration of load is required.')
+    if target_rps and schedule:
+        raise Exception('Either target rate or schedule of requests can be given.')
+    result = result if result is not None else LoadResult()
+    start = time.monotonic()
+    deadline = start + duration_secs if duration_secs is not None else None
+    bucket = TokenBucket(target_rps, burst=max(1, tokens_per_request)) if target_rps else None
+    counter = {'next': 0}
+    counter_lock = threading.Lock()
+
+    def worker():
+        while True:
+            with counter_lock:
+                sequence_number = counter['next']
+                if total_requests is not None and sequence_number >= total_requests:
+                    return
+                counter['next'] += 1
+            if bucket:
+                scheduled = bucket.acquire(tokens_per_request, deadline)
+                if scheduled is None:
+                    return
+            elif schedule:
+                scheduled = start + schedule(sequence_number)
+                if deadline is not None and scheduled >= deadline:
+                    return
+                delay = scheduled - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+            else:
+                scheduled = time.monotonic()
+                if deadline is not None and scheduled >= deadline:
+                    return
+            error_code = None
+            unprocessed_items = 0
+            result.add_in_flight(1)
+            try:
+                unprocessed_items = request(sequence_number) or 0
+            except ClientError as e:
+                error_code = e.response.get('Error', {}).get('Code', 'Unknown')
+            except RequestError as e:
+                error_code = e.error_code
+            except Exception as e:
+                error_code = type(e).__name__
+            finally:
+                result.add_in_flight(-1)
+            result.record(time.monotonic() - scheduled, error_code, unprocessed_items)
+
+    workers_number = concurrency if total_requests is None else max(1, min(concurrency, total_requests))
+    workers = [threading.Thread(target=worker, name=f'LoadWorker-{i}', daemon=True) for i in range(workers_number)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    result.duration_secs = time.monotonic() - start
+    log.info(f'Load done: {result.to_dict()}')
+    return result
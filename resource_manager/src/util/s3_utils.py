@@ -1,7 +1,9 @@
-from typing import List
+from typing import Iterator, List
 
 from boto3 import Session
 
+from documents.util.scripts.src.s3_util import DELETE_OBJECTS_MAX_KEYS, delete_objects_batch, execute_concurrently
+import resource_manager.src.constants as constants
 from .boto3_client_factory import client
 
 
@@ -19,62 +21,63 @@ def put_object(session: Session, bucket_name: str, key: str, body: bytes):
 
 def clean_bucket(session: Session, bucket_name: str):
     """
-    Clean the bucket
+    Clean the bucket: listed versions and delete markers are deleted by batches of up to 1000 keys
+    with concurrent delete_objects requests
     :param session The boto3 session
     :param bucket_name: the bucket name
     """
     s3_client = client('s3', session)
-    paginator = s3_client.get_paginator('list_object_versions')
-    pages = paginator.paginate(Bucket=bucket_name)
-
-    for page in pages:
-        print(f'The response from the list_object_versions: {page}')
-
-        versions: dict = page.get('Versions')
-        if versions is not None:
-            for version in versions:
-                key = version.get('Key')
-                version_id = version.get('VersionId')
-
-                s3_client.delete_object(Bucket=bucket_name, Key=key, VersionId=version_id)
-
-                print(f'The versioned object with Bucket={bucket_name}, '
-                      f'Key={key}, VersionId={version_id} was deleted')
-
-        delete_markers: dict = page.get('DeleteMarkers')
-        if delete_markers is not None:
-            for delete_marker in delete_markers:
-                key = delete_marker.get('Key')
-                version_id = delete_marker.get('VersionId')
-
-                s3_client.delete_object(Bucket=bucket_name, Key=key, VersionId=version_id)
 
-                print(f'The delete marker with Bucket={bucket_name},'
-                      f' Key={key}, VersionId={version_id} was deleted')
+    def get_batches():
+        batch = []
+        for version in iterate_object_versions(session, bucket_name):
+            batch.append({'Key': version['Key'], 'VersionId': version['VersionId']})
+            if len(batch) == DELETE_OBJECTS_MAX_KEYS:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    number_of_deleted_objects = 0
+    for deleted_in_batch in execute_concurrently(lambda batch: delete_objects_batch(s3_client, bucket_name, batch),
+                                                 get_batches(), constants.s3_clean_bucket_max_workers):
+        number_of_deleted_objects += deleted_in_batch
+    print(f'The number of deleted versioned objects and delete markers in the {bucket_name} bucket '
+          f'is {number_of_deleted_objects}')
+
+
+def iterate_object_versions(session: Session, bucket_name: str) -> Iterator[dict]:
+    """
+    Get the generator of versions and delete markers of the objects in the bucket, pages are listed lazily
+    :param session The boto3 session
+    :param bucket_name: the bucket name
+    :return: generator of versions and delete markers
+    """
+    s3_client = client('s3', session)
+    paginator = s3_client.get_paginator('list_object_versions')
+    for page in paginator.paginate(Bucket=bucket_name):
+        for version in page.get('Versions') or []:
+            yield version
+        for delete_marker in page.get('DeleteMarkers') or []:
+            yield delete_marker
 
 
 def get_number_of_files(session: Session, bucket_name: str) -> int:
     """
-    Get number of files in the bucket
+    Get number of files in the bucket, only KeyCount of listed pages is kept in memory
     :param session The boto3 session
     :param bucket_name: bucket name
     :return: number of files in the bucket
     """
-    pages = __list_objects(session, bucket_name)
-    contents_counter = 0
-    for page in pages:
-        contents = page.get('Contents')
-        contents_counter += 0 if not contents else len(contents)
-
-    return contents_counter
+    return sum(page.get('KeyCount', 0) for page in __list_objects(session, bucket_name))
 
 
-def __list_objects(session: Session, bucket_name: str) -> List[dict]:
+def __list_objects(session: Session, bucket_name: str) -> Iterator[dict]:
     """
-    Get the paginated list of the objects in the bucket without version checking and delete markers
+    Get the lazily paginated list of the objects in the bucket without version checking and delete markers
     :param session The boto3 session
     :param bucket_name: bucket name
-    :return: list of the objects in the bucket
+    :return: iterator of list_objects_v2 pages
     """
     s3_client = client('s3', session)
     paginator = s3_client.get_paginator('list_objects_v2')
@@ -0,0 +1,149 @@
+import datetime
+import hashlib
+import hmac
+import logging
+import threading
+import time
+
+import requests
+from aws_requests_auth.aws_auth import AWSRequestsAuth, getSignatureKey
+from requests.adapters import HTTPAdapter
+from websocket import create_connection, WebSocketBadStatusException
+
+import resource_manager.src.constants as constants
+from .load_generator import LoadResult, RequestError, run_load
+
+# Status code of HTTP requests rejected due to throttling
+THROTTLED_STATUS_CODE = 429
+# Status code of successful web socket handshake
+WS_HANDSHAKE_STATUS_CODE = 101
+
+log = logging.getLogger()
+
+
+class CachedSigningKeyAuth(AWSRequestsAuth):
+    """
+    AWS Signature Version 4 auth for requests, which derives signing key once per day (signing key
+    depends only on secret key, date, region and service) instead of four HMAC rounds per request.
+    """
+
+    def __init__(self, aws_access_key, aws_secret_access_key, aws_host, aws_region, aws_service, aws_token=None):
+        super().__init__(aws_access_key, aws_secret_access_key, aws_host, aws_region, aws_service, aws_token)
+        self._signing_key = (None, None)
+        self._lock = threading.Lock()
+
+    def get_signing_key(self, aws_secret_access_key: str, datestamp: str) -> bytes:
+        with self._lock:
+            key_datestamp, signing_key = self._signing_key
+            if key_datestamp != datestamp:
+                signing_key = getSignatureKey(aws_secret_access_key, datestamp, self.aws_region, self.service)
+                self._signing_key = (datestamp, signing_key)
+            return signing_key
+
+    def get_aws_request_headers(self, r, aws_access_key, aws_secret_access_key, aws_token):
+        t = datetime.datetime.utcnow()
+        amzdate = t.strftime('%Y%m%dT%H%M%SZ')
+        datestamp = t.strftime('%Y%m%d')
+        canonical_headers = 'host:' + self.aws_host + '\n' + 'x-amz-date:' + amzdate + '\n'
+        signed_headers = 'host;x-amz-date'
+        if aws_token:
+            canonical_headers += 'x-amz-security-token:' + aws_token + '\n'
+            signed_headers += ';x-amz-security-token'
+        body = r.body if r.body else bytes()
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        payload_hash = hashlib.sha256(body).hexdigest()
+        canonical_request = '\n'.join([r.method, self.get_canonical_path(r), self.get_canonical_querystring(r),
+                                       canonical_headers, signed_headers, payload_hash])
+        credential_scope = datestamp + '/' + self.aws_region + '/' + self.service + '/aws4_request'
+        string_to_sign = '\n'.join(['AWS4-HMAC-SHA256', amzdate, credential_scope,
+                                    hashlib.sha256(canonical_request.encode('utf-8')).hexdigest()])
+        signature = hmac.new(self.get_signing_key(aws_secret_access_key, datestamp),
+                             string_to_sign.encode('utf-8'), hashlib.sha256).hexdigest()
+        headers = {'Authorization': f'AWS4-HMAC-SHA256 Credential={aws_access_key}/{credential_scope}, '
+                                    f'SignedHeaders={signed_headers}, Signature={signature}',
+                   'x-amz-date': amzdate,
+                   'x-amz-content-sha256': payload_hash}
+        if aws_token:
+            headers['X-Amz-Security-Token'] = aws_token
+        return headers
+
+
+def _get_status_error_code(status_code: int) -> str:
+    return 'TooManyRequestsException' if status_code == THROTTLED_STATUS_CODE else f'HTTP{status_code}'
+
+
+def run_http_load(method: str, url: str, headers: dict = None, auth=None, data=None,
+                  total_requests: int = None, duration_secs: float = None, target_rps: float = None,
+                  concurrency: int = constants.load_generator_max_concurrency,
+                  timeout_secs: float = constants.traffic_generator_request_timeout_secs) -> LoadResult:
+    """
+    Sends HTTP requests with bounded number of concurrent requests paced to target rate. Every worker
+    thread keeps its own session, so connections are kept alive and TLS handshake is done once per worker.
+    Responses are accounted by status code, 429 responses are accounted as throttled.
+    :param method: The HTTP method
+    :param url: The URL
+    :param headers: The request headers
+    :param auth: The requests auth (for example CachedSigningKeyAuth)
+    :param data: The request body
+    :param total_requests: The number of requests, no limit if not given
+    :param duration_secs: The maximum duration of load in seconds, no limit if not given
+    :param target_rps: The target number of requests per second, not paced if not given
+    :param concurrency: The maximum number of concurrent requests
+    :param timeout_secs: The timeout of single request in seconds
+    :return: The load result
+    """
+    result = LoadResult()
+    sessions = threading.local()
+
+    def get_session() -> requests.Session:
+        if not hasattr(sessions, 'session'):
+            session = requests.Session()
+            session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=1))
+            sessions.session = session
+        return sessions.session
+
+    def send(sequence_number):
+        response = get_session().request(method, url, headers=headers, auth=auth, data=data, timeout=timeout_secs)
+        result.record_status(response.status_code)
+        if not 200 <= response.status_code < 300:
+            raise RequestError(_get_status_error_code(response.status_code))
+
+    log.info(f'Start sending {method} requests to [{url}]')
+    return run_load(send, total_requests=total_requests, duration_secs=duration_secs, target_rps=target_rps,
+                    concurrency=concurrency, result=result)
+
+
+def run_ws_load(url: str, hold_secs: float = 0, total_requests: int = None, duration_secs: float = None,
+                target_rps: float = None, concurrency: int = constants.load_generator_max_concurrency,
+                timeout_secs: float = constants.traffic_generator_request_timeout_secs) -> LoadResult:
+    """
+    Opens web socket connections with bounded number of concurrent connections paced to target rate.
+    Handshakes are accounted by status code, 429 responses are accounted as throttled.
+    :param url: The web socket URL
+    :param hold_secs: The time every successful connection is kept open (accounted in latency)
+    :param total_requests: The number of connections, no limit if not given
+    :param duration_secs: The maximum duration of load in seconds, no limit if not given
+    :param target_rps: The target number of connections per second, not paced if not given
+    :param concurrency: The maximum number of concurrent connections
+    :param timeout_secs: The timeout of handshake in seconds
+    :return: The load result
+    """
+    result = LoadResult()
+
+    def connect(sequence_number):
+        try:
+            ws = create_connection(url, timeout=timeout_secs)
+        except WebSocketBadStatusException as e:
+            result.record_status(e.status_code)
+            raise RequestError(_get_status_error_code(e.status_code))
+        result.record_status(WS_HANDSHAKE_STATUS_CODE)
+        try:
+            if hold_secs:
+                time.sleep(hold_secs)
+        finally:
+            ws.close()
+
+    log.info(f'Start opening web socket connections to [{url}]')
+    return run_load(connect, total_requests=total_requests, duration_secs=duration_secs, target_rps=target_rps,
+                    concurrency=concurrency, result=result)
@@ -1,7 +1,14 @@
 import hashlib
+import os
+import threading
 from cfn_tools import load_yaml, dump_yaml
 from cfn_tools.odict import ODict
 
+# Process wide cache of parsed yaml files and their SHA1 hashes: file path -> (file stamp, content, sha1),
+# file stamp (modification time and size) is validated on every access, so modified files are parsed again.
+_file_cache = {}
+_file_cache_lock = threading.Lock()
+
 
 def loads_yaml(file_content):
     """
@@ -11,9 +18,21 @@ def loads_yaml(file_content):
     return load_yaml(file_content)
 
 
-def file_loads_yaml(file_path):
+def _get_file_stamp(file_path: str):
+    """
+    Returns file stamp (modification time and size) for given file path or None if file can not be accessed.
+    :param file_path: The file path
+    """
+    try:
+        stat = os.stat(file_path)
+        return stat.st_mtime_ns, stat.st_size
+    except (OSError, TypeError):
+        return None
+
+
+def _read_yaml_file(file_path):
     """
-     Returns dict object, which represents YAML structure, for given file path.
+    Reads and parses yaml file for given file path.
     :param file_path The file path
     """
     file = None
@@ -25,6 +44,43 @@ def file_loads_yaml(file_path):
             file.close()
 
 
+def _get_cached_file(file_path: str) -> ():
+    """
+    Returns parsed content and SHA1 hash of canonical yaml dump for given file path, file is parsed only
+    if it was not parsed before or was modified since. Files which can not be accessed are not cached.
+    :param file_path: The file path
+    :return: The tuple of parsed content and SHA1 hash
+    """
+    stamp = _get_file_stamp(file_path)
+    with _file_cache_lock:
+        entry = _file_cache.get(file_path)
+    if stamp is not None and entry and entry[0] == stamp:
+        return entry[1], entry[2]
+    content = _read_yaml_file(file_path)
+    sha1 = hashlib.sha1(dump_yaml(content).encode()).hexdigest()
+    if stamp is not None:
+        with _file_cache_lock:
+            _file_cache[file_path] = (stamp, content, sha1)
+    return content, sha1
+
+
+def clear_cache():
+    """
+    Clears cache of parsed yaml files.
+    """
+    with _file_cache_lock:
+        _file_cache.clear()
+
+
+def file_loads_yaml(file_path):
+    """
+     Returns dict object, which represents YAML structure, for given file path. Content is cached
+     per process and shared, so it should not be modified by caller (make a copy instead).
+    :param file_path The file path
+    """
+    return _get_cached_file(file_path)[0]
+
+
 def file_dump_yaml(file_path: str) -> str:
     """
     Returns yaml formatted content for given file path.
@@ -40,8 +96,7 @@ def get_yaml_file_sha1_hash(file_path: str) -> str:
     :param file_path: The yaml file path
     :return: The sha1 hash
     """
-    content = file_dump_yaml(file_path)
-    return hashlib.sha1(content.encode()).hexdigest()
+    return _get_cached_file(file_path)[1]
 
 
 def get_yaml_content_sha1_hash(file_content: str) -> str:
@@ -4,7 +4,6 @@ from unittest.mock import MagicMock, call, patch
 from resource_manager.src.cloud_formation import CloudFormationTemplate
 from botocore.exceptions import ClientError
 import resource_manager.src.util.boto3_client_factory as client_factory
-from documents.util.scripts.test.mock_sleep import MockSleep
 
 
 @pytest.mark.unit_test
@@ -33,19 +32,16 @@ class TestCloudFormation(unittest.TestCase):
         client_factory.clients = {}
         client_factory.resources = {}
 
-    @patch('time.sleep')
-    @patch('time.time')
-    def test_deploy_cf_stack_new_success(self, patched_time, patched_sleep):
-        mock_sleep = MockSleep()
-        patched_time.side_effect = mock_sleep.time
-        patched_sleep.side_effect = mock_sleep.sleep
-
+    @patch('resource_manager.src.constants.cf_waiter_initial_secs', 0.01)
+    def test_deploy_cf_stack_new_success(self):
         mock_status_1 = MagicMock()
-        mock_status_1.configure_mock(stack_status='IN_PROGRESS')
+        mock_status_1.configure_mock(stack_status='CREATE_IN_PROGRESS')
         mock_status_2 = MagicMock()
         mock_status_2.configure_mock(stack_status='COMPLETED')
 
-        self.cf_resource_mock.Stack.side_effect = [mock_status_1, mock_status_2, mock_status_2, mock_status_2]
+        self.cf_resource_mock.Stack.side_effect = [mock_status_1, mock_status_2, mock_status_2]
+        self.cf_service_mock.describe_stacks.return_value = {'Stacks': [{'StackStatus': 'CREATE_COMPLETE'}]}
+        self.cf_service_mock.describe_stack_events.return_value = {'StackEvents': []}
         self.cfn_helper.deploy_cf_stack('test_template_url', 'test_stack_name', test_in_param='test_in_val')
         self.cf_service_mock.create_stack.assert_called_once_with(StackName='test_stack_name',
                                                                   TemplateURL='test_template_url',
@@ -54,12 +50,22 @@ class TestCloudFormation(unittest.TestCase):
                                                                                'ParameterValue': 'test_in_val'}],
                                                                   EnableTerminationProtection=True)
 
-        self.assertEqual(self.cf_resource_mock.Stack.call_count, 4)
+        self.cf_service_mock.describe_stacks.assert_called_once_with(StackName='test_stack_name')
+        self.assertEqual(self.cf_resource_mock.Stack.call_count, 3)
         self.cf_resource_mock.Stack.assert_has_calls([call('test_stack_name'),
-                                                      call('test_stack_name'),
                                                       call('test_stack_name'),
                                                       call('test_stack_name')])
 
+    @patch('resource_manager.src.constants.cf_waiter_initial_secs', 0.01)
+    def test_delete_cf_stack_failed_status_fail(self):
+        mock_status = MagicMock()
+        mock_status.configure_mock(stack_status='DELETE_IN_PROGRESS')
+        self.cf_resource_mock.Stack.return_value = mock_status
+        self.cf_service_mock.describe_stacks.return_value = {'Stacks': [{'StackStatus': 'DELETE_FAILED'}]}
+        self.cf_service_mock.describe_stack_events.return_value = {'StackEvents': []}
+
+        self.assertRaises(Exception, self.cfn_helper.delete_cf_stack, 'test_stack_name')
+
     def test_deploy_cf_stack_update_success(self):
         mock_status_1 = MagicMock()
         mock_status_1.configure_mock(stack_status='COMPLETED')
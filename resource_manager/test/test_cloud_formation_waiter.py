@@ -0,0 +1,210 @@
+import threading
+import unittest
+import pytest
+from unittest.mock import MagicMock, patch
+from botocore.exceptions import ClientError, EndpointConnectionError
+from resource_manager.src.cloud_formation_waiter import StackWaiter, StackWait, get_stack_waiter
+
+
+def get_event(event_id, logical_id, status, reason=None):
+    event = {'EventId': event_id, 'LogicalResourceId': logical_id, 'ResourceType': 'AWS::SQS::Queue',
+             'ResourceStatus': status}
+    if reason:
+        event['ResourceStatusReason'] = reason
+    return event
+
+
+def get_not_exist_error(stack_name):
+    return ClientError({'Error': {'Code': 'ValidationError', 'Message': f'Stack with id {stack_name} does not exist'}},
+                       'DescribeStacks')
+
+
+@pytest.mark.unit_test
+@patch('resource_manager.src.constants.cf_waiter_initial_secs', 0.01)
+class TestCloudFormationWaiter(unittest.TestCase):
+
+    def setUp(self):
+        self.client_mock = MagicMock()
+        self.client_mock.describe_stack_events.return_value = {'StackEvents': []}
+        self.waiter = StackWaiter(self.client_mock)
+
+    def test_wait_single_stack_success(self):
+        self.client_mock.describe_stacks.side_effect = [{'Stacks': [{'StackStatus': 'CREATE_IN_PROGRESS'}]},
+                                                        {'Stacks': [{'StackStatus': 'CREATE_COMPLETE'}]}]
+
+        status = self.waiter.wait('stack_a', 'CREATE_IN_PROGRESS')
+
+        self.assertEqual(status, 'CREATE_COMPLETE')
+        self.assertEqual(self.client_mock.describe_stacks.call_count, 2)
+        self.client_mock.list_stacks.assert_not_called()
+
+    def test_wait_stack_does_not_exist_success(self):
+        self.client_mock.describe_stacks.side_effect = get_not_exist_error('stack_a')
+
+        self.assertIsNone(self.waiter.wait('stack_a', 'DELETE_IN_PROGRESS'))
+
+    def test_wait_describe_fail(self):
+        self.client_mock.describe_stacks.side_effect = ClientError(
+            {'Error': {'Code': 'AccessDenied', 'Message': 'Access denied'}}, 'DescribeStacks')
+
+        self.assertRaises(ClientError, self.waiter.wait, 'stack_a', 'CREATE_IN_PROGRESS')
+
+    def test_wait_connection_error_retried_success(self):
+        self.client_mock.describe_stacks.side_effect = [
+            EndpointConnectionError(endpoint_url='https://cloudformation'),
+            {'Stacks': [{'StackStatus': 'CREATE_COMPLETE'}]}]
+
+        self.assertEqual(self.waiter.wait('stack_a', 'CREATE_IN_PROGRESS'), 'CREATE_COMPLETE')
+        self.assertEqual(self.client_mock.describe_stacks.call_count, 2)
+
+    @patch('resource_manager.src.constants.cf_waiter_max_failed_polls', 3)
+    def test_wait_connection_error_fail(self):
+        self.client_mock.describe_stacks.side_effect = EndpointConnectionError(endpoint_url='https://cloudformation')
+
+        self.assertRaises(EndpointConnectionError, self.waiter.wait, 'stack_a', 'CREATE_IN_PROGRESS')
+        self.assertEqual(self.client_mock.describe_stacks.call_count, 3)
+
+        self.client_mock.describe_stacks.side_effect = [{'Stacks': [{'StackStatus': 'CREATE_COMPLETE'}]}]
+        self.assertEqual(self.waiter.wait('stack_a', 'CREATE_IN_PROGRESS'), 'CREATE_COMPLETE')
+
+    @patch('resource_manager.src.constants.cf_waiter_max_failed_polls', 3)
+    def test_wait_list_stacks_error_retried_success(self):
+        stack_waits = [StackWait('stack_a', 'CREATE_IN_PROGRESS'), StackWait('stack_b', 'CREATE_IN_PROGRESS')]
+        self.client_mock.list_stacks.side_effect = [
+            EndpointConnectionError(endpoint_url='https://cloudformation'),
+            {'StackSummaries': [{'StackName': 'stack_a', 'StackStatus': 'CREATE_IN_PROGRESS'},
+                                {'StackName': 'stack_b', 'StackStatus': 'CREATE_IN_PROGRESS'}]}]
+
+        self.assertFalse(self.waiter._poll(stack_waits))
+        self.assertFalse(self.waiter._poll(stack_waits))
+        self.assertEqual(self.waiter._failed_polls, 0)
+        for stack_wait in stack_waits:
+            self.assertFalse(stack_wait.done.is_set())
+            self.assertIsNone(stack_wait.error)
+
+    @patch('resource_manager.src.constants.cf_waiter_initial_secs', 0.2)
+    def test_wait_multiple_stacks_single_describe_fail(self):
+        self.client_mock.list_stacks.return_value = {'StackSummaries': []}
+
+        def describe_stacks(StackName):
+            if StackName == 'stack_a':
+                raise ClientError({'Error': {'Code': 'AccessDenied', 'Message': 'Access denied'}}, 'DescribeStacks')
+            return {'Stacks': [{'StackStatus': 'UPDATE_COMPLETE'}]}
+
+        self.client_mock.describe_stacks.side_effect = describe_stacks
+        results = {}
+
+        def wait(stack_name, status):
+            try:
+                results[stack_name] = self.waiter.wait(stack_name, status)
+            except ClientError as e:
+                results[stack_name] = e
+
+        threads = [threading.Thread(target=wait, args=('stack_a', 'CREATE_IN_PROGRESS')),
+                   threading.Thread(target=wait, args=('stack_b', 'UPDATE_IN_PROGRESS'))]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=5)
+
+        self.assertIsInstance(results['stack_a'], ClientError)
+        self.assertEqual(results['stack_b'], 'UPDATE_COMPLETE')
+
+    def test_wait_poller_failure_passed_to_waits(self):
+        self.client_mock.describe_stacks.return_value = {'Stacks': [{'StackStatus': 'CREATE_COMPLETE'}]}
+        with patch.object(self.waiter, '_poll', side_effect=RuntimeError('Poller failed')):
+            self.assertRaises(RuntimeError, self.waiter.wait, 'stack_a', 'CREATE_IN_PROGRESS')
+
+        self.assertIsNone(self.waiter._poller)
+        self.assertEqual(self.waiter.wait('stack_a', 'CREATE_IN_PROGRESS'), 'CREATE_COMPLETE')
+
+    def test_wait_dead_poller_replaced(self):
+        self.client_mock.describe_stacks.return_value = {'Stacks': [{'StackStatus': 'CREATE_COMPLETE'}]}
+        dead_poller = threading.Thread(target=lambda: None)
+        dead_poller.start()
+        dead_poller.join()
+        self.waiter._poller = dead_poller
+
+        self.assertEqual(self.waiter.wait('stack_a', 'CREATE_IN_PROGRESS'), 'CREATE_COMPLETE')
+
+    @patch('resource_manager.src.constants.cf_waiter_initial_secs', 0.2)
+    def test_wait_multiple_stacks_batched_success(self):
+        self.client_mock.list_stacks.side_effect = [
+            {'StackSummaries': [{'StackName': 'stack_a', 'StackStatus': 'CREATE_IN_PROGRESS'},
+                                {'StackName': 'stack_b', 'StackStatus': 'UPDATE_IN_PROGRESS'}]},
+            {'StackSummaries': []}]
+        self.client_mock.describe_stacks.side_effect = lambda StackName: \
+            {'Stacks': [{'StackStatus': 'CREATE_COMPLETE' if StackName == 'stack_a' else 'UPDATE_COMPLETE'}]}
+        results = {}
+
+        def wait(stack_name, status):
+            results[stack_name] = self.waiter.wait(stack_name, status)
+
+        threads = [threading.Thread(target=wait, args=('stack_a', 'CREATE_IN_PROGRESS')),
+                   threading.Thread(target=wait, args=('stack_b', 'UPDATE_IN_PROGRESS'))]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=5)
+
+        self.assertEqual(results, {'stack_a': 'CREATE_COMPLETE', 'stack_b': 'UPDATE_COMPLETE'})
+        self.assertEqual(self.waiter.stats['list_stacks'], 2)
+        self.assertEqual(self.waiter.stats['describe_stacks'], 2)
+
+    def test_get_stack_statuses_batched_success(self):
+        self.client_mock.list_stacks.side_effect = [
+            {'StackSummaries': [{'StackName': 'stack_a', 'StackStatus': 'CREATE_IN_PROGRESS'},
+                                {'StackName': 'other', 'StackStatus': 'CREATE_IN_PROGRESS'}], 'NextToken': 'next'},
+            {'StackSummaries': [{'StackName': 'stack_b', 'StackStatus': 'DELETE_IN_PROGRESS'}]}]
+        self.client_mock.describe_stacks.side_effect = get_not_exist_error('stack_c')
+
+        statuses, errors = self.waiter._get_stack_statuses(['stack_a', 'stack_b', 'stack_c'])
+
+        self.assertEqual(statuses, {'stack_a': 'CREATE_IN_PROGRESS', 'stack_b': 'DELETE_IN_PROGRESS',
+                                    'stack_c': None})
+        self.assertEqual(errors, {})
+        self.assertEqual(self.client_mock.list_stacks.call_count, 2)
+        self.client_mock.describe_stacks.assert_called_once_with(StackName='stack_c')
+
+    def test_tail_events_cursor_success(self):
+        stack_wait = StackWait('stack_a', 'CREATE_IN_PROGRESS')
+        self.client_mock.describe_stack_events.side_effect = [
+            {'StackEvents': [get_event('3', 'QueueB', 'CREATE_IN_PROGRESS'),
+                             get_event('2', 'QueueA', 'CREATE_COMPLETE'),
+                             get_event('1', 'stack_a', 'CREATE_IN_PROGRESS', 'User Initiated'),
+                             get_event('0', 'stack_a', 'DELETE_COMPLETE')],
+             'NextToken': 'next'},
+            {'StackEvents': [get_event('4', 'QueueB', 'CREATE_COMPLETE'),
+                             get_event('3', 'QueueB', 'CREATE_IN_PROGRESS')],
+             'NextToken': 'next'},
+            {'StackEvents': [get_event('4', 'QueueB', 'CREATE_COMPLETE')], 'NextToken': 'next'}]
+
+        self.assertTrue(self.waiter._tail_events(stack_wait))
+        self.assertEqual(stack_wait.last_event_id, '3')
+        self.assertEqual(stack_wait.get_progress(), (1, 2))
+
+        self.assertTrue(self.waiter._tail_events(stack_wait))
+        self.assertEqual(stack_wait.last_event_id, '4')
+        self.assertEqual(stack_wait.get_progress(), (2, 2))
+
+        self.assertFalse(self.waiter._tail_events(stack_wait))
+        self.assertEqual(self.client_mock.describe_stack_events.call_count, 3)
+
+    def test_poll_progress_success(self):
+        stack_wait = StackWait('stack_a', 'CREATE_IN_PROGRESS')
+        self.client_mock.describe_stacks.return_value = {'Stacks': [{'StackStatus': 'CREATE_IN_PROGRESS'}]}
+
+        self.assertFalse(self.waiter._poll([stack_wait]))
+        self.assertFalse(stack_wait.done.is_set())
+
+        self.client_mock.describe_stack_events.return_value = \
+            {'StackEvents': [get_event('1', 'QueueA', 'CREATE_IN_PROGRESS')]}
+        self.assertTrue(self.waiter._poll([stack_wait]))
+        self.assertFalse(stack_wait.done.is_set())
+
+    def test_get_stack_waiter_shared_per_client_success(self):
+        client_a = MagicMock()
+        client_b = MagicMock()
+
+        self.assertIs(get_stack_waiter(client_a), get_stack_waiter(client_a))
+        self.assertIsNot(get_stack_waiter(client_a), get_stack_waiter(client_b))
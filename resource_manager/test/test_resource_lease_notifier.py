@@ -0,0 +1,155 @@
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+import pytest
+from botocore.exceptions import ClientError, EndpointConnectionError
+
+import resource_manager.src.constants as constants
+from resource_manager.src.resource_lease_notifier import ResourceLeaseNotifier, ResourceStreamListener
+from resource_manager.src.resource_model import ResourceModel
+
+TEST_TEMPLATE_NAME = 'path/to/TestTemplate.yml'
+
+
+def get_stream_record(cfn_template_name):
+    return {'eventName': 'MODIFY',
+            'dynamodb': {'Keys': {'cf_template_name': {'S': cfn_template_name},
+                                  'cf_stack_name': {'S': 'TestTemplate-ON-DEMAND-0'}}}}
+
+
+@pytest.mark.unit_test
+class TestResourceLeaseNotifier(unittest.TestCase):
+
+    def setUp(self):
+        self.notifier = ResourceLeaseNotifier()
+
+    def tearDown(self):
+        self.notifier.stop_stream_listener()
+
+    def test_wait_notified_success(self):
+        version = self.notifier.get_version(TEST_TEMPLATE_NAME)
+        threading.Timer(0.01, self.notifier.notify, [TEST_TEMPLATE_NAME]).start()
+        start = time.time()
+        self.assertTrue(self.notifier.wait(TEST_TEMPLATE_NAME, version, constants.sleep_time_secs))
+        # Waiter is woken up right after notification rather than after polling interval
+        self.assertLess(time.time() - start, constants.sleep_time_secs)
+
+    def test_wait_notified_before_wait_success(self):
+        version = self.notifier.get_version(TEST_TEMPLATE_NAME)
+        self.notifier.notify(TEST_TEMPLATE_NAME)
+        self.assertTrue(self.notifier.wait(TEST_TEMPLATE_NAME, version, 0))
+        self.assertEqual(self.notifier.get_version(TEST_TEMPLATE_NAME), version + 1)
+
+    def test_wait_other_template_notified_timeout(self):
+        version = self.notifier.get_version(TEST_TEMPLATE_NAME)
+        self.notifier.notify('path/to/OtherTemplate.yml')
+        self.assertFalse(self.notifier.wait(TEST_TEMPLATE_NAME, version, 0.01))
+
+    def test_get_backoff_secs_success(self):
+        for attempt in range(10):
+            delay = min(constants.lease_wait_max_secs, constants.lease_wait_initial_secs * 2 ** attempt)
+            backoff_secs = ResourceLeaseNotifier.get_backoff_secs(attempt)
+            self.assertGreaterEqual(backoff_secs, delay / 2)
+            self.assertLessEqual(backoff_secs, delay)
+
+    @patch('resource_manager.src.resource_lease_notifier.client')
+    def test_start_stream_listener_no_stream_success(self, client_mock):
+        client_mock.return_value.describe_table.return_value = {'Table': {}}
+        self.notifier.start_stream_listener(MagicMock(), ResourceModel.Meta.table_name)
+        client_mock.assert_called_once()
+        self.assertIsNone(self.notifier._listener)
+
+    @patch('resource_manager.src.resource_lease_notifier.client')
+    def test_start_stream_listener_describe_table_fail(self, client_mock):
+        client_mock.return_value.describe_table.side_effect = ClientError({'Error': {'Code': 'AccessDenied'}},
+                                                                          'DescribeTable')
+        self.notifier.start_stream_listener(MagicMock(), ResourceModel.Meta.table_name)
+        self.assertIsNone(self.notifier._listener)
+
+    @patch('resource_manager.src.resource_lease_notifier.client')
+    def test_start_stream_listener_success(self, client_mock):
+        client_mock.return_value.describe_table.return_value = {'Table': {'LatestStreamArn': 'stream_arn'}}
+        client_mock.return_value.describe_stream.return_value = {'StreamDescription': {'Shards': []}}
+        self.notifier.start_stream_listener(MagicMock(), ResourceModel.Meta.table_name)
+        listener = self.notifier._listener
+        self.assertTrue(listener.is_alive())
+        # Listener is started only once per process
+        self.notifier.start_stream_listener(MagicMock(), ResourceModel.Meta.table_name)
+        self.assertEqual(listener, self.notifier._listener)
+        self.notifier.stop_stream_listener()
+        self.assertFalse(listener.is_alive())
+
+    @patch('resource_manager.src.resource_model.Model.save')
+    @patch('resource_manager.src.resource_model.lease_notifier')
+    def test_update_status_notifies_success(self, notifier_mock, save_mock):
+        resource = ResourceModel(cf_template_name=TEST_TEMPLATE_NAME, cf_stack_name='TestTemplate-ON-DEMAND-0')
+        ResourceModel.update_status(resource, ResourceModel.Status.AVAILABLE)
+        self.assertEqual(resource.status, ResourceModel.Status.AVAILABLE.name)
+        save_mock.assert_called_once()
+        notifier_mock.notify.assert_called_once_with(TEST_TEMPLATE_NAME)
+
+
+@pytest.mark.unit_test
+class TestResourceStreamListener(unittest.TestCase):
+
+    def setUp(self):
+        self.notifier = ResourceLeaseNotifier()
+        self.streams_client_mock = MagicMock()
+        self.streams_client_mock.describe_stream.return_value = {'StreamDescription': {'Shards': [
+            {'ShardId': 'closed_shard', 'SequenceNumberRange': {'StartingSequenceNumber': '1',
+                                                                'EndingSequenceNumber': '2'}},
+            {'ShardId': 'open_shard', 'SequenceNumberRange': {'StartingSequenceNumber': '3'}}]}}
+        self.streams_client_mock.get_shard_iterator.return_value = {'ShardIterator': 'iterator_0'}
+        self.listener = ResourceStreamListener(self.streams_client_mock, 'stream_arn', self.notifier)
+
+    def test_run_notifies_success(self):
+        version = self.notifier.get_version(TEST_TEMPLATE_NAME)
+
+        def get_records(ShardIterator):
+            if ShardIterator == 'iterator_0':
+                return {'Records': [get_stream_record(TEST_TEMPLATE_NAME), get_stream_record(TEST_TEMPLATE_NAME)],
+                        'NextShardIterator': 'iterator_1'}
+            self.listener._stopped.set()
+            return {'Records': [], 'NextShardIterator': 'iterator_2'}
+        self.streams_client_mock.get_records.side_effect = get_records
+
+        self.listener.run()
+
+        # Records for the same template in single batch produce single notification
+        self.assertEqual(self.notifier.get_version(TEST_TEMPLATE_NAME), version + 1)
+        self.streams_client_mock.get_shard_iterator.assert_called_once_with(StreamArn='stream_arn',
+                                                                            ShardId='open_shard',
+                                                                            ShardIteratorType='LATEST')
+
+    def test_run_shard_closed_success(self):
+        def get_records(ShardIterator):
+            if self.streams_client_mock.get_records.call_count > 1:
+                self.listener._stopped.set()
+            return {'Records': [get_stream_record(TEST_TEMPLATE_NAME)]}
+        self.streams_client_mock.get_records.side_effect = get_records
+
+        with patch.object(constants, 'lease_stream_poll_time_secs', 0):
+            self.listener.run()
+
+        # Closed shard has no next iterator, shards are described again
+        self.assertEqual(self.streams_client_mock.describe_stream.call_count, 2)
+        self.assertEqual(self.notifier.get_version(TEST_TEMPLATE_NAME), 2)
+
+    def test_run_error_discovers_shards_again_success(self):
+        def get_records(ShardIterator):
+            if self.streams_client_mock.get_records.call_count == 1:
+                raise ClientError({'Error': {'Code': 'TrimmedDataAccess'}}, 'GetRecords')
+            if self.streams_client_mock.get_records.call_count == 2:
+                raise EndpointConnectionError(endpoint_url='https://streams.dynamodb')
+            self.listener._stopped.set()
+            return {'Records': [get_stream_record(TEST_TEMPLATE_NAME)], 'NextShardIterator': 'iterator_1'}
+        self.streams_client_mock.get_records.side_effect = get_records
+
+        with patch.object(constants, 'lease_stream_poll_time_secs', 0):
+            self.listener.run()
+
+        # Failed iterators are dropped, shards are described again after every failure
+        self.assertEqual(self.streams_client_mock.describe_stream.call_count, 3)
+        self.assertEqual(self.notifier.get_version(TEST_TEMPLATE_NAME), 1)
@@ -0,0 +1,239 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch, call
+
+import pytest
+from botocore.exceptions import ClientError
+from pynamodb.exceptions import UpdateError, QueryError, TransactWriteError
+
+from resource_manager.src.resource_model import ResourceModel
+
+TEST_TEMPLATE_PATH = 'path/to/TestTemplate.yml'
+TEMPLATE_SHA1 = 'template_sha1'
+PARAMS_SHA1 = 'params_sha1'
+STREAM_SPECIFICATION = {'StreamEnabled': True, 'StreamViewType': 'NEW_IMAGE'}
+
+
+def get_resource(index, status=ResourceModel.Status.AVAILABLE, template_sha1=TEMPLATE_SHA1):
+    return ResourceModel(cf_template_name=TEST_TEMPLATE_PATH,
+                         cf_stack_name=f'TestTemplate-ON-DEMAND-{index}',
+                         type=ResourceModel.Type.ON_DEMAND.name,
+                         status=status.name,
+                         cf_template_sha1=template_sha1,
+                         cf_input_parameters_sha1=PARAMS_SHA1,
+                         version=1)
+
+
+def get_update_error(code):
+    return UpdateError(cause=ClientError({'Error': {'Code': code, 'Message': code}}, 'UpdateItem'))
+
+
+@pytest.mark.unit_test
+class TestResourceModel(unittest.TestCase):
+
+    def setUp(self):
+        ResourceModel.lease_stats.update(attempts=0, leased=0, conflicts=0)
+        self.connection_patcher = patch('resource_manager.src.resource_model.ResourceModel._get_connection')
+        self.connection_mock = self.connection_patcher.start()
+        self.query_patcher = patch('resource_manager.src.resource_model.AvailableIndex.query')
+        self.query_mock = self.query_patcher.start()
+
+    def tearDown(self):
+        self.connection_patcher.stop()
+        self.query_patcher.stop()
+
+    def test_try_lease_success(self):
+        self.query_mock.return_value = [get_resource(0)]
+        leased = get_resource(0, ResourceModel.Status.LEASED).serialize(null_check=False)
+        self.connection_mock.return_value.update_item.return_value = {'Attributes': leased}
+
+        resource = ResourceModel.try_lease(TEST_TEMPLATE_PATH, ResourceModel.Type.ON_DEMAND, 'session_id',
+                                           TEMPLATE_SHA1, PARAMS_SHA1, ['dependency_stack'])
+
+        self.assertEqual(resource.status, ResourceModel.Status.LEASED.name)
+        self.connection_mock.return_value.update_item.assert_called_once()
+        update_kwargs = self.connection_mock.return_value.update_item.call_args[1]
+        self.assertEqual(update_kwargs['range_key'], 'TestTemplate-ON-DEMAND-0')
+        self.assertEqual(len(update_kwargs['actions']), 8)
+        self.assertEqual(ResourceModel.get_lease_stats(), {'attempts': 1, 'leased': 1, 'conflicts': 0})
+
+    def test_try_lease_conflict_success(self):
+        self.query_mock.return_value = [get_resource(0), get_resource(1)]
+        leased = get_resource(1, ResourceModel.Status.LEASED).serialize(null_check=False)
+        self.connection_mock.return_value.update_item.side_effect = [
+            get_update_error('ConditionalCheckFailedException'), {'Attributes': leased}]
+
+        resource = ResourceModel.try_lease(TEST_TEMPLATE_PATH, ResourceModel.Type.ON_DEMAND, 'session_id',
+                                           TEMPLATE_SHA1, PARAMS_SHA1)
+
+        self.assertEqual(resource.cf_stack_name, 'TestTemplate-ON-DEMAND-1')
+        self.assertEqual(ResourceModel.get_lease_stats(), {'attempts': 2, 'leased': 1, 'conflicts': 1})
+
+    def test_try_lease_concurrent_stats_success(self):
+        self.query_mock.side_effect = lambda *args, **kwargs: [get_resource(0)]
+        leased = get_resource(0, ResourceModel.Status.LEASED).serialize(null_check=False)
+        self.connection_mock.return_value.update_item.return_value = {'Attributes': leased}
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda _: ResourceModel.try_lease(TEST_TEMPLATE_PATH, ResourceModel.Type.ON_DEMAND,
+                                                                'session_id', TEMPLATE_SHA1, PARAMS_SHA1),
+                              range(200)))
+
+        self.assertEqual(ResourceModel.get_lease_stats(), {'attempts': 200, 'leased': 200, 'conflicts': 0})
+
+    def test_try_lease_outdated_resource_skipped(self):
+        self.query_mock.return_value = [get_resource(0, template_sha1='outdated_sha1')]
+
+        resource = ResourceModel.try_lease(TEST_TEMPLATE_PATH, ResourceModel.Type.ON_DEMAND, 'session_id',
+                                           TEMPLATE_SHA1, PARAMS_SHA1)
+
+        self.assertIsNone(resource)
+        self.connection_mock.return_value.update_item.assert_not_called()
+
+    def test_try_lease_query_fail(self):
+        self.query_mock.side_effect = QueryError('Index is being created')
+        self.assertIsNone(ResourceModel.try_lease(TEST_TEMPLATE_PATH, ResourceModel.Type.ON_DEMAND, 'session_id',
+                                                  TEMPLATE_SHA1, PARAMS_SHA1))
+
+    def test_try_lease_update_fail(self):
+        self.query_mock.return_value = [get_resource(0)]
+        self.connection_mock.return_value.update_item.side_effect = get_update_error('InternalServerError')
+        self.assertRaises(UpdateError, ResourceModel.try_lease, TEST_TEMPLATE_PATH, ResourceModel.Type.ON_DEMAND,
+                          'session_id', TEMPLATE_SHA1, PARAMS_SHA1)
+
+    @patch('resource_manager.src.resource_model.lease_notifier')
+    @patch('resource_manager.src.resource_model.TransactWrite')
+    def test_release_many_success(self, transact_write_mock, notifier_mock):
+        resources = [get_resource(i, ResourceModel.Status.LEASED) for i in range(30)]
+
+        ResourceModel.release_many(resources, ResourceModel.Status.AVAILABLE)
+
+        # 25 items per transaction
+        self.assertEqual(transact_write_mock.call_count, 2)
+        transaction = transact_write_mock.return_value.__enter__.return_value
+        self.assertEqual(transaction.update.call_count, 30)
+        for resource in resources:
+            self.assertEqual(resource.status, ResourceModel.Status.AVAILABLE.name)
+            self.assertEqual(resource.available_template_name, TEST_TEMPLATE_PATH)
+        self.assertEqual(notifier_mock.notify.call_count, 30)
+
+    @patch('resource_manager.src.resource_model.ResourceModel.update_status')
+    @patch('resource_manager.src.resource_model.TransactWrite')
+    def test_release_many_transaction_fail_success(self, transact_write_mock, update_status_mock):
+        transact_write_mock.return_value.__exit__.side_effect = TransactWriteError('Transaction cancelled')
+        resources = [get_resource(i, ResourceModel.Status.LEASED) for i in range(2)]
+
+        ResourceModel.release_many(resources, ResourceModel.Status.EXECUTE_FAILED)
+
+        update_status_mock.assert_has_calls([call(resources[0], ResourceModel.Status.EXECUTE_FAILED),
+                                             call(resources[1], ResourceModel.Status.EXECUTE_FAILED)])
+
+    @patch('resource_manager.src.resource_model.Model.save')
+    def test_save_available_index_attribute_success(self, save_mock):
+        resource = get_resource(0)
+        resource.save()
+        self.assertEqual(resource.available_template_name, TEST_TEMPLATE_PATH)
+        resource.status = ResourceModel.Status.LEASED.name
+        resource.save()
+        self.assertIsNone(resource.available_template_name)
+        self.assertEqual(save_mock.call_count, 2)
+
+    @patch('resource_manager.src.resource_model.ResourceModel.exists', return_value=True)
+    def test_create_ddb_table_missing_index_success(self, exists_mock):
+        client_mock = self.connection_mock.return_value.connection.client
+        existing_indexes = [{'IndexName': 'available-index', 'IndexStatus': 'ACTIVE'},
+                            {'IndexName': 'status-index', 'IndexStatus': 'ACTIVE'}]
+        all_indexes = existing_indexes + [{'IndexName': 'test-session-index', 'IndexStatus': 'ACTIVE'}]
+        client_mock.describe_table.side_effect = [
+            {'Table': {'GlobalSecondaryIndexes': existing_indexes}},
+            {'Table': {'GlobalSecondaryIndexes': all_indexes}},
+            {'Table': {'GlobalSecondaryIndexes': all_indexes, 'StreamSpecification': STREAM_SPECIFICATION}}]
+
+        ResourceModel.create_ddb_table()
+
+        client_mock.update_table.assert_called_once()
+        update_kwargs = client_mock.update_table.call_args[1]
+        self.assertEqual(update_kwargs['GlobalSecondaryIndexUpdates'][0]['Create']['IndexName'],
+                         'test-session-index')
+        self.assertCountEqual(update_kwargs['AttributeDefinitions'],
+                              [{'AttributeName': 'test_session_id', 'AttributeType': 'S'},
+                               {'AttributeName': 'status', 'AttributeType': 'S'}])
+
+    @patch('resource_manager.src.resource_model.ResourceModel.exists', return_value=True)
+    @patch('resource_manager.src.constants.ddb_index_wait_time_out_secs', 10)
+    @patch('resource_manager.src.resource_model.time.sleep')
+    @patch('resource_manager.src.resource_model.time.monotonic')
+    def test_create_ddb_table_index_not_active_fail(self, monotonic_mock, sleep_mock, exists_mock):
+        monotonic_mock.side_effect = range(0, 100, 5)
+        client_mock = self.connection_mock.return_value.connection.client
+        client_mock.describe_table.return_value = {'Table': {'GlobalSecondaryIndexes': [
+            {'IndexName': 'available-index', 'IndexStatus': 'ACTIVE'},
+            {'IndexName': 'status-index', 'IndexStatus': 'ACTIVE'}]}}
+
+        self.assertRaises(Exception, ResourceModel.create_ddb_table)
+
+        self.assertEqual(sleep_mock.call_count, 1)
+        client_mock.get_waiter.assert_not_called()
+
+    @patch('resource_manager.src.resource_model.ResourceModel.exists', return_value=True)
+    def test_create_ddb_table_existing_index_success(self, exists_mock):
+        client_mock = self.connection_mock.return_value.connection.client
+        client_mock.describe_table.return_value = {'Table': {'GlobalSecondaryIndexes': [
+            {'IndexName': 'available-index', 'IndexStatus': 'ACTIVE'},
+            {'IndexName': 'status-index', 'IndexStatus': 'ACTIVE'},
+            {'IndexName': 'test-session-index', 'IndexStatus': 'ACTIVE'}], 'StreamSpecification': STREAM_SPECIFICATION}}
+
+        ResourceModel.create_ddb_table()
+
+        client_mock.update_table.assert_not_called()
+
+    @patch('resource_manager.src.resource_model.ResourceModel.exists', return_value=True)
+    def test_create_ddb_table_missing_stream_success(self, exists_mock):
+        client_mock = self.connection_mock.return_value.connection.client
+        client_mock.describe_table.return_value = {'Table': {'GlobalSecondaryIndexes': [
+            {'IndexName': 'available-index', 'IndexStatus': 'ACTIVE'},
+            {'IndexName': 'status-index', 'IndexStatus': 'ACTIVE'},
+            {'IndexName': 'test-session-index', 'IndexStatus': 'ACTIVE'}]}}
+
+        ResourceModel.create_ddb_table()
+
+        client_mock.update_table.assert_called_once_with(TableName=ResourceModel.Meta.table_name,
+                                                         StreamSpecification=STREAM_SPECIFICATION)
+        client_mock.get_waiter.assert_called_once_with('table_exists')
+        client_mock.get_waiter.return_value.wait.assert_called_once_with(TableName=ResourceModel.Meta.table_name)
+
+    @patch('resource_manager.src.resource_model.StatusIndex.query')
+    def test_get_resources_by_statuses_success(self, query_mock):
+        leased = get_resource(0, ResourceModel.Status.LEASED)
+        creating = get_resource(1, ResourceModel.Status.CREATING)
+        query_mock.side_effect = [[leased], [creating]]
+
+        resources = ResourceModel.get_resources_by_statuses([ResourceModel.Status.LEASED,
+                                                             ResourceModel.Status.CREATING])
+
+        self.assertEqual(resources, [leased, creating])
+        query_mock.assert_has_calls([call(ResourceModel.Status.LEASED.name),
+                                     call(ResourceModel.Status.CREATING.name)])
+
+    @patch('resource_manager.src.resource_model.SessionIndex.query')
+    def test_get_resources_by_session_success(self, query_mock):
+        leased = get_resource(0, ResourceModel.Status.LEASED)
+        query_mock.return_value = [leased]
+
+        resources = ResourceModel.get_resources_by_session('session_id', [ResourceModel.Status.LEASED])
+
+        self.assertEqual(resources, [leased])
+        self.assertEqual(query_mock.call_args[0][0], 'session_id')
+        self.assertIsNotNone(query_mock.call_args[1]['filter_condition'])
+
+    @patch('resource_manager.src.resource_model.ResourceModel.scan')
+    def test_scan_parallel_success(self, scan_mock):
+        scan_mock.side_effect = lambda filter_condition, segment, total_segments: [get_resource(segment)]
+
+        resources = ResourceModel.scan_parallel(total_segments=3)
+
+        self.assertEqual([r.cf_stack_name for r in resources],
+                         ['TestTemplate-ON-DEMAND-0', 'TestTemplate-ON-DEMAND-1', 'TestTemplate-ON-DEMAND-2'])
+        self.assertEqual(scan_mock.call_count, 3)
+        for segment in range(3):
+            scan_mock.assert_any_call(None, segment=segment, total_segments=3)
@@ -1,5 +1,7 @@
+import threading
 import unittest
 import pytest
+import resource_manager.src.config as config
 import resource_manager.src.util.yaml_util as yaml_util
 from unittest.mock import patch, MagicMock, call, mock_open
 from resource_manager.src.resource_pool import ResourcePool
@@ -37,10 +39,18 @@ class TestResourcePool(unittest.TestCase):
         self.cfn_input_param_sha1 = yaml_util.get_yaml_content_sha1_hash({'TestParamA': 'test_value'})
         self.mock_file_patcher = patch('builtins.open', mock_open(read_data=self.file_data_dummy))
         self.mock_file = self.mock_file_patcher.start()
+        # By default no resource is leased by conditional update, resources are taken from template query
+        self.try_lease_patcher = patch('resource_manager.src.resource_model.ResourceModel.try_lease',
+                                       return_value=None)
+        self.try_lease_mock = self.try_lease_patcher.start()
+        self.transact_write_patcher = patch('resource_manager.src.resource_model.TransactWrite')
+        self.transact_write_mock = self.transact_write_patcher.start()
 
     def tearDown(self):
         self.os_path_patcher.stop()
         self.mock_file_patcher.stop()
+        self.try_lease_patcher.stop()
+        self.transact_write_patcher.stop()
 
     def test_add_cfn_templates_success(self):
         self.os_path_mock.splitext.side_effect = [('TestTemplateA', 'yml'),
@@ -355,10 +365,14 @@ class TestResourcePool(unittest.TestCase):
         self.cfn_helper_mock.deploy_cf_stack.assert_called_once()
 
     @patch('resource_manager.src.resource_model.ResourceModel.query')
-    @patch('time.sleep')
+    @patch('resource_manager.src.resource_lease_notifier.ResourceLeaseNotifier.wait')
     @patch('resource_manager.src.config.pool_size', {TEST_TEMP_NAME: {ResourceModel.Type.ON_DEMAND: 2}})
-    def test_pull_resources_on_demand_by_template_name_timeout_fail(self, sleep_mock, query_mock):
-        sleep_mock.side_effect = MockSleep().sleep
+    @patch('resource_manager.src.constants.wait_time_out_secs', 10)
+    @patch('resource_manager.src.resource_pool.time.monotonic')
+    def test_pull_resources_on_demand_by_template_name_timeout_fail(self, monotonic_mock, wait_mock, query_mock):
+        # Waits are woken up early, only elapsed time counts to timeout
+        monotonic_mock.side_effect = range(0, 100, 2)
+        wait_mock.return_value = False
         self.os_path_mock.splitext.return_value = (self.TEST_TEMP_NAME, 'yml')
 
         r1 = MagicMock()
@@ -378,6 +392,76 @@ class TestResourcePool(unittest.TestCase):
         cfn_template = (self.TEST_TEMP_NAME + ".yml", self.rm.cfn_templates[self.TEST_TEMP_NAME + ".yml"])
 
         self.assertRaises(Exception, self.rm.pull_resource_by_template, cfn_template)
+        self.assertEqual(wait_mock.call_count, 4)
+
+    @patch('resource_manager.src.resource_model.ResourceModel.query')
+    @patch('resource_manager.src.config.pool_size', {TEST_TEMP_NAME: {ResourceModel.Type.ON_DEMAND: 2}})
+    def test_pull_resources_on_demand_by_template_name_try_lease_success(self, query_mock):
+        self.os_path_mock.splitext.return_value = (self.TEST_TEMP_NAME, 'yml')
+        leased = MagicMock()
+        leased.configure_mock(cf_stack_index=1,
+                              type=ResourceModel.Type.ON_DEMAND.name,
+                              status=ResourceModel.Status.LEASED.name)
+        self.try_lease_mock.return_value = leased
+
+        cfn_templates = '|CfnTemplatePath|ResourceType|TestParamA|\n' \
+                        '|{}.yml         |   ON_DEMAND|test_value|'.format(self.TEST_TEMP_NAME)
+        self.rm.add_cfn_templates(cfn_templates)
+        cfn_template = (self.TEST_TEMP_NAME + ".yml", self.rm.cfn_templates[self.TEST_TEMP_NAME + ".yml"])
+        resource = self.rm.pull_resource_by_template(cfn_template)
+
+        self.assertEqual(resource, leased)
+        self.try_lease_mock.assert_called_once_with(self.TEST_TEMP_NAME + ".yml", ResourceModel.Type.ON_DEMAND,
+                                                    self.dummy_test_session_id, self.cfn_content_sha1,
+                                                    self.cfn_input_param_sha1, [])
+        query_mock.assert_not_called()
+
+    @patch('resource_manager.src.resource_model.ResourceModel.query')
+    @patch('resource_manager.src.resource_model.ResourceModel.create')
+    @patch('resource_manager.src.config.pool_size', {TEST_TEMP_NAME: {ResourceModel.Type.SHARED: 1}})
+    def test_pull_resources_shared_by_template_name_no_try_lease_success(self, create_mock, query_mock):
+        self.os_path_mock.splitext.return_value = (self.TEST_TEMP_NAME, 'yml')
+        query_mock.return_value = []
+        create_mock.return_value = MagicMock()
+
+        cfn_templates = '|CfnTemplatePath|ResourceType|TestParamA|\n' \
+                        '|{}.yml         |      SHARED|test_value|'.format(self.TEST_TEMP_NAME)
+        self.rm.add_cfn_templates(cfn_templates)
+        cfn_template = (self.TEST_TEMP_NAME + ".yml", self.rm.cfn_templates[self.TEST_TEMP_NAME + ".yml"])
+        self.rm.pull_resource_by_template(cfn_template)
+
+        self.try_lease_mock.assert_not_called()
+        query_mock.assert_called_once()
+
+    @patch('resource_manager.src.resource_model.ResourceModel.query')
+    @patch('resource_manager.src.resource_lease_notifier.ResourceLeaseNotifier.wait')
+    @patch('resource_manager.src.config.pool_size', {TEST_TEMP_NAME: {ResourceModel.Type.ON_DEMAND: 1}})
+    def test_pull_resources_on_demand_by_template_name_wait_released_success(self, wait_mock, query_mock):
+        self.os_path_mock.splitext.return_value = (self.TEST_TEMP_NAME, 'yml')
+        r1 = MagicMock()
+        r1.configure_mock(cf_stack_index=0,
+                          type=ResourceModel.Type.ON_DEMAND.name,
+                          status=ResourceModel.Status.LEASED.name,
+                          cf_template_sha1=self.cfn_content_sha1,
+                          cf_input_parameters_sha1=self.cfn_input_param_sha1)
+
+        def release_resource(cfn_template_name, version, timeout_secs):
+            r1.status = ResourceModel.Status.AVAILABLE.name
+            return True
+        wait_mock.side_effect = release_resource
+        query_mock.return_value = [r1]
+
+        cfn_templates = '|CfnTemplatePath|ResourceType|TestParamA|\n' \
+                        '|{}.yml         |   ON_DEMAND|test_value|'.format(self.TEST_TEMP_NAME)
+        self.rm.add_cfn_templates(cfn_templates)
+        cfn_template = (self.TEST_TEMP_NAME + ".yml", self.rm.cfn_templates[self.TEST_TEMP_NAME + ".yml"])
+        resource = self.rm.pull_resource_by_template(cfn_template)
+
+        self.assertEqual(resource.status, ResourceModel.Status.LEASED.name)
+        self.assertEqual(query_mock.call_count, 2)
+        wait_mock.assert_called_once()
+        self.assertEqual(wait_mock.call_args[0][0], self.TEST_TEMP_NAME + ".yml")
+        r1.save.assert_called_once()
 
     @patch('resource_manager.src.resource_model.ResourceModel.query')
     @patch('resource_manager.src.config.pool_size', {TEST_TEMP_NAME: {ResourceModel.Type.ON_DEMAND: 2},
@@ -700,52 +784,139 @@ class TestResourcePool(unittest.TestCase):
         r3.save.assert_called_once()
         r1.save.assert_called_once()
 
-    @patch('resource_manager.src.resource_model.ResourceModel.scan')
-    def test_fix_stalled_resources_success(self, scan_mock):
+    def test_add_cfn_templates_dependency_templates_success(self):
+        self.os_path_mock.splitext.side_effect = [('TestTemplateA', 'yml'),
+                                                  ('TestTemplateB', 'yml'),
+                                                  ('RoleA', 'yml'),
+                                                  ('RoleB', 'yml')]
+
+        cfn_templates = "|CfnTemplatePath   |ResourceType|TestParamA                             |\n" \
+                        "|TestTemplateA.yml |ON_DEMAND   |test_value                             |\n" \
+                        "|TestTemplateB.yml |ON_DEMAND   |{{cfn-output:TestTemplateA>TestParamA}}|\n" \
+                        "|RoleA.yml         |ASSUME_ROLE |                                       |\n" \
+                        "|RoleB.yml         |ASSUME_ROLE |                                       |"
+        self.rm.add_cfn_templates(cfn_templates)
+
+        dependencies = {path: config[ResourcePool.CFN_DEPENDENCY_TEMPLATES_PARAM]
+                        for path, config in self.rm.cfn_templates.items()}
+        self.assertEqual(dependencies, {'TestTemplateA.yml': [],
+                                        'TestTemplateB.yml': ['TestTemplateA.yml'],
+                                        'RoleA.yml': [],
+                                        'RoleB.yml': ['RoleA.yml']})
+
+    @patch('resource_manager.src.resource_pool.ResourcePool.pull_resource_by_template')
+    def test_pull_resources_parallel_by_dependencies_success(self, pull_resource_mock):
+        self.os_path_mock.splitext.side_effect = [('TestTemplateA', 'yml'),
+                                                  ('TestTemplateB', 'yml'),
+                                                  ('TestTemplateC', 'yml')]
+        # Independent templates A and B are pulled at the same time, otherwise barrier times out
+        barrier = threading.Barrier(2, timeout=5)
+        pulled_templates = []
+
+        def pull_resource(cfn_template):
+            if cfn_template[0] != 'TestTemplateC.yml':
+                barrier.wait()
+            pulled_templates.append(cfn_template[0])
+            return MagicMock()
+        pull_resource_mock.side_effect = pull_resource
+
+        cfn_templates = "|CfnTemplatePath   |ResourceType|TestParamA                             |\n" \
+                        "|TestTemplateA.yml |ON_DEMAND   |test_value                             |\n" \
+                        "|TestTemplateB.yml |ON_DEMAND   |test_value                             |\n" \
+                        "|TestTemplateC.yml |ON_DEMAND   |{{cfn-output:TestTemplateA>TestParamA}}|"
+        self.rm.add_cfn_templates(cfn_templates)
+        resources = self.rm.pull_resources()
+
+        self.assertEqual(pull_resource_mock.call_count, 3)
+        self.assertEqual(pulled_templates[2], 'TestTemplateC.yml')
+        for cfn_config in resources.values():
+            self.assertIsNotNone(cfn_config[ResourcePool.CFN_RESOURCE_PARAM])
+
+    @patch('resource_manager.src.resource_pool.ResourcePool.pull_resource_by_template')
+    def test_pull_resources_parallel_fail(self, pull_resource_mock):
+        self.os_path_mock.splitext.side_effect = [('TestTemplateA', 'yml'),
+                                                  ('TestTemplateB', 'yml'),
+                                                  ('TestTemplateC', 'yml')]
+        resource_b = MagicMock()
+
+        def pull_resource(cfn_template):
+            if cfn_template[0] == 'TestTemplateA.yml':
+                raise Exception('Failed to pull resource')
+            return resource_b
+        pull_resource_mock.side_effect = pull_resource
+
+        cfn_templates = "|CfnTemplatePath   |ResourceType|TestParamA                             |\n" \
+                        "|TestTemplateA.yml |ON_DEMAND   |test_value                             |\n" \
+                        "|TestTemplateB.yml |ON_DEMAND   |test_value                             |\n" \
+                        "|TestTemplateC.yml |ON_DEMAND   |{{cfn-output:TestTemplateA>TestParamA}}|"
+        self.rm.add_cfn_templates(cfn_templates)
+        self.assertRaises(Exception, self.rm.pull_resources)
+
+        # Dependent template is not pulled, pulled resource is tracked to be released
+        self.assertEqual(pull_resource_mock.call_count, 2)
+        self.assertEqual(self.rm.cfn_templates['TestTemplateB.yml'][ResourcePool.CFN_RESOURCE_PARAM], resource_b)
+        self.assertIsNone(self.rm.cfn_templates['TestTemplateC.yml'][ResourcePool.CFN_RESOURCE_PARAM])
+
+    @patch('resource_manager.src.resource_model.ResourceModel.get_resources_by_session')
+    def test_fix_stalled_resources_success(self, get_resources_by_session_mock):
         r1 = MagicMock()
         r1.configure_mock(status=ResourceModel.Status.LEASED.name,
                           test_session_id=self.dummy_test_session_id)
         r2 = MagicMock()
         r2.configure_mock(status=ResourceModel.Status.CREATING.name,
                           test_session_id=self.dummy_test_session_id)
-        scan_mock.return_value = [r1, r2]
+        get_resources_by_session_mock.return_value = [r1, r2]
 
         self.rm.fix_stalled_resources()
 
+        get_resources_by_session_mock.assert_called_once_with(self.dummy_test_session_id,
+                                                              [ResourceModel.Status.LEASED,
+                                                               ResourceModel.Status.CREATING,
+                                                               ResourceModel.Status.DELETING,
+                                                               ResourceModel.Status.UPDATING])
         self.assertEqual(r1.status, ResourceModel.Status.AVAILABLE.name)
         r2.delete.assert_called_once()
 
     @patch('resource_manager.src.resource_model.ResourceModel.scan')
-    def test_fix_stalled_resources_no_session_success(self, scan_mock):
+    @patch('resource_manager.src.resource_model.ResourceModel.status_index')
+    def test_fix_stalled_resources_no_session_success(self, status_index_mock, scan_mock):
         r1 = MagicMock()
         r1.configure_mock(status=ResourceModel.Status.LEASED.name,
                           test_session_id='dummy_test_session_id_a')
         r2 = MagicMock()
         r2.configure_mock(status=ResourceModel.Status.CREATING.name,
                           test_session_id='dummy_test_session_id_b')
-        scan_mock.return_value = [r1, r2]
+        resources_by_status = {ResourceModel.Status.LEASED.name: [r1], ResourceModel.Status.CREATING.name: [r2]}
+        status_index_mock.query.side_effect = lambda status: resources_by_status.get(status, [])
         rm = ResourcePool(self.cfn_helper_mock, self.s3_helper_mock, dict(), None, None)
         rm.fix_stalled_resources()
 
+        self.assertEqual(status_index_mock.query.call_count, 4)
+        scan_mock.assert_not_called()
         self.assertEqual(r1.status, ResourceModel.Status.AVAILABLE.name)
         r2.delete.assert_called_once()
 
     @patch('resource_manager.src.resource_model.ResourceModel.scan')
-    def test_fix_stalled_resources_no_deletion_success(self, scan_mock):
+    @patch('resource_manager.src.resource_model.ResourceModel.session_index')
+    def test_fix_stalled_resources_no_deletion_success(self, session_index_mock, scan_mock):
         r1 = MagicMock()
         r1.configure_mock(status=ResourceModel.Status.LEASED.name,
                           test_session_id=self.dummy_test_session_id)
         r2 = MagicMock()
         r2.configure_mock(status=ResourceModel.Status.CREATING.name,
                           test_session_id='dummy_bad_test_session_id')
-        scan_mock.return_value = [r1, r2]
+        resources_by_session = {self.dummy_test_session_id: [r1], 'dummy_bad_test_session_id': [r2]}
+        session_index_mock.query.side_effect = \
+            lambda session_id, filter_condition=None: resources_by_session.get(session_id, [])
 
         self.rm.fix_stalled_resources()
 
+        session_index_mock.query.assert_called_once()
+        scan_mock.assert_not_called()
         self.assertEqual(r1.status, ResourceModel.Status.AVAILABLE.name)
         r2.delete.assert_not_called()
 
-    @patch('resource_manager.src.resource_model.ResourceModel.scan')
+    @patch('resource_manager.src.resource_model.ResourceModel.scan_parallel')
     @patch('resource_manager.src.resource_model.ResourceModel.delete_table')
     def test_destroy_all_resources_success(self, delete_table_mock, scan_mock):
         r1 = MagicMock()
@@ -757,12 +928,17 @@ class TestResourcePool(unittest.TestCase):
 
         self.rm.destroy_all_resources()
 
-        self.cfn_helper_mock.delete_cf_stack.assert_has_calls([call('stack_name_1'), call('stack_name_2')])
+        scan_mock.assert_called_once()
+        # Stacks are deleted concurrently, so deletion order is not defined
+        self.cfn_helper_mock.delete_cf_stack.assert_has_calls([call('stack_name_1'), call('stack_name_2')],
+                                                              any_order=True)
+        r1.delete.assert_called_once()
+        r2.delete.assert_called_once()
         self.s3_helper_mock.delete_bucket.assert_called_once()
         self.s3_helper_mock.get_bucket_name.assert_called_once()
         delete_table_mock.assert_called_once()
 
-    @patch('resource_manager.src.resource_model.ResourceModel.scan')
+    @patch('resource_manager.src.resource_model.ResourceModel.scan_parallel')
     @patch('resource_manager.src.resource_model.ResourceModel.delete_table')
     @patch('time.sleep')
     def test_destroy_all_resources_with_dependents_success(self, patched_sleep, delete_table_mock, scan_mock):
@@ -777,25 +953,19 @@ class TestResourcePool(unittest.TestCase):
                           cfn_dependency_stacks='[stack_name_1]',
                           status=ResourceModel.Status.AVAILABLE.name)
 
-        r3 = MagicMock()
-        r3.configure_mock(cf_stack_name='stack_name_2',
-                          cfn_dependency_stacks='[stack_name_1]',
-                          status=ResourceModel.Status.DELETED.name)
-
-        r4 = MagicMock()
-        r4.configure_mock(cf_stack_name='stack_name_1',
-                          status=ResourceModel.Status.DELETED.name)
-
-        scan_mock.side_effect = [[r1, r2], [r1, r3], [r4, r3]]
+        scan_mock.return_value = [r1, r2]
 
         self.rm.destroy_all_resources()
 
-        self.assertEqual(self.cfn_helper_mock.delete_cf_stack.call_count, 2)
+        scan_mock.assert_called_once()
+        self.cfn_helper_mock.delete_cf_stack.assert_has_calls([call('stack_name_2'), call('stack_name_1')])
+        self.assertEqual(r1.status, ResourceModel.Status.DELETED.name)
+        self.assertEqual(r2.status, ResourceModel.Status.DELETED.name)
         self.s3_helper_mock.delete_bucket.assert_called_once()
         self.s3_helper_mock.get_bucket_name.assert_called_once()
         delete_table_mock.assert_called_once()
 
-    @patch('resource_manager.src.resource_model.ResourceModel.scan')
+    @patch('resource_manager.src.resource_model.ResourceModel.scan_parallel')
     @patch('resource_manager.src.resource_model.ResourceModel.delete_table')
     @patch('time.sleep')
     def test_destroy_all_resources_with_dependents_failed(self, patched_sleep, delete_table_mock, scan_mock):
@@ -810,20 +980,15 @@ class TestResourcePool(unittest.TestCase):
                           cfn_dependency_stacks='[stack_name_1]',
                           status=ResourceModel.Status.AVAILABLE.name)
 
-        r3 = MagicMock()
-        r3.configure_mock(cf_stack_name='stack_name_2',
-                          cfn_dependency_stacks='[stack_name_1]',
-                          status=ResourceModel.Status.DELETE_FAILED.name)
-
-        r4 = MagicMock()
-        r4.configure_mock(cf_stack_name='stack_name_1',
-                          status=ResourceModel.Status.AVAILABLE.name)
-
-        scan_mock.side_effect = [[r1, r2], [r1, r3], [r4, r3]]
+        scan_mock.return_value = [r1, r2]
+        self.cfn_helper_mock.delete_cf_stack.side_effect = Exception('dummy_exception')
 
         self.assertRaises(Exception, self.rm.destroy_all_resources)
 
-        self.cfn_helper_mock.delete_cf_stack.assert_has_calls([call('stack_name_2')])
+        self.cfn_helper_mock.delete_cf_stack.assert_called_once_with('stack_name_2')
+        self.assertEqual(r1.status, ResourceModel.Status.DELETE_FAILED.name)
+        self.assertEqual(r2.status, ResourceModel.Status.DELETE_FAILED.name)
+        r1.delete.assert_not_called()
         self.s3_helper_mock.get_bucket_name.assert_called_once()
         self.s3_helper_mock.delete_bucket.assert_not_called()
         delete_table_mock.assert_not_called()
@@ -981,6 +1146,10 @@ class TestResourcePool(unittest.TestCase):
         self.assertEqual(ResourceModel.Status.AVAILABLE.name, assume_role.status)
 
         self.cfn_helper_mock.delete_cf_stack.assert_not_called()
+        # Both failed resources are updated in single transaction
+        transaction = self.transact_write_mock.return_value.__enter__.return_value
+        self.assertEqual(transaction.update.call_count, 2)
+        self.transact_write_mock.assert_called_once()
 
     def test_release_resources_on_test_fail_release_failed_resources_success(self):
         on_demand = MagicMock()
@@ -1027,3 +1196,45 @@ class TestResourcePool(unittest.TestCase):
         self.assertEqual(ResourceModel.Status.AVAILABLE.name, assume_role.status)
 
         self.cfn_helper_mock.delete_cf_stack.assert_called_once()
+
+    def test_get_s3_cfn_content_cached_by_etag_success(self):
+        ResourcePool.s3_cfn_cache.clear()
+        self.s3_helper_mock.get_file_etag.side_effect = ['etag_1', 'etag_1', 'etag_2']
+        self.s3_helper_mock.get_file_content.return_value = self.file_data_dummy
+
+        content_1 = self.rm._get_s3_cfn_content('assume_roles.yml')
+        content_2 = self.rm._get_s3_cfn_content('assume_roles.yml')
+        content_3 = self.rm._get_s3_cfn_content('assume_roles.yml')
+
+        self.assertIs(content_1, content_2)
+        self.assertIsNot(content_1, content_3)
+        self.assertEqual(self.s3_helper_mock.get_file_content.call_count, 2)
+        ResourcePool.s3_cfn_cache.clear()
+
+    def test_get_s3_cfn_content_not_exist_success(self):
+        self.s3_helper_mock.get_file_etag.return_value = None
+
+        content = self.rm._get_s3_cfn_content('assume_roles.yml')
+
+        self.assertEqual(content['Resources'], {})
+        self.s3_helper_mock.get_file_content.assert_not_called()
+
+    @patch('resource_manager.src.util.yaml_util.is_equal')
+    @patch('resource_manager.src.util.yaml_util.get_yaml_file_sha1_hash', return_value='role_sha1')
+    def test_is_assume_role_merged_cached_success(self, sha1_mock, is_equal_mock):
+        ResourcePool.s3_cfn_cache.clear()
+        ResourcePool.assume_role_merged_cache.clear()
+        is_equal_mock.return_value = True
+        self.s3_helper_mock.get_file_etag.return_value = 'etag_1'
+        self.s3_helper_mock.get_file_content.return_value = self.file_data_dummy
+        role_content = yaml_util.loads_yaml(self.file_data_dummy)
+
+        for i in range(3):
+            existing = self.rm._get_s3_cfn_content(config.ssm_assume_role_cfn_s3_path)
+            self.assertTrue(self.rm._is_assume_role_merged(existing, 'RoleA.yml', role_content))
+
+        is_equal_mock.assert_called_once()
+        self.s3_helper_mock.get_file_content.assert_called_once()
+        self.assertEqual(self.s3_helper_mock.get_file_etag.call_count, 3)
+        ResourcePool.s3_cfn_cache.clear()
+        ResourcePool.assume_role_merged_cache.clear()
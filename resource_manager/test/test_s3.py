@@ -48,6 +48,9 @@ class TestS3(unittest.TestCase):
         }
         self.session_mock.resource.side_effect = lambda service_name, config=None: \
             self.resource_side_effect_map.get(service_name)
+        # Clients are pooled per session, so us-east-1 session should return same mocked services.
+        self.session_mock_east1.client.side_effect = self.session_mock.client.side_effect
+        self.session_mock_east1.resource.side_effect = self.session_mock.resource.side_effect
 
         self.s3_helper = S3(self.session_mock, self.mock_aws_account)
         self.s3_helper_east1 = S3(self.session_mock_east1, self.mock_aws_account)
@@ -222,6 +225,21 @@ class TestS3(unittest.TestCase):
         key_exists = self.s3_helper.bucket_key_exist("test_bucket", "test_file")
         self.assertFalse(key_exists)
 
+    def test_get_file_etag_success(self):
+        self.mock_s3_service.head_object.return_value = {'ETag': '"test_etag"'}
+        etag = self.s3_helper.get_file_etag("test_bucket", "test_file")
+        self.assertEqual(etag, '"test_etag"')
+        self.mock_s3_service.head_object.assert_called_once_with(Bucket="test_bucket", Key="test_file",
+                                                                 ExpectedBucketOwner=self.mock_aws_account)
+
+    def test_get_file_etag_not_found_success(self):
+        self.mock_s3_service.head_object.side_effect = ClientError({'Error': {'Code': '404'}}, "HeadObject")
+        self.assertIsNone(self.s3_helper.get_file_etag("test_bucket", "test_file"))
+
+    def test_get_file_etag_fail(self):
+        self.mock_s3_service.head_object.side_effect = ClientError({'Error': {'Code': '403'}}, "HeadObject")
+        self.assertRaises(ClientError, self.s3_helper.get_file_etag, "test_bucket", "test_file")
+
     def test_upload_local_file_to_account_unique_bucket_passed_wo_postfix(self):
         # Result - bucket NOT exist and passed to helper method and will be created
         self.mock_s3_resource.buckets.all.return_value = []
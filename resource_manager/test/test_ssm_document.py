@@ -6,7 +6,6 @@ import pytest
 
 import resource_manager.src.constants as constants
 import resource_manager.src.util.boto3_client_factory as client_factory
-from resource_manager.test.util.mock_sleep import MockSleep
 from resource_manager.src.ssm_document import SsmDocument
 
 SSM_EXECUTION_ID = '123456'
@@ -36,6 +35,18 @@ def prepare_execution_description(step_name, status):
     }
 
 
+def prepare_execution_metadata(execution_id, status):
+    return {
+        'AutomationExecutionMetadataList': [
+            {
+                'AutomationExecutionId': execution_id,
+                'DocumentName': SSM_DOCUMENT_NAME,
+                'AutomationExecutionStatus': status
+            }
+        ]
+    }
+
+
 def prepare_execution_description_with_multiple_steps():
     initial: dict = {
         'AutomationExecution':
@@ -70,6 +81,7 @@ def prepare_execution_description_with_multiple_steps():
 
 
 @pytest.mark.unit_test
+@patch('resource_manager.src.constants.ssm_monitor_poll_time_secs', 0.01)
 class TestSsmDocument(unittest.TestCase):
     def setUp(self):
         self.region_name = 'test_region'
@@ -93,36 +105,17 @@ class TestSsmDocument(unittest.TestCase):
         self.assertRaises(Exception, self.ssm_document.execute, 'test_document_name',
                           {'test_param_1': ['test_value_1']})
 
-    @patch('time.sleep')
-    @patch('time.time')
-    def test_wait_for_execution_completion(self, patched_time, patched_sleep):
-        mock_sleep = MockSleep()
-        patched_time.side_effect = mock_sleep.time
-        patched_sleep.side_effect = mock_sleep.sleep
-
-        execution_1 = {'AutomationExecution':
-                       {'StepExecutions': [{'StepStatus': 'InProgress',
-                                            'StepName': 'test_step',
-                                            'StepExecutionId': '11111'}],
-                        'AutomationExecutionStatus': 'InProgress'}}
-        execution_2 = {'AutomationExecution':
-                       {'StepExecutions': [{'StepStatus': 'InProgress',
-                                            'StepName': 'test_step',
-                                            'StepExecutionId': '11111'}],
-                        'AutomationExecutionStatus': 'Pending'}}
-        execution_3 = {'AutomationExecution':
-                       {'StepExecutions': [{'StepStatus': 'InProgress',
-                                            'StepName': 'test_step',
-                                            'StepExecutionId': '11111'}],
-                        'AutomationExecutionStatus': 'Completed'}}
-
-        self.mock_ssm.get_automation_execution.side_effect = [execution_1, execution_2, execution_3]
+    def test_wait_for_execution_completion(self):
+        self.mock_ssm.describe_automation_executions.side_effect = [
+            prepare_execution_metadata('123456', 'InProgress'),
+            prepare_execution_metadata('123456', 'Pending'),
+            prepare_execution_metadata('123456', 'Completed')]
 
         status = self.ssm_document.wait_for_execution_completion('123456', 'test_document_name')
         self.assertEqual('Completed', status)
-        self.mock_ssm.get_automation_execution.assert_has_calls([call(AutomationExecutionId='123456'),
-                                                                 call(AutomationExecutionId='123456'),
-                                                                 call(AutomationExecutionId='123456')])
+        self.mock_ssm.describe_automation_executions.assert_has_calls(
+            [call(Filters=[{'Key': 'ExecutionId', 'Values': ['123456']}])] * 3)
+        self.mock_ssm.get_automation_execution.assert_not_called()
 
     def test_execute_success(self):
         self.mock_ssm.list_document_versions.return_value = {'DocumentVersions': ['test_document_name']}
@@ -132,13 +125,7 @@ class TestSsmDocument(unittest.TestCase):
         self.mock_ssm.start_automation_execution.assert_called_once()
 
     # Test wait_for_execution_step_status_is_terminal_or_waiting
-    @patch('time.sleep')
-    @patch('time.time')
-    def test_wait_for_execution_step_status_is_terminal_or_waiting_success(self, patched_time, patched_sleep):
-        mock_sleep = MockSleep()
-        patched_time.side_effect = mock_sleep.time
-        patched_sleep.side_effect = mock_sleep.sleep
-
+    def test_wait_for_execution_step_status_is_terminal_or_waiting_success(self):
         execution_1 = prepare_execution_description(SSM_STEP_NAME, 'InProgress')
         execution_2 = prepare_execution_description(SSM_STEP_NAME, 'InProgress')
         execution_3 = prepare_execution_description(SSM_STEP_NAME, 'Success')
@@ -150,13 +137,7 @@ class TestSsmDocument(unittest.TestCase):
         )
         self.assertEqual("Success", status)
 
-    @patch('time.sleep')
-    @patch('time.time')
-    def test_wait_for_execution_step_status_is_terminal_or_waiting_waiting(self, patched_time, patched_sleep):
-        mock_sleep = MockSleep()
-        patched_time.side_effect = mock_sleep.time
-        patched_sleep.side_effect = mock_sleep.sleep
-
+    def test_wait_for_execution_step_status_is_terminal_or_waiting_waiting(self):
         execution_1 = prepare_execution_description(SSM_STEP_NAME, 'InProgress')
         execution_2 = prepare_execution_description(SSM_STEP_NAME, 'InProgress')
         execution_3 = prepare_execution_description(SSM_STEP_NAME, 'Waiting')
@@ -168,27 +149,15 @@ class TestSsmDocument(unittest.TestCase):
         )
         self.assertEqual("Waiting", status)
 
-    @patch('time.sleep')
-    @patch('time.time')
-    def test_wait_for_execution_step_status_is_terminal_or_waiting_timeout(self, patched_time, patched_sleep):
-        mock_sleep = MockSleep()
-        patched_time.side_effect = mock_sleep.time
-        patched_sleep.side_effect = mock_sleep.sleep
-
+    def test_wait_for_execution_step_status_is_terminal_or_waiting_timeout(self):
         self.mock_ssm.get_automation_execution.return_value = prepare_execution_description(SSM_STEP_NAME, 'InProgress')
 
         status = self.ssm_document.wait_for_execution_step_status_is_terminal_or_waiting(
-            SSM_EXECUTION_ID, SSM_DOCUMENT_NAME, SSM_STEP_NAME, 10
+            SSM_EXECUTION_ID, SSM_DOCUMENT_NAME, SSM_STEP_NAME, 0.05
         )
         self.assertEqual("WaitTimedOut", status)
 
-    @patch('time.sleep')
-    @patch('time.time')
-    def test_wait_for_execution_step_status_is_in_progress(self, patched_time, patched_sleep):
-        mock_sleep = MockSleep()
-        patched_time.side_effect = mock_sleep.time
-        patched_sleep.side_effect = mock_sleep.sleep
-
+    def test_wait_for_execution_step_status_is_in_progress(self):
         execution_1 = prepare_execution_description(SSM_STEP_NAME, 'Pending')
         execution_2 = prepare_execution_description(SSM_STEP_NAME, 'Pending')
         execution_3 = prepare_execution_description(SSM_STEP_NAME, 'InProgress')
@@ -200,17 +169,11 @@ class TestSsmDocument(unittest.TestCase):
         )
         self.assertEqual("InProgress", status)
 
-    @patch('time.sleep')
-    @patch('time.time')
-    def test_wait_for_execution_step_status_is_in_progress_timeout(self, patched_time, patched_sleep):
-        mock_sleep = MockSleep()
-        patched_time.side_effect = mock_sleep.time
-        patched_sleep.side_effect = mock_sleep.sleep
-
+    def test_wait_for_execution_step_status_is_in_progress_timeout(self):
         self.mock_ssm.get_automation_execution.return_value = prepare_execution_description(SSM_STEP_NAME, 'Pending')
 
         status = self.ssm_document.wait_for_execution_step_status_is_in_progress(
-            SSM_EXECUTION_ID, SSM_DOCUMENT_NAME, SSM_STEP_NAME, 10
+            SSM_EXECUTION_ID, SSM_DOCUMENT_NAME, SSM_STEP_NAME, 0.05
         )
         self.assertEqual("WaitTimedOut", status)
 
@@ -220,43 +183,30 @@ class TestSsmDocument(unittest.TestCase):
         output = self.ssm_document.get_step_output(SSM_EXECUTION_ID, SSM_STEP_NAME, SSM_OUTPUT_KEY)
         self.assertEqual(SSM_OUTPUT_VALUE, output)
 
-    @patch('time.sleep')
-    @patch('time.time')
-    def test_cancel_execution_with_rollback_with_rollback_step_success(self, patched_time, patched_sleep):
-        mock_sleep = MockSleep()
-        patched_time.side_effect = mock_sleep.time
-        patched_sleep.side_effect = mock_sleep.sleep
-
-        execution_1 = prepare_execution_description(constants.rollback_step_name, 'Success')
-        execution_2 = prepare_execution_description(constants.rollback_step_name, 'Success')
-        execution_3 = prepare_execution_description(SSM_STEP_NAME, 'InProgress')
-        execution_4 = prepare_execution_description(SSM_STEP_NAME, 'Success')
-        self.mock_ssm.get_automation_execution.side_effect = [execution_1, execution_2, execution_3, execution_4]
+    def test_cancel_execution_with_rollback_with_rollback_step_success(self):
+        self.mock_ssm.describe_automation_executions.side_effect = [
+            prepare_execution_metadata('test_execution_id', 'Cancelling'),
+            prepare_execution_metadata('test_execution_id', 'Cancelled'),
+            prepare_execution_metadata(SSM_OUTPUT_VALUE, 'InProgress'),
+            prepare_execution_metadata(SSM_OUTPUT_VALUE, 'Success')]
+        self.mock_ssm.get_automation_execution.return_value = \
+            prepare_execution_description(constants.rollback_step_name, 'Success')
         self.ssm_document.cancel_execution_with_rollback('test_execution_id')
         self.mock_ssm.stop_automation_execution.assert_called_once()
-        self.mock_ssm.get_automation_execution.assert_has_calls([call(AutomationExecutionId='test_execution_id'),
-                                                                 call(AutomationExecutionId='test_execution_id'),
-                                                                 call(AutomationExecutionId=SSM_OUTPUT_VALUE),
-                                                                 call(AutomationExecutionId=SSM_OUTPUT_VALUE)])
-        self.assertEqual(self.mock_ssm.get_automation_execution.call_count, 4)
-
-    @patch('time.sleep')
-    @patch('time.time')
-    def test_cancel_execution_with_rollback_no_rollback_step_success(self, patched_time, patched_sleep):
-        mock_sleep = MockSleep()
-        patched_time.side_effect = mock_sleep.time
-        patched_sleep.side_effect = mock_sleep.sleep
+        self.mock_ssm.describe_automation_executions.assert_has_calls(
+            [call(Filters=[{'Key': 'ExecutionId', 'Values': ['test_execution_id']}])] * 2
+            + [call(Filters=[{'Key': 'ExecutionId', 'Values': [SSM_OUTPUT_VALUE]}])] * 2)
+        self.mock_ssm.get_automation_execution.assert_called_once_with(AutomationExecutionId='test_execution_id')
 
-        execution_1 = prepare_execution_description(SSM_STEP_NAME, 'InProgress')
-        execution_2 = prepare_execution_description(SSM_STEP_NAME, 'Success')
-        execution_3 = prepare_execution_description(SSM_STEP_NAME, 'Success')
-        self.mock_ssm.get_automation_execution.side_effect = [execution_1, execution_2, execution_3]
+    def test_cancel_execution_with_rollback_no_rollback_step_success(self):
+        self.mock_ssm.describe_automation_executions.side_effect = [
+            prepare_execution_metadata('test_execution_id', 'Cancelling'),
+            prepare_execution_metadata('test_execution_id', 'Cancelled')]
+        self.mock_ssm.get_automation_execution.return_value = prepare_execution_description(SSM_STEP_NAME, 'Success')
         self.ssm_document.cancel_execution_with_rollback('test_execution_id')
         self.mock_ssm.stop_automation_execution.assert_called_once()
-        self.mock_ssm.get_automation_execution.assert_has_calls([call(AutomationExecutionId='test_execution_id'),
-                                                                 call(AutomationExecutionId='test_execution_id'),
-                                                                 call(AutomationExecutionId='test_execution_id')])
-        self.assertEqual(self.mock_ssm.get_automation_execution.call_count, 3)
+        self.assertEqual(self.mock_ssm.describe_automation_executions.call_count, 2)
+        self.mock_ssm.get_automation_execution.assert_called_once_with(AutomationExecutionId='test_execution_id')
 
     def test_get_successfully_executed_steps_by_order(self):
         self.mock_ssm.get_automation_execution.return_value = prepare_execution_description_with_multiple_steps()
@@ -0,0 +1,175 @@
+import threading
+import unittest
+import pytest
+from unittest.mock import MagicMock, patch
+from botocore.exceptions import ClientError, ReadTimeoutError
+from resource_manager.src.ssm_execution_monitor import ExecutionMonitor, get_execution_monitor
+
+
+def get_metadata(execution_id, status, step_name=None):
+    return {'AutomationExecutionId': execution_id, 'AutomationExecutionStatus': status,
+            'DocumentName': 'document', 'CurrentStepName': step_name}
+
+
+def describe_executions(statuses):
+    def describe(Filters):
+        return {'AutomationExecutionMetadataList': [get_metadata(e, statuses[e]) for e in Filters[0]['Values']]}
+    return describe
+
+
+@pytest.mark.unit_test
+@patch('resource_manager.src.constants.ssm_monitor_poll_time_secs', 0.01)
+class TestSsmExecutionMonitor(unittest.TestCase):
+
+    def setUp(self):
+        self.client_mock = MagicMock()
+        self.monitor = ExecutionMonitor(self.client_mock)
+
+    def test_wait_for_status_success(self):
+        self.client_mock.describe_automation_executions.side_effect = [
+            {'AutomationExecutionMetadataList': [get_metadata('exec_a', 'InProgress', 'step_1')]},
+            {'AutomationExecutionMetadataList': [get_metadata('exec_a', 'Success')]}]
+
+        execution = self.monitor.wait_for('exec_a', lambda e: e['AutomationExecutionStatus'] == 'Success')
+
+        self.assertEqual(execution['AutomationExecutionStatus'], 'Success')
+        self.assertEqual(self.monitor.stats, {'describe_automation_executions': 2, 'get_automation_execution': 0})
+
+    def test_wait_for_steps_success(self):
+        self.client_mock.get_automation_execution.side_effect = [
+            {'AutomationExecution': {'StepExecutions': [{'StepName': 'a', 'StepStatus': 'InProgress'}]}},
+            {'AutomationExecution': {'StepExecutions': [{'StepName': 'a', 'StepStatus': 'Success'}]}}]
+
+        execution = self.monitor.wait_for('exec_a', lambda e: e['StepExecutions'][0]['StepStatus'] == 'Success',
+                                          with_steps=True)
+
+        self.assertEqual(execution['StepExecutions'][0]['StepStatus'], 'Success')
+        self.client_mock.describe_automation_executions.assert_not_called()
+        self.assertEqual(self.client_mock.get_automation_execution.call_count, 2)
+
+    def test_wait_for_timeout(self):
+        self.client_mock.describe_automation_executions.side_effect = describe_executions({'exec_a': 'InProgress'})
+
+        self.assertIsNone(self.monitor.wait_for('exec_a', lambda e: False, timeout_secs=0.05))
+        self.assertEqual(self.monitor._waiters, {})
+        self.assertEqual(self.monitor._executions, {})
+
+    def test_wait_for_fail(self):
+        self.client_mock.describe_automation_executions.side_effect = ClientError(
+            {'Error': {'Code': 'AccessDenied', 'Message': 'Access denied'}}, 'DescribeAutomationExecutions')
+
+        self.assertRaises(ClientError, self.monitor.wait_for, 'exec_a', lambda e: True)
+
+    def test_wait_for_connection_error_fail(self):
+        self.client_mock.describe_automation_executions.side_effect = [
+            ReadTimeoutError(endpoint_url='https://ssm'),
+            {'AutomationExecutionMetadataList': [get_metadata('exec_a', 'Success')]}]
+
+        self.assertRaises(ReadTimeoutError, self.monitor.wait_for, 'exec_a', lambda e: True)
+        self.assertEqual(self.monitor.wait_for('exec_a', lambda e: True)['AutomationExecutionStatus'], 'Success')
+
+    def test_wait_for_poller_failure_passed_to_waiters(self):
+        self.client_mock.describe_automation_executions.side_effect = describe_executions({'exec_a': 'Success'})
+        with patch.object(self.monitor, '_poll', side_effect=RuntimeError('Poller failed')):
+            self.assertRaises(RuntimeError, self.monitor.wait_for, 'exec_a', lambda e: True)
+
+        self.assertIsNone(self.monitor._poller)
+        self.assertEqual(self.monitor.wait_for('exec_a', lambda e: True)['AutomationExecutionStatus'], 'Success')
+
+    def test_wait_for_dead_poller_replaced(self):
+        self.client_mock.describe_automation_executions.side_effect = describe_executions({'exec_a': 'Success'})
+        dead_poller = threading.Thread(target=lambda: None)
+        dead_poller.start()
+        dead_poller.join()
+        self.monitor._poller = dead_poller
+
+        self.assertEqual(self.monitor.wait_for('exec_a', lambda e: True)['AutomationExecutionStatus'], 'Success')
+
+    def test_wait_for_ignores_state_fetched_before_registration(self):
+        self.monitor._executions['exec_a'] = (self.monitor._poll_number, get_metadata('exec_a', 'Waiting'))
+        self.monitor._waiters['exec_a'] = [1, 0]
+        self.client_mock.describe_automation_executions.side_effect = describe_executions({'exec_a': 'Success'})
+
+        execution = self.monitor.wait_for('exec_a', lambda e: True)
+
+        self.assertEqual(execution['AutomationExecutionStatus'], 'Success')
+        self.client_mock.describe_automation_executions.assert_called()
+
+    def test_poll_batched_success(self):
+        execution_ids = [f'exec_{i}' for i in range(12)]
+        self.client_mock.describe_automation_executions.side_effect = describe_executions(
+            {e: 'Success' for e in execution_ids})
+        self.client_mock.get_automation_execution.return_value = {'AutomationExecution': {'StepExecutions': []}}
+
+        executions, errors = self.monitor._poll(execution_ids, ['exec_steps'])
+
+        self.assertEqual(len(executions), 13)
+        self.assertEqual(errors, {})
+        self.assertEqual(self.client_mock.describe_automation_executions.call_count, 2)
+        self.client_mock.get_automation_execution.assert_called_once_with(AutomationExecutionId='exec_steps')
+
+    def test_describe_executions_paginated_success(self):
+        self.client_mock.describe_automation_executions.side_effect = [
+            {'AutomationExecutionMetadataList': [get_metadata('exec_a', 'Success')], 'NextToken': 'next'},
+            {'AutomationExecutionMetadataList': [get_metadata('exec_b', 'Failed')]}]
+
+        executions = self.monitor._describe_executions(['exec_a', 'exec_b'])
+
+        self.assertEqual(list(executions.keys()), ['exec_a', 'exec_b'])
+        self.client_mock.describe_automation_executions.assert_called_with(
+            Filters=[{'Key': 'ExecutionId', 'Values': ['exec_a', 'exec_b']}], NextToken='next')
+
+    @patch('resource_manager.src.constants.ssm_monitor_poll_time_secs', 0.2)
+    def test_wait_for_multiple_executions_shared_poll_success(self):
+        statuses = {'exec_a': 'InProgress', 'exec_b': 'InProgress'}
+
+        def describe(Filters):
+            response = describe_executions(statuses)(Filters)
+            statuses.update({e: 'Success' for e in statuses})
+            return response
+
+        self.client_mock.describe_automation_executions.side_effect = describe
+        results = {}
+        start = threading.Barrier(2)
+
+        def wait(execution_id):
+            start.wait()
+            results[execution_id] = self.monitor.wait_for(
+                execution_id, lambda e: e['AutomationExecutionStatus'] == 'Success')['AutomationExecutionStatus']
+
+        threads = [threading.Thread(target=wait, args=(e,)) for e in statuses]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=5)
+
+        self.assertEqual(results, {'exec_a': 'Success', 'exec_b': 'Success'})
+        self.assertLessEqual(self.client_mock.describe_automation_executions.call_count, 3)
+
+    def test_log_progress_step_transitions_success(self):
+        logger_mock = MagicMock()
+        self.client_mock.meta.region_name = 'us-east-1'
+        monitor = ExecutionMonitor(self.client_mock, logger_mock)
+        previous = {'AutomationExecutionId': 'exec_a', 'DocumentName': 'document', 'StepExecutions': [
+            {'StepName': 'a', 'StepExecutionId': 'step_a', 'StepStatus': 'InProgress'}]}
+        current = {'AutomationExecutionId': 'exec_a', 'DocumentName': 'document', 'StepExecutions': [
+            {'StepName': 'a', 'StepExecutionId': 'step_a', 'StepStatus': 'Success'},
+            {'StepName': 'b', 'StepExecutionId': 'step_b', 'StepStatus': 'InProgress'}]}
+
+        monitor._log_progress(previous, current)
+        monitor._log_progress(current, current)
+
+        self.assertEqual(logger_mock.info.call_count, 2)
+        self.assertEqual(
+            logger_mock.info.call_args_list[0][0][0],
+            'SSM document step [document>a] is in [Success] status: '
+            'https://us-east-1.console.aws.amazon.com/systems-manager/automation/execution/exec_a/step/1/step_a')
+        self.assertIn('[document>b] is in [InProgress] status', logger_mock.info.call_args_list[1][0][0])
+        self.assertTrue(logger_mock.info.call_args_list[1][0][0].endswith('/exec_a/step/2/step_b'))
+
+    def test_get_execution_monitor_shared_per_client_success(self):
+        client_a = MagicMock()
+        client_b = MagicMock()
+
+        self.assertIs(get_execution_monitor(client_a), get_execution_monitor(client_a))
+        self.assertIsNot(get_execution_monitor(client_a), get_execution_monitor(client_b))
@@ -0,0 +1,88 @@
+import unittest
+import pytest
+import resource_manager.src.tools.resource_table_benchmark as benchmark
+from unittest.mock import patch, MagicMock
+from resource_manager.src.resource_model import ResourceModel
+
+
+@pytest.mark.unit_test
+class TestResourceTableBenchmark(unittest.TestCase):
+
+    def setUp(self):
+        self.meta = {'host': getattr(ResourceModel.Meta, 'host', None),
+                     'region': getattr(ResourceModel.Meta, 'region', None),
+                     'table_name': ResourceModel.Meta.table_name}
+
+    def tearDown(self):
+        for name, value in self.meta.items():
+            setattr(ResourceModel.Meta, name, value)
+        ResourceModel._connection = None
+
+    def test_generate_resources_success(self):
+        resources = list(benchmark.generate_resources(20, template_count=2, session_count=4))
+
+        self.assertEqual(len(resources), 20)
+        self.assertEqual(len({r.cf_template_name for r in resources}), 2)
+        self.assertEqual(len({r.test_session_id for r in resources}), 4)
+        self.assertEqual(len({r.status for r in resources}), len(ResourceModel.Status))
+        available = [r for r in resources if r.status == ResourceModel.Status.AVAILABLE.name]
+        self.assertTrue(all(r.available_template_name == r.cf_template_name for r in available))
+
+    @patch('resource_manager.src.resource_model.ResourceModel.get_resources_by_session')
+    @patch('resource_manager.src.resource_model.ResourceModel.get_resources_by_statuses')
+    @patch('resource_manager.src.resource_model.ResourceModel.scan_parallel')
+    @patch('resource_manager.src.resource_model.ResourceModel.scan')
+    def test_run_benchmark_success(self, scan_mock, scan_parallel_mock, by_statuses_mock, by_session_mock):
+        resources = list(benchmark.generate_resources(20, template_count=2, session_count=2))
+        scan_mock.side_effect = lambda: iter(resources)
+        scan_parallel_mock.return_value = resources
+        by_statuses_mock.return_value = resources[:8]
+        by_session_mock.return_value = resources[:4]
+
+        results = benchmark.run_benchmark(4)
+
+        self.assertEqual([r['items'] for r in results], [20, 20, 8, 8, 4, 4])
+        scan_parallel_mock.assert_called_once_with(total_segments=4)
+
+    @patch('resource_manager.src.resource_model.ResourceModel._get_connection')
+    def test_capacity_counter_success(self, connection_mock):
+        connection = connection_mock.return_value.connection
+        connection.dispatch.side_effect = [{'ConsumedCapacity': {'CapacityUnits': 1.5}},
+                                           {'ConsumedCapacity': [{'CapacityUnits': 2.0}, {'CapacityUnits': 3.0}]},
+                                           {}]
+        counter = benchmark.ConsumedCapacityCounter()
+        counter.install()
+
+        connection.dispatch('Scan', {})
+        self.assertEqual(counter.reset(), 1.5)
+        connection.dispatch('BatchWriteItem', {})
+        connection.dispatch('DescribeTable', {})
+        self.assertEqual(counter.reset(), 5.0)
+        self.assertEqual(counter.reset(), 0.0)
+
+    @patch('resource_manager.src.tools.resource_table_benchmark.run_benchmark')
+    @patch('resource_manager.src.tools.resource_table_benchmark.seed_table')
+    def test_main_success(self, seed_table_mock, run_benchmark_mock):
+        run_benchmark_mock.return_value = [{'name': 'scan', 'items': 10, 'duration_secs': 0.1,
+                                            'capacity_units': 2.5}]
+
+        benchmark.main(['-e', 'http://localhost:8001', '-n', '10', '-s', '2'])
+
+        seed_table_mock.assert_called_once_with(10, template_count=50, session_count=20)
+        run_benchmark_mock.assert_called_once_with(2)
+        self.assertEqual(ResourceModel.Meta.host, 'http://localhost:8001')
+        self.assertEqual(ResourceModel.Meta.table_name, benchmark.BENCHMARK_TABLE_NAME)
+
+    @patch('resource_manager.src.resource_model.ResourceModel.batch_write')
+    @patch('resource_manager.src.resource_model.ResourceModel.create_table')
+    @patch('resource_manager.src.resource_model.ResourceModel.delete_table')
+    @patch('resource_manager.src.resource_model.ResourceModel.exists', return_value=True)
+    def test_seed_table_success(self, exists_mock, delete_table_mock, create_table_mock, batch_write_mock):
+        batch = MagicMock()
+        batch_write_mock.return_value.__enter__.return_value = batch
+
+        benchmark.seed_table(5, template_count=1, session_count=1)
+
+        delete_table_mock.assert_called_once()
+        create_table_mock.assert_called_once_with(billing_mode="PAY_PER_REQUEST", wait=True)
+        self.assertEqual(batch.save.call_count, 5)
@@ -69,39 +69,39 @@ class TestResourceTool(unittest.TestCase):
         client_factory.clients = {}
         client_factory.resources = {}
 
-    @patch('resource_manager.src.resource_model.ResourceModel.scan')
+    @patch('resource_manager.src.resource_model.ResourceModel.scan_parallel')
     def test_list_command_success(self, scan):
         scan.return_value = [self.resource_a, self.resource_b, self.resource_c]
         resource_tool.main(['-c', 'LIST'])
         scan.assert_called_once()
 
-    @patch('resource_manager.src.resource_model.ResourceModel.scan')
+    @patch('resource_manager.src.resource_model.ResourceModel.scan_parallel')
     def test_list_command_by_age_success(self, scan):
         scan.return_value = [self.resource_a, self.resource_b, self.resource_c]
         resource_tool.main(['-c', 'LIST', '-a', '4'])
         scan.assert_called_once()
 
-    @patch('resource_manager.src.resource_model.ResourceModel.scan')
+    @patch('resource_manager.src.resource_model.ResourceModel.scan_parallel')
     def test_list_command_by_age_and_status_success(self, scan):
         scan.return_value = [self.resource_a, self.resource_b, self.resource_c]
         resource_tool.main(['-c', 'LIST', '-a', '4', '-s', 'AVAILABLE'])
         scan.assert_called_once()
 
-    @patch('resource_manager.src.resource_model.ResourceModel.scan')
+    @patch('resource_manager.src.resource_model.ResourceModel.scan_parallel')
     def test_list_command_by_status_success(self, scan):
         scan.return_value = [self.resource_a, self.resource_b, self.resource_c]
         resource_tool.main(['-c', 'LIST', '-s', 'AVAILABLE'])
         scan.assert_called_once()
 
-    @patch('resource_manager.src.resource_model.ResourceModel.scan')
+    @patch('resource_manager.src.resource_model.ResourceModel.scan_parallel')
     def test_destroy_command_no_templates_fail(self, scan):
         self.assertRaises(SystemExit, resource_tool.main, ['-c', 'DESTROY'])
 
-    @patch('resource_manager.src.resource_model.ResourceModel.scan')
+    @patch('resource_manager.src.resource_model.ResourceModel.scan_parallel')
     def test_no_commands_given_fail(self, scan):
         self.assertRaises(SystemExit, resource_tool.main, [])
 
-    @patch('resource_manager.src.resource_model.ResourceModel.scan')
+    @patch('resource_manager.src.resource_model.ResourceModel.scan_parallel')
     @patch('resource_manager.src.resource_model.ResourceModel.configure')
     def test_destroy_command_success(self, configure, scan):
         error_response = {'Error': {'Code': 'ValidationError', 'Message': self.err_message('template_a_stack_a_1')}}
@@ -110,13 +110,13 @@ class TestResourceTool(unittest.TestCase):
 
         resource_tool.main(['-c', 'DESTROY', '-t', 'template_a'])
 
-        self.assertEqual(scan.call_count, 2)
+        scan.assert_called_once()
         self.mock_s3_bucket.delete_objects.assert_called_once()
         self.assertEqual(self.resource_a.status, ResourceModel.Status.DELETED.name)
         self.assertEqual(self.resource_b.status, ResourceModel.Status.AVAILABLE.name)
         self.assertEqual(self.resource_c.status, ResourceModel.Status.AVAILABLE.name)
 
-    @patch('resource_manager.src.resource_model.ResourceModel.scan')
+    @patch('resource_manager.src.resource_model.ResourceModel.scan_parallel')
     @patch('resource_manager.src.resource_model.ResourceModel.configure')
     def test_destroy_by_status_command_success(self, configure, scan):
         error_response = {'Error': {'Code': 'ValidationError', 'Message': self.err_message('template_a_stack_a_2')}}
@@ -125,14 +125,14 @@ class TestResourceTool(unittest.TestCase):
 
         resource_tool.main(['-c', 'DESTROY', '-t', 'template_a', '-s', 'EXECUTE_FAILED'])
 
-        self.assertEqual(scan.call_count, 2)
+        scan.assert_called_once()
         self.mock_s3_bucket.delete_objects.assert_called_once()
         self.assertEqual(self.resource_a.status, ResourceModel.Status.AVAILABLE.name)
         self.assertEqual(self.resource_d.status, ResourceModel.Status.DELETED.name)
         self.assertEqual(self.resource_b.status, ResourceModel.Status.AVAILABLE.name)
         self.assertEqual(self.resource_c.status, ResourceModel.Status.AVAILABLE.name)
 
-    @patch('resource_manager.src.resource_model.ResourceModel.scan')
+    @patch('resource_manager.src.resource_model.ResourceModel.scan_parallel')
     @patch('resource_manager.src.resource_model.ResourceModel.configure')
     def test_destroy_by_age_command_success(self, configure, scan):
         error_response = {'Error': {'Code': 'ValidationError', 'Message': self.err_message('template_a_stack_b_1')}}
@@ -141,14 +141,14 @@ class TestResourceTool(unittest.TestCase):
 
         resource_tool.main(['-c', 'DESTROY', '-t', 'template_b', '-a', '3'])
 
-        self.assertEqual(scan.call_count, 2)
+        scan.assert_called_once()
         self.mock_s3_bucket.delete_objects.assert_called_once()
         self.assertEqual(self.resource_a.status, ResourceModel.Status.AVAILABLE.name)
         self.assertEqual(self.resource_d.status, ResourceModel.Status.EXECUTE_FAILED.name)
         self.assertEqual(self.resource_b.status, ResourceModel.Status.DELETED.name)
         self.assertEqual(self.resource_c.status, ResourceModel.Status.AVAILABLE.name)
 
-    @patch('resource_manager.src.resource_model.ResourceModel.scan')
+    @patch('resource_manager.src.resource_model.ResourceModel.scan_parallel')
     @patch('resource_manager.src.resource_model.ResourceModel.configure')
     def test_destroy_all_command_success(self, configure, scan):
         error_1 = {'Error': {'Code': 'ValidationError', 'Message': self.err_message('template_a_stack_a_1')}}
@@ -164,14 +164,14 @@ class TestResourceTool(unittest.TestCase):
         scan.return_value = [self.resource_a, self.resource_b, self.resource_c]
 
         resource_tool.main(['-c', 'DESTROY_ALL'])
-        self.assertEqual(scan.call_count, 2)
+        scan.assert_called_once()
         self.mock_s3_bucket.delete_objects.assert_called_once()
         self.assertEqual(self.mock_cfn_service.delete_stack.call_count, 3)
         self.assertEqual(self.resource_a.status, ResourceModel.Status.DELETED.name)
         self.assertEqual(self.resource_b.status, ResourceModel.Status.DELETED.name)
         self.assertEqual(self.resource_c.status, ResourceModel.Status.DELETED.name)
 
-    @patch('resource_manager.src.resource_model.ResourceModel.scan')
+    @patch('resource_manager.src.resource_model.ResourceModel.scan_parallel')
     @patch('resource_manager.src.resource_model.ResourceModel.configure')
     def test_destroy_all_by_status_command_success(self, configure, scan):
         error_response = {'Error': {'Code': 'ValidationError', 'Message': self.err_message('template_a_stack_a_2')}}
@@ -181,7 +181,7 @@ class TestResourceTool(unittest.TestCase):
         scan.return_value = [self.resource_a, self.resource_b, self.resource_c, self.resource_d]
 
         resource_tool.main(['-c', 'DESTROY_ALL', '-s', 'EXECUTE_FAILED'])
-        self.assertEqual(scan.call_count, 2)
+        scan.assert_called_once()
         self.mock_s3_bucket.delete_objects.assert_called_once()
         self.assertEqual(self.mock_cfn_service.delete_stack.call_count, 1)
         self.assertEqual(self.resource_a.status, ResourceModel.Status.AVAILABLE.name)
@@ -189,7 +189,7 @@ class TestResourceTool(unittest.TestCase):
         self.assertEqual(self.resource_c.status, ResourceModel.Status.AVAILABLE.name)
         self.assertEqual(self.resource_d.status, ResourceModel.Status.DELETED.name)
 
-    @patch('resource_manager.src.resource_model.ResourceModel.scan')
+    @patch('resource_manager.src.resource_model.ResourceModel.scan_parallel')
     @patch('resource_manager.src.resource_model.ResourceModel.configure')
     def test_destroy_all_by_age_command_success(self, configure, scan):
         error_response1 = {'Error': {'Code': 'ValidationError', 'Message': self.err_message('template_a_stack_b_1')}}
@@ -201,7 +201,7 @@ class TestResourceTool(unittest.TestCase):
         scan.return_value = [self.resource_a, self.resource_b, self.resource_c, self.resource_d]
 
         resource_tool.main(['-c', 'DESTROY_ALL', '-a', '3'])
-        self.assertEqual(scan.call_count, 2)
+        scan.assert_called_once()
         self.mock_s3_bucket.delete_objects.assert_called_once()
         self.assertEqual(self.mock_cfn_service.delete_stack.call_count, 2)
         self.assertEqual(self.resource_a.status, ResourceModel.Status.AVAILABLE.name)
@@ -209,7 +209,7 @@ class TestResourceTool(unittest.TestCase):
         self.assertEqual(self.resource_c.status, ResourceModel.Status.AVAILABLE.name)
         self.assertEqual(self.resource_d.status, ResourceModel.Status.DELETED.name)
 
-    @patch('resource_manager.src.resource_model.ResourceModel.scan')
+    @patch('resource_manager.src.resource_model.ResourceModel.scan_parallel')
     @patch('resource_manager.src.resource_model.ResourceModel.configure')
     def test_destroy_all_not_existing_templates_command_success(self, configure, scan):
         scan.return_value = [self.resource_a, self.resource_b, self.resource_c]
@@ -222,7 +222,7 @@ class TestResourceTool(unittest.TestCase):
         self.assertEqual(self.resource_b.status, ResourceModel.Status.AVAILABLE.name)
         self.assertEqual(self.resource_c.status, ResourceModel.Status.AVAILABLE.name)
 
-    @patch('resource_manager.src.resource_model.ResourceModel.scan')
+    @patch('resource_manager.src.resource_model.ResourceModel.scan_parallel')
     @patch('resource_manager.src.resource_model.ResourceModel.configure')
     @patch('time.sleep')
     def test_destroy_all_command_with_dependencies_fail(self, sleep_mock, configure, scan):
@@ -250,10 +250,10 @@ class TestResourceTool(unittest.TestCase):
         self.mock_cfn_service.delete_stack.assert_called_once()
         self.assertEqual(resource_a.status, ResourceModel.Status.DELETE_FAILED.name)
         self.assertEqual(resource_b.status, ResourceModel.Status.DELETE_FAILED.name)
-        self.assertTrue(scan.call_count >= 2)
+        scan.assert_called_once()
         self.mock_s3_bucket.delete_objects.assert_not_called()
 
-    @patch('resource_manager.src.resource_model.ResourceModel.scan')
+    @patch('resource_manager.src.resource_model.ResourceModel.scan_parallel')
     @patch('resource_manager.src.resource_model.ResourceModel.configure')
     @patch('time.sleep')
     def test_destroy_all_command_with_dependencies_success(self, sleep_mock, configure, scan):
@@ -280,7 +280,7 @@ class TestResourceTool(unittest.TestCase):
         self.assertEqual(self.mock_cfn_service.delete_stack.call_count, 2)
         self.assertEqual(resource_a.status, ResourceModel.Status.DELETED.name)
         self.assertEqual(resource_b.status, ResourceModel.Status.DELETED.name)
-        self.assertTrue(scan.call_count >= 2)
+        scan.assert_called_once()
         self.mock_s3_bucket.delete_objects.assert_called_once()
 
     def test_find_resource_dependents_success(self):
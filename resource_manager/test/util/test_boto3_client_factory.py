@@ -1,6 +1,10 @@
+import gc
 import unittest
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock
 import pytest
+from botocore.config import Config
 import resource_manager.src.util.boto3_client_factory as client_factory
 
 
@@ -12,8 +16,10 @@ class TestBoto3ClientFactory(unittest.TestCase):
 
     def tearDown(self):
         # Clean client factory cache after each test.
-        client_factory.clients = {}
-        client_factory.resources = {}
+        client_factory.clients = weakref.WeakKeyDictionary()
+        client_factory.resources = weakref.WeakKeyDictionary()
+        client_factory.stats.update(hits=0, misses=0, creation_time_secs=0.0)
+        client_factory.configure(50)
 
     def test_client_cache_success(self):
         client_before_cache = client_factory.client('test_client', self.session_mock)
@@ -26,3 +32,71 @@ class TestBoto3ClientFactory(unittest.TestCase):
         resource_after_cache = client_factory.resource('test_client', self.session_mock)
         self.assertEqual(resource_before_cache, resource_after_cache)
         self.session_mock.resource.assert_called_once_with('test_client', config=client_factory.config)
+
+    def test_client_cache_by_session_success(self):
+        other_session_mock = MagicMock()
+        client = client_factory.client('test_client', self.session_mock)
+        other_client = client_factory.client('test_client', other_session_mock)
+        self.assertNotEqual(client, other_client)
+        self.session_mock.client.assert_called_once_with('test_client', config=client_factory.config)
+        other_session_mock.client.assert_called_once_with('test_client', config=client_factory.config)
+
+    def test_client_cache_by_config_success(self):
+        self.session_mock.client.side_effect = lambda service_name, config=None: MagicMock()
+        custom_config = Config(retries={'max_attempts': 1})
+        client = client_factory.client('test_client', self.session_mock)
+        custom_client = client_factory.client('test_client', self.session_mock, custom_config)
+        self.assertNotEqual(client, custom_client)
+        self.assertEqual(custom_client, client_factory.client('test_client', self.session_mock, custom_config))
+        self.session_mock.client.assert_called_with('test_client', config=custom_config)
+        self.assertEqual(self.session_mock.client.call_count, 2)
+
+    def test_client_cache_by_config_values_success(self):
+        self.session_mock.client.side_effect = lambda service_name, config=None: MagicMock()
+        custom_client = client_factory.client('test_client', self.session_mock, Config(retries={'max_attempts': 1}))
+        equal_client = client_factory.client('test_client', self.session_mock, Config(retries={'max_attempts': 1}))
+        other_config = Config(retries={'max_attempts': 1}, read_timeout=5)
+        other_client = client_factory.client('test_client', self.session_mock, other_config)
+        self.assertEqual(custom_client, equal_client)
+        self.assertNotEqual(custom_client, other_client)
+        self.session_mock.client.assert_called_with('test_client', config=other_config)
+        self.assertEqual(self.session_mock.client.call_count, 2)
+
+    def test_client_cache_session_evicted_success(self):
+        session_mock = MagicMock()
+        session_mock.region_name = 'us-east-1'
+        # Pooled objects must not reference session (as boto3 clients do not), child mocks reference parent mock
+        session_mock.client.side_effect = lambda service_name, config=None: object()
+        session_mock.resource.side_effect = lambda service_name, config=None: object()
+        client_factory.client('test_client', session_mock)
+        client_factory.resource('test_client', session_mock)
+        self.assertEqual(len(client_factory.clients), 1)
+        self.assertEqual(len(client_factory.resources), 1)
+        del session_mock
+        gc.collect()
+        self.assertEqual(len(client_factory.clients), 0)
+        self.assertEqual(len(client_factory.resources), 0)
+
+    def test_client_cache_concurrent_success(self):
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            created = list(executor.map(lambda _: client_factory.client('test_client', self.session_mock), range(50)))
+        self.assertEqual(len(set(created)), 1)
+        self.session_mock.client.assert_called_once()
+
+    def test_get_stats_success(self):
+        client_factory.client('test_client', self.session_mock)
+        client_factory.client('test_client', self.session_mock)
+        client_factory.resource('test_client', self.session_mock)
+        stats = client_factory.get_stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 2)
+        self.assertGreaterEqual(stats['average_creation_time_secs'], 0)
+
+    def test_configure_success(self):
+        self.session_mock.client.side_effect = lambda service_name, config=None: MagicMock()
+        client_before_configure = client_factory.client('test_client', self.session_mock)
+        client_factory.configure(10)
+        client_after_configure = client_factory.client('test_client', self.session_mock)
+        self.assertNotEqual(client_before_configure, client_after_configure)
+        self.assertEqual(client_factory.config.max_pool_connections, 10)
+        self.session_mock.client.assert_called_with('test_client', config=client_factory.config)
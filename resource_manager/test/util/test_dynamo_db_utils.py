@@ -14,6 +14,7 @@ from resource_manager.src.util.dynamo_db_utils import (
     _update_table, add_global_table_and_wait_for_active,
     create_backup_and_wait_for_available, delete_backup_and_wait,
     get_item_single, put_item_single, get_item_async_stress_test, put_item_async_stress_test,
+    batch_get_item_single, batch_write_item_single, run_load_test, DynamoDbLoadMode,
     _get_random_value, generate_random_item,
     drop_and_wait_dynamo_db_table_if_exists, get_continuous_backups_status,
     get_contributor_insights_status_for_table_and_indexes,
@@ -1013,6 +1014,46 @@ class TestDynamoDbUtil(unittest.TestCase):
         )
         self.assertEqual(put_item_mock.call_count, 10)
 
+    def test_batch_get_item_single(self):
+        keys = [{'id': {'S': '1'}}, {'id': {'S': '2'}}]
+        self.dynamodb_client_mock.batch_get_item.return_value = {
+            'UnprocessedKeys': {'my_table': {'Keys': [keys[1]]}}}
+        unprocessed = batch_get_item_single(boto3_session=self.session_mock, table_name='my_table', keys=keys)
+        self.assertEqual(unprocessed, 1)
+        self.dynamodb_client_mock.batch_get_item.assert_called_once_with(
+            RequestItems={'my_table': {'Keys': keys, 'ConsistentRead': True}})
+
+    def test_batch_write_item_single(self):
+        items = [{'id': {'S': '1'}}]
+        self.dynamodb_client_mock.batch_write_item.return_value = {'UnprocessedItems': {}}
+        unprocessed = batch_write_item_single(boto3_session=self.session_mock, table_name='my_table', items=items)
+        self.assertEqual(unprocessed, 0)
+        self.dynamodb_client_mock.batch_write_item.assert_called_once_with(
+            RequestItems={'my_table': [{'PutRequest': {'Item': items[0]}}]})
+
+    def test_run_load_test_batch_write_item(self):
+        items = [{'id': {'S': str(i)}} for i in range(30)]
+        self.dynamodb_client_mock.batch_write_item.side_effect = [
+            {'UnprocessedItems': {'my_table': [{'PutRequest': {'Item': items[0]}}]}},
+            ClientError({'Error': {'Code': 'ProvisionedThroughputExceededException', 'Message': 'throttled'}},
+                        'BatchWriteItem'),
+            {}]
+        result = run_load_test(boto3_session=self.session_mock, table_name='my_table',
+                               mode=DynamoDbLoadMode.BATCH_WRITE_ITEM, items=items, total_items=60,
+                               concurrency=1, batch_size=30)
+        self.assertEqual(self.dynamodb_client_mock.batch_write_item.call_count, 3)
+        self.assertEqual((result.requests, result.throttles, result.unprocessed_items), (3, 1, 1))
+        batch = self.dynamodb_client_mock.batch_write_item.call_args_list[1][1]['RequestItems']['my_table']
+        self.assertEqual([r['PutRequest']['Item'] for r in batch], items[25:] + items[:20])
+
+    def test_run_load_test_get_item_reuses_client(self):
+        result = run_load_test(boto3_session=self.session_mock, table_name='my_table',
+                               mode=DynamoDbLoadMode.GET_ITEM, items=[{'id': {'S': '1'}}], total_items=20,
+                               target_rps=1000, concurrency=4)
+        self.assertEqual(result.successes, 20)
+        self.assertEqual(self.dynamodb_client_mock.get_item.call_count, 20)
+        self.assertEqual(self.session_mock.client.call_count, 1)
+
     def test_get_random_value_s(self):
         output = _get_random_value(STRING, 10)
         self.assertIsInstance(output, str)
@@ -259,7 +259,7 @@ class TestElasticacheUtil(unittest.TestCase):
         ]
         calls = [
             call(CacheClusterId=test_elasticache_util.REPLICATION_GROUP_ID + '-' + cluster_id)
-            for cluster_id in ['001', '002', '003', '004', '001', '002', '004', '001', '003']
+            for cluster_id in ['001', '002', '003', '004', '001', '002', '003', '004', '001']
         ]
         elasticache_utils.wait_for_parameters_in_sync(
             self.session_mock,
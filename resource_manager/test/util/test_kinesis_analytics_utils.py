@@ -19,6 +19,7 @@ TEST_SEC_INTERVAL = 0.2
 TEST_SLEEP_INTERVAL = 0.05
 TEST_WAIT_TO_START = 0.1
 TEST_INTERVAL_AMONG_STREAM_RECORDS = 0.05
+TEST_RECORDS_PER_SECOND = 200
 TEST_SNAPSHOT_NAME = 'Test-KinesisAnalyticsFl_ewBYozhsrZPC-001'
 MOCK_SNAPSHOTS_NAMES_LIST = ['Test-KinesisAnalyticsFl_ewBYozhsrZPC-001', 'MyFirstSnapshot',
                              'MySecondSnapshot']
@@ -133,17 +134,31 @@ class KinesisAnalyticsTestUtils(unittest.TestCase):
         self.assertTrue(0 < kinan_utils._get_hotspot(mock_test_field, mock_hotspot_size)['height'] <= 10)
 
     @patch('resource_manager.src.util.kinesis_analytics_utils.random')
-    def test__get_record(self, mock_random):
+    def test__get_point(self, mock_random):
         mock_test_field = {'left': 0, 'width': 10, 'top': 0, 'height': 10}
         mock_random.random.side_effect = lambda: 0.8
         mock_hotspot_weight = 0.2
         hotspot = None
-        self.assertEqual(kinan_utils._get_record(mock_test_field, hotspot, mock_hotspot_weight),
-                         {'Data': '{"x": 8.0, "y": 8.0, "is_hot": "N"}', 'PartitionKey': 'partition_key'})
+        self.assertEqual(kinan_utils._get_point(mock_test_field, hotspot, mock_hotspot_weight),
+                         {'x': 8.0, 'y': 8.0, 'is_hot': 'N'})
         hotspot = {'left': 4.0, 'width': 1.0, 'top': 3.2, 'height': 1.0}
         mock_hotspot_weight = 0.9
-        self.assertEqual(kinan_utils._get_record(mock_test_field, hotspot, mock_hotspot_weight),
-                         {'Data': '{"x": 4.8, "y": 4.0, "is_hot": "Y"}', 'PartitionKey': 'partition_key'})
+        self.assertEqual(kinan_utils._get_point(mock_test_field, hotspot, mock_hotspot_weight),
+                         {'x': 4.8, 'y': 4.0, 'is_hot': 'Y'})
+
+    @patch('resource_manager.src.util.kinesis_analytics_utils.HOTSPOT_POINTS_NUMBER', 2)
+    @patch('resource_manager.src.util.kinesis_analytics_utils._get_hotspot')
+    def test__get_ml_point_factory(self, mock_get_hotspot):
+        hotspots = [{'left': 1.0, 'width': 1, 'top': 1.0, 'height': 1},
+                    {'left': 5.0, 'width': 1, 'top': 5.0, 'height': 1}]
+        mock_get_hotspot.side_effect = hotspots
+        next_point = kinan_utils._get_ml_point_factory(hotspot_weight=1)
+        points = [next_point() for _ in range(4)]
+        self.assertEqual(mock_get_hotspot.call_count, 2)
+        for point, hotspot in zip(points, [hotspots[0], hotspots[0], hotspots[1], hotspots[1]]):
+            self.assertEqual(point['is_hot'], 'Y')
+            self.assertTrue(hotspot['left'] <= point['x'] <= hotspot['left'] + hotspot['width'])
+            self.assertTrue(hotspot['top'] <= point['y'] <= hotspot['top'] + hotspot['height'])
 
     @patch('resource_manager.src.util.kinesis_analytics_utils.random')
     @patch('resource_manager.src.util.kinesis_analytics_utils.datetime')
@@ -160,41 +175,53 @@ class KinesisAnalyticsTestUtils(unittest.TestCase):
     def test_generate_ml_stream(self, mock_random):
         mock_random.random.side_effect = lambda: 0.8
         self.mock_kinesis.put_records.side_effect = lambda StreamName, Records: \
-            self.mock_kinesis_methods_effect_map.get('put_records')
-        kinan_utils.generate_ml_stream(TEST_INPUT_STREAM,
-                                       TEST_SEC_INTERVAL,
-                                       self.session_mock,
-                                       interval_among_stream_records=TEST_INTERVAL_AMONG_STREAM_RECORDS)
-        self.assertTrue(int(TEST_SEC_INTERVAL / TEST_INTERVAL_AMONG_STREAM_RECORDS) - 1
-                        <= self.mock_kinesis.put_records.call_count
-                        <= int(TEST_SEC_INTERVAL / TEST_INTERVAL_AMONG_STREAM_RECORDS))
+            {'FailedRecordCount': 0, 'Records': [{'SequenceNumber': '1'} for _ in Records]}
+        stats = kinan_utils.generate_ml_stream(TEST_INPUT_STREAM,
+                                               TEST_SEC_INTERVAL,
+                                               self.session_mock,
+                                               records_per_second=TEST_RECORDS_PER_SECOND)
+        records = [r for c in self.mock_kinesis.put_records.call_args_list for r in c[1]['Records']]
+        self.assertTrue(int(TEST_SEC_INTERVAL * TEST_RECORDS_PER_SECOND) - 10
+                        <= len(records)
+                        <= int(TEST_SEC_INTERVAL * TEST_RECORDS_PER_SECOND) + 10)
+        self.assertEqual(stats['records'], len(records))
+        self.assertTrue(len({r['PartitionKey'] for r in records}) > 1)
+        self.assertEqual(records[0]['Data'], '{"x": 8.0, "y": 8.0, "is_hot": "N"}')
 
     @patch('resource_manager.src.util.kinesis_analytics_utils.random')
-    @patch('resource_manager.src.util.kinesis_analytics_utils.json')
-    def test_generate_dummy_ticker_stream(self, mock_json, mock_random):
+    def test_generate_dummy_ticker_stream(self, mock_random):
         mock_random.random.side_effect = lambda: 0.834
-        mock_json.dumps.side_effect = lambda x: '2005-06-01T13:33:00'
-        self.mock_kinesis.put_record.side_effect = lambda StreamName, Data, PartitionKey: \
-            self.mock_kinesis_methods_effect_map.get('put_record')
-        kinan_utils.generate_dummy_ticker_stream(TEST_INPUT_STREAM,
-                                                 TEST_SEC_INTERVAL,
-                                                 self.session_mock,
-                                                 interval_among_stream_records=TEST_INTERVAL_AMONG_STREAM_RECORDS)
-        self.assertEqual(self.mock_kinesis.put_record.call_count,
-                         int(TEST_SEC_INTERVAL / TEST_INTERVAL_AMONG_STREAM_RECORDS))
+        mock_random.choice.side_effect = lambda x: x[0]
+        self.mock_kinesis.put_records.side_effect = lambda StreamName, Records: \
+            {'FailedRecordCount': 0, 'Records': [{'SequenceNumber': '1'} for _ in Records]}
+        stats = kinan_utils.generate_dummy_ticker_stream(TEST_INPUT_STREAM,
+                                                         TEST_SEC_INTERVAL,
+                                                         self.session_mock,
+                                                         records_per_second=TEST_RECORDS_PER_SECOND)
+        self.assertTrue(int(TEST_SEC_INTERVAL * TEST_RECORDS_PER_SECOND) - 10
+                        <= stats['records']
+                        <= int(TEST_SEC_INTERVAL * TEST_RECORDS_PER_SECOND) + 10)
+        self.mock_kinesis.put_record.assert_not_called()
 
     @patch('resource_manager.src.util.kinesis_analytics_utils.random')
-    @patch('resource_manager.src.util.kinesis_analytics_utils.json')
-    def test_produce_dummy_ticker_stream_records(self, mock_json, mock_random):
+    def test_produce_dummy_ticker_stream_records(self, mock_random):
         mock_random.random.side_effect = lambda: 0.834
-        mock_json.dumps.side_effect = lambda x: '2005-06-01T13:33:00'
-        self.mock_kinesis.put_record.side_effect = lambda StreamName, Data, PartitionKey: \
-            self.mock_kinesis_methods_effect_map.get('put_record')
-        kinan_utils.produce_dummy_ticker_stream_records(TEST_INPUT_STREAM,
-                                                        self.session_mock,
-                                                        3,
-                                                        TEST_INTERVAL_AMONG_STREAM_RECORDS)
-        self.assertEqual(self.mock_kinesis.put_record.call_count, 3)
+        mock_random.choice.side_effect = lambda x: x[0]
+        self.mock_kinesis.put_records.side_effect = lambda StreamName, Records: \
+            {'FailedRecordCount': 0, 'Records': [{'SequenceNumber': '1'} for _ in Records]}
+        stats = kinan_utils.produce_dummy_ticker_stream_records(TEST_INPUT_STREAM,
+                                                                self.session_mock,
+                                                                3,
+                                                                TEST_INTERVAL_AMONG_STREAM_RECORDS)
+        self.assertEqual(self.mock_kinesis.put_records.call_count, 3)
+        self.assertEqual(stats['records'], 3)
+
+    def test_produce_dummy_ticker_stream_records_single_request(self):
+        self.mock_kinesis.put_records.side_effect = lambda StreamName, Records: \
+            {'FailedRecordCount': 0, 'Records': [{'SequenceNumber': '1'} for _ in Records]}
+        kinan_utils.produce_dummy_ticker_stream_records(TEST_INPUT_STREAM, self.session_mock, 3, None)
+        self.mock_kinesis.put_records.assert_called_once()
+        self.assertEqual(len(self.mock_kinesis.put_records.call_args[1]['Records']), 3)
 
     def test_cache_kinan_app_seperate_flink_sql(self):
         # test SQL application type:
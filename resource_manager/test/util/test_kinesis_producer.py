@@ -0,0 +1,117 @@
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from resource_manager.src.util.kinesis_producer import KinesisProducer, PUT_RECORDS_MAX_RECORDS, \
+    THROUGHPUT_EXCEEDED_ERROR_CODE
+
+TEST_STREAM_NAME = 'test_stream'
+
+
+def get_records(number):
+    return [{'Data': f'{{"i": {i}}}', 'PartitionKey': str(i)} for i in range(number)]
+
+
+def mock_put_records_success(StreamName, Records):
+    return {'FailedRecordCount': 0, 'Records': [{'SequenceNumber': '1', 'ShardId': 'shardId-0'} for _ in Records]}
+
+
+@pytest.mark.unit_test
+class TestKinesisProducer(unittest.TestCase):
+
+    def setUp(self):
+        self.session_mock = MagicMock()
+        self.mock_kinesis = MagicMock()
+        self.session_mock.client.return_value = self.mock_kinesis
+        self.mock_kinesis.put_records.side_effect = mock_put_records_success
+        self.sleep_patcher = patch('resource_manager.src.util.kinesis_producer.time.sleep')
+        self.mock_sleep = self.sleep_patcher.start()
+
+    def tearDown(self):
+        self.sleep_patcher.stop()
+
+    def test_put_records_chunked_success(self):
+        producer = KinesisProducer(self.session_mock, TEST_STREAM_NAME)
+        failed = producer.put_records(get_records(1100))
+
+        self.assertEqual(failed, [])
+        self.assertEqual([len(c[1]['Records']) for c in self.mock_kinesis.put_records.call_args_list],
+                         [PUT_RECORDS_MAX_RECORDS, PUT_RECORDS_MAX_RECORDS, 100])
+        self.assertEqual(producer.stats['records'], 1100)
+        self.assertEqual(producer.stats['requests'], 3)
+
+    def test_put_records_retry_failed_only_success(self):
+        responses = [{'FailedRecordCount': 2,
+                      'Records': [{'SequenceNumber': '1'},
+                                  {'ErrorCode': THROUGHPUT_EXCEEDED_ERROR_CODE, 'ErrorMessage': 'Rate exceeded'},
+                                  {'SequenceNumber': '1'},
+                                  {'ErrorCode': 'InternalFailure', 'ErrorMessage': 'Internal'}]},
+                     {'FailedRecordCount': 0, 'Records': [{'SequenceNumber': '2'}, {'SequenceNumber': '2'}]}]
+        self.mock_kinesis.put_records.side_effect = lambda StreamName, Records: responses.pop(0)
+        records = get_records(4)
+        producer = KinesisProducer(self.session_mock, TEST_STREAM_NAME)
+        failed = producer.put_records(records)
+
+        self.assertEqual(failed, [])
+        self.assertEqual(self.mock_kinesis.put_records.call_args_list[1][1]['Records'], [records[1], records[3]])
+        self.assertEqual(producer.stats, {'requests': 2, 'records': 4, 'failed_records': 0,
+                                          'retried_records': 2, 'throttled_records': 1})
+        self.mock_sleep.assert_called_once()
+
+    def test_put_records_max_attempts_fail(self):
+        self.mock_kinesis.put_records.side_effect = lambda StreamName, Records: \
+            {'FailedRecordCount': len(Records),
+             'Records': [{'ErrorCode': THROUGHPUT_EXCEEDED_ERROR_CODE} for _ in Records]}
+        producer = KinesisProducer(self.session_mock, TEST_STREAM_NAME, max_attempts=3)
+        failed = producer.put_records(get_records(2))
+
+        self.assertEqual(len(failed), 2)
+        self.assertEqual(self.mock_kinesis.put_records.call_count, 3)
+        self.assertEqual(producer.stats['failed_records'], 2)
+        self.assertEqual(producer.stats['throttled_records'], 6)
+
+    def test_produce_total_records_random_partition_keys_success(self):
+        producer = KinesisProducer(self.session_mock, TEST_STREAM_NAME, record_factory=lambda: {'x': 1})
+        stats = producer.produce(total_records=700)
+
+        records = [r for c in self.mock_kinesis.put_records.call_args_list for r in c[1]['Records']]
+        self.assertEqual(stats['records'], 700)
+        self.assertEqual(self.mock_kinesis.put_records.call_count, 2)
+        self.assertEqual(records[0]['Data'], '{"x": 1}')
+        self.assertEqual(len({r['PartitionKey'] for r in records}), 700)
+
+    def test_produce_paced_batch_size_success(self):
+        producer = KinesisProducer(self.session_mock, TEST_STREAM_NAME, record_factory=lambda: {'x': 1},
+                                   records_per_second=100, linger_secs=0.1)
+        self.sleep_patcher.stop()
+        start = time.monotonic()
+        stats = producer.produce(total_records=30)
+        self.sleep_patcher.start()
+
+        self.assertEqual(producer.batch_size, 10)
+        self.assertEqual(stats['requests'], 3)
+        self.assertGreaterEqual(time.monotonic() - start, 0.15)
+
+    def test_start_stop_success(self):
+        self.sleep_patcher.stop()
+        producer = KinesisProducer(self.session_mock, TEST_STREAM_NAME, record_factory=lambda: {'x': 1},
+                                   records_per_second=200, linger_secs=0.05)
+        with producer:
+            producer.start()
+            self.assertRaises(Exception, producer.start)
+            time.sleep(0.2)
+        self.sleep_patcher.start()
+
+        self.assertGreater(producer.stats['records'], 0)
+        requests = self.mock_kinesis.put_records.call_count
+        time.sleep(0.05)
+        self.assertEqual(self.mock_kinesis.put_records.call_count, requests)
+
+    def test_stop_raises_producer_error_fail(self):
+        self.mock_kinesis.put_records.side_effect = Exception('Stream does not exist')
+        producer = KinesisProducer(self.session_mock, TEST_STREAM_NAME, record_factory=lambda: {'x': 1})
+        producer.start(total_records=1)
+
+        self.assertRaises(Exception, producer.stop)
@@ -1,5 +1,7 @@
 import io
 import json
+import threading
+import time
 import unittest
 from unittest.mock import MagicMock, patch
 
@@ -222,38 +224,93 @@ class TestLambdaUtil(unittest.TestCase):
         self.mock_lambda.invoke.assert_called_once_with(FunctionName=LAMBDA_ARN, InvocationType='RequestResponse')
 
     def test_trigger_ordinary_lambda_several_times(self):
-        response_body_encoded = json.dumps({}).encode()
-        response_payload = StreamingBody(
-            io.BytesIO(response_body_encoded),
-            len(response_body_encoded)
-        )
-        self.mock_lambda.invoke.return_value = mock_function_invoke(200, response_payload)
+        self.mock_lambda.invoke.side_effect = lambda FunctionName, InvocationType: \
+            mock_function_invoke(200, StreamingBody(io.BytesIO(b'{}'), 2))
         trigger_attempts = 4
         response = lambda_utils.trigger_ordinary_lambda_several_times(LAMBDA_ARN, self.session_mock, trigger_attempts)
-        self.mock_lambda.invoke.assert_called_with(FunctionName=LAMBDA_ARN)
-        self.assertTrue(response)
+        self.mock_lambda.invoke.assert_called_with(FunctionName=LAMBDA_ARN, InvocationType='RequestResponse')
+        self.assertEqual(response.successes, trigger_attempts)
+        self.assertEqual(response.status_codes, {200: trigger_attempts})
         self.assertEqual(self.mock_lambda.invoke.call_count, trigger_attempts)
 
-    @patch('time.sleep')
-    @patch('time.time')
-    def test_trigger_lambda_under_stress(self, patched_time, patched_sleep):
-        mock_sleep = MockSleep()
-        patched_time.side_effect = mock_sleep.time
-        patched_sleep.side_effect = mock_sleep.sleep
-        overall_stress_time = 13
+    def test_trigger_ordinary_lambda_several_times_reserved_concurrency(self):
+        # Function with reserved concurrency 1 throttles overlapping invokes
+        in_flight = []
+        lock = threading.Lock()
+
+        def invoke(FunctionName, InvocationType):
+            with lock:
+                if in_flight:
+                    raise ClientError({'ResponseMetadata': {'HTTPStatusCode': 429},
+                                       'Error': {'Code': 'TooManyRequestsException'}}, "Invoke")
+                in_flight.append(1)
+            time.sleep(0.005)
+            with lock:
+                in_flight.pop()
+            return mock_function_invoke(200, None)
+
+        self.mock_lambda.invoke.side_effect = invoke
+        response = lambda_utils.trigger_ordinary_lambda_several_times(LAMBDA_ARN, self.session_mock, 10)
+        self.assertEqual(response.successes, 10)
+        self.assertEqual(response.throttles, 0)
+        # Client with default retries is used, not the load client without retries
+        self.session_mock.client.assert_called_once_with('lambda', config=client_factory.config)
+
+    def test_trigger_ordinary_lambda_several_times_throttled(self):
+        responses = [mock_function_invoke(200, None), mock_function_invoke(200, None)]
+
+        def invoke(FunctionName, InvocationType):
+            if not responses:
+                raise ClientError({'ResponseMetadata': {'HTTPStatusCode': 429},
+                                   'Error': {'Code': 'TooManyRequestsException'}}, "Invoke")
+            return responses.pop()
+
+        self.mock_lambda.invoke.side_effect = invoke
+        self.assertRaises(Exception, lambda_utils.trigger_ordinary_lambda_several_times, LAMBDA_ARN,
+                          self.session_mock, 3, 1)
+
+    def test_invoke_lambda_under_load_accounting(self):
+        results = [mock_function_invoke(200, None),
+                   dict(mock_function_invoke(200, None), FunctionError='Unhandled'),
+                   ClientError({'ResponseMetadata': {'HTTPStatusCode': 429},
+                                'Error': {'Code': 'TooManyRequestsException'}}, "Invoke"),
+                   ClientError({'ResponseMetadata': {'HTTPStatusCode': 500},
+                                'Error': {'Code': 'ServiceException'}}, "Invoke")]
+        self.mock_lambda.invoke.side_effect = results
+        result = lambda_utils.invoke_lambda_under_load(LAMBDA_ARN, self.session_mock, total_invocations=4,
+                                                       concurrency=1)
+        self.assertEqual((result.requests, result.successes, result.throttles, result.function_errors),
+                         (4, 2, 1, 1))
+        self.assertEqual(result.status_codes, {200: 2, 429: 1, 500: 1})
+        self.assertEqual(result.errors, {'ServiceException': 1})
+        self.assertEqual(result.to_dict()['latency']['count'], 4)
+
+    def test_trigger_lambda_under_stress(self):
+        invoke_times = []
+        lock = threading.Lock()
+
+        def invoke(FunctionName, InvocationType):
+            with lock:
+                invoke_times.append(time.monotonic())
+            time.sleep(0.02)
+            return mock_function_invoke(202, None)
+
+        self.mock_lambda.invoke.side_effect = invoke
+        overall_stress_time = 0.35
         number_in_each_chunk = 3
-        delay_among_chunks = 2
-        start_stress = mock_sleep.time()
-        end_stress = start_stress + overall_stress_time
+        delay_among_chunks = 0.1
+        start = time.monotonic()
 
-        lambda_utils.trigger_lambda_under_stress(
+        result = lambda_utils.trigger_lambda_under_stress(
             LAMBDA_ARN, self.session_mock, overall_stress_time, number_in_each_chunk, delay_among_chunks)
 
-        self.assertLess(abs(end_stress - mock_sleep.time()), delay_among_chunks + 0.1)
-        self.assertLessEqual(self.mock_lambda.invoke.call_count, (1 + overall_stress_time
-                                                                  / delay_among_chunks) * number_in_each_chunk)
-        self.assertGreaterEqual(self.mock_lambda.invoke.call_count, overall_stress_time
-                                * number_in_each_chunk / delay_among_chunks - 1)
+        self.mock_lambda.invoke.assert_called_with(FunctionName=LAMBDA_ARN, InvocationType='Event')
+        self.assertEqual(result.requests, 12)
+        self.assertEqual(result.status_codes, {202: 12})
+        self.assertEqual(result.max_in_flight, number_in_each_chunk)
+        chunk_starts = sorted(invoke_times)[::number_in_each_chunk]
+        for i, chunk_start in enumerate(chunk_starts):
+            self.assertAlmostEqual(chunk_start - start, i * delay_among_chunks, delta=0.05)
 
     @patch('time.sleep')
     @patch('time.time')
@@ -0,0 +1,116 @@
+import threading
+import time
+import unittest
+
+import pytest
+from botocore.exceptions import ClientError
+
+from resource_manager.src.util.load_generator import LatencyHistogram, LoadResult, TokenBucket, run_load
+
+
+def get_client_error(code):
+    return ClientError({'Error': {'Code': code, 'Message': code}}, 'operation')
+
+
+@pytest.mark.unit_test
+class TestLoadGenerator(unittest.TestCase):
+
+    def test_token_bucket_paces_rate_success(self):
+        bucket = TokenBucket(rate=100)
+        start = time.monotonic()
+        scheduled = [bucket.acquire() for _ in range(21)]
+
+        self.assertGreaterEqual(time.monotonic() - start, 0.18)
+        self.assertAlmostEqual(scheduled[-1] - scheduled[0], 0.2, delta=0.01)
+
+    def test_token_bucket_deadline_success(self):
+        bucket = TokenBucket(rate=10)
+        deadline = time.monotonic() + 0.15
+
+        self.assertIsNotNone(bucket.acquire(deadline=deadline))
+        self.assertIsNotNone(bucket.acquire(deadline=deadline))
+        self.assertIsNone(bucket.acquire(deadline=deadline))
+
+    def test_latency_histogram_percentiles_success(self):
+        histogram = LatencyHistogram()
+        for i in range(1, 1001):
+            histogram.record(i / 1000.0)
+
+        self.assertEqual(histogram.count, 1000)
+        self.assertAlmostEqual(histogram.percentile(50), 0.5, delta=0.5 / 64)
+        self.assertAlmostEqual(histogram.percentile(99), 0.99, delta=0.99 / 64)
+        self.assertEqual(histogram.to_dict()['max_secs'], 1.0)
+        self.assertIsNone(LatencyHistogram().percentile(50))
+
+    def test_load_result_record_success(self):
+        result = LoadResult()
+        result.record(0.1)
+        result.record(0.1, 'ProvisionedThroughputExceededException')
+        result.record(0.1, 'ValidationException')
+        result.record(0.1, unprocessed_items=3)
+
+        self.assertEqual((result.requests, result.successes, result.throttles, result.unprocessed_items),
+                         (4, 2, 1, 3))
+        self.assertEqual(result.errors, {'ValidationException': 1})
+
+    def test_run_load_total_requests_success(self):
+        sequence_numbers = []
+        lock = threading.Lock()
+
+        def request(sequence_number):
+            with lock:
+                sequence_numbers.append(sequence_number)
+            if sequence_number % 10 == 0:
+                raise get_client_error('ThrottlingException')
+
+        result = run_load(request, total_requests=50, concurrency=4)
+
+        self.assertEqual(sorted(sequence_numbers), list(range(50)))
+        self.assertEqual((result.requests, result.successes, result.throttles), (50, 45, 5))
+        self.assertEqual(result.histogram.count, 50)
+
+    def test_run_load_duration_and_rate_success(self):
+        result = run_load(lambda i: None, duration_secs=0.5, target_rps=40, concurrency=4)
+
+        self.assertGreaterEqual(result.requests, 15)
+        self.assertLessEqual(result.requests, 22)
+        self.assertLess(result.duration_secs, 1)
+
+    def test_run_load_concurrency_cap_success(self):
+        active = {'current': 0, 'max': 0}
+        lock = threading.Lock()
+
+        def request(sequence_number):
+            with lock:
+                active['current'] += 1
+                active['max'] = max(active['max'], active['current'])
+            time.sleep(0.01)
+            with lock:
+                active['current'] -= 1
+
+        run_load(request, total_requests=30, concurrency=3)
+
+        self.assertLessEqual(active['max'], 3)
+
+    def test_run_load_without_limit_fail(self):
+        self.assertRaises(Exception, run_load, lambda i: None)
+
+    def test_run_load_schedule_success(self):
+        start = time.monotonic()
+        started = []
+        lock = threading.Lock()
+
+        def request(sequence_number):
+            with lock:
+                started.append((sequence_number, time.monotonic() - start))
+            time.sleep(0.02)
+
+        result = run_load(request, duration_secs=0.25, concurrency=2, schedule=lambda i: (i // 2) * 0.1)
+
+        self.assertEqual(result.requests, 6)
+        self.assertEqual(result.max_in_flight, 2)
+        for sequence_number, offset in started:
+            self.assertAlmostEqual(offset, (sequence_number // 2) * 0.1, delta=0.05)
+
+    def test_run_load_rate_and_schedule_fail(self):
+        self.assertRaises(Exception, run_load, lambda i: None, total_requests=1, target_rps=1, schedule=lambda i: 0)
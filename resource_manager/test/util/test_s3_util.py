@@ -1,11 +1,11 @@
 import unittest
 import pytest
-from unittest.mock import MagicMock, call
+from unittest.mock import MagicMock
 from resource_manager.src.util.s3_utils import put_object, get_object, __list_objects as list_objects, \
-    get_number_of_files, get_versions, clean_bucket
+    get_number_of_files, get_versions, clean_bucket, iterate_object_versions
 from documents.util.scripts.test.test_s3_util import list_objects_v2_paginated_side_effect, S3_BUCKET, \
     S3_EMPTY_BUCKET, list_object_versions_paginated_side_effect, S3_OBJECT_WITH_VERSIONS, S3_OBJECT_KEY_NO_VERSIONS, \
-    S3_FILE_VERSION_ID
+    S3_FILE_VERSION_ID, get_list_versions_response
 import resource_manager.src.util.boto3_client_factory as client_factory
 
 S3_OBJECT_KEY = 's3-object-key'
@@ -89,20 +89,44 @@ class TestS3Util(unittest.TestCase):
         )
         self.assertEqual(1, len(versions))
 
+    def test_iterate_object_versions(self):
+        versions = iterate_object_versions(self.session_mock, S3_BUCKET)
+        self.list_object_versions_mock.paginate.assert_not_called()
+        self.assertEqual(["test0.txt", "test0.txt", "test_deleted0.txt", "test1.txt", "test1.txt",
+                          "test_deleted1.txt"], [version['Key'] for version in versions])
+        self.list_object_versions_mock.paginate.assert_called_once_with(Bucket=S3_BUCKET)
+
     def test_clean_bucket_empty(self):
         clean_bucket(self.session_mock, S3_EMPTY_BUCKET)
         self.list_object_versions_mock.paginate.assert_called_once_with(Bucket=S3_EMPTY_BUCKET)
         self.mock_s3_service.delete_object.assert_not_called()
+        self.mock_s3_service.delete_objects.assert_not_called()
 
     def test_clean_bucket(self):
+        self.mock_s3_service.delete_objects.return_value = {}
         clean_bucket(self.session_mock, S3_BUCKET)
         self.list_object_versions_mock.paginate.assert_called_once_with(Bucket=S3_BUCKET)
-        self.assertEqual(6, self.mock_s3_service.delete_object.call_count)
-        self.mock_s3_service.delete_object.assert_has_calls([
-            call(Bucket=S3_BUCKET, Key="test0.txt", VersionId="null"),
-            call(Bucket=S3_BUCKET, Key="test0.txt", VersionId=S3_FILE_VERSION_ID),
-            call(Bucket=S3_BUCKET, Key="test_deleted0.txt", VersionId=S3_FILE_VERSION_ID),
-            call(Bucket=S3_BUCKET, Key="test1.txt", VersionId="null"),
-            call(Bucket=S3_BUCKET, Key="test1.txt", VersionId=S3_FILE_VERSION_ID),
-            call(Bucket=S3_BUCKET, Key="test_deleted1.txt", VersionId=S3_FILE_VERSION_ID),
-        ])
+        self.mock_s3_service.delete_objects.assert_called_once_with(Bucket=S3_BUCKET, Delete={
+            'Objects': [
+                {'Key': "test0.txt", 'VersionId': "null"},
+                {'Key': "test0.txt", 'VersionId': S3_FILE_VERSION_ID},
+                {'Key': "test_deleted0.txt", 'VersionId': S3_FILE_VERSION_ID},
+                {'Key': "test1.txt", 'VersionId': "null"},
+                {'Key': "test1.txt", 'VersionId': S3_FILE_VERSION_ID},
+                {'Key': "test_deleted1.txt", 'VersionId': S3_FILE_VERSION_ID},
+            ],
+            'Quiet': True
+        })
+
+    def test_clean_bucket_batches(self):
+        self.mock_s3_service.delete_objects.return_value = {}
+        self.list_object_versions_mock.paginate.side_effect = None
+        self.list_object_versions_mock.paginate.return_value = (get_list_versions_response(p) for p in range(1000))
+        clean_bucket(self.session_mock, S3_BUCKET)
+        self.assertEqual(3, self.mock_s3_service.delete_objects.call_count)
+        self.assertEqual(3000, sum(len(c[1]['Delete']['Objects'])
+                                   for c in self.mock_s3_service.delete_objects.call_args_list))
+
+    def test_clean_bucket_delete_errors(self):
+        self.mock_s3_service.delete_objects.return_value = {'Errors': [{'Key': "test0.txt", 'Code': 'AccessDenied'}]}
+        self.assertRaises(Exception, clean_bucket, self.session_mock, S3_BUCKET)
@@ -0,0 +1,88 @@
+import datetime
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+from aws_requests_auth.aws_auth import AWSRequestsAuth, getSignatureKey
+from websocket import WebSocketBadStatusException
+
+from resource_manager.src.util.traffic_generator import CachedSigningKeyAuth, run_http_load, run_ws_load
+
+TEST_HOST = 'abcdef.execute-api.us-east-1.amazonaws.com'
+TEST_NOW = datetime.datetime(2021, 3, 4, 5, 6, 7)
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.client_ports.add(self.client_address[1])
+            self.server.requests += 1
+            status_code = 429 if self.server.requests % 2 == 0 else 200
+        self.send_response(status_code)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'{}')
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.mark.unit_test
+class TestTrafficGenerator(unittest.TestCase):
+
+    def test_cached_signing_key_auth_signature_success(self):
+        auth_args = dict(aws_access_key='AKID', aws_secret_access_key='secret', aws_host=TEST_HOST,
+                         aws_region='us-east-1', aws_service='execute-api', aws_token='token')
+        request = requests.Request('POST', f'https://{TEST_HOST}/stage/path?b=2&a=1', data='{"x": 1}').prepare()
+        with patch('resource_manager.src.util.traffic_generator.datetime') as mock_datetime, \
+                patch('aws_requests_auth.aws_auth.datetime') as mock_aws_datetime, \
+                patch('resource_manager.src.util.traffic_generator.getSignatureKey',
+                      wraps=getSignatureKey) as mock_get_key:
+            mock_datetime.datetime.utcnow.return_value = TEST_NOW
+            mock_aws_datetime.datetime.utcnow.return_value = TEST_NOW
+            expected = AWSRequestsAuth(**auth_args).get_aws_request_headers_handler(request)
+            auth = CachedSigningKeyAuth(**auth_args)
+            actual = auth.get_aws_request_headers_handler(request)
+            auth.get_aws_request_headers_handler(request)
+
+        self.assertEqual(actual, expected)
+        mock_get_key.assert_called_once()
+
+    def test_run_http_load_status_codes_success(self):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), MockHandler)
+        server.lock = threading.Lock()
+        server.client_ports = set()
+        server.requests = 0
+        server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+        server_thread.start()
+        try:
+            result = run_http_load('GET', f'http://127.0.0.1:{server.server_address[1]}/', total_requests=20,
+                                   concurrency=2)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        self.assertEqual(result.status_codes, {200: 10, 429: 10})
+        self.assertEqual((result.requests, result.successes, result.throttles), (20, 10, 10))
+        self.assertEqual(result.histogram.count, 20)
+        # Connections are kept alive by every worker
+        self.assertLessEqual(len(server.client_ports), 2)
+
+    @patch('resource_manager.src.util.traffic_generator.create_connection')
+    def test_run_ws_load_status_codes_success(self, mock_create_connection):
+        connection = MagicMock()
+        responses = [connection, WebSocketBadStatusException('Handshake status %d %s', 429),
+                     WebSocketBadStatusException('Handshake status %d %s', 403)]
+        mock_create_connection.side_effect = responses
+
+        result = run_ws_load('wss://test', total_requests=3, concurrency=1)
+
+        self.assertEqual(result.status_codes, {101: 1, 429: 1, 403: 1})
+        self.assertEqual((result.successes, result.throttles), (1, 1))
+        self.assertEqual(result.errors, {'HTTP403': 1})
+        connection.close.assert_called_once()
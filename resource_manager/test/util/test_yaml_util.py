@@ -1,6 +1,7 @@
 import unittest
 import pytest
 import os
+import tempfile
 from unittest.mock import patch, mock_open
 import resource_manager.src.util.yaml_util as yaml_util
 
@@ -72,3 +73,30 @@ class TestYamlUtil(unittest.TestCase):
         temp_hash_1 = yaml_util.get_yaml_file_sha1_hash(cfn_template_path_1)
         temp_hash_2 = yaml_util.get_yaml_file_sha1_hash(cfn_template_path_2)
         self.assertNotEqual(temp_hash_1, temp_hash_2)
+
+    def test_file_loads_yaml_cached_success(self):
+        yaml_util.clear_cache()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, 'template.yml')
+            with open(file_path, 'w') as f:
+                f.write(self.file_data_dummy_1)
+            with patch('resource_manager.src.util.yaml_util.loads_yaml', wraps=yaml_util.loads_yaml) as loads_mock:
+                content_1 = yaml_util.file_loads_yaml(file_path)
+                hash_1 = yaml_util.get_yaml_file_sha1_hash(file_path)
+                self.assertIs(yaml_util.file_loads_yaml(file_path), content_1)
+                self.assertEqual(yaml_util.get_yaml_file_sha1_hash(file_path), hash_1)
+                self.assertEqual(loads_mock.call_count, 1)
+
+                # Modified file (different size) is parsed again
+                with open(file_path, 'w') as f:
+                    f.write(self.file_data_dummy_2)
+                self.assertNotEqual(yaml_util.get_yaml_file_sha1_hash(file_path), hash_1)
+                self.assertEqual(loads_mock.call_count, 2)
+        yaml_util.clear_cache()
+
+    def test_file_loads_yaml_not_existing_file_not_cached_success(self):
+        with patch('builtins.open', mock_open(read_data=self.file_data_dummy_1)):
+            with patch('resource_manager.src.util.yaml_util.loads_yaml', wraps=yaml_util.loads_yaml) as loads_mock:
+                yaml_util.file_loads_yaml('not_existing_file')
+                yaml_util.file_loads_yaml('not_existing_file')
+                self.assertEqual(loads_mock.call_count, 2)